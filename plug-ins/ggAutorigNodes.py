@@ -0,0 +1,619 @@
+"""
+Custom nodes and commands used by the gg autorig.
+The plug-ins folder lives in the module root, so Maya finds this file once the module is installed.
+Node ids use the 0x0007F000 - 0x0007FFFF range reserved for local development.
+"""
+
+import os
+import sys
+
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaUI as omui
+import maya.api.OpenMayaRender as omr
+
+SCRIPTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+if SCRIPTS_PATH not in sys.path:
+    sys.path.append(SCRIPTS_PATH)
+
+from gg_autorig.utils import matrix_math
+from gg_autorig.utils import volume_math
+from gg_autorig.utils import scene_finalize
+
+def maya_useNewAPI():
+    """
+    Tells Maya this plugin uses the Python API 2.0.
+    """
+    pass
+
+
+class GuideDisplayNode(omui.MPxLocatorNode):
+    """
+    Display only locator that draws the connector lines of a guide module.
+    Every guide world matrix is connected to inputMatrix and each segment stores the two matrix indices to join.
+    """
+
+    type_name = "ggGuideDisplay"
+    type_id = om.MTypeId(0x0007F100)
+    draw_db_classification = "drawdb/geometry/ggGuideDisplay"
+    draw_registrant_id = "ggGuideDisplayOverride"
+
+    input_matrix = None
+    segment = None
+    segment_start = None
+    segment_end = None
+    color = None
+
+    @staticmethod
+    def creator():
+        return GuideDisplayNode()
+
+    @staticmethod
+    def initialize():
+        matrix_attr = om.MFnMatrixAttribute()
+        GuideDisplayNode.input_matrix = matrix_attr.create("inputMatrix", "inm", om.MFnMatrixAttribute.kDouble)
+        matrix_attr.array = True
+        matrix_attr.usesArrayDataBuilder = True
+
+        numeric_attr = om.MFnNumericAttribute()
+        GuideDisplayNode.segment_start = numeric_attr.create("segmentStart", "sgs", om.MFnNumericData.kInt, 0)
+        GuideDisplayNode.segment_end = numeric_attr.create("segmentEnd", "sge", om.MFnNumericData.kInt, 0)
+
+        compound_attr = om.MFnCompoundAttribute()
+        GuideDisplayNode.segment = compound_attr.create("segment", "sg")
+        compound_attr.addChild(GuideDisplayNode.segment_start)
+        compound_attr.addChild(GuideDisplayNode.segment_end)
+        compound_attr.array = True
+        compound_attr.usesArrayDataBuilder = True
+
+        GuideDisplayNode.color = numeric_attr.createColor("lineColor", "lc")
+        numeric_attr.default = (0.0, 0.0, 0.0)
+
+        for attr in (GuideDisplayNode.input_matrix, GuideDisplayNode.segment, GuideDisplayNode.color):
+            om.MPxNode.addAttribute(attr)
+
+    def isBounded(self):
+        return False
+
+
+class GuideDisplayData(om.MUserData):
+    """
+    Line points and color cached between prepareForDraw and addUIDrawables.
+    """
+
+    def __init__(self):
+        om.MUserData.__init__(self, False)
+        self.points = om.MPointArray()
+        self.color = om.MColor((0.0, 0.0, 0.0, 1.0))
+
+
+class GuideDisplayDrawOverride(omr.MPxDrawOverride):
+    """
+    Viewport 2.0 override drawing every segment of a ggGuideDisplay node with a single line list call.
+    """
+
+    @staticmethod
+    def creator(obj):
+        return GuideDisplayDrawOverride(obj)
+
+    def __init__(self, obj):
+        omr.MPxDrawOverride.__init__(self, obj, None, True)
+
+    def supportedDrawAPIs(self):
+        return omr.MRenderer.kAllDevices
+
+    def hasUIDrawables(self):
+        return True
+
+    def isBounded(self, obj_path, camera_path):
+        return False
+
+    def prepareForDraw(self, obj_path, camera_path, frame_context, old_data):
+        data = old_data if isinstance(old_data, GuideDisplayData) else GuideDisplayData()
+
+        node_fn = om.MFnDependencyNode(obj_path.node())
+        matrix_plug = node_fn.findPlug(GuideDisplayNode.input_matrix, False)
+        segment_plug = node_fn.findPlug(GuideDisplayNode.segment, False)
+        color_plug = node_fn.findPlug(GuideDisplayNode.color, False)
+
+        positions = {}
+        for i in range(matrix_plug.numElements()):
+            element = matrix_plug.elementByPhysicalIndex(i)
+            matrix = om.MFnMatrixData(element.asMObject()).matrix()
+            positions[element.logicalIndex()] = om.MPoint(matrix.getElement(3, 0), matrix.getElement(3, 1), matrix.getElement(3, 2))
+
+        points = om.MPointArray()
+        for i in range(segment_plug.numElements()):
+            element = segment_plug.elementByPhysicalIndex(i)
+            start = positions.get(element.child(0).asInt())
+            end = positions.get(element.child(1).asInt())
+            if start is None or end is None:
+                continue
+            points.append(start)
+            points.append(end)
+
+        data.points = points
+        data.color = om.MColor((color_plug.child(0).asFloat(), color_plug.child(1).asFloat(), color_plug.child(2).asFloat(), 1.0))
+
+        return data
+
+    def addUIDrawables(self, obj_path, draw_manager, frame_context, data):
+        if not isinstance(data, GuideDisplayData) or not len(data.points):
+            return
+
+        # The lines are drawn in world space, the locator transform is ignored.
+        inverse = obj_path.inclusiveMatrixInverse()
+        points = om.MPointArray([point * inverse for point in data.points])
+
+        draw_manager.beginDrawable()
+        draw_manager.setColor(data.color)
+        draw_manager.lineList(points, False)
+        draw_manager.endDrawable()
+
+
+def read_matrix_array(data, attr):
+    """
+    Reads a matrix array attribute inside compute.
+
+    Args:
+        data (om.MDataBlock): The data block.
+        attr (om.MObject): The array attribute.
+    Returns:
+        dict: Flat matrix lists keyed by logical index.
+    """
+    matrices = {}
+    array_handle = data.inputArrayValue(attr)
+    for i in range(len(array_handle)):
+        array_handle.jumpToPhysicalElement(i)
+        matrices[array_handle.elementLogicalIndex()] = list(array_handle.inputValue().asMatrix())
+    return matrices
+
+
+class SpaceSwitchNode(om.MPxNode):
+    """
+    Replaces the parentMatrix + choice + blendMatrix network of a space switch with a single node.
+    The default space (defaultMatrix * defaultOffset) is blended towards the selected driver space with the follow weights.
+    The math lives in gg_autorig.utils.matrix_math.space_switch.
+    """
+
+    type_name = "ggSpaceSwitch"
+    type_id = om.MTypeId(0x0007F101)
+
+    driver_matrix = None
+    driver_offset = None
+    default_matrix = None
+    default_offset = None
+    space_index = None
+    translate_follow = None
+    rotate_follow = None
+    output_matrix = None
+
+    @staticmethod
+    def creator():
+        return SpaceSwitchNode()
+
+    @staticmethod
+    def initialize():
+        matrix_attr = om.MFnMatrixAttribute()
+        SpaceSwitchNode.driver_matrix = matrix_attr.create("driverMatrix", "drm", om.MFnMatrixAttribute.kDouble)
+        matrix_attr.array = True
+        matrix_attr.usesArrayDataBuilder = True
+        SpaceSwitchNode.driver_offset = matrix_attr.create("driverOffset", "dro", om.MFnMatrixAttribute.kDouble)
+        matrix_attr.array = True
+        matrix_attr.usesArrayDataBuilder = True
+        SpaceSwitchNode.default_matrix = matrix_attr.create("defaultMatrix", "dfm", om.MFnMatrixAttribute.kDouble)
+        SpaceSwitchNode.default_offset = matrix_attr.create("defaultOffset", "dfo", om.MFnMatrixAttribute.kDouble)
+        SpaceSwitchNode.output_matrix = matrix_attr.create("outputMatrix", "out", om.MFnMatrixAttribute.kDouble)
+        matrix_attr.writable = False
+        matrix_attr.storable = False
+
+        numeric_attr = om.MFnNumericAttribute()
+        SpaceSwitchNode.space_index = numeric_attr.create("spaceIndex", "si", om.MFnNumericData.kInt, 0)
+        numeric_attr.keyable = True
+        numeric_attr.setMin(0)
+        SpaceSwitchNode.translate_follow = numeric_attr.create("translateFollow", "tf", om.MFnNumericData.kDouble, 1.0)
+        numeric_attr.keyable = True
+        numeric_attr.setMin(0.0)
+        numeric_attr.setMax(1.0)
+        SpaceSwitchNode.rotate_follow = numeric_attr.create("rotateFollow", "rf", om.MFnNumericData.kDouble, 1.0)
+        numeric_attr.keyable = True
+        numeric_attr.setMin(0.0)
+        numeric_attr.setMax(1.0)
+
+        inputs = (SpaceSwitchNode.driver_matrix, SpaceSwitchNode.driver_offset, SpaceSwitchNode.default_matrix,
+                  SpaceSwitchNode.default_offset, SpaceSwitchNode.space_index, SpaceSwitchNode.translate_follow,
+                  SpaceSwitchNode.rotate_follow)
+        for attr in inputs + (SpaceSwitchNode.output_matrix,):
+            om.MPxNode.addAttribute(attr)
+        for attr in inputs:
+            om.MPxNode.attributeAffects(attr, SpaceSwitchNode.output_matrix)
+
+    def compute(self, plug, data):
+        if plug != SpaceSwitchNode.output_matrix:
+            return None
+
+        drivers = read_matrix_array(data, SpaceSwitchNode.driver_matrix)
+        offsets = read_matrix_array(data, SpaceSwitchNode.driver_offset)
+        indices = sorted(drivers)
+
+        space_index = data.inputValue(SpaceSwitchNode.space_index).asInt()
+        result = matrix_math.space_switch(
+            list(data.inputValue(SpaceSwitchNode.default_matrix).asMatrix()),
+            list(data.inputValue(SpaceSwitchNode.default_offset).asMatrix()),
+            [drivers[i] for i in indices],
+            [offsets.get(i, matrix_math.IDENTITY) for i in indices],
+            indices.index(space_index) if space_index in drivers else space_index,
+            data.inputValue(SpaceSwitchNode.translate_follow).asDouble(),
+            data.inputValue(SpaceSwitchNode.rotate_follow).asDouble(),
+        )
+
+        output_handle = data.outputValue(SpaceSwitchNode.output_matrix)
+        output_handle.setMMatrix(om.MMatrix(result))
+        output_handle.setClean()
+
+
+class PoleVectorNode(om.MPxNode):
+    """
+    Computes the pole vector matrix of a three joint chain, replacing the rowFromMatrix/distanceBetween/plusMinusAverage
+    network of create_matrix_pole_vector. The math lives in gg_autorig.utils.matrix_math.pole_vector_matrix.
+    """
+
+    type_name = "ggPoleVector"
+    type_id = om.MTypeId(0x0007F102)
+
+    start_matrix = None
+    mid_matrix = None
+    end_matrix = None
+    pole_distance = None
+    orient_weight = None
+    output_matrix = None
+
+    @staticmethod
+    def creator():
+        return PoleVectorNode()
+
+    @staticmethod
+    def initialize():
+        matrix_attr = om.MFnMatrixAttribute()
+        PoleVectorNode.start_matrix = matrix_attr.create("startMatrix", "stm", om.MFnMatrixAttribute.kDouble)
+        PoleVectorNode.mid_matrix = matrix_attr.create("midMatrix", "mdm", om.MFnMatrixAttribute.kDouble)
+        PoleVectorNode.end_matrix = matrix_attr.create("endMatrix", "enm", om.MFnMatrixAttribute.kDouble)
+        PoleVectorNode.output_matrix = matrix_attr.create("outputMatrix", "out", om.MFnMatrixAttribute.kDouble)
+        matrix_attr.writable = False
+        matrix_attr.storable = False
+
+        numeric_attr = om.MFnNumericAttribute()
+        PoleVectorNode.pole_distance = numeric_attr.create("poleDistance", "pd", om.MFnNumericData.kDouble, 1.0)
+        numeric_attr.keyable = True
+        PoleVectorNode.orient_weight = numeric_attr.create("orientWeight", "ow", om.MFnNumericData.kDouble, 0.0)
+        numeric_attr.keyable = True
+        numeric_attr.setMin(0.0)
+        numeric_attr.setMax(1.0)
+
+        inputs = (PoleVectorNode.start_matrix, PoleVectorNode.mid_matrix, PoleVectorNode.end_matrix,
+                  PoleVectorNode.pole_distance, PoleVectorNode.orient_weight)
+        for attr in inputs + (PoleVectorNode.output_matrix,):
+            om.MPxNode.addAttribute(attr)
+        for attr in inputs:
+            om.MPxNode.attributeAffects(attr, PoleVectorNode.output_matrix)
+
+    def compute(self, plug, data):
+        if plug != PoleVectorNode.output_matrix:
+            return None
+
+        result = matrix_math.pole_vector_matrix(
+            list(data.inputValue(PoleVectorNode.start_matrix).asMatrix()),
+            list(data.inputValue(PoleVectorNode.mid_matrix).asMatrix()),
+            list(data.inputValue(PoleVectorNode.end_matrix).asMatrix()),
+            data.inputValue(PoleVectorNode.pole_distance).asDouble(),
+            data.inputValue(PoleVectorNode.orient_weight).asDouble(),
+        )
+
+        output_handle = data.outputValue(PoleVectorNode.output_matrix)
+        output_handle.setMMatrix(om.MMatrix(result))
+        output_handle.setClean()
+
+
+class TwoBoneIkNode(om.MPxNode):
+    """
+    Closed form two bone solver with soft, stretch, pin and length multipliers, replacing the distance/remap/law of cosine
+    network of limb_module_matrix.ik_rig. The math lives in gg_autorig.utils.matrix_math.two_bone_ik.
+    """
+
+    type_name = "ggTwoBoneIk"
+    type_id = om.MTypeId(0x0007F103)
+
+    root_matrix = None
+    pole_matrix = None
+    handle_matrix = None
+    upper_rest_length = None
+    lower_rest_length = None
+    global_scale = None
+    stretch = None
+    upper_length_mult = None
+    lower_length_mult = None
+    soft = None
+    soft_start = None
+    pin = None
+    primary_axis = None
+    secondary_axis = None
+    mirror = None
+    upper_matrix = None
+    lower_matrix = None
+    end_matrix = None
+
+    @staticmethod
+    def creator():
+        return TwoBoneIkNode()
+
+    @staticmethod
+    def initialize():
+        matrix_attr = om.MFnMatrixAttribute()
+        TwoBoneIkNode.root_matrix = matrix_attr.create("rootMatrix", "rtm", om.MFnMatrixAttribute.kDouble)
+        TwoBoneIkNode.pole_matrix = matrix_attr.create("poleMatrix", "pom", om.MFnMatrixAttribute.kDouble)
+        TwoBoneIkNode.handle_matrix = matrix_attr.create("handleMatrix", "hdm", om.MFnMatrixAttribute.kDouble)
+
+        outputs = []
+        for long_name, short_name in (("upperMatrix", "upm"), ("lowerMatrix", "lwm"), ("endMatrix", "edm")):
+            outputs.append(matrix_attr.create(long_name, short_name, om.MFnMatrixAttribute.kDouble))
+            matrix_attr.writable = False
+            matrix_attr.storable = False
+        TwoBoneIkNode.upper_matrix, TwoBoneIkNode.lower_matrix, TwoBoneIkNode.end_matrix = outputs
+
+        numeric_attr = om.MFnNumericAttribute()
+
+        def create_double(long_name, short_name, default, min_value=None, max_value=None):
+            attr = numeric_attr.create(long_name, short_name, om.MFnNumericData.kDouble, default)
+            numeric_attr.keyable = True
+            if min_value is not None:
+                numeric_attr.setMin(min_value)
+            if max_value is not None:
+                numeric_attr.setMax(max_value)
+            return attr
+
+        TwoBoneIkNode.upper_rest_length = create_double("upperRestLength", "url", 1.0, 0.0)
+        TwoBoneIkNode.lower_rest_length = create_double("lowerRestLength", "lrl", 1.0, 0.0)
+        TwoBoneIkNode.global_scale = create_double("globalScale", "gs", 1.0, 0.001)
+        TwoBoneIkNode.stretch = create_double("stretch", "st", 0.0, 0.0, 1.0)
+        TwoBoneIkNode.upper_length_mult = create_double("upperLengthMult", "ulm", 1.0, 0.001)
+        TwoBoneIkNode.lower_length_mult = create_double("lowerLengthMult", "llm", 1.0, 0.001)
+        TwoBoneIkNode.soft = create_double("soft", "sf", 0.0, 0.0, 1.0)
+        TwoBoneIkNode.soft_start = create_double("softStart", "ss", 0.8, 0.0, 1.0)
+        TwoBoneIkNode.pin = create_double("pin", "pn", 0.0, 0.0, 1.0)
+
+        TwoBoneIkNode.primary_axis = numeric_attr.create("primaryAxis", "pa", om.MFnNumericData.k3Double)
+        numeric_attr.default = (1.0, 0.0, 0.0)
+        TwoBoneIkNode.secondary_axis = numeric_attr.create("secondaryAxis", "sa", om.MFnNumericData.k3Double)
+        numeric_attr.default = (0.0, 1.0, 0.0)
+        TwoBoneIkNode.mirror = numeric_attr.create("mirror", "mr", om.MFnNumericData.kBoolean, False)
+
+        inputs = (TwoBoneIkNode.root_matrix, TwoBoneIkNode.pole_matrix, TwoBoneIkNode.handle_matrix,
+                  TwoBoneIkNode.upper_rest_length, TwoBoneIkNode.lower_rest_length, TwoBoneIkNode.global_scale,
+                  TwoBoneIkNode.stretch, TwoBoneIkNode.upper_length_mult, TwoBoneIkNode.lower_length_mult,
+                  TwoBoneIkNode.soft, TwoBoneIkNode.soft_start, TwoBoneIkNode.pin,
+                  TwoBoneIkNode.primary_axis, TwoBoneIkNode.secondary_axis, TwoBoneIkNode.mirror)
+        for attr in inputs + tuple(outputs):
+            om.MPxNode.addAttribute(attr)
+        for attr in inputs:
+            for output in outputs:
+                om.MPxNode.attributeAffects(attr, output)
+
+    def compute(self, plug, data):
+        outputs = (TwoBoneIkNode.upper_matrix, TwoBoneIkNode.lower_matrix, TwoBoneIkNode.end_matrix)
+        if plug not in outputs:
+            return None
+
+        # One solve gives the three matrices, so all the outputs are cleaned together.
+        results = matrix_math.two_bone_ik(
+            list(data.inputValue(TwoBoneIkNode.root_matrix).asMatrix()),
+            list(data.inputValue(TwoBoneIkNode.pole_matrix).asMatrix()),
+            list(data.inputValue(TwoBoneIkNode.handle_matrix).asMatrix()),
+            data.inputValue(TwoBoneIkNode.upper_rest_length).asDouble(),
+            data.inputValue(TwoBoneIkNode.lower_rest_length).asDouble(),
+            global_scale=data.inputValue(TwoBoneIkNode.global_scale).asDouble(),
+            stretch=data.inputValue(TwoBoneIkNode.stretch).asDouble(),
+            upper_mult=data.inputValue(TwoBoneIkNode.upper_length_mult).asDouble(),
+            lower_mult=data.inputValue(TwoBoneIkNode.lower_length_mult).asDouble(),
+            soft=data.inputValue(TwoBoneIkNode.soft).asDouble(),
+            soft_start=data.inputValue(TwoBoneIkNode.soft_start).asDouble(),
+            pin=data.inputValue(TwoBoneIkNode.pin).asDouble(),
+            primary_axis=list(data.inputValue(TwoBoneIkNode.primary_axis).asDouble3()),
+            secondary_axis=list(data.inputValue(TwoBoneIkNode.secondary_axis).asDouble3()),
+            mirror=data.inputValue(TwoBoneIkNode.mirror).asBool(),
+        )
+
+        for output, result in zip(outputs, results):
+            output_handle = data.outputValue(output)
+            output_handle.setMMatrix(om.MMatrix(result))
+            output_handle.setClean()
+
+
+class VolumePreservationNode(om.MPxNode):
+    """
+    Computes the squash and stretch scale of every joint of a chain, replacing the remapValue/floatMath network of
+    volume_preservation_system. The math lives in gg_autorig.utils.volume_math.volume_preservation.
+    """
+
+    type_name = "ggVolumePreservation"
+    type_id = om.MTypeId(0x0007F104)
+
+    stretch_factor = None
+    percentage = None
+    falloff = None
+    max_pos = None
+    max_stretch_length = None
+    min_stretch_length = None
+    max_stretch_effect = None
+    min_stretch_effect = None
+    volume_preservation = None
+    rest_scale = None
+    output_scale = None
+
+    @staticmethod
+    def creator():
+        return VolumePreservationNode()
+
+    @staticmethod
+    def initialize():
+        numeric_attr = om.MFnNumericAttribute()
+
+        def create_double(long_name, short_name, default):
+            attr = numeric_attr.create(long_name, short_name, om.MFnNumericData.kDouble, default)
+            numeric_attr.keyable = True
+            return attr
+
+        VolumePreservationNode.stretch_factor = create_double("stretchFactor", "sf", 1.0)
+        VolumePreservationNode.falloff = create_double("falloff", "fo", 0.0)
+        VolumePreservationNode.max_pos = create_double("maxPos", "mp", 0.5)
+        VolumePreservationNode.max_stretch_length = create_double("maxStretchLength", "msl", 2.0)
+        VolumePreservationNode.min_stretch_length = create_double("minStretchLength", "nsl", 0.5)
+        VolumePreservationNode.max_stretch_effect = create_double("maxStretchEffect", "mse", 2.0)
+        VolumePreservationNode.min_stretch_effect = create_double("minStretchEffect", "nse", 0.5)
+        VolumePreservationNode.volume_preservation = create_double("volumePreservation", "vp", 1.0)
+        VolumePreservationNode.rest_scale = create_double("restScale", "rs", 1.0)
+
+        VolumePreservationNode.percentage = create_double("percentage", "pc", 0.0)
+        numeric_attr.array = True
+        numeric_attr.usesArrayDataBuilder = True
+
+        VolumePreservationNode.output_scale = numeric_attr.create("outputScale", "os", om.MFnNumericData.kDouble, 1.0)
+        numeric_attr.array = True
+        numeric_attr.usesArrayDataBuilder = True
+        numeric_attr.writable = False
+        numeric_attr.storable = False
+
+        inputs = (VolumePreservationNode.stretch_factor, VolumePreservationNode.percentage, VolumePreservationNode.falloff,
+                  VolumePreservationNode.max_pos, VolumePreservationNode.max_stretch_length, VolumePreservationNode.min_stretch_length,
+                  VolumePreservationNode.max_stretch_effect, VolumePreservationNode.min_stretch_effect,
+                  VolumePreservationNode.volume_preservation, VolumePreservationNode.rest_scale)
+        for attr in inputs + (VolumePreservationNode.output_scale,):
+            om.MPxNode.addAttribute(attr)
+        for attr in inputs:
+            om.MPxNode.attributeAffects(attr, VolumePreservationNode.output_scale)
+
+    def compute(self, plug, data):
+        array_plug = plug.array() if plug.isElement else plug
+        if array_plug != VolumePreservationNode.output_scale:
+            return None
+
+        percentages = {}
+        array_handle = data.inputArrayValue(VolumePreservationNode.percentage)
+        for i in range(len(array_handle)):
+            array_handle.jumpToPhysicalElement(i)
+            percentages[array_handle.elementLogicalIndex()] = array_handle.inputValue().asDouble()
+        indices = sorted(percentages)
+
+        scales = volume_math.volume_preservation(
+            data.inputValue(VolumePreservationNode.stretch_factor).asDouble(),
+            [percentages[i] for i in indices],
+            falloff=data.inputValue(VolumePreservationNode.falloff).asDouble(),
+            max_pos=data.inputValue(VolumePreservationNode.max_pos).asDouble(),
+            max_stretch_length=data.inputValue(VolumePreservationNode.max_stretch_length).asDouble(),
+            min_stretch_length=data.inputValue(VolumePreservationNode.min_stretch_length).asDouble(),
+            max_stretch_effect=data.inputValue(VolumePreservationNode.max_stretch_effect).asDouble(),
+            min_stretch_effect=data.inputValue(VolumePreservationNode.min_stretch_effect).asDouble(),
+            volume_preservation=data.inputValue(VolumePreservationNode.volume_preservation).asDouble(),
+            rest_scale=data.inputValue(VolumePreservationNode.rest_scale).asDouble(),
+        )
+
+        # Output elements share the logical indices of the percentages.
+        output_handle = data.outputArrayValue(VolumePreservationNode.output_scale)
+        builder = output_handle.builder()
+        for index, scale in zip(indices, scales):
+            builder.addElement(index).setDouble(scale)
+        output_handle.set(builder)
+        output_handle.setAllClean()
+
+
+class FinalizeSceneCommand(om.MPxCommand):
+    """
+    ggFinalizeScene [-renameShapes bool] [-labelJoints bool]
+    Renames the controller shapes and labels the joints of the scene with one MDagModifier, owned by the command so the
+    whole pass is a single undo step. Returns the number of renamed shapes and labeled joints.
+    """
+
+    command_name = "ggFinalizeScene"
+
+    def __init__(self):
+        om.MPxCommand.__init__(self)
+        self.dag_modifier = None
+
+    @staticmethod
+    def creator():
+        return FinalizeSceneCommand()
+
+    @staticmethod
+    def syntax():
+        syntax = om.MSyntax()
+        syntax.addFlag("-rs", "-renameShapes", om.MSyntax.kBoolean)
+        syntax.addFlag("-lj", "-labelJoints", om.MSyntax.kBoolean)
+        return syntax
+
+    def doIt(self, args):
+        arg_data = om.MArgParser(self.syntax(), args)
+        rename_shapes = arg_data.flagArgumentBool("-renameShapes", 0) if arg_data.isFlagSet("-renameShapes") else True
+        label_joints = arg_data.flagArgumentBool("-labelJoints", 0) if arg_data.isFlagSet("-labelJoints") else True
+
+        renames, labels = scene_finalize.collect_edits(rename_shapes=rename_shapes, label_joints=label_joints)
+        self.dag_modifier = scene_finalize.queue_edits(renames, labels)
+        self.redoIt()
+
+        om.MPxCommand.setResult([len(renames), len(labels)])
+
+    def redoIt(self):
+        self.dag_modifier.doIt()
+
+    def undoIt(self):
+        self.dag_modifier.undoIt()
+
+    def isUndoable(self):
+        return True
+
+
+NODES = (SpaceSwitchNode, PoleVectorNode, TwoBoneIkNode, VolumePreservationNode)
+COMMANDS = (FinalizeSceneCommand,)
+
+
+def initializePlugin(plugin):
+    plugin_fn = om.MFnPlugin(plugin, "GuiidoGC", "1.0", "Any")
+    try:
+        plugin_fn.registerNode(GuideDisplayNode.type_name, GuideDisplayNode.type_id, GuideDisplayNode.creator,
+                               GuideDisplayNode.initialize, om.MPxNode.kLocatorNode, GuideDisplayNode.draw_db_classification)
+        omr.MDrawRegistry.registerDrawOverrideCreator(GuideDisplayNode.draw_db_classification, GuideDisplayNode.draw_registrant_id,
+                                                      GuideDisplayDrawOverride.creator)
+    except Exception:
+        sys.stderr.write(f"Failed to register node: {GuideDisplayNode.type_name}\n")
+        raise
+    for node in NODES:
+        try:
+            plugin_fn.registerNode(node.type_name, node.type_id, node.creator, node.initialize)
+        except Exception:
+            sys.stderr.write(f"Failed to register node: {node.type_name}\n")
+            raise
+    for command in COMMANDS:
+        try:
+            plugin_fn.registerCommand(command.command_name, command.creator, command.syntax)
+        except Exception:
+            sys.stderr.write(f"Failed to register command: {command.command_name}\n")
+            raise
+
+
+def uninitializePlugin(plugin):
+    plugin_fn = om.MFnPlugin(plugin)
+    try:
+        omr.MDrawRegistry.deregisterDrawOverrideCreator(GuideDisplayNode.draw_db_classification, GuideDisplayNode.draw_registrant_id)
+        plugin_fn.deregisterNode(GuideDisplayNode.type_id)
+    except Exception:
+        sys.stderr.write(f"Failed to deregister node: {GuideDisplayNode.type_name}\n")
+        raise
+    for node in NODES:
+        try:
+            plugin_fn.deregisterNode(node.type_id)
+        except Exception:
+            sys.stderr.write(f"Failed to deregister node: {node.type_name}\n")
+            raise
+    for command in COMMANDS:
+        try:
+            plugin_fn.deregisterCommand(command.command_name)
+        except Exception:
+            sys.stderr.write(f"Failed to deregister command: {command.command_name}\n")
+            raise
@@ -258,11 +258,12 @@ class falangeModule(object):
         print(self.distance_between_output)
         # --- CUSTOM SOLVER --- #
 
-        upper_divide, upper_arm_acos, power_mults = core.law_of_cosine(sides = [f"{self.distance_between_output[0]}", f"{self.distance_between_output[1]}", f"{arm_length_min}.output"], name = f"{self.side}_{self.module_name}Upper", acos=True)
+        upper_divide, upper_arm_acos, power_mults = core.law_of_cosine(sides = [f"{self.distance_between_output[0]}", f"{self.distance_between_output[1]}", f"{arm_length_min}.output"], name = f"{self.side}_{self.module_name}Upper", acos=True, module=f"{self.side}_{self.module_name}")
         lower_divide, lower_power_mults, negate_cos_value = core.law_of_cosine(sides = [f"{self.distance_between_output[0]}", f"{arm_length_min}.output", f"{self.distance_between_output[1]}"],
                                                                             power = [power_mults[0], power_mults[2], power_mults[1]],
                                                                             name = f"{self.side}_{self.module_name}Lower", 
-                                                                            negate=True)
+                                                                            negate=True,
+                                                                            module=f"{self.side}_{self.module_name}")
 
         # --- Aligns --- #
 
@@ -404,11 +405,12 @@ class falangeModule(object):
 
         # --- CUSTOM SOLVER --- #
 
-        upper_divide, upper_arm_acos, power_mults = core.law_of_cosine(sides = [f"{self.distance_between_output[0]}", f"{self.distance_between_output[1]}", f"{arm_length_min}.output"], name = f"{self.side}_{self.module_name}Upper", acos=True)
+        upper_divide, upper_arm_acos, power_mults = core.law_of_cosine(sides = [f"{self.distance_between_output[0]}", f"{self.distance_between_output[1]}", f"{arm_length_min}.output"], name = f"{self.side}_{self.module_name}Upper", acos=True, module=f"{self.side}_{self.module_name}")
         lower_divide, lower_power_mults, negate_cos_value = core.law_of_cosine(sides = [f"{self.distance_between_output[0]}", f"{arm_length_min}.output", f"{self.distance_between_output[1]}"],
                                                                              power = [power_mults[0], power_mults[2], power_mults[1]],
                                                                              name = f"{self.side}_{self.module_name}Lower", 
-                                                                             negate=True)
+                                                                             negate=True,
+                                                                             module=f"{self.side}_{self.module_name}")
 
         # --- Aligns --- #
  
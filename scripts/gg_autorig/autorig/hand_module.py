@@ -5,7 +5,7 @@ import maya.api.OpenMaya as om
 import math
 
 # Local imports
-from gg_autorig.utils.curve_tool import controller_creator
+from gg_autorig.utils.curve_tool import controller_creator, controller_creator_batch
 from gg_autorig.utils.guides.guides_manager import guide_import
 from gg_autorig.utils import data_export
 from gg_autorig.utils import space_switch
@@ -129,13 +129,6 @@ class HandModule():
 
             guide_matrix = []
 
-            meta_ctl, meta_ctl_grp = controller_creator(
-                name=guides_chain[0].replace("_GUIDE", ""),
-                suffixes=["GRP", "ANM"],
-                lock=["tx","tz","ty","scaleX", "scaleY", "scaleZ", "visibility"],
-                ro=True,
-            )
-
             if self.side == "L":
                 self.primary_aim = (1, 0, 0)
                 self.secondary_aim = (0, -1, 0)
@@ -190,6 +183,36 @@ class HandModule():
 
             half_chain_length = len(chain_length) // 2
 
+            fk_names = [guide.replace("Guide_AMX.outputMatrix", "Fk") for i, guide in enumerate(chain_length) if not "End" in guide and i > 0]
+            controllers = controller_creator_batch([
+                {
+                    "name": fk_name,
+                    "suffixes": ["GRP", "ANM"],
+                    "lock": ["scaleX", "scaleY", "scaleZ", "visibility"],
+                    "ro": True,
+                    "parent": f"{fk_names[i-1]}_CTL" if i else self.fk_controllers_trn,
+                }
+                for i, fk_name in enumerate(fk_names)
+            ] + [
+                {
+                    "name": guides_chain[-1].replace("End_GUIDE", suffix),
+                    "suffixes": ["GRP", "ANM"],
+                    "lock": ["scaleX", "scaleY", "scaleZ", "visibility"],
+                    "ro": True,
+                    "parent": self.ik_controllers_trn,
+                }
+                for suffix in ("Ik", "Pv")
+            ] + [
+                {
+                    "name": guides_chain[0].replace("_GUIDE", ""),
+                    "suffixes": ["GRP", "ANM"],
+                    "lock": ["tx","tz","ty","scaleX", "scaleY", "scaleZ", "visibility"],
+                    "ro": True,
+                    "parent": self.fk_controllers_trn,
+                },
+            ])
+            (ik_ctl, ik_ctl_grp), (pv_ctl, pv_ctl_grp), (meta_ctl, meta_ctl_grp) = controllers[-3:]
+
             cmds.connectAttr(f"{guide_matrix[0]}", f"{hand_settings_blend_matrix}.target[{index}].targetMatrix")
             cmds.setAttr(f"{hand_settings_blend_matrix}.target[{index}].scaleWeight", 0)
             cmds.setAttr(f"{hand_settings_blend_matrix}.target[{index}].translateWeight", 0)
@@ -207,14 +230,7 @@ class HandModule():
                 joint = cmds.createNode("joint", name=guide.replace("Guide_AMX.outputMatrix", replace_name), p=parent, ss=True)
                 if not "End" in guide and i > 0:
 
-                    ctl, ctl_grp = controller_creator(
-                    name=guide.replace("Guide_AMX.outputMatrix", "Fk"),
-                    suffixes=["GRP", "ANM"],
-                    lock=["scaleX", "scaleY", "scaleZ", "visibility"],
-                    ro=True,
-                    )
-
-                    cmds.parent(ctl_grp[0], self.fk_controllers_trn if not fk_ctls else fk_ctls[-1])
+                    ctl, ctl_grp = controllers[len(fk_ctls)]
 
                     fk_ctls.append(ctl)
                     fk_ctls_grps.append(ctl_grp)
@@ -244,27 +260,11 @@ class HandModule():
             cmds.connectAttr(f"{meta_ctl}.worldMatrix[0]", f"{mult_matrix}.matrixIn[2]")
             cmds.connectAttr(f"{mult_matrix}.matrixSum", f"{joint_chain[1]}.offsetParentMatrix")
 
-            ik_ctl, ik_ctl_grp = controller_creator(
-                name=guides_chain[-1].replace("End_GUIDE", "Ik"),
-                suffixes=["GRP", "ANM"],
-                lock=["scaleX", "scaleY", "scaleZ", "visibility"],
-                ro=True,
-            )
-
             cmds.connectAttr(f"{guide_matrix[-1]}", f"{ik_ctl_grp[0]}.offsetParentMatrix")
 
-            pv_ctl, pv_ctl_grp = controller_creator(
-                name=guides_chain[-1].replace("End_GUIDE", "Pv"),
-                suffixes=["GRP", "ANM"],
-                lock=["scaleX", "scaleY", "scaleZ", "visibility"],
-                ro=True,
-            )
-
             cmds.connectAttr(f"{guide_matrix[2]}", f"{pv_ctl_grp[0]}.offsetParentMatrix")
             cmds.setAttr(f"{pv_ctl_grp[0]}.ty", distances[0])
 
-            cmds.parent(ik_ctl_grp[0], pv_ctl_grp[0], self.ik_controllers_trn)
-            cmds.parent(meta_ctl_grp[0], self.fk_controllers_trn)
             cmds.connectAttr(f"{meta_ctl}.worldMatrix[0]", f"{joint_chain[0]}.offsetParentMatrix")
             cmds.connectAttr(guide_matrix[0], f"{meta_ctl_grp[0]}.offsetParentMatrix")
 
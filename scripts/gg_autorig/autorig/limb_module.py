@@ -8,6 +8,7 @@ import math
 from gg_autorig.utils.curve_tool import controller_creator
 from gg_autorig.utils.guides.guides_manager import guide_import
 from gg_autorig.utils import data_export
+from gg_autorig.utils.node_graph import NodeGraph
 
 # Dev only imports
 from gg_autorig.utils.guides import guides_manager
@@ -19,6 +20,108 @@ reload(de_boors)
 reload(guides_manager)
 reload(ss)
 
+SOFT_STRETCH_PIN_GRAPH = NodeGraph(
+    nodes={
+        "distance": ("distanceBetween", "{prefix}DistanceToControl_DBT", None),
+        "distanceNormalized": ("floatMath", "{prefix}DistanceToControlNormalized_DBT", 3),
+        "upperLength": ("floatMath", "{prefix}UpperLength_FLM", 2),
+        "fullLength": ("floatMath", "{prefix}FullLength_FLM", 0),
+        "lowerLength": ("floatMath", "{prefix}LowerLength_FLM", 2),
+        "softValue": ("remapValue", "{prefix}SoftValue_RMV", None),
+        "softDistance": ("floatMath", "{prefix}SoftDistance_FLM", 1),
+        "distanceMinusSoft": ("floatMath", "{prefix}DistanceToControlMinusSoftDistance_FLM", 1),
+        "distanceMinusSoftDivided": ("floatMath", "{prefix}DistanceToControlMinusSoftDistanceDividedBySoftValue_FLM", 3),
+        "distanceMinusSoftDividedNegate": ("floatMath", "{prefix}DistanceToControlMinusSoftDistanceDividedBySoftValueNegate_FLM", 2),
+        "softEPower": ("floatMath", "{prefix}SoftEPower_FLM", 6),
+        "softOneMinusEPower": ("floatMath", "{prefix}SoftOneMinusEPower_FLM", 1),
+        "softOneMinusEPowerEnable": ("floatMath", "{prefix}SoftOneMinusEPowerSoftValueEnable_FLM", 2),
+        "softConstant": ("floatMath", "{prefix}SoftConstant_FLM", 0),
+        "softRatio": ("floatMath", "{prefix}SoftRatio_FLM", 3),
+        "lengthRatio": ("floatMath", "{prefix}LengthRatio_FLM", 3),
+        "distanceByLengthRatio": ("floatMath", "{prefix}DistanceToControlDividedByTheLengthRatio_FLM", 3),
+        "softEffectorDistance": ("floatMath", "{prefix}SoftEffectorDistance_FLM", 2),
+        "softCondition": ("condition", "{prefix}SoftCondition_CON", 2),
+        "softEffectorRatioMinusOne": ("floatMath", "{prefix}DistanceToControlDividedByTheSoftEffectorMinusOne_FLM", 1),
+        "stretchAmount": ("floatMath", "{prefix}DistanceToControlDividedByTheSoftEffectorMinusOneMultipliedByTheStretch_FLM", 2),
+        "stretchFactor": ("floatMath", "{prefix}StretchFactor_FLM", 0),
+        "softEffectStretchDistance": ("floatMath", "{prefix}SoftEffectStretchDistance_FLM", 2),
+        "upperLengthStretch": ("floatMath", "{prefix}UpperLengthStretch_FLM", 2),
+        "lowerLengthStretch": ("floatMath", "{prefix}LowerLengthStretch_FLM", 2),
+        "softEffectorRatio": ("floatMath", "{prefix}DistanceToControlDividedByTheSoftEffector_FLM", 3),
+        "upperPin": ("distanceBetween", "{prefix}UpperPin_DBT", None),
+        "lowerPin": ("distanceBetween", "{prefix}LowerPin_DBT", None),
+        "upperPinBlend": ("blendTwoAttr", "{prefix}UpperPin_BTA", None),
+        "lowerPinBlend": ("blendTwoAttr", "{prefix}LowerPin_BTA", None),
+    },
+    edges=[
+        ("distance.distance", "distanceNormalized.floatA"),
+        ("distanceNormalized.outFloat", "lengthRatio.floatA"),
+        ("distanceNormalized.outFloat", "distanceMinusSoft.floatA"),
+        ("distanceNormalized.outFloat", "distanceByLengthRatio.floatA"),
+        ("distanceNormalized.outFloat", "softCondition.firstTerm"),
+        ("distanceNormalized.outFloat", "softCondition.colorIfFalseR"),
+        ("distanceNormalized.outFloat", "softEffectorRatio.floatA"),
+        ("upperLength.outFloat", "softCondition.colorIfFalseG"),
+        ("upperLength.outFloat", "fullLength.floatA"),
+        ("upperLength.outFloat", "upperLengthStretch.floatB"),
+        ("fullLength.outFloat", "softRatio.floatB"),
+        ("fullLength.outFloat", "softDistance.floatA"),
+        ("fullLength.outFloat", "lengthRatio.floatB"),
+        ("lowerLength.outFloat", "fullLength.floatB"),
+        ("lowerLength.outFloat", "softCondition.colorIfFalseB"),
+        ("lowerLength.outFloat", "lowerLengthStretch.floatA"),
+        ("softValue.outValue", "distanceMinusSoftDivided.floatB"),
+        ("softValue.outValue", "softDistance.floatB"),
+        ("softValue.outValue", "softOneMinusEPowerEnable.floatA"),
+        ("softDistance.outFloat", "softConstant.floatB"),
+        ("softDistance.outFloat", "distanceMinusSoft.floatB"),
+        ("softDistance.outFloat", "softCondition.secondTerm"),
+        ("distanceMinusSoft.outFloat", "distanceMinusSoftDivided.floatA"),
+        ("distanceMinusSoftDivided.outFloat", "distanceMinusSoftDividedNegate.floatA"),
+        ("distanceMinusSoftDividedNegate.outFloat", "softEPower.floatB"),
+        ("softEPower.outFloat", "softOneMinusEPower.floatB"),
+        ("softOneMinusEPower.outFloat", "softOneMinusEPowerEnable.floatB"),
+        ("softOneMinusEPowerEnable.outFloat", "softConstant.floatA"),
+        ("softConstant.outFloat", "softRatio.floatA"),
+        ("softRatio.outFloat", "softEffectorDistance.floatA"),
+        ("lengthRatio.outFloat", "distanceByLengthRatio.floatB"),
+        ("distanceByLengthRatio.outFloat", "softEffectorDistance.floatB"),
+        ("softEffectorDistance.outFloat", "softEffectorRatio.floatB"),
+        ("softEffectorDistance.outFloat", "softEffectStretchDistance.floatA"),
+        ("softEffectorRatio.outFloat", "softEffectorRatioMinusOne.floatA"),
+        ("softEffectorRatioMinusOne.outFloat", "stretchAmount.floatA"),
+        ("stretchAmount.outFloat", "stretchFactor.floatA"),
+        ("stretchFactor.outFloat", "upperLengthStretch.floatA"),
+        ("stretchFactor.outFloat", "softEffectStretchDistance.floatB"),
+        ("stretchFactor.outFloat", "lowerLengthStretch.floatB"),
+        ("softEffectStretchDistance.outFloat", "softCondition.colorIfTrueR"),
+        ("upperLengthStretch.outFloat", "softCondition.colorIfTrueG"),
+        ("lowerLengthStretch.outFloat", "softCondition.colorIfTrueB"),
+        ("@stretch", "stretchAmount.floatB"),
+        ("@rootMatrix", "distance.inMatrix1"),
+        ("@ikHandleMatrix", "distance.inMatrix2"),
+        ("@upperLengthMult", "upperLength.floatA"),
+        ("@lowerLengthMult", "lowerLength.floatA"),
+        ("@upperRestLength", "upperLength.floatB"),
+        ("@lowerRestLength", "lowerLength.floatB"),
+        ("@soft", "softValue.inputValue"),
+        ("@globalScale", "distanceNormalized.floatB"),
+        ("@pin", "upperPinBlend.attributesBlender"),
+        ("@pin", "lowerPinBlend.attributesBlender"),
+        ("@rootMatrix", "upperPin.inMatrix1"),
+        ("@pvMatrix", "upperPin.inMatrix2"),
+        ("@softMatrix", "lowerPin.inMatrix1"),
+        ("@pvMatrix", "lowerPin.inMatrix2"),
+    ],
+    values={
+        "distanceMinusSoftDividedNegate.floatB": -1.0,
+        "softEPower.floatA": math.e,
+        "softOneMinusEPower.floatA": 1.0,
+        "softValue.inputMin": 0.001,
+        "softEffectorRatioMinusOne.floatB": 1.0,
+    },
+)
+
 
 class LimbModule(object):
 
@@ -596,185 +699,59 @@ class LimbModule(object):
 
         cmds.connectAttr(f"{aimMatrix}.outputMatrix", f"{self.offset_node}.offsetParentMatrix")
 
-        nodes_to_create = {
-            f"{self.side}_{self.module_name}DistanceToControl_DBT": ("distanceBetween", None), #0
-            f"{self.side}_{self.module_name}DistanceToControlNormalized_DBT": ("floatMath", 3), #1
-            f"{self.side}_{self.module_name}UpperLength_FLM": ("floatMath", 2), #2
-            f"{self.side}_{self.module_name}FullLength_FLM": ("floatMath", 0), #3
-            f"{self.side}_{self.module_name}LowerLength_FLM": ("floatMath", 2), #4
-            f"{self.side}_{self.module_name}SoftValue_RMV": ("remapValue", None), #5
-            f"{self.side}_{self.module_name}SoftDistance_FLM": ("floatMath", 1), #6
-            f"{self.side}_{self.module_name}DistanceToControlMinusSoftDistance_FLM": ("floatMath", 1), #7
-            f"{self.side}_{self.module_name}DistanceToControlMinusSoftDistanceDividedBySoftValue_FLM": ("floatMath", 3),#8
-            f"{self.side}_{self.module_name}DistanceToControlMinusSoftDistanceDividedBySoftValueNegate_FLM": ("floatMath", 2), #9
-            f"{self.side}_{self.module_name}SoftEPower_FLM": ("floatMath", 6), #10
-            f"{self.side}_{self.module_name}SoftOneMinusEPower_FLM": ("floatMath", 1), #11
-            f"{self.side}_{self.module_name}SoftOneMinusEPowerSoftValueEnable_FLM": ("floatMath", 2), #12
-            f"{self.side}_{self.module_name}SoftConstant_FLM": ("floatMath", 0), #13
-            f"{self.side}_{self.module_name}SoftRatio_FLM": ("floatMath", 3), #14
-            f"{self.side}_{self.module_name}LengthRatio_FLM": ("floatMath", 3), #15
-            f"{self.side}_{self.module_name}DistanceToControlDividedByTheLengthRatio_FLM": ("floatMath", 3), #16
-            f"{self.side}_{self.module_name}SoftEffectorDistance_FLM": ("floatMath", 2), #17
-            f"{self.side}_{self.module_name}SoftCondition_CON": ("condition", None), #18
-            f"{self.side}_{self.module_name}DistanceToControlDividedByTheSoftEffectorMinusOne_FLM": ("floatMath", 1), #19 
-            f"{self.side}_{self.module_name}DistanceToControlDividedByTheSoftEffectorMinusOneMultipliedByTheStretch_FLM": ("floatMath", 2), #20 
-            f"{self.side}_{self.module_name}StretchFactor_FLM": ("floatMath", 0), #21 
-            f"{self.side}_{self.module_name}SoftEffectStretchDistance_FLM": ("floatMath", 2), #22 
-            f"{self.side}_{self.module_name}UpperLengthStretch_FLM": ("floatMath", 2), #23 
-            f"{self.side}_{self.module_name}LowerLengthStretch_FLM": ("floatMath", 2), #24 
-            f"{self.side}_{self.module_name}DistanceToControlDividedByTheSoftEffector_FLM": ("floatMath", 3), #25
-            f"{self.side}_{self.module_name}UpperPin_DBT": ("distanceBetween", None), #26
-            f"{self.side}_{self.module_name}LowerPin_DBT": ("distanceBetween", None), #27
-            f"{self.side}_{self.module_name}UpperPin_BTA": ("blendTwoAttr", None), #28
-            f"{self.side}_{self.module_name}LowerPin_BTA": ("blendTwoAttr", None), #29
-            
-        }
-
-
-
-
-        created_nodes = []
-        for node_name, (node_type, operation) in nodes_to_create.items():
-            node = cmds.createNode(node_type, name=node_name)
-            created_nodes.append(node)
-            if operation is not None:
-                cmds.setAttr(f'{node}.operation', operation)
-
-        # Connections between selected nodes
-        cmds.connectAttr(created_nodes[0] + ".distance", created_nodes[1]+".floatA")
-        cmds.connectAttr(created_nodes[1] + ".outFloat", created_nodes[15]+".floatA")
-        cmds.connectAttr(created_nodes[1] + ".outFloat", created_nodes[7]+".floatA")
-        cmds.connectAttr(created_nodes[1] + ".outFloat", created_nodes[16]+".floatA")
-        cmds.connectAttr(created_nodes[1] + ".outFloat", created_nodes[18]+".firstTerm")
-        cmds.connectAttr(created_nodes[1] + ".outFloat", created_nodes[18]+".colorIfFalseR")
-        cmds.connectAttr(created_nodes[2] + ".outFloat", created_nodes[18]+".colorIfFalseG")
-        cmds.connectAttr(created_nodes[2] + ".outFloat", created_nodes[3]+".floatA")
-        cmds.connectAttr(created_nodes[3] + ".outFloat", created_nodes[14]+".floatB")
-        cmds.connectAttr(created_nodes[3] + ".outFloat", created_nodes[6]+".floatA")
-        cmds.connectAttr(created_nodes[3] + ".outFloat", created_nodes[15]+".floatB")
-        cmds.connectAttr(created_nodes[4] + ".outFloat", created_nodes[3]+".floatB")
-        cmds.connectAttr(created_nodes[4] + ".outFloat", created_nodes[18]+".colorIfFalseB")
-        cmds.connectAttr(created_nodes[5] + ".outValue", created_nodes[8]+".floatB")
-        cmds.connectAttr(created_nodes[5] + ".outValue", created_nodes[6]+".floatB")
-        cmds.connectAttr(created_nodes[5] + ".outValue", created_nodes[12]+".floatA")
-        cmds.connectAttr(created_nodes[6] + ".outFloat", created_nodes[13]+".floatB")
-        cmds.connectAttr(created_nodes[6] + ".outFloat", created_nodes[7]+".floatB")
-        cmds.connectAttr(created_nodes[6] + ".outFloat", created_nodes[18]+".secondTerm")
-        cmds.connectAttr(created_nodes[7] + ".outFloat", created_nodes[8]+".floatA")
-        cmds.connectAttr(created_nodes[8] + ".outFloat", created_nodes[9]+".floatA")
-        cmds.connectAttr(created_nodes[9] + ".outFloat", created_nodes[10]+".floatB")
-        cmds.connectAttr(created_nodes[10] + ".outFloat", created_nodes[11]+".floatB")
-        cmds.connectAttr(created_nodes[11] + ".outFloat", created_nodes[12]+".floatB")
-        cmds.connectAttr(created_nodes[12] + ".outFloat", created_nodes[13]+".floatA")
-        cmds.connectAttr(created_nodes[13] + ".outFloat", created_nodes[14]+".floatA")
-        cmds.connectAttr(created_nodes[14] + ".outFloat", created_nodes[17]+".floatA")
-        cmds.connectAttr(created_nodes[15] + ".outFloat", created_nodes[16]+".floatB")
-        cmds.connectAttr(created_nodes[16] + ".outFloat", created_nodes[17]+".floatB")
-
-        cmds.connectAttr(created_nodes[19] + ".outFloat", created_nodes[20]+".floatA")
-        cmds.connectAttr(created_nodes[20] + ".outFloat", created_nodes[21]+".floatA")
-        cmds.connectAttr(created_nodes[21] + ".outFloat", created_nodes[23]+".floatA")
-        cmds.connectAttr(created_nodes[21] + ".outFloat", created_nodes[22]+".floatB")
-        cmds.connectAttr(created_nodes[21] + ".outFloat", created_nodes[24]+".floatB")
-        cmds.connectAttr(created_nodes[1] + ".outFloat", created_nodes[25]+".floatA")
-        cmds.connectAttr(created_nodes[17] + ".outFloat", created_nodes[25]+".floatB")
-        cmds.connectAttr(created_nodes[17] + ".outFloat", created_nodes[22]+".floatA")
-
-        cmds.connectAttr(created_nodes[25] + ".outFloat", created_nodes[19]+".floatA")
-
-        cmds.connectAttr(created_nodes[2] + ".outFloat", created_nodes[23]+".floatB")
-        cmds.connectAttr(created_nodes[4] + ".outFloat", created_nodes[24]+".floatA")
-
-        cmds.connectAttr(self.hand_ws_ik_ctl + ".stretch", created_nodes[20]+".floatB")
-
-        cmds.connectAttr(created_nodes[22] + ".outFloat", created_nodes[18]+".colorIfTrueR")
-        cmds.connectAttr(created_nodes[23] + ".outFloat", created_nodes[18]+".colorIfTrueG")
-        cmds.connectAttr(created_nodes[24] + ".outFloat", created_nodes[18]+".colorIfTrueB")
-
-        # Connections TRN and nodes
-
-        cmds.connectAttr(f"{self.root_ik_ctl}.worldMatrix", f"{created_nodes[0]}.inMatrix1")
-        cmds.connectAttr(f"{self.ikHandleManager}.worldMatrix", f"{created_nodes[0]}.inMatrix2")
-        cmds.connectAttr(f"{self.hand_ws_ik_ctl}.lowerLengthMult", f"{created_nodes[4]}.floatA")
-        cmds.connectAttr(f"{self.hand_ws_ik_ctl}.upperLengthMult", f"{created_nodes[2]}.floatA")
-        cmds.connectAttr(f"{self.hand_ws_ik_ctl}.soft", f"{created_nodes[5]}.inputValue")
-        cmds.connectAttr(f"{self.masterWalk_ctl}.globalScale", f"{created_nodes[1]}.floatB")
-
-        # setAttr nodes
-
-
-
-        # cmds.setAttr(f"{created_nodes[2]}.floatB", abs(cmds.getAttr(f"{self.ik_chain[1]}.translateX")))
-        # cmds.setAttr(f"{created_nodes[4]}.floatB", abs(cmds.getAttr(f"{self.ik_chain[2]}.translateX")))
-
-        cmds.connectAttr(self.distance_between_output[0], f"{created_nodes[2]}.floatB")
-        cmds.connectAttr(self.distance_between_output[1], f"{created_nodes[4]}.floatB")
-
-
-        cmds.setAttr(f"{created_nodes[9]}.floatB", -1)
-        cmds.setAttr(f"{created_nodes[10]}.floatA", math.e)
-        cmds.setAttr(f"{created_nodes[11]}.floatA", 1)
-        cmds.setAttr(f"{created_nodes[5]}.inputMin", 0.001)
-        cmds.setAttr(f"{created_nodes[5]}.outputMax", (cmds.getAttr(f"{created_nodes[3]}.outFloat") - cmds.getAttr(f"{created_nodes[1]}.outFloat")))
-        cmds.setAttr(f"{created_nodes[18]}.operation", 2)
-        cmds.setAttr(f"{created_nodes[19]}.floatB", 1)
-
-
-        #Pin 
-
-        cmds.connectAttr(self.pv_ik_ctl + ".pin", created_nodes[28]+".attributesBlender")
+        created_nodes = SOFT_STRETCH_PIN_GRAPH.build(
+            inputs={
+                "stretch": f"{self.hand_ws_ik_ctl}.stretch",
+                "rootMatrix": f"{self.root_ik_ctl}.worldMatrix[0]",
+                "ikHandleMatrix": f"{self.ikHandleManager}.worldMatrix[0]",
+                "upperLengthMult": f"{self.hand_ws_ik_ctl}.upperLengthMult",
+                "lowerLengthMult": f"{self.hand_ws_ik_ctl}.lowerLengthMult",
+                "upperRestLength": self.distance_between_output[0],
+                "lowerRestLength": self.distance_between_output[1],
+                "soft": f"{self.hand_ws_ik_ctl}.soft",
+                "globalScale": f"{self.masterWalk_ctl}.globalScale",
+                "pin": f"{self.pv_ik_ctl}.pin",
+                "pvMatrix": f"{self.pv_ik_ctl}.worldMatrix[0]",
+                "softMatrix": f"{self.soft_trn}.worldMatrix[0]",
+            },
+            prefix=f"{self.side}_{self.module_name}",
+        )
 
+        cmds.setAttr(f"{created_nodes['softValue']}.outputMax", (cmds.getAttr(f"{created_nodes['fullLength']}.outFloat") - cmds.getAttr(f"{created_nodes['distanceNormalized']}.outFloat")))
 
         if self.side == "R":
             # Negate upper/lower pin distances for R side using a loop
             multi_soft_negate = cmds.createNode("multiplyDivide", name=f"{self.side}_{self.module_name}MultiSoftNegate_FLM", ss=True)
             cmds.setAttr(multi_soft_negate + ".input2", -1, -1, -1, type="double3")  # Set to divide
 
-            cmds.connectAttr(created_nodes[18] + ".outColorR", multi_soft_negate + ".input1X")
-            cmds.connectAttr(created_nodes[18] + ".outColorG", multi_soft_negate + ".input1Y")
-            cmds.connectAttr(created_nodes[18] + ".outColorB", multi_soft_negate + ".input1Z")
+            cmds.connectAttr(created_nodes["softCondition"] + ".outColorR", multi_soft_negate + ".input1X")
+            cmds.connectAttr(created_nodes["softCondition"] + ".outColorG", multi_soft_negate + ".input1Y")
+            cmds.connectAttr(created_nodes["softCondition"] + ".outColorB", multi_soft_negate + ".input1Z")
             cmds.connectAttr(multi_soft_negate + ".outputX", self.soft_trn + ".tx")
-            cmds.connectAttr(multi_soft_negate + ".outputY", created_nodes[28] + ".input[0]")
-            cmds.connectAttr(multi_soft_negate + ".outputZ", created_nodes[29] + ".input[0]")
-            
-
+            cmds.connectAttr(multi_soft_negate + ".outputY", created_nodes["upperPinBlend"] + ".input[0]")
+            cmds.connectAttr(multi_soft_negate + ".outputZ", created_nodes["lowerPinBlend"] + ".input[0]")
 
-
-
-            for idx, name in zip([26, 27], ["UpperArm", "LowerArm"]):
+            for key, name in zip(["upperPin", "lowerPin"], ["UpperArm", "LowerArm"]):
                 negate_node = cmds.createNode("floatMath", name=f"{self.side}_{self.module_name}{name}PinNegate_FLM", ss=True)
-                cmds.connectAttr(created_nodes[idx] + ".distance", negate_node + ".floatA")
+                cmds.connectAttr(created_nodes[key] + ".distance", negate_node + ".floatA")
                 cmds.setAttr(negate_node + ".operation", 2)
                 cmds.setAttr(negate_node + ".floatB", -1)
-                cmds.connectAttr(negate_node + ".outFloat", created_nodes[28 + idx - 26] + ".input[1]")
+                cmds.connectAttr(negate_node + ".outFloat", created_nodes[f"{key}Blend"] + ".input[1]")
 
         else:
-            cmds.connectAttr(created_nodes[26] + ".distance", created_nodes[28]+".input[1]")
-            cmds.connectAttr(created_nodes[27] + ".distance", created_nodes[29]+".input[1]")
-
-            cmds.connectAttr(f"{created_nodes[18]}.outColorR",f"{self.soft_trn}.translateX")
-            cmds.connectAttr(created_nodes[18] + ".outColorG", created_nodes[28]+".input[0]")
-            cmds.connectAttr(created_nodes[18] + ".outColorB", created_nodes[29]+".input[0]")
+            cmds.connectAttr(created_nodes["upperPin"] + ".distance", created_nodes["upperPinBlend"]+".input[1]")
+            cmds.connectAttr(created_nodes["lowerPin"] + ".distance", created_nodes["lowerPinBlend"]+".input[1]")
 
-
-
-
-                         
-                         
-                         
-        cmds.connectAttr(self.root_ik_ctl + ".worldMatrix", created_nodes[26]+".inMatrix1")
-        cmds.connectAttr(self.pv_ik_ctl + ".worldMatrix", created_nodes[26]+".inMatrix2")
-
-        cmds.connectAttr(self.pv_ik_ctl + ".pin", created_nodes[29]+".attributesBlender")
-        cmds.connectAttr(self.pv_ik_ctl + ".worldMatrix", created_nodes[27]+".inMatrix2")
-        cmds.connectAttr(self.soft_trn + ".worldMatrix", created_nodes[27]+".inMatrix1")
+            cmds.connectAttr(f"{created_nodes['softCondition']}.outColorR",f"{self.soft_trn}.translateX")
+            cmds.connectAttr(created_nodes["softCondition"] + ".outColorG", created_nodes["upperPinBlend"]+".input[0]")
+            cmds.connectAttr(created_nodes["softCondition"] + ".outColorB", created_nodes["lowerPinBlend"]+".input[0]")
 
         # cmds.disconnectAttr(f"{self.pv_ik_ctl}.worldMatrix[0]", f"{self.ik_rps[0]}.offsetParentMatrix")        
         cmds.connectAttr(f"{self.soft_trn}.worldMatrix[0]", f"{self.ik_rps[0]}.offsetParentMatrix", force=True)
 
-
-        cmds.connectAttr(created_nodes[28] + ".output", self.ik_chain[1]+".translateX", f=True)
-        cmds.connectAttr(created_nodes[29] + ".output", self.ik_chain[2]+".translateX", f=True)
+        # The chain translates may already be driven, force stays outside the graph.
+        cmds.connectAttr(created_nodes["upperPinBlend"] + ".output", self.ik_chain[1]+".translateX", f=True)
+        cmds.connectAttr(created_nodes["lowerPinBlend"] + ".output", self.ik_chain[2]+".translateX", f=True)
             
 
         upper_mult = cmds.createNode("multDoubleLinear", name=f"{self.side}_{self.module_name}FkUpperLengthMult_MDL")
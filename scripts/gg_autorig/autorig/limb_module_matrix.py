@@ -5,9 +5,10 @@ import maya.api.OpenMaya as om
 import math
 
 # Local imports
-from gg_autorig.utils.curve_tool import controller_creator
+from gg_autorig.utils.curve_tool import controller_creator, controller_creator_batch
 from gg_autorig.utils.guides.guides_manager import guide_import
 from gg_autorig.utils import data_export
+from gg_autorig.utils import attribute_spec as attrs
 
 # Dev only imports
 from gg_autorig.utils.guides import guides_manager
@@ -23,11 +24,49 @@ reload(de_boors_002)
 reload(guides_manager)
 reload(ss)
 reload(core)
+reload(attrs)
 
 AXIS_VECTOR = {'x': (1, 0, 0), '-x': (-1, 0, 0), 'y': (0, 1, 0), '-y': (0, -1, 0), 'z': (0, 0, 1), '-z': (0, 0, -1)}
 
+# Controller attribute layouts, kept as data so they can be serialized with attribute_spec.dumps and diffed.
+PV_IK_ATTRIBUTES = [
+    attrs.separator("extraAttr", "Extra Attributes"),
+    attrs.numeric("pvOrientation", "Pv Orientation", default=0, min_value=0, max_value=1),
+    attrs.separator("poleVectorPinning", "Pole Vector Pinning"),
+    attrs.numeric("pin", "Pin", default=0, min_value=0, max_value=1),
+]
+
+END_IK_ATTRIBUTES = [
+    attrs.separator("softSettings", "Soft Settings"),
+    attrs.numeric("soft", "Soft", default=0, min_value=0, max_value=1),
+    attrs.numeric("softStart", "Soft Start", default=0.8, min_value=0, max_value=1),
+    attrs.separator("strechySep", "Strechy"),
+    attrs.numeric("upperLengthMult", "Upper Length Mult", default=1, min_value=0.001),
+    attrs.numeric("lowerLengthMult", "Lower Length Mult", default=1, min_value=0.001),
+    attrs.numeric("stretch", "Stretch", default=0, min_value=0, max_value=1),
+]
+
+BENDY_ATTRIBUTES = [
+    attrs.separator("extraAttr", "Extra Attributes"),
+    attrs.numeric("secondaryControllersHeight", "secondary Controllers Height", default=1, min_value=0, max_value=1),
+]
+
+REVERSE_FOOT_ATTRIBUTES = [
+    attrs.separator("reverseFoot", "Reverse foot"),
+    attrs.numeric("roll", "Roll", default=0),
+    attrs.numeric("rollLiftAngle", "Roll Lift Angle", default=45, min_value=0),
+    attrs.numeric("rollStraightAngle", "Roll Straight Angle", default=90, min_value=0),
+    attrs.numeric("bank", "Bank", default=0),
+    attrs.numeric("ankleTwist", "Ankle Twist", default=0),
+    attrs.numeric("ballTwist", "Ball Twist", default=0),
+    attrs.numeric("tipTwist", "Tip Twist", default=0),
+    attrs.numeric("heelTwist", "Heel Twist", default=0),
+]
+
 class LimbModule(object):
 
+    solver_nodes = False
+
     def __init__(self, side="L"):
 
         self.side = side
@@ -112,21 +151,26 @@ class LimbModule(object):
         self.fk_ctls = []
         self.fk_grps = []
         self.fk_offset = []
+        fk_names = [self.guides[i].replace("_GUIDE", "Fk") for i in range(len(self.guides_matrix))]
+        controllers = controller_creator_batch([
+            {
+                "name": fk_name,
+                "suffixes": ["GRP", "ANM"],
+                "lock": ["scaleX", "scaleY", "scaleZ", "visibility"],
+                "ro": True,
+                "parent": f"{fk_names[i-1]}_CTL" if i else self.individual_controllers_grp,
+            }
+            for i, fk_name in enumerate(fk_names)
+        ])
         for i, guide in enumerate(self.guides_matrix):
 
-            ctl, ctl_grp = controller_creator(
-                name=self.guides[i].replace("_GUIDE", "Fk"),
-                suffixes=["GRP", "ANM"],
-                lock=["scaleX", "scaleY", "scaleZ", "visibility"],
-                ro=True,
-            )
-
-            cmds.parent(ctl_grp[0], self.fk_ctls[-1] if self.fk_ctls else self.individual_controllers_grp)
+            ctl, ctl_grp = controllers[i]
 
             if not i == 2:
-                cmds.addAttr(ctl, shortName="strechySep", niceName="Strechy ———", enumName="———",attributeType="enum", keyable=True)
-                cmds.setAttr(ctl+".strechySep", channelBox=True, lock=True)
-                cmds.addAttr(ctl, shortName="stretch", niceName="Stretch",minValue=1,defaultValue=1, keyable=True)
+                attrs.apply_specs(ctl, [
+                    attrs.separator("strechySep", "Strechy"),
+                    attrs.numeric("stretch", "Stretch", default=1, min_value=1),
+                ])
 
                 
 
@@ -173,11 +217,27 @@ class LimbModule(object):
 
         self.ik_rig()
 
-    def create_matrix_pole_vector(self, m1_attr, m2_attr, m3_attr, pole_distance=1.0, name="poleVector_LOC"):
+    def create_matrix_pole_vector(self, m1_attr, m2_attr, m3_attr, pole_distance=1.0, name="poleVector_LOC", weight_attr=None):
         """
         Given three matrix attributes (e.g. joint.worldMatrix[0]), compute a proper pole vector
         position using Maya matrix and math nodes (no Python vector math).
+        With solver_nodes the whole network is a single ggPoleVector node.
+
+        Args:
+            weight_attr (str, optional): Attribute driving how much the pole vector aims to the mid joint.
+        Returns:
+            str: The node holding the pole vector outputMatrix.
         """
+        if self.solver_nodes:
+            pole_vector = cmds.createNode("ggPoleVector", name=f"{self.side}_{self.module_name}Pv_PVS", ss=True)
+            cmds.connectAttr(m1_attr, f"{pole_vector}.startMatrix")
+            cmds.connectAttr(m2_attr, f"{pole_vector}.midMatrix")
+            cmds.connectAttr(m3_attr, f"{pole_vector}.endMatrix")
+            cmds.setAttr(f"{pole_vector}.poleDistance", pole_distance)
+            if weight_attr:
+                cmds.connectAttr(weight_attr, f"{pole_vector}.orientWeight")
+            return pole_vector
+
         def matrix_to_translation(matrix_attr, prefix):
             dm = cmds.createNode('rowFromMatrix', name=f"{self.side}_{self.module_name}Pv{prefix.capitalize()}Offset_RFM", ss=True)
             cmds.connectAttr(matrix_attr, f'{dm}.matrix')
@@ -292,6 +352,8 @@ class LimbModule(object):
         blend_matrix = cmds.createNode('blendMatrix', name=f"{self.side}_{self.module_name}PvBlend_BLM", ss=True)
         cmds.connectAttr(f'{fourByFour}.output', f'{blend_matrix}.inputMatrix')
         cmds.connectAttr(f'{aim_matrix}.outputMatrix', f'{blend_matrix}.target[0].targetMatrix')
+        if weight_attr:
+            cmds.connectAttr(weight_attr, f"{blend_matrix}.target[0].weight")
 
         return blend_matrix
 
@@ -328,38 +390,21 @@ class LimbModule(object):
 
         cmds.connectAttr(self.guides[2] + ".worldMatrix[0]", f"{self.hand_ik_ctl_grp[0]}.offsetParentMatrix")
 
-        cmds.addAttr(self.pv_ik_ctl, shortName="extraAttr", niceName="Extra Attributes  ———", enumName="———",attributeType="enum", keyable=True)
-        cmds.setAttr(self.pv_ik_ctl+".extraAttr", channelBox=True, lock=True)
-        cmds.addAttr(self.pv_ik_ctl, shortName="pvOrientation", niceName="Pv Orientation",defaultValue=0, minValue=0, maxValue=1, keyable=True)
+        attrs.apply_layout({
+            self.pv_ik_ctl: PV_IK_ATTRIBUTES,
+            self.hand_ik_ctl: END_IK_ATTRIBUTES,
+        })
 
-        cmds.addAttr(self.pv_ik_ctl, shortName="poleVectorPinning", niceName="Pole Vector Pinning ———", enumName="———",attributeType="enum", keyable=True)
-        cmds.setAttr(self.pv_ik_ctl+".poleVectorPinning", channelBox=True, lock=True)
-        cmds.addAttr(self.pv_ik_ctl, shortName="pin", niceName="Pin",minValue=0,maxValue=1,defaultValue=0, keyable=True)
-        
         cmds.connectAttr(f"{self.guides_matrix[0]}.outputMatrix", f"{self.root_ik_ctl_grp[0]}.offsetParentMatrix")      
 
-        cmds.addAttr(self.hand_ik_ctl, shortName="softSettings", niceName="Soft Settings  ———", enumName="———",attributeType="enum", keyable=True)
-        # cmds.addAttr(self.hand_ik_ctl, shortName="curvature", niceName="Curvature", maxValue=1, minValue=0,defaultValue=0, keyable=True)
-        cmds.setAttr(self.hand_ik_ctl+".softSettings", channelBox=True, lock=True)
-        cmds.addAttr(self.hand_ik_ctl, shortName="soft", niceName="Soft",minValue=0,maxValue=1,defaultValue=0, keyable=True)
-        cmds.addAttr(self.hand_ik_ctl, shortName="softStart", niceName="Soft Start",minValue=0,maxValue=1,defaultValue=0.8, keyable=True)
-        # cmds.addAttr(self.hand_ik_ctl, shortName="twist", niceName="Twist",minValue=-180,defaultValue=0, maxValue=180, keyable=True)
-        # cmds.addAttr(self.hand_ik_ctl, shortName="upperTwist", niceName="Upper Twist",defaultValue=0, keyable=True)
-
-        cmds.addAttr(self.hand_ik_ctl, shortName="strechySep", niceName="Strechy  ———", enumName="———",attributeType="enum", keyable=True)
-        cmds.setAttr(self.hand_ik_ctl+".strechySep", channelBox=True, lock=True)
-        cmds.addAttr(self.hand_ik_ctl, shortName="upperLengthMult", niceName="Upper Length Mult",minValue=0.001,defaultValue=1, keyable=True)
-        cmds.addAttr(self.hand_ik_ctl, shortName="lowerLengthMult", niceName="Lower Length Mult",minValue=0.001,defaultValue=1, keyable=True)
-        cmds.addAttr(self.hand_ik_ctl, shortName="stretch", niceName="Stretch",minValue=0,maxValue=1,defaultValue=0, keyable=True)
-
         pv_pos = self.create_matrix_pole_vector(
             f"{self.guides_matrix[0]}.outputMatrix",
             f"{self.guides_matrix[1]}.outputMatrix",
             f"{self.guides_matrix[2]}.outputMatrix",
-            name=f"{self.side}_{self.module_name}PV"
+            name=f"{self.side}_{self.module_name}PV",
+            weight_attr=f"{self.pv_ik_ctl}.pvOrientation"
         )
 
-        cmds.connectAttr(f"{self.pv_ik_ctl}.pvOrientation", f"{pv_pos}.target[0].weight")
         cmds.connectAttr(f"{pv_pos}.outputMatrix", f"{self.pv_ik_ctl_grp[0]}.offsetParentMatrix")
 
         name = [f"{self.side}_{self.module_name}UpperInitialLength", f"{self.side}_{self.module_name}LowerInitialLength", f"{self.side}_{self.module_name}CurrentLength"]
@@ -373,6 +418,11 @@ class LimbModule(object):
         else:
             self.ikHandleManager = f"{self.hand_ik_ctl}.worldMatrix[0]"
 
+        if self.solver_nodes:
+            self.ik_wm = self.create_two_bone_solver(name)
+            self.pairblends()
+            return
+
         self.distance_between_output = []
         for i, (first, second) in enumerate(zip([f"{self.guides[0]}.worldMatrix[0]", f"{self.guides[1]}.worldMatrix[0]", f"{self.root_ik_ctl}.worldMatrix[0]"], [f"{self.guides[1]}.worldMatrix[0]", f"{self.guides[2]}.worldMatrix[0]", f"{self.ikHandleManager}"])):
             distance = cmds.createNode("distanceBetween", name=f"{name[i]}_DB", ss=True)
@@ -432,13 +482,14 @@ class LimbModule(object):
 
         # --- CUSTOM SOLVER --- #
 
-        upper_divide, upper_arm_acos, power_mults = core.law_of_cosine(sides = [f"{soft_upper_length_scaled}.output", f"{soft_lower_length_scaled}.output", f"{arm_length_min}.output"], name = f"{self.side}_{self.module_name}Upper", acos=True)
+        upper_divide, upper_arm_acos, power_mults = core.law_of_cosine(sides = [f"{soft_upper_length_scaled}.output", f"{soft_lower_length_scaled}.output", f"{arm_length_min}.output"], name = f"{self.side}_{self.module_name}Upper", acos=True, module=f"{self.side}_{self.module_name}")
         lower_divide, lower_power_mults, negate_cos_value = core.law_of_cosine(sides = [f"{soft_upper_length_scaled}.output", f"{arm_length_min}.output", f"{soft_lower_length_scaled}.output"],
                                                                              power = [power_mults[0], power_mults[2], power_mults[1]],
                                                                              name = f"{self.side}_{self.module_name}Lower", 
-                                                                             negate=True)
+                                                                             negate=True,
+                                                                             module=f"{self.side}_{self.module_name}")
 
-        soft_cosValue, soft_power_mults = core.law_of_cosine(sides = [f"{stretch_multiply_nodes[0]}.output", f"{stretch_multiply_nodes[1]}.output", f"{arm_length_min}.output"], name = f"{self.side}_{self.module_name}SoftArm")
+        soft_cosValue, soft_power_mults = core.law_of_cosine(sides = [f"{stretch_multiply_nodes[0]}.output", f"{stretch_multiply_nodes[1]}.output", f"{arm_length_min}.output"], name = f"{self.side}_{self.module_name}SoftArm", module=f"{self.side}_{self.module_name}")
 
         # --- SOFT ARM --- #
 
@@ -647,6 +698,37 @@ class LimbModule(object):
 
         self.pairblends()
 
+    def create_two_bone_solver(self, name):
+        """
+        Builds the soft, stretch and pin two bone solve with a single ggTwoBoneIk node.
+
+        Args:
+            name (list): Names of the upper and lower initial length nodes.
+        Returns:
+            list: The upper, lower and end world matrix plugs.
+        """
+        solver = cmds.createNode("ggTwoBoneIk", name=f"{self.side}_{self.module_name}Ik_TBS", ss=True)
+
+        for i, attr in enumerate(["upperRestLength", "lowerRestLength"]):
+            distance = cmds.createNode("distanceBetween", name=f"{name[i]}_DB", ss=True)
+            cmds.connectAttr(f"{self.guides[i]}.worldMatrix[0]", f"{distance}.inMatrix1")
+            cmds.connectAttr(f"{self.guides[i + 1]}.worldMatrix[0]", f"{distance}.inMatrix2")
+            cmds.connectAttr(f"{distance}.distance", f"{solver}.{attr}")
+
+        cmds.connectAttr(f"{self.root_ik_ctl}.worldMatrix[0]", f"{solver}.rootMatrix")
+        cmds.connectAttr(f"{self.pv_ik_ctl}.worldMatrix[0]", f"{solver}.poleMatrix")
+        cmds.connectAttr(f"{self.ikHandleManager}", f"{solver}.handleMatrix")
+        cmds.connectAttr(f"{self.masterWalk_ctl}.globalScale", f"{solver}.globalScale")
+        cmds.connectAttr(f"{self.pv_ik_ctl}.pin", f"{solver}.pin")
+        for attr in ["stretch", "upperLengthMult", "lowerLengthMult", "soft", "softStart"]:
+            cmds.connectAttr(f"{self.hand_ik_ctl}.{attr}", f"{solver}.{attr}")
+
+        cmds.setAttr(f"{solver}.primaryAxis", *self.primary_aim_vector, type="double3")
+        cmds.setAttr(f"{solver}.secondaryAxis", 0, -1 if self.side == "R" else 1, 0, type="double3")
+        cmds.setAttr(f"{solver}.mirror", self.side == "R")
+
+        return [f"{solver}.upperMatrix", f"{solver}.lowerMatrix", f"{solver}.endMatrix"]
+
     def pairblends(self):
         self.switch_ctl, self.switch_ctl_grp = controller_creator(
             name=f"{self.side}_{self.module_name}Switch",
@@ -734,9 +816,7 @@ class LimbModule(object):
                 ro=True,
             )
 
-            cmds.addAttr(ctl, shortName="extraAttr", niceName="Extra Attributes  ———", enumName="———",attributeType="enum", keyable=True)
-            cmds.setAttr(ctl+".extraAttr", channelBox=True, lock=True)
-            cmds.addAttr(ctl, shortName="secondaryControllersHeight", niceName="secondary Controllers Height", maxValue=1, minValue=0,defaultValue=1, keyable=True)
+            attrs.apply_specs(ctl, BENDY_ATTRIBUTES)
 
             cmds.parent(ctl_grp[0], self.bendy_controllers)
 
@@ -941,16 +1021,7 @@ class LimbModule(object):
         cmds.connectAttr(f"{self.frontRoll_grp[0]}.worldInverseMatrix[0]", f"{front_roll_wm}.matrixIn[1]")
         cmds.connectAttr(f"{ball_wm}.outputMatrix", f"{front_roll_wm}.matrixIn[2]")
 
-        cmds.addAttr(self.hand_ik_ctl, shortName="reverseFoot", niceName="Reverse foot  ———", enumName="———",attributeType="enum", keyable=True)
-        cmds.setAttr(self.hand_ik_ctl+".reverseFoot", channelBox=True, lock=True)
-        cmds.addAttr(self.hand_ik_ctl, shortName="roll", niceName="Roll",defaultValue=0, keyable=True)
-        cmds.addAttr(self.hand_ik_ctl, shortName="rollLiftAngle", niceName="Roll Lift Angle",minValue=0,defaultValue=45, keyable=True)
-        cmds.addAttr(self.hand_ik_ctl, shortName="rollStraightAngle", niceName="Roll Straight Angle",minValue=0,defaultValue=90, keyable=True)
-        cmds.addAttr(self.hand_ik_ctl, shortName="bank", niceName="Bank",defaultValue=0, keyable=True)
-        cmds.addAttr(self.hand_ik_ctl, shortName="ankleTwist", niceName="Ankle Twist",defaultValue=0, keyable=True)
-        cmds.addAttr(self.hand_ik_ctl, shortName="ballTwist", niceName="Ball Twist",defaultValue=0, keyable=True)
-        cmds.addAttr(self.hand_ik_ctl, shortName="tipTwist", niceName="Tip Twist",defaultValue=0, keyable=True)
-        cmds.addAttr(self.hand_ik_ctl, shortName="heelTwist", niceName="Heel Twist",defaultValue=0, keyable=True)
+        attrs.apply_specs(self.hand_ik_ctl, REVERSE_FOOT_ATTRIBUTES)
 
         # # ----ADDING THE ROLL----#
 
@@ -5,9 +5,11 @@ import maya.api.OpenMaya as om
 import math
 
 # Local imports
-from gg_autorig.utils.curve_tool import controller_creator
+from gg_autorig.utils.curve_tool import controller_creator, controller_creator_batch
 from gg_autorig.utils.guides.guides_manager import guide_import
 from gg_autorig.utils import data_export
+from gg_autorig.utils import core
+from gg_autorig.utils.spine_graphs import STRETCH_GRAPH, OFFSET_GRAPH, SQUASH_GRAPH, VOLUME_BOUNDS_GRAPH, VOLUME_JOINT_GRAPH
 
 reload(data_export)
 
@@ -16,6 +18,9 @@ class NeckModule():
     Class to create a neck module in a Maya rigging setup.
     This module handles the creation of neck joints, controllers, and various systems such as stretch, reverse, offset, squash, and volume preservation.
     """
+
+    solver_nodes = False
+
     def __init__(self):
         """
         Initializes the SpineModule class, setting up paths and data exporters.
@@ -95,15 +100,19 @@ class NeckModule():
         self.guide_matrix = [aim_matrix, blend_matrix]
         name = ["neck", "head"]
 
-        for i, matrix in enumerate(self.guide_matrix ):
-            ctl, ctl_grp = controller_creator(
-                name=f"C_{name[i]}",
-                suffixes=["GRP", "OFF","ANM"],
-                lock=["scaleX", "scaleY", "scaleZ", "visibility"],
-                ro=True,
-            )
+        controllers = controller_creator_batch([
+            {
+                "name": f"C_{name[i]}",
+                "suffixes": ["GRP", "OFF","ANM"],
+                "lock": ["scaleX", "scaleY", "scaleZ", "visibility"],
+                "ro": True,
+                "parent": self.controllers_trn,
+            }
+            for i in range(len(self.guide_matrix))
+        ])
 
-            cmds.parent(ctl_grp[0], self.controllers_trn)
+        for i, matrix in enumerate(self.guide_matrix ):
+            ctl, ctl_grp = controllers[i]
 
 
             cmds.connectAttr(f"{matrix}.outputMatrix", f"{ctl_grp[0]}.offsetParentMatrix")
@@ -196,43 +205,22 @@ class NeckModule():
         cmds.addAttr(self.main_controllers[1], shortName="attachedFKVis", niceName="Attached FK Visibility", attributeType="bool", keyable=True)
 
 
-        nodes_to_create = {
-            "C_neck_CIN": ("curveInfo", None), #0
-            "C_neckStretchFactor_FLM": ("floatMath", 3), #1
-            "C_neckStretchFactor_CLM": ("clamp", None), #2
-            "C_neckInitialArcLegth_FLM": ("floatMath", 2), #3
-            "C_neckBaseStretch_FLC": ("floatConstant", None), #4
-            "C_neckStretch_BTA": ("blendTwoAttr", None), # 5
-            "C_neckStretchValue_FLM": ("floatMath", 2),# 6
-        }
-
-        created_nodes = []
-        for node_name, (node_type, operation) in nodes_to_create.items():
-            node = cmds.createNode(node_type, name=node_name)
-            created_nodes.append(node)
-            if operation is not None:
-                cmds.setAttr(f'{node}.operation', operation)
-
-        cmds.connectAttr(created_nodes[0] + ".arcLength", created_nodes[1]+".floatA")
-        cmds.connectAttr(created_nodes[1] + ".outFloat", created_nodes[2]+".inputR")
-        cmds.connectAttr(created_nodes[3] + ".outFloat", created_nodes[1]+".floatB")
-        cmds.connectAttr(created_nodes[2] + ".outputR", created_nodes[5]+".input[1]")
-        cmds.connectAttr(created_nodes[4] + ".outFloat", created_nodes[5]+".input[0]")
-        cmds.connectAttr(created_nodes[5] + ".output", created_nodes[6]+".floatA")
-        cmds.setAttr(created_nodes[4]+".inFloat", 1)
-        cmds.connectAttr(f"{self.main_controllers[1]}.stretch", created_nodes[5]+".attributesBlender")
-        cmds.connectAttr(f"{self.main_controllers[1]}.stretchMax", created_nodes[2]+".maxR")
-        cmds.connectAttr(f"{self.main_controllers[1]}.stretchMin", created_nodes[2]+".minR")
-        cmds.connectAttr(f"{self.parentName}.worldSpace[0]", created_nodes[0]+".inputCurve")
-        cmds.connectAttr(f"{self.distance_between}.distance", f"{created_nodes[3]}.floatB")
-        cmds.connectAttr(f"{self.masterWalk_ctl}.globalScale", created_nodes[3]+".floatA")
-        cmds.connectAttr(f"{self.twist_division}.outFloat", f"{created_nodes[6]}.floatB")
-        for i, joint in enumerate(self.main_chain[1:]):
-            if i == len(self.main_chain)-2:
-                cmds.connectAttr(f"{self.controllers_dcp[1]}.outputRotate", f"{joint}.rotate")
-            cmds.connectAttr(created_nodes[6]+".outFloat", f"{joint}.translateZ")
-
-        self.stretch_float_math = created_nodes[6]
+        created_nodes = STRETCH_GRAPH.build(
+            inputs={
+                "stretch": f"{self.main_controllers[1]}.stretch",
+                "stretchMax": f"{self.main_controllers[1]}.stretchMax",
+                "stretchMin": f"{self.main_controllers[1]}.stretchMin",
+                "curve": f"{self.parentName}.worldSpace[0]",
+                "distance": f"{self.distance_between}.distance",
+                "globalScale": f"{self.masterWalk_ctl}.globalScale",
+                "twistDivision": f"{self.twist_division}.outFloat",
+            },
+            outputs={"joints": [f"{joint}.translateZ" for joint in self.main_chain[1:]]},
+            prefix="C_neck",
+        )
+        cmds.connectAttr(f"{self.controllers_dcp[1]}.outputRotate", f"{self.main_chain[-1]}.rotate")
+
+        self.stretch_float_math = created_nodes["value"]
 
         self.reverse_system()
 
@@ -287,28 +275,15 @@ class NeckModule():
         Args:
             self: Instance of the SpineModule class.
         """
-        nodes_to_create = {
-            "C_neckReversed05_DCM": ("decomposeMatrix", None),
-            "C_neckOffset_NPC": ("nearestPointOnCurve", None),
-            "C_neckOffsetInitialValue_FLC": ("floatConstant", None),
-            "C_neckOffset_BTA": ("blendTwoAttr", None),
-        }
-
-        created_nodes = []
-        for node_name, (node_type, operation) in nodes_to_create.items():
-            node = cmds.createNode(node_type, name=node_name)
-            created_nodes.append(node)
-            if operation is not None:
-                cmds.setAttr(f'{node}.operation', operation)
-
-        cmds.connectAttr(created_nodes[0] + ".outputTranslate", created_nodes[1]+".inPosition")
-        cmds.connectAttr(created_nodes[1] + ".parameter", created_nodes[3]+".input[1]")
-        cmds.connectAttr(created_nodes[2] + ".outFloat", created_nodes[3]+".input[0]")
-        cmds.connectAttr(f"{self.main_controllers[1]}.offset", created_nodes[3]+".attributesBlender")
-        cmds.connectAttr(f"{self.reverse_chain[-1]}.worldMatrix[0]", created_nodes[0]+".inputMatrix")
-        cmds.connectAttr(f"{self.curve}.worldSpace[0]", created_nodes[1]+".inputCurve")
-        cmds.connectAttr(f"{created_nodes[3]}.output", self.ik_handle +".offset")
-        cmds.setAttr(created_nodes[2]+".inFloat", 0)
+        OFFSET_GRAPH.build(
+            inputs={
+                "offset": f"{self.main_controllers[1]}.offset",
+                "reverseMatrix": f"{self.reverse_chain[-1]}.worldMatrix[0]",
+                "curve": f"{self.curve}.worldSpace[0]",
+            },
+            outputs={"ikOffset": f"{self.ik_handle}.offset"},
+            prefix="C_neck",
+        )
 
         self.squash_system()
 
@@ -356,26 +331,16 @@ class NeckModule():
             cmds.connectAttr(f"{joint}.worldMatrix[0]", f"{dcm}.inputMatrix")
             cmds.connectAttr(f"{dcm}.outputTranslate", f"{squash_curve}.controlPoints[{i}]")
 
-        nodes_to_create = {
-            "C_neckSquash_CIN": ("curveInfo", None),
-            "C_neckSquashBaseLength_FLM": ("floatMath", 2),
-            "C_neckSquashFactor_FLM": ("floatMath", 3),
-        }
-
-        created_nodes = []
-        for node_name, (node_type, operation) in nodes_to_create.items():
-            node = cmds.createNode(node_type, name=node_name)
-            created_nodes.append(node)
-            if operation is not None:   
-                cmds.setAttr(f'{node}.operation', operation)
+        created_nodes = SQUASH_GRAPH.build(
+            inputs={
+                "curve": f"{squash_curve}.worldSpace[0]",
+                "globalScale": f"{self.masterWalk_ctl}.globalScale",
+            },
+            prefix="C_neck",
+        )
+        cmds.setAttr(f"{created_nodes['baseLength']}.floatB", cmds.getAttr(f"{created_nodes['curveInfo']}.arcLength"))
 
-        cmds.connectAttr(f"{squash_curve}.worldSpace[0]", created_nodes[0]+".inputCurve")
-        cmds.connectAttr(created_nodes[0] + ".arcLength", created_nodes[2]+".floatA")
-        cmds.connectAttr(created_nodes[1] + ".outFloat", created_nodes[2]+".floatB") 
-        cmds.connectAttr(f"{self.masterWalk_ctl}.globalScale", created_nodes[1]+".floatA") 
-        cmds.setAttr(created_nodes[1]+".floatB", cmds.getAttr(created_nodes[0]+".arcLength"))
-
-        self.squash_factor_fml = created_nodes[2]
+        self.squash_factor_fml = created_nodes["factor"]
 
         self.volume_preservation_system()
 
@@ -470,87 +435,44 @@ class NeckModule():
         """
                 
         squash_joints = self.attached_fk()
+
+        if self.solver_nodes:
+            core.volume_preservation_node(
+                name="C_neckVolume_VPS",
+                control=self.main_controllers[1],
+                settings=self.neck_settings_trn,
+                stretch_factor=f"{self.squash_factor_fml}.outFloat",
+                percentages=[f"{self.neck_settings_trn}.neck0{i+1}SquashPercentage" for i in range(len(squash_joints))],
+                joints=squash_joints,
+            )
+            return
        
-        nodes_to_create = {
-            "C_neckVolumeLowBound_RMV": ("remapValue", None),# 0
-            "C_neckVolumeHighBound_RMV": ("remapValue", None),# 1
-            "C_neckVolumeLowBoundNegative_FLM": ("floatMath", 1),# 2
-            "C_neckVolumeHighBoundNegative_FLM": ("floatMath", 1),# 3
-            "C_neckVolumeSquashDelta_FLM": ("floatMath", 1), # 4
-            "C_neckVolumeStretchDelta_FLM": ("floatMath", 1), # 5
-        } 
-
-        main_created_nodes = []
-        for node_name, (node_type, operation) in nodes_to_create.items():
-            node = cmds.createNode(node_type, name=node_name)
-            main_created_nodes.append(node)
-            if operation is not None:
-                cmds.setAttr(f'{node}.operation', operation)
-        values = [0.001, 0.999]
-        for i in range(0,2):
-            cmds.connectAttr(f"{self.main_controllers[1]}.falloff", f"{main_created_nodes[i]}.inputValue")
-            cmds.connectAttr(f"{self.main_controllers[1]}.maxPos", f"{main_created_nodes[i]}.outputMin")
-            cmds.setAttr(f"{main_created_nodes[i]}.outputMax", values[i])
-            cmds.connectAttr(f"{main_created_nodes[i]}.outValue", f"{main_created_nodes[i+2]}.floatB")
-
-        cmds.setAttr(f"{main_created_nodes[2]}.floatA", 0)
-        cmds.setAttr(f"{main_created_nodes[3]}.floatA", 2)
-        cmds.setAttr(f"{main_created_nodes[4]}.floatB", 1)
-        cmds.setAttr(f"{main_created_nodes[5]}.floatA", 1)
-        cmds.connectAttr(f"{self.neck_settings_trn}.maxStretchEffect", f"{main_created_nodes[4]}.floatA")
-        cmds.connectAttr(f"{self.neck_settings_trn}.minStretchEffect", f"{main_created_nodes[5]}.floatB")
+        main_created_nodes = VOLUME_BOUNDS_GRAPH.build(
+            inputs={
+                "falloff": f"{self.main_controllers[1]}.falloff",
+                "maxPos": f"{self.main_controllers[1]}.maxPos",
+                "maxStretchEffect": f"{self.neck_settings_trn}.maxStretchEffect",
+                "minStretchEffect": f"{self.neck_settings_trn}.minStretchEffect",
+            },
+            prefix="C_neck",
+        )
 
         for i, joint in enumerate(squash_joints):
-            nodes_to_create = {
-                f"C_neckVolumeSquashFactor0{i+1}_FLM": ("floatMath", 2), # 0
-                f"C_neckVolumeStretchFactor0{i+1}_FLM": ("floatMath", 2), # 1
-                f"C_neckVolumeStretchFullValue0{i+1}_FLM": ("floatMath", 1), # 2
-                f"C_neckVolumeSquashFullValue0{i+1}_FLM": ("floatMath", 0), # 3
-                f"C_neckVolume0{i+1}_RMV": ("remapValue", None), # 4
-                f"C_neckVolumeFactor0{i+1}_RMV": ("remapValue", None), # 5
-            }
-
-            created_nodes = []
-            for node_name, (node_type, operation) in nodes_to_create.items():
-                node = cmds.createNode(node_type, name=node_name)
-                created_nodes.append(node)
-                if operation is not None:
-                    cmds.setAttr(f'{node}.operation', operation)
-
-            cmds.connectAttr(f"{self.neck_settings_trn}.neck0{i+1}SquashPercentage", f"{created_nodes[5]}.inputValue")
-            cmds.connectAttr(f"{main_created_nodes[2]}.outFloat", f"{created_nodes[5]}.value[0].value_Position")
-            cmds.connectAttr(f"{main_created_nodes[0]}.outValue", f"{created_nodes[5]}.value[1].value_Position")
-            cmds.connectAttr(f"{main_created_nodes[1]}.outValue", f"{created_nodes[5]}.value[2].value_Position")
-            cmds.connectAttr(f"{main_created_nodes[3]}.outFloat", f"{created_nodes[5]}.value[3].value_Position")
-
-
-            cmds.connectAttr(created_nodes[0] + ".outFloat", created_nodes[3]+".floatA")
-            cmds.connectAttr(created_nodes[1] + ".outFloat", created_nodes[2]+".floatB")
-            cmds.connectAttr(created_nodes[2] + ".outFloat", created_nodes[4]+".value[2].value_FloatValue")
-            cmds.connectAttr(created_nodes[3] + ".outFloat", created_nodes[4]+".value[0].value_FloatValue")
-            cmds.connectAttr(self.squash_factor_fml + ".outFloat", created_nodes[4]+".inputValue")
-            cmds.setAttr(f"{created_nodes[3]}.floatB", 1)
-            cmds.setAttr(f"{created_nodes[2]}.floatA", 1)
-
-            cmds.connectAttr(f"{main_created_nodes[4]}.outFloat", created_nodes[0]+".floatA")
-            cmds.connectAttr(f"{main_created_nodes[5]}.outFloat", created_nodes[1]+".floatA")
-            cmds.connectAttr(f"{created_nodes[5]}.outValue", created_nodes[0]+".floatB")
-            cmds.connectAttr(f"{created_nodes[5]}.outValue", created_nodes[1]+".floatB")
-
-            cmds.connectAttr(f"{self.neck_settings_trn}.maxStretchLength", f"{created_nodes[4]}.value[2].value_Position")
-            cmds.connectAttr(f"{self.neck_settings_trn}.minStretchLength", f"{created_nodes[4]}.value[0].value_Position")   
-
-            floatConstant = cmds.createNode("floatConstant", name=f"C_neckVolume0{i+1}_FLC", ss=True)
-            blendTwoAttr = cmds.createNode("blendTwoAttr", name=f"C_neckVolume0{i+1}_BTA", ss=True)
-            cmds.connectAttr(f"{created_nodes[4]}.outValue", f"{blendTwoAttr}.input[1]")
-            cmds.connectAttr(f"{floatConstant}.outFloat", f"{blendTwoAttr}.input[0]")
-            cmds.connectAttr(f"{self.main_controllers[1]}.volumePreservation", f"{blendTwoAttr}.attributesBlender")
-
-            cmds.connectAttr(f"{blendTwoAttr}.output",f"{joint}.scaleX")   
-            cmds.connectAttr(f"{blendTwoAttr}.output",f"{joint}.scaleZ")   
-
-
-            values = [-1, 1, 1, -1]
-            for i in range(0,4):
-                cmds.setAttr(f"{created_nodes[5]}.value[{i}].value_Interp", 2)
-                cmds.setAttr(f"{created_nodes[5]}.value[{i}].value_FloatValue", values[i])
+            VOLUME_JOINT_GRAPH.build(
+                inputs={
+                    "squashPercentage": f"{self.neck_settings_trn}.neck0{i+1}SquashPercentage",
+                    "lowBoundNegative": f"{main_created_nodes['lowBoundNegative']}.outFloat",
+                    "lowBound": f"{main_created_nodes['lowBound']}.outValue",
+                    "highBound": f"{main_created_nodes['highBound']}.outValue",
+                    "highBoundNegative": f"{main_created_nodes['highBoundNegative']}.outFloat",
+                    "squashFactor": f"{self.squash_factor_fml}.outFloat",
+                    "squashDelta": f"{main_created_nodes['squashDelta']}.outFloat",
+                    "stretchDelta": f"{main_created_nodes['stretchDelta']}.outFloat",
+                    "maxStretchLength": f"{self.neck_settings_trn}.maxStretchLength",
+                    "minStretchLength": f"{self.neck_settings_trn}.minStretchLength",
+                    "volumePreservation": f"{self.main_controllers[1]}.volumePreservation",
+                },
+                outputs={"scale": [f"{joint}.scaleX", f"{joint}.scaleZ"]},
+                prefix="C_neck",
+                index=i + 1,
+            )
@@ -4,7 +4,10 @@
 from gg_autorig.utils import basic_structure
 from gg_autorig.utils import data_export
 from gg_autorig.utils import core
-# from gg_autorig.utils.guides import guides_manager
+from gg_autorig.utils import curve_tool
+from gg_autorig.utils import guide_bake
+from gg_autorig.utils import scene_finalize
+from gg_autorig.utils.guides import guides_manager
 
 # Rig modules import
 from gg_autorig.autorig import limb_module_matrix as lbm
@@ -25,7 +28,11 @@ import maya.api.OpenMaya as om
 
 reload(basic_structure)
 reload(core)
+reload(curve_tool)
 reload(data_export)
+reload(guide_bake)
+reload(scene_finalize)
+reload(guides_manager)
 reload(lbm)
 reload(spm_quad)
 reload(spm_bip)
@@ -36,41 +43,91 @@ reload(vfk)
 reload(skh)
 reload(han)
 
+def finalize_scene(rename_shapes=True, label_joints=True):
+    """
+    Renames the controller shapes and labels the joints of the scene in a single dag traversal.
+    Every nurbsCurve shape is renamed after its parent transform ("Shape", "Shape1", ...), instanced shapes keep their name.
+    Every joint gets its side from the name prefix (C_, L_, R_), type Other and the module name as otherType.
+    The edits run through the ggFinalizeScene command, one MDagModifier and a single undo step. Without the plugin
+    they are applied with cmds inside one undo chunk.
+
+    Args:
+        rename_shapes (bool): If True the nurbsCurve shapes are renamed.
+        label_joints (bool): If True the joints are labeled.
+    Returns:
+        tuple: Number of renamed shapes and labeled joints.
+    """
+
+    if core.load_plugin():
+        renamed, labeled = cmds.ggFinalizeScene(renameShapes=rename_shapes, labelJoints=label_joints)
+
+    else:
+        renames, labels = scene_finalize.collect_edits(rename_shapes=rename_shapes, label_joints=label_joints)
+        renames = [(om.MFnDagNode(node).fullPathName(), name) for node, name in renames]
+        labels = [(om.MFnDagNode(node).fullPathName(), side, other_type) for node, side, other_type in labels]
+
+        cmds.undoInfo(openChunk=True, chunkName="gg_finalize_scene")
+        try:
+            for path, name in renames:
+                cmds.rename(path, name)
+            for path, side, other_type in labels:
+                if side is not None:
+                    cmds.setAttr(f"{path}.side", side)
+                cmds.setAttr(f"{path}.type", scene_finalize.OTHER_TYPE)
+                if other_type is not None:
+                    cmds.setAttr(f"{path}.otherType", other_type, type="string")
+        finally:
+            cmds.undoInfo(closeChunk=True)
+        renamed, labeled = len(renames), len(labels)
+
+    om.MGlobal.displayInfo(f"Finalize: {renamed} shapes renamed, {labeled} joints labeled.")
+
+    return renamed, labeled
+
 def rename_ctl_shapes():
     """
     Rename all shapes in the scene to follow a specific naming convention.
     This function finds all nurbsCurve shapes in the scene, retrieves their parent transform, and renames the shape to match the parent's name with "Shape" appended.
     """
-    
-    obj = cmds.ls(type="nurbsCurve")
 
-    for shapes in obj:
-        parentName = cmds.listRelatives(shapes, parent=True)[0]
-        cmds.rename(shapes, f"{parentName}Shape")
+    return finalize_scene(rename_shapes=True, label_joints=False)
 
 def joint_label():
     """
     Set attributes for all joints in the scene to label them according to their side and type.
-    This function iterates through all joints, checks their names for side indicators (L_, R_, C_), and sets the 'side' and 'type' attributes accordingly.
+    This function iterates through all joints, checks their name prefix for the side (L_, R_, C_), and sets the 'side' and 'type' attributes accordingly.
     """
 
-    for jnt in cmds.ls(type="joint"):
-        if "L_" in jnt:
-            cmds.setAttr(jnt + ".side", 1)
-        if "R_" in jnt:
-            cmds.setAttr(jnt + ".side", 2)
-        if "C_" in jnt:
-            cmds.setAttr(jnt + ".side", 0)
-        cmds.setAttr(jnt + ".type", 18)
-        cmds.setAttr(jnt + ".otherType", jnt.split("_")[1], type= "string")
-
-def make(asset_name="dragon"):
+    return finalize_scene(rename_shapes=False, label_joints=True)
+
+BUILT_MODULES = ("arm", "frontLeg", "leg", "backLeg", "hand", "spine", "neck", "variableFk")
+
+def make(asset_name="dragon", instance_shapes=False, space_switch_node=False, solver_nodes=False, de_boor_spine=False, de_boor_stretch_aware=False, bake_guides=False):
     """
     Build a complete dragon rig in Maya by creating basic structure, modules, and setting up space switching for controllers.
     This function initializes various modules, creates the basic structure, and sets up controllers and constraints for the rig.
     It also sets the radius for all joints and displays a completion message.
+
+    Args:
+        asset_name (str): Name of the asset.
+        instance_shapes (bool): If True, identical controller shapes are created once and instanced.
+        space_switch_node (bool): If True, each space switch is a single ggSpaceSwitch node.
+        solver_nodes (bool): If True, the limbs use the ggAutorigNodes solver nodes instead of native node networks.
+        de_boor_spine (bool): If True, the spines place their joints with precomputed De Boor weights instead of an ikSpline handle.
+        de_boor_stretch_aware (bool): If True, the De Boor spines measure their curve at runtime and reparametrize the joints for the stretch limits.
+        bake_guides (bool): If True, the guide networks are evaluated once, baked as static values and deleted with the guides.
     """   
 
+    curve_tool.set_shape_instancing(instance_shapes)
+    ss.reset_manager(use_node=space_switch_node)
+    solver_nodes = solver_nodes and core.load_plugin()
+    for module in (lbm.LimbModule, spm_bip.SpineModule, spm_quad.SpineModule, nck_bip.NeckModule, nck_quad.NeckModule):
+        module.solver_nodes = solver_nodes
+    for module in (spm_bip.SpineModule, spm_quad.SpineModule):
+        module.de_boor_spine = de_boor_spine
+        module.de_boor_stretch_aware = de_boor_stretch_aware
+    core.reset_cosine_cache()
+
     data_exporter = data_export.DataExport()
     data_exporter.new_build()
     if not asset_name:
@@ -86,6 +143,12 @@ def make(asset_name="dragon"):
     except Exception as e:
         om.MGlobal.displayError(f"Error loading guides data: {e}")
 
+    guides_manager.reset_registry(modules=[
+        guide_name
+        for guides in guides_data.values() if isinstance(guides, dict)
+        for guide_name, guide_info in guides.items() if guide_info.get("moduleName") in BUILT_MODULES
+    ])
+
     for template_name, guides in guides_data.items():
         if not isinstance(guides, dict):
             continue
@@ -117,8 +180,15 @@ def make(asset_name="dragon"):
 
     skeleton_hierarchy = skh.build_complete_hierarchy() 
 
-    rename_ctl_shapes()
-    joint_label()
+    if bake_guides:
+        guide_bake.bake_guides()
+
+    finalize_scene()
+
+    curve_tool.shape_cache_report()
+    ss.get_manager().report()
+    core.COSINE_CACHE.report()
+    guides_manager.get_registry().report()
 
     cmds.inViewMessage(
     amg=f'Completed <hl> {asset_name.capitalize()} RIG</hl> build.',
@@ -13,38 +13,40 @@ from gg_autorig.utils import data_export
 from gg_autorig.utils.guides import guides_manager
 reload(guides_manager)
 
+RIVET_BACKENDS = ("loft", "uvPin")
 
 
-def river_joint(mesh = "C_body_MSH", guide_name = ""):
-
+def get_mesh_dag_path(mesh):
     """
-    Create a limb rig with controllers and constraints.
-    This function sets up the basic structure for a limb, including controllers and constraints.
-    """     
-
-    data_exporter = data_export.DataExport()
-
-    modules_grp = data_exporter.get_data("basic_structure", "modules_GRP")
-    skel_grp = data_exporter.get_data("basic_structure", "skel_GRP")
-    masterWalk_ctl = data_exporter.get_data("basic_structure", "masterWalk_CTL")
-
-    guides = guide_import(guide_name, all_descendents=True, path=None)
-
-    name = guide_name.replace("_GUIDE", "")
-
-    individual_module_grp = cmds.createNode("transform", name=f"{name}Module_GRP", parent=modules_grp, ss=True)
-    skinnging_grp = data_exporter.get_data("rivet_module", "skinningJoints_GRP")
-    if not skinnging_grp:
-        skinnging_grp = cmds.createNode("transform", name=f"{name}ModuleJoints_GRP", parent=skel_grp, ss=True)
-
-    target_pos = cmds.xform(guides, query=True, worldSpace=True, translation=True)
-    target_point = om.MVector(target_pos)
+    Returns the dag path of the first non intermediate mesh shape under the given transform.
 
+    Args:
+        mesh (str): The name of the mesh transform or shape.
+    Returns:
+        om.MDagPath: The dag path of the mesh shape.
+    """
     sel_list = om.MSelectionList()
     sel_list.add(mesh)
     dag_path = sel_list.getDagPath(0)
+    if dag_path.apiType() != om.MFn.kMesh:
+        dag_path.extendToShape()
+    return dag_path
+
+
+def closest_vertex_index(mesh, position):
+    """
+    Returns the index of the closest vertex of the mesh to the given world position.
+
+    Args:
+        mesh (str): The name of the mesh.
+        position (list): World position to look up.
+    Returns:
+        int: The closest vertex index.
+    """
+    dag_path = get_mesh_dag_path(mesh)
     mesh_fn = om.MFnMesh(dag_path)
 
+    target_point = om.MVector(position)
     vertex_positions = mesh_fn.getPoints(om.MSpace.kWorld)
 
     min_dist = float('inf')
@@ -56,6 +58,53 @@ def river_joint(mesh = "C_body_MSH", guide_name = ""):
             min_dist = dist
             closest_index = i
 
+    return closest_index
+
+
+def closest_uvs(mesh, positions, uv_set=None):
+    """
+    Finds the closest UV coordinate on the mesh for every given world position in a single pass.
+    The mesh function set and the intersector acceleration structure are built once and reused for all the points.
+
+    Args:
+        mesh (str): The name of the mesh.
+        positions (list): List of world positions.
+        uv_set (str, optional): UV set to sample. Defaults to the current UV set of the mesh.
+    Returns:
+        list: A list of (u, v) tuples, one per position.
+    """
+    dag_path = get_mesh_dag_path(mesh)
+    mesh_fn = om.MFnMesh(dag_path)
+    uv_set = uv_set or mesh_fn.currentUVSetName()
+
+    intersector = om.MMeshIntersector()
+    intersector.create(dag_path.node(), dag_path.inclusiveMatrix())
+
+    uvs = []
+    for position in positions:
+        point_on_mesh = intersector.getClosestPoint(om.MPoint(position))
+        world_point = om.MPoint(point_on_mesh.point) * dag_path.inclusiveMatrix()
+        u, v, _ = mesh_fn.getUVAtPoint(world_point, om.MSpace.kWorld, uvSet=uv_set)
+        uvs.append((u, v))
+
+    return uvs
+
+
+def loft_rivet_matrix(mesh, name, position):
+    """
+    Creates the loft based rivet network for a single position.
+    Two opposite border edges of the closest face are lofted and sampled with a pointOnSurfaceInfo node.
+
+    Args:
+        mesh (str): The name of the mesh.
+        name (str): Base name for the created nodes.
+        position (list): World position of the rivet.
+    Returns:
+        str: The output matrix plug of the rivet.
+    """
+    dag_path = get_mesh_dag_path(mesh)
+    closest_index = closest_vertex_index(mesh, position)
+
     vertex_iter = om.MItMeshVertex(dag_path)
     vertex_iter.setIndex(closest_index)
 
@@ -85,15 +134,15 @@ def river_joint(mesh = "C_body_MSH", guide_name = ""):
             opposite_edges = remaining_edges
             break
 
-    cmds.delete(guides)
-    
+    cmds.select(clear=True)
+
     loft = cmds.loft(opposite_edges, name=f"{name}_LOFT", uniform=True)
 
     point_on_surface = cmds.createNode("pointOnSurfaceInfo", name=f"{name}_POSI", ss=True)
     cmds.connectAttr(f"{loft[1]}.outputSurface", f"{point_on_surface}.inputSurface", force=True)
 
     cmds.delete(loft[0])
-    loft_node = cmds.rename(loft[1], f"{name}_LOFT")
+    cmds.rename(loft[1], f"{name}_LOFT")
 
     matrix_node = cmds.createNode('fourByFourMatrix', name=f"{name}4B4M", ss=True)
 
@@ -115,6 +164,73 @@ def river_joint(mesh = "C_body_MSH", guide_name = ""):
 
     cmds.setAttr(f"{point_on_surface}.turnOnPercentage", 1)
 
+    return f"{matrix_node}.output"
+
+
+def uv_pin_rivet_matrices(mesh, names, positions, uv_set=None):
+    """
+    Attaches many rivets to a mesh through a single uvPin node.
+    The UV coordinate of every rivet is looked up once at build time, after that the only node evaluated per frame is the uvPin.
+
+    Args:
+        mesh (str): The name of the mesh.
+        names (list): Base names of the rivets, logged with the uvPin index driving them.
+        positions (list): World positions of the rivets.
+        uv_set (str, optional): UV set used by the uvPin. Defaults to the current UV set of the mesh.
+    Returns:
+        list: The output matrix plugs of the uvPin, one per rivet.
+    """
+    dag_path = get_mesh_dag_path(mesh)
+    mesh_shape = dag_path.partialPathName()
+    mesh_transform = cmds.listRelatives(mesh_shape, parent=True)[0]
+
+    uv_set = uv_set or om.MFnMesh(dag_path).currentUVSetName()
+    uvs = closest_uvs(mesh, positions, uv_set=uv_set)
+
+    uv_pin = f"{mesh_transform}Rivets_UVP"
+    if not cmds.objExists(uv_pin):
+        uv_pin = cmds.createNode("uvPin", name=uv_pin, ss=True)
+        cmds.connectAttr(f"{mesh_shape}.worldMesh[0]", f"{uv_pin}.deformedGeometry", force=True)
+
+        orig_shapes = [shape for shape in cmds.listRelatives(mesh_transform, shapes=True, fullPath=True) or [] if cmds.getAttr(f"{shape}.intermediateObject")]
+        if orig_shapes:
+            cmds.connectAttr(f"{orig_shapes[0]}.outMesh", f"{uv_pin}.originalGeometry", force=True)
+
+        cmds.setAttr(f"{uv_pin}.uvSetName", uv_set, type="string")
+        cmds.setAttr(f"{uv_pin}.normalAxis", 1)
+        cmds.setAttr(f"{uv_pin}.tangentAxis", 0)
+
+    # Logical indices can be sparse once rivets are deleted, new rivets go after the highest one.
+    indices = cmds.getAttr(f"{uv_pin}.coordinate", multiIndices=True) or []
+    start_index = max(indices) + 1 if indices else 0
+
+    output_plugs = []
+    for i, (name, (u, v)) in enumerate(zip(names, uvs)):
+        index = start_index + i
+        cmds.setAttr(f"{uv_pin}.coordinate[{index}].coordinateU", u)
+        cmds.setAttr(f"{uv_pin}.coordinate[{index}].coordinateV", v)
+        output_plugs.append(f"{uv_pin}.outputMatrix[{index}]")
+
+    rivets = ", ".join(f"{name}[{start_index + i}]" for i, name in enumerate(names))
+    om.MGlobal.displayInfo(f"{len(output_plugs)} rivets attached to {mesh_transform} through {uv_pin}: {rivets}.")
+
+    return output_plugs
+
+
+def rivet_controls(name, matrix_plug, masterWalk_ctl, module_grp, skinning_grp):
+    """
+    Creates the controller and joints driven by a rivet matrix.
+
+    Args:
+        name (str): Base name of the rivet.
+        matrix_plug (str): Plug with the world matrix of the rivet.
+        masterWalk_ctl (str): The masterWalk controller.
+        module_grp (str): Group where the rivet joint is parented.
+        skinning_grp (str): Group where the skinning joint is parented.
+    Returns:
+        tuple: The controller and the skinning joint.
+    """
+
     ctl, ctl_grp = controller_creator(
                 name=name,
                 suffixes=["GRP", "NEG"],
@@ -133,7 +249,7 @@ def river_joint(mesh = "C_body_MSH", guide_name = ""):
     cmds.setAttr(f"{pick_matrix}.useTranslate", 0)
 
 
-    cmds.connectAttr(f"{matrix_node}.output", f"{ctl_grp[0]}.offsetParentMatrix", force=True)
+    cmds.connectAttr(matrix_plug, f"{ctl_grp[0]}.offsetParentMatrix", force=True)
 
     decompose_matrix = cmds.createNode("decomposeMatrix", name=f"{name}_DM", ss=True)
     cmds.connectAttr(f"{ctl}.inverseMatrix", f"{decompose_matrix}.inputMatrix", force=True)
@@ -141,18 +257,87 @@ def river_joint(mesh = "C_body_MSH", guide_name = ""):
     cmds.connectAttr(f"{decompose_matrix}.outputRotate", f"{ctl_grp[1]}.rotate", force=True)
     cmds.connectAttr(f"{decompose_matrix}.outputScale", f"{ctl_grp[1]}.scale", force=True)
     
-    joint_offset = cmds.createNode("transform", name=f"{name}Offset_TRN", ss=True, parent=individual_module_grp)
+    joint_offset = cmds.createNode("transform", name=f"{name}Offset_TRN", ss=True, parent=module_grp)
     cmds.matchTransform(joint_offset, ctl_grp[0])
     joint = cmds.createNode("joint", name=f"{name}_JNT", parent=joint_offset, ss=True)
     cmds.connectAttr(f"{ctl}.matrix", f"{joint}.offsetParentMatrix", force=True)
 
-    joint_env = cmds.createNode("joint", name=f"{name}_ENV", parent=skinnging_grp, ss=True)
+    joint_env = cmds.createNode("joint", name=f"{name}_ENV", parent=skinning_grp, ss=True)
     cmds.connectAttr(f"{joint}.worldMatrix[0]", f"{joint_env}.offsetParentMatrix", force=True)
 
     cmds.setAttr(f"{joint}.translateX", 0)
     cmds.setAttr(f"{joint}.translateY", 0)
     cmds.setAttr(f"{joint}.translateZ", 0)
 
+    return ctl, joint_env
+
+
+def river_joint(mesh = "C_body_MSH", guide_name = "", backend="loft"):
+
+    """
+    Create a rivet controller and joint attached to a mesh from a guide.
+    This function sets up the basic structure for a rivet, including controllers and constraints.
+
+    Args:
+        mesh (str): The name of the mesh to attach the rivet to.
+        guide_name (str): The name of the guide to position the rivet.
+        backend (str): "loft" for the loft + pointOnSurfaceInfo network, "uvPin" for a shared uvPin node.
+    """     
+
+    return river_joints(mesh=mesh, guide_names=[guide_name], backend=backend)
+
+
+def river_joints(mesh = "C_body_MSH", guide_names = None, backend="loft"):
+
+    """
+    Create rivet controllers and joints attached to a mesh for several guides at once.
+    The loft backend is the default, with the uvPin backend every rivet of the mesh is driven by one multi output uvPin node.
+
+    Args:
+        mesh (str): The name of the mesh to attach the rivets to.
+        guide_names (list): The names of the guides to position the rivets.
+        backend (str): "loft" for the loft + pointOnSurfaceInfo network, "uvPin" for a shared uvPin node.
+    Returns:
+        list: The created rivet controllers.
+    """
+
+    if backend not in RIVET_BACKENDS:
+        om.MGlobal.displayError(f"Unknown rivet backend '{backend}', use one of {RIVET_BACKENDS}.")
+        return
+
+    guide_names = guide_names or []
+    data_exporter = data_export.DataExport()
+
+    modules_grp = data_exporter.get_data("basic_structure", "modules_GRP")
+    skel_grp = data_exporter.get_data("basic_structure", "skel_GRP")
+    masterWalk_ctl = data_exporter.get_data("basic_structure", "masterWalk_CTL")
+
+    names = []
+    positions = []
+    for guide_name in guide_names:
+        guides = guide_import(guide_name, all_descendents=True, path=None)
+        positions.append(cmds.xform(guides[0], query=True, worldSpace=True, translation=True))
+        names.append(guide_name.replace("_GUIDE", ""))
+        cmds.delete(guides)
+
+    if backend == "uvPin":
+        matrix_plugs = uv_pin_rivet_matrices(mesh, names, positions)
+    else:
+        matrix_plugs = [loft_rivet_matrix(mesh, name, position) for name, position in zip(names, positions)]
+
+    skinnging_grp = data_exporter.get_data("rivet_module", "skinningJoints_GRP")
+
+    ctls = []
+    for name, matrix_plug in zip(names, matrix_plugs):
+        individual_module_grp = cmds.createNode("transform", name=f"{name}Module_GRP", parent=modules_grp, ss=True)
+        if not skinnging_grp:
+            skinnging_grp = cmds.createNode("transform", name=f"{name}ModuleJoints_GRP", parent=skel_grp, ss=True)
+
+        ctl, _ = rivet_controls(name, matrix_plug, masterWalk_ctl, individual_module_grp, skinnging_grp)
+        ctls.append(ctl)
+
+    return ctls
+
 
 
-river_joint(guide_name="L_BellyJiggle_GUIDE")
\ No newline at end of file
+# river_joint(guide_name="L_BellyJiggle_GUIDE")
@@ -9,15 +9,74 @@ import maya.api.OpenMaya as om
 from gg_autorig.utils import data_export
 from gg_autorig.utils import core
 from gg_autorig.utils import space_switch
+from gg_autorig.utils import hierarchy_resolver
 
 reload(core)
+reload(hierarchy_resolver)
+
+def get_enum_field(node, attr_name):
+    """
+    Returns the first field name of an enum attribute.
+
+    Args:
+        node (str): Node holding the attribute.
+        attr_name (str): Name of the enum attribute.
+    Returns:
+        str: The first field of the enum, None if the attribute does not exist.
+    """
+    sel_list = om.MSelectionList()
+    sel_list.add(node)
+    node_fn = om.MFnDependencyNode(sel_list.getDependNode(0))
+    if not node_fn.hasAttribute(attr_name):
+        return None
+    enum_fn = om.MFnEnumAttribute(node_fn.attribute(attr_name))
+    return enum_fn.fieldName(enum_fn.getMin())
+
+def get_node(name):
+    """
+    Returns the MObject of a node by name.
+
+    Args:
+        name (str): Name of the node.
+    Returns:
+        om.MObject: The node.
+    """
+    sel_list = om.MSelectionList()
+    sel_list.add(name)
+    return sel_list.getDependNode(0)
+
+def get_finger_key(joint):
+    """
+    Returns the finger a hand joint belongs to, e.g. "L_index02_JNT" -> "index".
+
+    Args:
+        joint (str): Name of the joint.
+    Returns:
+        str: The finger key.
+    """
+    name = joint.split("_", 1)[1]
+    name = name.replace("metacarpal", "")
+    name = ''.join([c for c in name if not c.isdigit()])
+    name = name.replace("JNT", "")
+    return name.lower()
 
 def parented_chain(skinning_joints, parent, hand_value):
+    """
+    Creates the _ENV chain (or one chain per finger for hands) following the given skinning joints.
+    All the joints are created already parented in one MDagModifier and every joint is driven through a single multMatrix
+    (source world matrix * parent world inverse) queued in one MDGModifier.
+    The joints are created under their final parent so their channels and joint orient are already zeroed.
+
+    Args:
+        skinning_joints (list): The module skinning joints to follow.
+        parent (str): The joint the chain hangs from, None to parent it to the skeleton hierarchy group.
+        hand_value (bool): If True the joints are split in one chain per finger.
+    Returns:
+        list: The created _ENV joints.
+    """
 
     data_exporter = data_export.DataExport()
 
-    skelHierarchy_grp = data_exporter.get_data("basic_structure", "skeletonHierarchy_GRP")
-
     try:
         env_replace = parent.replace("_JNT", "_ENV")
         if cmds.objExists(env_replace):
@@ -28,87 +87,63 @@ def parented_chain(skinning_joints, parent, hand_value):
     complete_chain = []
 
     if hand_value:
-        def get_finger_key(joint):
-            name = joint.split("_", 1)[1]
-            name = name.replace("metacarpal", "")
-            name = ''.join([c for c in name if not c.isdigit()])
-            name = name.replace("JNT", "")
-            return name.lower()
-
         finger_chains = {}
         for joint in skinning_joints:
-            key = get_finger_key(joint)
-            if key not in finger_chains:
-                finger_chains[key] = []
-            finger_chains[key].append(joint)
+            finger_chains.setdefault(get_finger_key(joint), []).append(joint)
 
-        complete_chain = [finger_chains[key] for key in finger_chains]
+        complete_chain = list(finger_chains.values())
     else:
         complete_chain = [skinning_joints]
 
-    end_joints = []
-    for index, chain in enumerate(complete_chain):
+    parent_obj = get_node(parent or data_exporter.get_data("basic_structure", "skeletonHierarchy_GRP"))
+
+    dag_modifier = om.MDagModifier()
+    chains_objs = []
+    for chain in complete_chain:
         joints = []
         for joint in chain:
-            cmds.select(clear=True)
-            joint_env = cmds.createNode("joint", n=joint.replace("_JNT", "_ENV"))
-
-
-            if "localHip" in joint_env:
-                cmds.parent(joint_env, joints[0])
-                joints.append(joint_env)
-                end_joints.append(joint_env)
-
-                continue
-
-            if joints:
-
-                cmds.parent(joint_env, joints[-1])
-
-            elif parent:
-                cmds.parent(joint_env, parent)
+            if "localHip" in joint:
+                joint_parent = joints[0]
+            elif joints:
+                joint_parent = joints[-1]
+            else:
+                joint_parent = parent_obj
 
-            elif parent is None:
-                cmds.parent(joint_env, skelHierarchy_grp)
-            
+            joint_env = dag_modifier.createNode("joint", joint_parent)
+            dag_modifier.renameNode(joint_env, joint.replace("_JNT", "_ENV"))
             joints.append(joint_env)
-            end_joints.append(joint_env)
-
-        for i, joint in enumerate(joints):
-            
-            if parent is None:
-                cmds.connectAttr(complete_chain[index][i] + ".worldMatrix[0]", joint + ".offsetParentMatrix", force=True)
-            
-            elif parent:
-                mult_matrix = cmds.createNode("multMatrix", n=joint.replace("_ENV", "_MMX"), ss=True)
-                cmds.connectAttr(complete_chain[index][i] + ".worldMatrix[0]", mult_matrix + ".matrixIn[0]", force=True)
-                cmds.connectAttr(parent + ".worldInverseMatrix[0]", mult_matrix + ".matrixIn[1]", force=True)
-                cmds.connectAttr(mult_matrix + ".matrixSum", joint + ".offsetParentMatrix", force=True)
-
-                for attr in ["tx", "ty", "tz", "rx", "ry", "rz"]:
-                    cmds.setAttr(joint + "." + attr, 0)
-                
-            
+        chains_objs.append((joints, [get_node(joint) for joint in chain]))
+    dag_modifier.doIt()
 
-            if "localHip" in joint:
-                mult_matrix = cmds.createNode("multMatrix", n=joint.replace("_ENV", "_MMX"), ss=True)
-                cmds.connectAttr(complete_chain[index][i] + ".worldMatrix[0]", mult_matrix + ".matrixIn[0]", force=True)
-                cmds.connectAttr(joints[0] + ".worldInverseMatrix[0]", mult_matrix + ".matrixIn[1]", force=True)
-                cmds.connectAttr(mult_matrix + ".matrixSum", joint + ".offsetParentMatrix", force=True)
-
-                for attr in ["tx", "ty", "tz", "rx", "ry", "rz"]:
-                    cmds.setAttr(joint + "." + attr, 0)
+    def world_plug(obj, attr):
+        return om.MFnDependencyNode(obj).findPlug(attr, False).elementByLogicalIndex(0)
 
-            elif i != 0:
-                mult_matrix = cmds.createNode("multMatrix", n=joint.replace("_ENV", "_MMX"), ss=True)
-                cmds.connectAttr(complete_chain[index][i] + ".worldMatrix[0]", mult_matrix + ".matrixIn[0]", force=True)
-                cmds.connectAttr(joints[i-1] + ".worldInverseMatrix[0]", mult_matrix + ".matrixIn[1]", force=True)
-                cmds.connectAttr(mult_matrix + ".matrixSum", joint + ".offsetParentMatrix", force=True)
+    dg_modifier = om.MDGModifier()
+    end_joints = []
+    for joints, sources in chains_objs:
+        for i, (joint_env, source) in enumerate(zip(joints, sources)):
+            joint_fn = om.MFnDependencyNode(joint_env)
+            end_joints.append(joint_fn.name())
+            offset_parent_matrix = joint_fn.findPlug("offsetParentMatrix", False)
+
+            if i == 0 and parent is None:
+                dg_modifier.connect(world_plug(source, "worldMatrix"), offset_parent_matrix)
+                continue
 
-                for attr in ["tx", "ty", "tz", "rx", "ry", "rz"]:
-                    cmds.setAttr(joint + "." + attr, 0)
+            if i == 0:
+                space = parent_obj
+            elif "localHip" in joint_fn.name():
+                space = joints[0]
+            else:
+                space = joints[i-1]
 
-            cmds.setAttr(joint + ".jointOrient", 0, 0, 0, type="double3")
+            mult_matrix = dg_modifier.createNode("multMatrix")
+            dg_modifier.renameNode(mult_matrix, joint_fn.name().replace("_ENV", "_MMX"))
+            matrix_in = om.MFnDependencyNode(mult_matrix).findPlug("matrixIn", False)
+            dg_modifier.connect(world_plug(source, "worldMatrix"), matrix_in.elementByLogicalIndex(0))
+            dg_modifier.connect(world_plug(space, "worldInverseMatrix"), matrix_in.elementByLogicalIndex(1))
+            dg_modifier.connect(om.MFnDependencyNode(mult_matrix).findPlug("matrixSum", False), offset_parent_matrix)
+    dg_modifier.doIt()
 
     return end_joints
 
@@ -121,11 +156,7 @@ def build_complete_hierarchy():
     """
     data_exporter = data_export.DataExport()
     try:
-        complete_path = os.path.realpath(__file__)
-        relative_path = complete_path.split("scripts")[0]
-        build_path = os.path.join(relative_path, "build", "build_cache.cache")
-        
-        with open(build_path, "r") as f:
+        with open(data_exporter.build_path, "r") as f:
             build_data = json.load(f)
 
         guides_path = core.init_template_file(ext=".guides", export=False)
@@ -157,112 +188,85 @@ def build_complete_hierarchy():
         module_side  = group.split("_")[0]
         
         try:
-            enum_text = cmds.attributeQuery('moduleName', node=group, listEnum=True)[0].split(':')[0]
-            try:
-                prefix = cmds.attributeQuery('prefix', node=group, listEnum=True)[0].split(':')[0]
+            enum_text = get_enum_field(group, "moduleName")
+            prefix = get_enum_field(group, "prefix")
+            if prefix:
                 enum_text = enum_text[0].upper() + enum_text[1:]
                 skel_grps_to_modules.append((module_side, prefix + enum_text))
-
-            except Exception as e:
+            else:
                 skel_grps_to_modules.append((module_side, enum_text))
 
-
         except Exception as e:
             om.MGlobal.displayError(f"Error getting attribute for {group}: {e}")
+            skel_grps_to_modules.append((module_side, None))
+
+    links, missing = hierarchy_resolver.resolve_hierarchy(guides_data.get("hierarchy", []), skel_grps_to_modules)
+    for guide in missing:
+        om.MGlobal.displayWarning(f"No skinning group found for {guide}, skipping it in the hierarchy.")
+
+    # Space switches are queued and built together once every rest matrix has been read.
+    with space_switch.get_manager().batch():
+        for link in links:
+            parent_side, parent_module = link["parent_side"], link["parent_module"]
+            child_side, child_module = link["child_side"], link["child_module"]
+            parent_index, child_index = link["parent_index"], link["child_index"]
+            parent_index_chain = link["parent_index_chain"]
+            hand_value = link["hand_value"]
+
+            if parent_module == "root":
+                parented_chain(skinning_joints=skinning_joints[child_index], parent=None, hand_value=hand_value)
+            else:
+                parented_chain(skinning_joints=skinning_joints[child_index], parent=skinning_joints[parent_index][parent_index_chain], hand_value=hand_value)
 
-    parent_child_pairs = []
-    hierarchy_list = guides_data.get("hierarchy", [])
-    stack = [(None, item) for item in hierarchy_list]
-
-    while stack:
-        parent_name, current_item = stack.pop()
-        for key, children in current_item.items():
-            if parent_name:
-                parent_child_pairs.append((parent_name, key))
-            for child in children:
-                if isinstance(child, dict):
-                    stack.append((key, child))
-
-
-    for parent, child in parent_child_pairs:
-        parent_side, parent_module = parent.split("_")[0], parent.split("_")[1]
-        child_side, child_module = child.split("_")[0], child.split("_")[1]
-
-        if child_module == "localHip" and parent_module == "spine":
-            continue
-
-        for i, (side, grp) in enumerate(skel_grps_to_modules):
-            match_parent_module = "spine" if parent_module == "localHip" else parent_module
-            match_child_module = "spine" if child_module == "localHip" else child_module
-
-            if side == parent_side and grp == match_parent_module:
-                parent_index = i
+            # ===== SPACE SWITCHES ===== #
+            parent_ctl = "localHip" if parent_module == "localHip" else f"localChest"
 
-            elif side == child_side and grp == match_child_module:
-                child_index = i
-            elif match_parent_module == "root":
-                parent_index = "Skip"
-                continue
+            if hand_value:
+                hand_controller = data_exporter.get_data(f"{child_side}_HandModule", "hand_controllers")
+                space_switch.fk_switch(target = hand_controller, sources= [skinning_joints[parent_index][-1]])
 
-        parent_index_chain = -1 if not parent_module == "spine" else -2
+            if parent_module == "spine" or parent_module == "localHip":
+                parent_module = "spine" if parent_module == "localHip" else parent_module
+                body_ctl = data_exporter.get_data(f"{parent_side}_{parent_module}Module", "body_ctl")
+                local_hip_ctl = data_exporter.get_data(f"{parent_side}_{parent_module}Module", parent_ctl)
 
+                if child_module == "arm" or child_module == "leg" or child_module == "frontLeg" or child_module == "backLeg":
+                    if child_module == "arm" or child_module == "frontLeg":
+                        clavicle = data_exporter.get_data(f"{child_side}_{child_module}Module", "scapula_ctl")
+                        space_switch.fk_switch(target = clavicle, sources= [local_hip_ctl, body_ctl])
+                        parents = [clavicle, local_hip_ctl, body_ctl]
 
-        hand_value = True if child_module == "hand" else False
+                    else:
+                        parents = [local_hip_ctl, body_ctl]
 
-        if parent_module == "root":
-            parented_chain(skinning_joints=skinning_joints[child_index], parent=None, hand_value=hand_value)
-        else:
-            parented_chain(skinning_joints=skinning_joints[child_index], parent=skinning_joints[parent_index][parent_index_chain], hand_value=hand_value)
+                    fk = data_exporter.get_data(f"{child_side}_{child_module}Module", "fk_ctl")[0]
+                    pv = data_exporter.get_data(f"{child_side}_{child_module}Module", "pv_ctl")
+                    root = data_exporter.get_data(f"{child_side}_{child_module}Module", "root_ctl")
+                    ik = data_exporter.get_data(f"{child_side}_{child_module}Module", "end_ik")
 
-        # ===== SPACE SWITCHES ===== #
-        parent_ctl = "localHip" if parent_module == "localHip" else f"localChest"
+                    space_switch.fk_switch(target = fk, sources= parents)
+                    space_switch.fk_switch(target = root, sources= parents)
+                    space_switch.fk_switch(target = ik, sources= parents, default_rotate=0, default_translate=0)
+                    space_switch.fk_switch(target = pv, sources= [ik, local_hip_ctl, body_ctl])
 
-        if hand_value:
-            hand_controller = data_exporter.get_data(f"{child_side}_HandModule", "hand_controllers")
-            space_switch.fk_switch(target = hand_controller, sources= [skinning_joints[parent_index][-1]])
-
-        if parent_module == "spine" or parent_module == "localHip":
-            parent_module = "spine" if parent_module == "localHip" else parent_module
-            body_ctl = data_exporter.get_data(f"{parent_side}_{parent_module}Module", "body_ctl")
-            local_hip_ctl = data_exporter.get_data(f"{parent_side}_{parent_module}Module", parent_ctl)
+                elif child_module == "neck":
+                
+                    neck = data_exporter.get_data(f"{child_side}_{child_module}Module", "neck_ctl")
+                    head = data_exporter.get_data(f"{child_side}_{child_module}Module", "head_ctl")
 
-            if child_module == "arm" or child_module == "leg" or child_module == "frontLeg" or child_module == "backLeg":
-                if child_module == "arm" or child_module == "frontLeg":
-                    clavicle = data_exporter.get_data(f"{child_side}_{child_module}Module", "scapula_ctl")
-                    space_switch.fk_switch(target = clavicle, sources= [local_hip_ctl, body_ctl])
-                    parents = [clavicle, local_hip_ctl, body_ctl]
+                    space_switch.fk_switch(target = neck, sources= [local_hip_ctl, body_ctl])
+                    space_switch.fk_switch(target = head, sources= [neck, local_hip_ctl, body_ctl], default_rotate=0)
 
                 else:
-                    parents = [local_hip_ctl, body_ctl]
-
-                fk = data_exporter.get_data(f"{child_side}_{child_module}Module", "fk_ctl")[0]
-                pv = data_exporter.get_data(f"{child_side}_{child_module}Module", "pv_ctl")
-                root = data_exporter.get_data(f"{child_side}_{child_module}Module", "root_ctl")
-                ik = data_exporter.get_data(f"{child_side}_{child_module}Module", "end_ik")
-
-                space_switch.fk_switch(target = fk, sources= parents)
-                space_switch.fk_switch(target = root, sources= parents)
-                space_switch.fk_switch(target = ik, sources= parents, default_rotate=0, default_translate=0)
-                space_switch.fk_switch(target = pv, sources= [ik, local_hip_ctl, body_ctl])
-
-            elif child_module == "neck":
-                
-                neck = data_exporter.get_data(f"{child_side}_{child_module}Module", "neck_ctl")
-                head = data_exporter.get_data(f"{child_side}_{child_module}Module", "head_ctl")
-
-                space_switch.fk_switch(target = neck, sources= [local_hip_ctl, body_ctl])
-                space_switch.fk_switch(target = head, sources= [neck, local_hip_ctl, body_ctl], default_rotate=0)
+                    main_ctl= data_exporter.get_data(f"{child_side}_{child_module}Module", "main_ctl")
+                    space_switch.fk_switch(target = main_ctl, sources= [local_hip_ctl, body_ctl])
 
             else:
                 main_ctl= data_exporter.get_data(f"{child_side}_{child_module}Module", "main_ctl")
-                space_switch.fk_switch(target = main_ctl, sources= [local_hip_ctl, body_ctl])
-
-        else:
-            main_ctl= data_exporter.get_data(f"{child_side}_{child_module}Module", "main_ctl")
-            parent_main_ctl = data_exporter.get_data(f"{parent_side}_{parent_module}Module", "end_main_ctl")
+                parent_main_ctl = data_exporter.get_data(f"{parent_side}_{parent_module}Module", "end_main_ctl")
 
-            if not main_ctl or not parent_main_ctl:
-                continue
+                if not main_ctl or not parent_main_ctl:
+                    continue
 
-            space_switch.fk_switch(target = main_ctl, sources= [parent_main_ctl, local_hip_ctl, body_ctl])
+                space_switch.fk_switch(target = main_ctl, sources= [parent_main_ctl, local_hip_ctl, body_ctl])
 
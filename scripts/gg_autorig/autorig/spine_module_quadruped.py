@@ -5,18 +5,27 @@ import maya.api.OpenMaya as om
 import math
 
 # Local imports
-from gg_autorig.utils.curve_tool import controller_creator
+from gg_autorig.utils.curve_tool import controller_creator, controller_creator_batch
 from gg_autorig.utils.guides.guides_manager import guide_import
 from gg_autorig.utils import data_export
+from gg_autorig.utils import core
+from gg_autorig.utils.spine_graphs import STRETCH_GRAPH, OFFSET_GRAPH, SQUASH_GRAPH, VOLUME_BOUNDS_GRAPH, VOLUME_JOINT_GRAPH
+from gg_autorig.utils import de_boor_core_002 as de_boor
 from gg_autorig.utils.space_switch import fk_switch
 
 reload(data_export)
+reload(de_boor)
 
 class SpineModule():
     """
     Class to create a spine module in a Maya rigging setup.
     This module handles the creation of spine joints, controllers, and various systems such as stretch, reverse, offset, squash, and volume preservation.
     """
+
+    solver_nodes = False
+    de_boor_spine = False
+    de_boor_stretch_aware = False
+
     def __init__(self):
         """
         Initializes the SpineModule class, setting up paths and data exporters.
@@ -105,16 +114,21 @@ class SpineModule():
 
         self.guide_matrix = [aim_matrix, blend_matrix02, blend_matrix]
 
-        for i, matrix in enumerate(self.guide_matrix ):
-            name = f"Tan0{i}" if i == 1 else f"0{i+1}"
-            ctl, ctl_grp = controller_creator(
-                name=f"C_spine{name}",
-                suffixes=["GRP", "OFF","ANM"],
-                lock=["scaleX", "scaleY", "scaleZ", "visibility"],
-                ro=True,
-            )
+        names = [f"Tan0{i}" if i == 1 else f"0{i+1}" for i in range(len(self.guide_matrix))]
+        controllers = controller_creator_batch([
+            {
+                "name": f"C_spine{name}",
+                "suffixes": ["GRP", "OFF","ANM"],
+                "lock": ["scaleX", "scaleY", "scaleZ", "visibility"],
+                "ro": True,
+                "parent": f"C_spine{names[0]}_CTL" if i == 2 else self.controllers_trn,
+            }
+            for i, name in enumerate(names)
+        ])
 
-            cmds.parent(ctl_grp[0], self.main_controllers[0] if i == 2 else self.controllers_trn)
+        for i, matrix in enumerate(self.guide_matrix ):
+            name = names[i]
+            ctl, ctl_grp = controllers[i]
 
             if i == 2:
                 offset_multMatrix = cmds.createNode("multMatrix", name=f"C_spineOffset{name}_MMX", ss=True)
@@ -169,28 +183,29 @@ class SpineModule():
 
             self.main_chain.append(joint)
 
-        point1 = cmds.xform(self.main_controllers[0], query=True, worldSpace=True, translation=True)
-        point2 = cmds.xform(self.main_controllers[1], query=True, worldSpace=True, translation=True)
-        point3 = cmds.xform(self.main_controllers[2], query=True, worldSpace=True, translation=True)
-        self.curve = cmds.curve(d=2, p=(point1,point2,point3), n="C_spine_CRV")
-        cmds.delete(self.curve, constructionHistory = True)
+        if self.de_boor_spine:
+            self.de_boor_chain(self.main_controllers, degree=2, aim_axis="z", up_axis="y")
+        else:
+            point1 = cmds.xform(self.main_controllers[0], query=True, worldSpace=True, translation=True)
+            point2 = cmds.xform(self.main_controllers[1], query=True, worldSpace=True, translation=True)
+            point3 = cmds.xform(self.main_controllers[2], query=True, worldSpace=True, translation=True)
+            self.curve = cmds.curve(d=2, p=(point1,point2,point3), n="C_spine_CRV")
+            cmds.delete(self.curve, constructionHistory = True)
 
-        self.ik_handle = cmds.ikHandle(sj=self.main_chain[0], ee=self.main_chain[-1], sol="ikSplineSolver", n="C_spine_HDL", createCurve=False, curve=self.curve,parentCurve=False)[0]
-        cmds.parent(self.ik_handle, self.curve, self.module_trn)
+            self.ik_handle = cmds.ikHandle(sj=self.main_chain[0], ee=self.main_chain[-1], sol="ikSplineSolver", n="C_spine_HDL", createCurve=False, curve=self.curve,parentCurve=False)[0]
+            cmds.parent(self.ik_handle, self.curve, self.module_trn)
 
+            self.curve =cmds.rename(self.curve, "C_spineIkCurve_CRV")
 
+            self.parentName = cmds.listRelatives(self.curve, shapes=True)[0]
+            self.parentName = cmds.rename(self.parentName, f"{self.curve}Shape")
 
-        self.curve =cmds.rename(self.curve, "C_spineIkCurve_CRV")
+            cmds.setAttr(f"{self.curve}.inheritsTransform", 0)
 
-        self.parentName = cmds.listRelatives(self.curve, shapes=True)[0]
-        self.parentName = cmds.rename(self.parentName, f"{self.curve}Shape")
-
-        cmds.setAttr(f"{self.curve}.inheritsTransform", 0)
-
-        for i, ctl in enumerate([self.main_controllers[0], self.main_controllers[1], self.main_controllers[2]]):
-            dcp = cmds.createNode("decomposeMatrix", name=ctl.replace("_CTL", "_DCP"), ss=True)
-            cmds.connectAttr(f"{ctl}.worldMatrix[0]", f"{dcp}.inputMatrix")
-            cmds.connectAttr(f"{dcp}.outputTranslate", f"{self.curve}.controlPoints[{i}]")
+            for i, ctl in enumerate([self.main_controllers[0], self.main_controllers[1], self.main_controllers[2]]):
+                dcp = cmds.createNode("decomposeMatrix", name=ctl.replace("_CTL", "_DCP"), ss=True)
+                cmds.connectAttr(f"{ctl}.worldMatrix[0]", f"{dcp}.inputMatrix")
+                cmds.connectAttr(f"{dcp}.outputTranslate", f"{self.curve}.controlPoints[{i}]")
 
         cmds.select(clear=True)
         self.chest_fix = cmds.joint(name = "C_localChest_JNT")
@@ -277,21 +292,52 @@ class SpineModule():
         cmds.setAttr(f"{parent_matrix}.target[0].offsetMatrix", offset_matrix, type="matrix")
         cmds.connectAttr(f"{parent_matrix}.outputMatrix", f"{localHip_grp[0]}.offsetParentMatrix")
 
-        cmds.setAttr(f"{self.ik_handle}.dTwistControlEnable", 1) 
-        cmds.setAttr(f"{self.ik_handle}.dWorldUpType", 4)
-        cmds.setAttr(f"{self.ik_handle}.dForwardAxis", 4)
-        cmds.setAttr(f"{self.ik_handle}.dWorldUpAxis", 0)
-        cmds.setAttr(f"{self.ik_handle}.dWorldUpVectorX", 0)
-        cmds.setAttr(f"{self.ik_handle}.dWorldUpVectorY", 1)
-        cmds.setAttr(f"{self.ik_handle}.dWorldUpVectorZ", 0)
-        cmds.setAttr(f"{self.ik_handle}.dWorldUpVectorEndX", 0)
-        cmds.setAttr(f"{self.ik_handle}.dWorldUpVectorEndY", 1)
-        cmds.setAttr(f"{self.ik_handle}.dWorldUpVectorEndZ", 0)
-        cmds.connectAttr(f"{self.main_controllers[0]}.worldMatrix[0]", f"{self.ik_handle}.dWorldUpMatrix")
-        cmds.connectAttr(f"{self.main_controllers[2]}.worldMatrix[0]", f"{self.ik_handle}.dWorldUpMatrixEnd")
+        if not self.de_boor_spine:
+            cmds.setAttr(f"{self.ik_handle}.dTwistControlEnable", 1) 
+            cmds.setAttr(f"{self.ik_handle}.dWorldUpType", 4)
+            cmds.setAttr(f"{self.ik_handle}.dForwardAxis", 4)
+            cmds.setAttr(f"{self.ik_handle}.dWorldUpAxis", 0)
+            cmds.setAttr(f"{self.ik_handle}.dWorldUpVectorX", 0)
+            cmds.setAttr(f"{self.ik_handle}.dWorldUpVectorY", 1)
+            cmds.setAttr(f"{self.ik_handle}.dWorldUpVectorZ", 0)
+            cmds.setAttr(f"{self.ik_handle}.dWorldUpVectorEndX", 0)
+            cmds.setAttr(f"{self.ik_handle}.dWorldUpVectorEndY", 1)
+            cmds.setAttr(f"{self.ik_handle}.dWorldUpVectorEndZ", 0)
+            cmds.connectAttr(f"{self.main_controllers[0]}.worldMatrix[0]", f"{self.ik_handle}.dWorldUpMatrix")
+            cmds.connectAttr(f"{self.main_controllers[2]}.worldMatrix[0]", f"{self.ik_handle}.dWorldUpMatrixEnd")
 
         self.stretch_system()
 
+    def de_boor_chain(self, spline_controllers, degree, aim_axis, up_axis):
+        """
+        Places the spine joints from the controller matrices with precomputed De Boor weights instead of an ikSpline handle.
+        The parameters of the joints come from an arc length table of the rest curve, so they are equally spaced by length.
+
+        Args:
+            self: Instance of the SpineModule class.
+            spline_controllers (list): Controllers used as control vertices, in order.
+            degree (int): Degree of the curve.
+            aim_axis (str): Joint axis aimed along the curve.
+            up_axis (str): Joint axis aligned with the controllers.
+        """
+
+        positions = [cmds.xform(ctl, query=True, worldSpace=True, translation=True) for ctl in spline_controllers]
+        kv = de_boor.get_open_uniform_kv(len(positions), degree)
+        table = de_boor.arc_length_table(positions, d=degree, kv=kv)
+        params = de_boor.uniform_length_params(table, len(self.main_chain))
+
+        self.de_boor_positions, self.de_boor_outputs = de_boor.de_boor_chain(
+            spline_controllers, params, name="C_spineDeBoor", aim_axis=aim_axis, up_axis=up_axis, d=degree
+        )
+        self.de_boor_controllers = spline_controllers
+        self.de_boor_params = params
+        self.de_boor_degree = degree
+
+        cmds.parent(self.main_chain[1:], self.module_trn)
+        for joint in self.main_chain:
+            cmds.setAttr(f"{joint}.inheritsTransform", 0)
+            cmds.xform(joint, matrix=om.MMatrix.kIdentity)
+
     def stretch_system(self):
         """
         Creates the stretch system for the spine module, including attributes and nodes for stretch and squash functionality.
@@ -300,12 +346,15 @@ class SpineModule():
             self: Instance of the SpineModule class.
         """
            
-        cmds.addAttr(self.body_ctl, shortName="STRETCH", niceName="Stretch ———", enumName="———",attributeType="enum", keyable=True)
-        cmds.setAttr(self.body_ctl+".STRETCH", channelBox=True, lock=True)
-        cmds.addAttr(self.body_ctl, shortName="stretch", niceName="Stretch", maxValue=1, minValue=0,defaultValue=0, keyable=True)
-        cmds.addAttr(self.body_ctl, shortName="stretchMin", niceName="Stretch Min", maxValue=1, minValue=0.001,defaultValue=0.8, keyable=True)
-        cmds.addAttr(self.body_ctl, shortName="stretchMax", niceName="Stretch Max", minValue=1,defaultValue=1.2, keyable=True)
-        cmds.addAttr(self.body_ctl, shortName="offset", niceName="Offset", maxValue=1, minValue=0,defaultValue=0, keyable=True)
+        # The baked De Boor chain follows its curve, the stretch limits need the stretch aware reparametrization.
+        if not self.de_boor_spine or self.de_boor_stretch_aware:
+            cmds.addAttr(self.body_ctl, shortName="STRETCH", niceName="Stretch ———", enumName="———",attributeType="enum", keyable=True)
+            cmds.setAttr(self.body_ctl+".STRETCH", channelBox=True, lock=True)
+            cmds.addAttr(self.body_ctl, shortName="stretch", niceName="Stretch", maxValue=1, minValue=0,defaultValue=0, keyable=True)
+            cmds.addAttr(self.body_ctl, shortName="stretchMin", niceName="Stretch Min", maxValue=1, minValue=0.001,defaultValue=0.8, keyable=True)
+            cmds.addAttr(self.body_ctl, shortName="stretchMax", niceName="Stretch Max", minValue=1,defaultValue=1.2, keyable=True)
+        if not self.de_boor_spine:
+            cmds.addAttr(self.body_ctl, shortName="offset", niceName="Offset", maxValue=1, minValue=0,defaultValue=0, keyable=True)
 
         cmds.addAttr(self.body_ctl, shortName="SQUASH", niceName="Squash ———", enumName="———",attributeType="enum", keyable=True)
         cmds.setAttr(self.body_ctl+".SQUASH", channelBox=True, lock=True)
@@ -317,42 +366,42 @@ class SpineModule():
         cmds.setAttr(self.body_ctl+".attachedFk", channelBox=True, lock=True)
         cmds.addAttr(self.body_ctl, shortName="attachedFKVis", niceName="Attached FK Visibility", attributeType="bool", keyable=True)
 
+        if self.de_boor_spine:
+            output_plugs = self.de_boor_outputs
+            if self.de_boor_stretch_aware:
+                output_plugs = de_boor.chain_stretch(
+                    self.de_boor_controllers,
+                    self.de_boor_params,
+                    self.de_boor_outputs,
+                    stretch=f"{self.body_ctl}.stretch",
+                    stretch_min=f"{self.body_ctl}.stretchMin",
+                    stretch_max=f"{self.body_ctl}.stretchMax",
+                    global_scale=f"{self.masterWalk_ctl}.globalScale",
+                    name="C_spineDeBoor",
+                    d=self.de_boor_degree,
+                )
+            for joint, plug in zip(self.main_chain, output_plugs):
+                cmds.connectAttr(plug, f"{joint}.offsetParentMatrix")
+
+            # The reverse and offset systems slide an ikSpline along its curve, the De Boor chain has neither.
+            self.squash_system()
+            return
+
+        created_nodes = STRETCH_GRAPH.build(
+            inputs={
+                "stretch": f"{self.body_ctl}.stretch",
+                "stretchMax": f"{self.body_ctl}.stretchMax",
+                "stretchMin": f"{self.body_ctl}.stretchMin",
+                "curve": f"{self.parentName}.worldSpace[0]",
+                "distance": f"{self.distance_between}.distance",
+                "globalScale": f"{self.masterWalk_ctl}.globalScale",
+                "twistDivision": f"{self.twist_division}.outFloat",
+            },
+            outputs={"joints": [f"{joint}.translateZ" for joint in self.main_chain[1:]]},
+            prefix="C_spine",
+        )
 
-        nodes_to_create = {
-            "C_spine_CIN": ("curveInfo", None), #0
-            "C_spineStretchFactor_FLM": ("floatMath", 3), #1
-            "C_spineStretchFactor_CLM": ("clamp", None), #2
-            "C_spineInitialArcLegth_FLM": ("floatMath", 2), #3
-            "C_spineBaseStretch_FLC": ("floatConstant", None), #4
-            "C_spineStretch_BTA": ("blendTwoAttr", None), # 5
-            "C_spineStretchValue_FLM": ("floatMath", 2),# 6
-        }
-
-        created_nodes = []
-        for node_name, (node_type, operation) in nodes_to_create.items():
-            node = cmds.createNode(node_type, name=node_name)
-            created_nodes.append(node)
-            if operation is not None:
-                cmds.setAttr(f'{node}.operation', operation)
-
-        cmds.connectAttr(created_nodes[0] + ".arcLength", created_nodes[1]+".floatA")
-        cmds.connectAttr(created_nodes[1] + ".outFloat", created_nodes[2]+".inputR")
-        cmds.connectAttr(created_nodes[3] + ".outFloat", created_nodes[1]+".floatB")
-        cmds.connectAttr(created_nodes[2] + ".outputR", created_nodes[5]+".input[1]")
-        cmds.connectAttr(created_nodes[4] + ".outFloat", created_nodes[5]+".input[0]")
-        cmds.connectAttr(created_nodes[5] + ".output", created_nodes[6]+".floatA")
-        cmds.setAttr(created_nodes[4]+".inFloat", 1)
-        cmds.connectAttr(f"{self.body_ctl}.stretch", created_nodes[5]+".attributesBlender")
-        cmds.connectAttr(f"{self.body_ctl}.stretchMax", created_nodes[2]+".maxR")
-        cmds.connectAttr(f"{self.body_ctl}.stretchMin", created_nodes[2]+".minR")
-        cmds.connectAttr(f"{self.parentName}.worldSpace[0]", created_nodes[0]+".inputCurve")
-        cmds.connectAttr(f"{self.distance_between}.distance", f"{created_nodes[3]}.floatB")
-        cmds.connectAttr(f"{self.masterWalk_ctl}.globalScale", created_nodes[3]+".floatA")
-        cmds.connectAttr(f"{self.twist_division}.outFloat", f"{created_nodes[6]}.floatB")
-        for joint in self.main_chain[1:]:
-            cmds.connectAttr(created_nodes[6]+".outFloat", f"{joint}.translateZ")
-
-        self.stretch_float_math = created_nodes[6]
+        self.stretch_float_math = created_nodes["value"]
 
         self.reverse_system()
 
@@ -407,28 +456,15 @@ class SpineModule():
         Args:
             self: Instance of the SpineModule class.
         """
-        nodes_to_create = {
-            "C_spineReversed05_DCM": ("decomposeMatrix", None),
-            "C_spineOffset_NPC": ("nearestPointOnCurve", None),
-            "C_spineOffsetInitialValue_FLC": ("floatConstant", None),
-            "C_spineOffset_BTA": ("blendTwoAttr", None),
-        }
-
-        created_nodes = []
-        for node_name, (node_type, operation) in nodes_to_create.items():
-            node = cmds.createNode(node_type, name=node_name)
-            created_nodes.append(node)
-            if operation is not None:
-                cmds.setAttr(f'{node}.operation', operation)
-
-        cmds.connectAttr(created_nodes[0] + ".outputTranslate", created_nodes[1]+".inPosition")
-        cmds.connectAttr(created_nodes[1] + ".parameter", created_nodes[3]+".input[1]")
-        cmds.connectAttr(created_nodes[2] + ".outFloat", created_nodes[3]+".input[0]")
-        cmds.connectAttr(f"{self.body_ctl}.offset", created_nodes[3]+".attributesBlender")
-        cmds.connectAttr(f"{self.reverse_chain[-1]}.worldMatrix[0]", created_nodes[0]+".inputMatrix")
-        cmds.connectAttr(f"{self.curve}.worldSpace[0]", created_nodes[1]+".inputCurve")
-        cmds.connectAttr(f"{created_nodes[3]}.output", self.ik_handle +".offset")
-        cmds.setAttr(created_nodes[2]+".inFloat", 0)
+        OFFSET_GRAPH.build(
+            inputs={
+                "offset": f"{self.body_ctl}.offset",
+                "reverseMatrix": f"{self.reverse_chain[-1]}.worldMatrix[0]",
+                "curve": f"{self.curve}.worldSpace[0]",
+            },
+            outputs={"ikOffset": f"{self.ik_handle}.offset"},
+            prefix="C_spine",
+        )
 
         self.squash_system()
 
@@ -476,26 +512,16 @@ class SpineModule():
             cmds.connectAttr(f"{joint}.worldMatrix[0]", f"{dcm}.inputMatrix")
             cmds.connectAttr(f"{dcm}.outputTranslate", f"{squash_curve}.controlPoints[{i}]")
 
-        nodes_to_create = {
-            "C_spineSquash_CIN": ("curveInfo", None),
-            "C_spineSquashBaseLength_FLM": ("floatMath", 2),
-            "C_spineSquashFactor_FLM": ("floatMath", 3),
-        }
-
-        created_nodes = []
-        for node_name, (node_type, operation) in nodes_to_create.items():
-            node = cmds.createNode(node_type, name=node_name)
-            created_nodes.append(node)
-            if operation is not None:   
-                cmds.setAttr(f'{node}.operation', operation)
-
-        cmds.connectAttr(f"{squash_curve}.worldSpace[0]", created_nodes[0]+".inputCurve")
-        cmds.connectAttr(created_nodes[0] + ".arcLength", created_nodes[2]+".floatA")
-        cmds.connectAttr(created_nodes[1] + ".outFloat", created_nodes[2]+".floatB") 
-        cmds.connectAttr(f"{self.masterWalk_ctl}.globalScale", created_nodes[1]+".floatA") 
-        cmds.setAttr(created_nodes[1]+".floatB", cmds.getAttr(created_nodes[0]+".arcLength"))
+        created_nodes = SQUASH_GRAPH.build(
+            inputs={
+                "curve": f"{squash_curve}.worldSpace[0]",
+                "globalScale": f"{self.masterWalk_ctl}.globalScale",
+            },
+            prefix="C_spine",
+        )
+        cmds.setAttr(f"{created_nodes['baseLength']}.floatB", cmds.getAttr(f"{created_nodes['curveInfo']}.arcLength"))
 
-        self.squash_factor_fml = created_nodes[2]
+        self.squash_factor_fml = created_nodes["factor"]
 
         self.volume_preservation_system()
 
@@ -575,87 +601,44 @@ class SpineModule():
         """
                 
         squash_joints = self.attached_fk()
+
+        if self.solver_nodes:
+            core.volume_preservation_node(
+                name="C_spineVolume_VPS",
+                control=self.body_ctl,
+                settings=self.spine_settings_trn,
+                stretch_factor=f"{self.squash_factor_fml}.outFloat",
+                percentages=[f"{self.spine_settings_trn}.spine0{i+1}SquashPercentage" for i in range(len(squash_joints))],
+                joints=squash_joints,
+            )
+            return
        
-        nodes_to_create = {
-            "C_spineVolumeLowBound_RMV": ("remapValue", None),# 0
-            "C_spineVolumeHighBound_RMV": ("remapValue", None),# 1
-            "C_spineVolumeLowBoundNegative_FLM": ("floatMath", 1),# 2
-            "C_spineVolumeHighBoundNegative_FLM": ("floatMath", 1),# 3
-            "C_spineVolumeSquashDelta_FLM": ("floatMath", 1), # 4
-            "C_spineVolumeStretchDelta_FLM": ("floatMath", 1), # 5
-        } 
-
-        main_created_nodes = []
-        for node_name, (node_type, operation) in nodes_to_create.items():
-            node = cmds.createNode(node_type, name=node_name)
-            main_created_nodes.append(node)
-            if operation is not None:
-                cmds.setAttr(f'{node}.operation', operation)
-        values = [0.001, 0.999]
-        for i in range(0,2):
-            cmds.connectAttr(f"{self.body_ctl}.falloff", f"{main_created_nodes[i]}.inputValue")
-            cmds.connectAttr(f"{self.body_ctl}.maxPos", f"{main_created_nodes[i]}.outputMin")
-            cmds.setAttr(f"{main_created_nodes[i]}.outputMax", values[i])
-            cmds.connectAttr(f"{main_created_nodes[i]}.outValue", f"{main_created_nodes[i+2]}.floatB")
-
-        cmds.setAttr(f"{main_created_nodes[2]}.floatA", 0)
-        cmds.setAttr(f"{main_created_nodes[3]}.floatA", 2)
-        cmds.setAttr(f"{main_created_nodes[4]}.floatB", 1)
-        cmds.setAttr(f"{main_created_nodes[5]}.floatA", 1)
-        cmds.connectAttr(f"{self.spine_settings_trn}.maxStretchEffect", f"{main_created_nodes[4]}.floatA")
-        cmds.connectAttr(f"{self.spine_settings_trn}.minStretchEffect", f"{main_created_nodes[5]}.floatB")
+        main_created_nodes = VOLUME_BOUNDS_GRAPH.build(
+            inputs={
+                "falloff": f"{self.body_ctl}.falloff",
+                "maxPos": f"{self.body_ctl}.maxPos",
+                "maxStretchEffect": f"{self.spine_settings_trn}.maxStretchEffect",
+                "minStretchEffect": f"{self.spine_settings_trn}.minStretchEffect",
+            },
+            prefix="C_spine",
+        )
 
         for i, joint in enumerate(squash_joints):
-            nodes_to_create = {
-                f"C_spineVolumeSquashFactor0{i+1}_FLM": ("floatMath", 2), # 0
-                f"C_spineVolumeStretchFactor0{i+1}_FLM": ("floatMath", 2), # 1
-                f"C_spineVolumeStretchFullValue0{i+1}_FLM": ("floatMath", 1), # 2
-                f"C_spineVolumeSquashFullValue0{i+1}_FLM": ("floatMath", 0), # 3
-                f"C_spineVolume0{i+1}_RMV": ("remapValue", None), # 4
-                f"C_spineVolumeFactor0{i+1}_RMV": ("remapValue", None), # 5
-            }
-
-            created_nodes = []
-            for node_name, (node_type, operation) in nodes_to_create.items():
-                node = cmds.createNode(node_type, name=node_name)
-                created_nodes.append(node)
-                if operation is not None:
-                    cmds.setAttr(f'{node}.operation', operation)
-
-            cmds.connectAttr(f"{self.spine_settings_trn}.spine0{i+1}SquashPercentage", f"{created_nodes[5]}.inputValue")
-            cmds.connectAttr(f"{main_created_nodes[2]}.outFloat", f"{created_nodes[5]}.value[0].value_Position")
-            cmds.connectAttr(f"{main_created_nodes[0]}.outValue", f"{created_nodes[5]}.value[1].value_Position")
-            cmds.connectAttr(f"{main_created_nodes[1]}.outValue", f"{created_nodes[5]}.value[2].value_Position")
-            cmds.connectAttr(f"{main_created_nodes[3]}.outFloat", f"{created_nodes[5]}.value[3].value_Position")
-
-
-            cmds.connectAttr(created_nodes[0] + ".outFloat", created_nodes[3]+".floatA")
-            cmds.connectAttr(created_nodes[1] + ".outFloat", created_nodes[2]+".floatB")
-            cmds.connectAttr(created_nodes[2] + ".outFloat", created_nodes[4]+".value[2].value_FloatValue")
-            cmds.connectAttr(created_nodes[3] + ".outFloat", created_nodes[4]+".value[0].value_FloatValue")
-            cmds.connectAttr(self.squash_factor_fml + ".outFloat", created_nodes[4]+".inputValue")
-            cmds.setAttr(f"{created_nodes[3]}.floatB", 1)
-            cmds.setAttr(f"{created_nodes[2]}.floatA", 1)
-
-            cmds.connectAttr(f"{main_created_nodes[4]}.outFloat", created_nodes[0]+".floatA")
-            cmds.connectAttr(f"{main_created_nodes[5]}.outFloat", created_nodes[1]+".floatA")
-            cmds.connectAttr(f"{created_nodes[5]}.outValue", created_nodes[0]+".floatB")
-            cmds.connectAttr(f"{created_nodes[5]}.outValue", created_nodes[1]+".floatB")
-
-            cmds.connectAttr(f"{self.spine_settings_trn}.maxStretchLength", f"{created_nodes[4]}.value[2].value_Position")
-            cmds.connectAttr(f"{self.spine_settings_trn}.minStretchLength", f"{created_nodes[4]}.value[0].value_Position")   
-
-            floatConstant = cmds.createNode("floatConstant", name=f"C_spineVolume0{i+1}_FLC", ss=True)
-            blendTwoAttr = cmds.createNode("blendTwoAttr", name=f"C_spineVolume0{i+1}_BTA", ss=True)
-            cmds.connectAttr(f"{created_nodes[4]}.outValue", f"{blendTwoAttr}.input[1]")
-            cmds.connectAttr(f"{floatConstant}.outFloat", f"{blendTwoAttr}.input[0]")
-            cmds.connectAttr(f"{self.body_ctl}.volumePreservation", f"{blendTwoAttr}.attributesBlender")
-
-            cmds.connectAttr(f"{blendTwoAttr}.output",f"{joint}.scaleX")   
-            cmds.connectAttr(f"{blendTwoAttr}.output",f"{joint}.scaleZ")   
-
-
-            values = [-1, 1, 1, -1]
-            for i in range(0,4):
-                cmds.setAttr(f"{created_nodes[5]}.value[{i}].value_Interp", 2)
-                cmds.setAttr(f"{created_nodes[5]}.value[{i}].value_FloatValue", values[i])
+            VOLUME_JOINT_GRAPH.build(
+                inputs={
+                    "squashPercentage": f"{self.spine_settings_trn}.spine0{i+1}SquashPercentage",
+                    "lowBoundNegative": f"{main_created_nodes['lowBoundNegative']}.outFloat",
+                    "lowBound": f"{main_created_nodes['lowBound']}.outValue",
+                    "highBound": f"{main_created_nodes['highBound']}.outValue",
+                    "highBoundNegative": f"{main_created_nodes['highBoundNegative']}.outFloat",
+                    "squashFactor": f"{self.squash_factor_fml}.outFloat",
+                    "squashDelta": f"{main_created_nodes['squashDelta']}.outFloat",
+                    "stretchDelta": f"{main_created_nodes['stretchDelta']}.outFloat",
+                    "maxStretchLength": f"{self.spine_settings_trn}.maxStretchLength",
+                    "minStretchLength": f"{self.spine_settings_trn}.minStretchLength",
+                    "volumePreservation": f"{self.body_ctl}.volumePreservation",
+                },
+                outputs={"scale": [f"{joint}.scaleX", f"{joint}.scaleZ"]},
+                prefix="C_spine",
+                index=i + 1,
+            )
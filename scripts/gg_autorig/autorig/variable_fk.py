@@ -5,7 +5,7 @@ import maya.api.OpenMaya as om
 import math
 
 # Local imports
-from gg_autorig.utils.curve_tool import controller_creator
+from gg_autorig.utils.curve_tool import controller_creator, controller_creator_batch
 from gg_autorig.utils.guides.guides_manager import guide_import
 from gg_autorig.utils import data_export
 
@@ -142,17 +142,20 @@ class VariableFkModule(object):
         cmds.setAttr(f"{variable_ctl_trn}.inheritsTransform", 0)
 
 
-        for i in range(3):
-
-            ctl, ctl_grp = controller_creator(
-                    name=f"{self.side}_{self.prefix}VariableFk{i+1:02d}",
-                    suffixes=["GRP", "ANM"],
-                    lock=["tx","tz","ty", "visibility"],
-                    ro=True,
-                )
+        controllers = controller_creator_batch([
+            {
+                "name": f"{self.side}_{self.prefix}VariableFk{i+1:02d}",
+                "suffixes": ["GRP", "ANM"],
+                "lock": ["tx","tz","ty", "visibility"],
+                "ro": True,
+                "parent": variable_ctl_trn,
+            }
+            for i in range(3)
+        ])
 
+        for i in range(3):
 
-            cmds.parent(ctl_grp[0], variable_ctl_trn)
+            ctl, ctl_grp = controllers[i]
 
             cmds.addAttr(ctl, shortName="extraAttr", niceName="Extra Attributes  ———", enumName="———",attributeType="enum", keyable=True)
             cmds.setAttr(ctl+".extraAttr", channelBox=True, lock=True)
@@ -1,6 +1,7 @@
 import os
 import json
 import re
+import time
 from PySide2 import QtWidgets, QtCore, QtGui
 from shiboken2 import wrapInstance
 import maya.cmds as cmds
@@ -561,24 +562,17 @@ class GG_Toolbox(MayaQWidgetDockableMixin, QtWidgets.QDialog):
 
             limb_name = "foot" if limb_attr == "Leg Module" else limb_attr.split(" ")[0].lower() + "Leg"
 
-            modules_map = {
-                "Arm Module": guide_creation.ArmGuideCreation(side=side, twist_joints=twist_joints),
-                "Front Leg Module": guide_creation.FrontLegGuideCreation(side=side, twist_joints=twist_joints),
-                "Leg Module": guide_creation.LegGuideCreation(side=side, twist_joints=twist_joints),
-                "Back Leg Module": guide_creation.BackLegGuideCreation(side=side, twist_joints=twist_joints),
-                "Spine Module": guide_creation.SpineGuideCreation(side=side, twist_joints=twist_joints, type=type),
-                "Neck Module": guide_creation.NeckGuideCreation(side=side, twist_joints=twist_joints, type=type),
-                "Hand Module": guide_creation.HandGuideCreation(side=side, controller_number=controller_number),
-                "Variable Fk Module": guide_creation.VariableFK(sides=side, quantity=controller_number, prefix=prefix, joints=twist_joints)
-            }
+            start_time = time.perf_counter()
 
             if mirror and mirror[0] == "Foot Module":
                     a = guide_creation.FootGuideCreation(side=side, limb_name=limb_name)
                     self.guides = a.create_guides(guides_trn, buffers_trn)
+                    om.MGlobal.displayInfo(f"Added {module_name} in {(time.perf_counter() - start_time) * 1000:.1f} ms.")
                     return self.guides
 
-            if module_name in modules_map:
-                guide = modules_map[module_name]
+            guide = guide_creation.create_guide_module(module_name, side=side, twist_joints=twist_joints, type=type, controller_number=controller_number, prefix=prefix)
+
+            if guide:
                 self.guides = guide.create_guides(guides_trn, buffers_trn)
                 self.end_guides.append(self.guides)
                 if "Leg" in module_name and not mirror:
@@ -609,6 +603,8 @@ class GG_Toolbox(MayaQWidgetDockableMixin, QtWidgets.QDialog):
 
                 self.tree.setRootIsDecorated(True)
 
+                om.MGlobal.displayInfo(f"Added {module_name} in {(time.perf_counter() - start_time) * 1000:.1f} ms.")
+
                 if mirror:
                     return self.guides
 
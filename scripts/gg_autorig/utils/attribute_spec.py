@@ -0,0 +1,159 @@
+import json
+import maya.api.OpenMaya as om
+
+SEPARATOR_FIELD = "———"
+
+NUMERIC_TYPES = {
+    "double": om.MFnNumericData.kDouble,
+    "float": om.MFnNumericData.kFloat,
+    "long": om.MFnNumericData.kInt,
+    "bool": om.MFnNumericData.kBoolean,
+}
+
+def separator(name, nice_name):
+    """
+    Returns the spec of a locked enum attribute used as a title in the channel box.
+
+    Args:
+        name (str): Attribute name.
+        nice_name (str): Title shown in the channel box, the separator field is appended.
+    Returns:
+        dict: The attribute spec.
+    """
+    return {"name": name, "niceName": f"{nice_name}  {SEPARATOR_FIELD}", "type": "separator"}
+
+def numeric(name, nice_name, default=0, min_value=None, max_value=None, attribute_type="double", keyable=True):
+    """
+    Returns the spec of a numeric attribute.
+
+    Args:
+        name (str): Attribute name.
+        nice_name (str): Name shown in the channel box.
+        default (float): Default value.
+        min_value (float): Minimum value, None for no minimum.
+        max_value (float): Maximum value, None for no maximum.
+        attribute_type (str): One of NUMERIC_TYPES.
+        keyable (bool): If False the attribute is only shown in the channel box.
+    Returns:
+        dict: The attribute spec.
+    """
+    spec = {"name": name, "niceName": nice_name, "type": attribute_type, "default": default, "keyable": keyable}
+    if min_value is not None:
+        spec["min"] = min_value
+    if max_value is not None:
+        spec["max"] = max_value
+    return spec
+
+def enum(name, nice_name, fields, default=0, keyable=True):
+    """
+    Returns the spec of an enum attribute.
+
+    Args:
+        name (str): Attribute name.
+        nice_name (str): Name shown in the channel box.
+        fields (list): Enum field names.
+        default (int): Default index.
+        keyable (bool): If False the attribute is only shown in the channel box.
+    Returns:
+        dict: The attribute spec.
+    """
+    return {"name": name, "niceName": nice_name, "type": "enum", "fields": list(fields), "default": default, "keyable": keyable}
+
+def create_attribute(spec):
+    """
+    Creates the attribute object of a spec, it still has to be added to a node.
+
+    Args:
+        spec (dict): The attribute spec.
+    Returns:
+        om.MObject: The attribute.
+    """
+    attr_type = spec["type"]
+
+    if attr_type in ("separator", "enum"):
+        attr_fn = om.MFnEnumAttribute()
+        attr = attr_fn.create(spec["name"], spec["name"], spec.get("default", 0))
+        for i, field in enumerate(spec.get("fields", [SEPARATOR_FIELD])):
+            attr_fn.addField(field, i)
+    elif attr_type in NUMERIC_TYPES:
+        attr_fn = om.MFnNumericAttribute()
+        attr = attr_fn.create(spec["name"], spec["name"], NUMERIC_TYPES[attr_type], spec.get("default", 0))
+        if "min" in spec:
+            attr_fn.setMin(spec["min"])
+        if "max" in spec:
+            attr_fn.setMax(spec["max"])
+    else:
+        raise ValueError(f"Unknown attribute type '{attr_type}' for {spec['name']}.")
+
+    attr_fn.setNiceNameOverride(spec["niceName"])
+    if attr_type == "separator" or not spec.get("keyable", True):
+        attr_fn.keyable = False
+        attr_fn.channelBox = True
+    else:
+        attr_fn.keyable = True
+
+    return attr
+
+def apply_specs(node, specs):
+    """
+    Adds the attributes of a spec list to a node with a single modifier.
+
+    Args:
+        node (str): The node receiving the attributes.
+        specs (list): Attribute specs, in channel box order.
+    Returns:
+        om.MDGModifier: The modifier used.
+    """
+    return apply_layout({node: specs})
+
+def apply_layout(layout):
+    """
+    Adds the attributes of several nodes with a single modifier and locks the separators.
+    Attributes that already exist on a node are skipped.
+
+    Args:
+        layout (dict): Spec lists keyed by node name.
+    Returns:
+        om.MDGModifier: The modifier used.
+    """
+    dg_modifier = om.MDGModifier()
+    separators = []
+    sel_list = om.MSelectionList()
+    for node, specs in layout.items():
+        sel_list.clear()
+        sel_list.add(node)
+        node_fn = om.MFnDependencyNode(sel_list.getDependNode(0))
+        for spec in specs:
+            if node_fn.hasAttribute(spec["name"]):
+                continue
+            dg_modifier.addAttribute(node_fn.object(), create_attribute(spec))
+            if spec["type"] == "separator":
+                separators.append((node_fn, spec["name"]))
+    dg_modifier.doIt()
+
+    for node_fn, name in separators:
+        node_fn.findPlug(name, False).isLocked = True
+
+    return dg_modifier
+
+def dumps(layout):
+    """
+    Serializes a spec list or layout so attribute layouts can be stored and diffed.
+
+    Args:
+        layout (list or dict): Spec list or layout.
+    Returns:
+        str: Indented json with sorted keys.
+    """
+    return json.dumps(layout, indent=4, sort_keys=True, ensure_ascii=False)
+
+def loads(data):
+    """
+    Reads a spec list or layout written by dumps.
+
+    Args:
+        data (str): The json string.
+    Returns:
+        list or dict: The specs.
+    """
+    return json.loads(data)
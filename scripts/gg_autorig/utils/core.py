@@ -2,6 +2,8 @@ import os
 import maya.cmds as cmds
 from maya.api import OpenMaya as om
 
+from gg_autorig.utils import template_resolver
+
 class DataManager:
     _ctls_data = None
     _guide_data = None
@@ -9,6 +11,7 @@ class DataManager:
     @classmethod
     def set_ctls_data(cls, data):
         cls._ctls_data = data
+        template_resolver.RESOLVER.invalidate()
 
     @classmethod
     def get_ctls_data(cls):
@@ -17,6 +20,7 @@ class DataManager:
     @classmethod
     def set_guide_data(cls, data):
         cls._guide_data = data
+        template_resolver.RESOLVER.invalidate()
 
     @classmethod
     def get_guide_data(cls):
@@ -44,6 +48,7 @@ def init_template_file(ext=".guides", export=True):
     Initializes the TEMPLATE_FILE variable.
     If a path is provided, it sets TEMPLATE_FILE to that path.
     Otherwise, it uses the default template file path.
+    The lookup goes through the cached template resolver, so only the export branch touches the disk every call.
     """
 
     if ext == ".guides":
@@ -54,29 +59,7 @@ def init_template_file(ext=".guides", export=True):
     end_file_path = None
 
 
-    if not os.path.isabs(file_name):
-        folder= {".guides": "guides", ".ctls": "curves"}
-        complete_path = os.path.realpath(__file__)
-        relative_path = complete_path.split("\scripts")[0]
-        guides_dir = os.path.join(relative_path, folder[ext])
-        base_name = file_name
-        # Find all files matching the pattern
-        existing = [
-            f for f in os.listdir(guides_dir)
-            if f.startswith(base_name) and f.endswith(ext)
-        ]
-        max_num = 1
-        for f in existing:
-            try:
-                num = int(f[len(base_name):len(base_name)+2])
-                if num > max_num:
-                    max_num = num
-            except ValueError:
-                continue
-        default_template = os.path.join(guides_dir, f"{base_name}{max_num:02d}{ext}")
-    else:
-        default_template = file_name
-        base_name = os.path.splitext(file_name)[0]
+    default_template = template_resolver.RESOLVER.resolve(file_name, ext)
 
     if export:
         if os.path.exists(default_template):
@@ -109,6 +92,29 @@ def init_template_file(ext=".guides", export=True):
 
     return end_file_path
 
+PLUGIN_NAME = "ggAutorigNodes"
+
+def load_plugin(plugin_name=PLUGIN_NAME):
+    """
+    Loads the autorig custom nodes plugin if it is not loaded yet.
+
+    Args:
+        plugin_name (str): Name of the plugin file without extension.
+    Returns:
+        bool: True if the plugin is loaded.
+    """
+    if cmds.pluginInfo(plugin_name, query=True, loaded=True):
+        return True
+
+    plugin_path = os.path.join(template_resolver.get_repo_root(), "plug-ins", f"{plugin_name}.py")
+    try:
+        cmds.loadPlugin(plugin_path if os.path.exists(plugin_path) else plugin_name, quiet=True)
+    except RuntimeError:
+        om.MGlobal.displayWarning(f"Could not load the {plugin_name} plugin.")
+        return False
+
+    return cmds.pluginInfo(plugin_name, query=True, loaded=True)
+
 def square_multiyply(distance, side):
     name = distance.split(".")[0]
     name = "_".join(name.split("_")[:2])
@@ -117,9 +123,83 @@ def square_multiyply(distance, side):
     cmds.connectAttr(f"{distance}", f"{multiply}.input[1]")
     return f"{multiply}.output"
 
-def law_of_cosine(sides = [], power=[], name = "L_armModule", negate=False, acos=False):
+class CosineGraphCache:
+    """
+    Memoizes the subgraphs built by law_of_cosine keyed by their source plugs, so squares, numerators, denominators,
+    cosines, acos and negate nodes fed by the same plugs are created once and reused by every call.
+    Entries whose node was deleted are rebuilt.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self.stats = {}
+
+    def get(self, key, build):
+        """
+        Returns the cached plug of a key, building it if it is missing or its node no longer exists.
+
+        Args:
+            key (tuple): Kind of subgraph and its source plugs.
+            build (function): Creates the subgraph and returns its output plug.
+        Returns:
+            tuple: The plug and True if it was built by this call.
+        """
+        plug = self.nodes.get(key)
+        if plug and cmds.objExists(plug.split(".")[0]):
+            return plug, False
+        plug = build()
+        self.nodes[key] = plug
+        return plug, True
+
+    def count(self, module, created, legacy):
+        """
+        Adds the nodes created by a call and the nodes the call would have created without the cache.
+
+        Args:
+            module (str): Module the call belongs to.
+            created (int): Nodes created.
+            legacy (int): Nodes created without the cache.
+        """
+        stats = self.stats.setdefault(module, {"created": 0, "legacy": 0})
+        stats["created"] += created
+        stats["legacy"] += legacy
+
+    def report(self):
+        """
+        Reports the nodes saved per module.
+
+        Returns:
+            dict: created, legacy and saved counts keyed by module.
+        """
+        report = {}
+        for module, stats in self.stats.items():
+            report[module] = dict(stats, saved=stats["legacy"] - stats["created"])
+            if report[module]["saved"]:
+                om.MGlobal.displayInfo(f"Law of cosine {module}: {stats['created']} nodes created, {report[module]['saved']} saved.")
+        return report
+
+COSINE_CACHE = CosineGraphCache()
+
+def reset_cosine_cache():
+    """
+    Drops the law of cosine cache, called at the start of every build.
+    """
+    global COSINE_CACHE
+    COSINE_CACHE = CosineGraphCache()
+
+def law_of_cosine(sides = [], power=[], name = "L_armModule", negate=False, acos=False, module=None):
     """`
     Calculate the angle opposite side c using the law of cosines.
+    The nodes are shared through COSINE_CACHE, so calls on the same plugs reuse the squares, denominators and cosines.
+
+    Args:
+        sides (list): The a, b and c side plugs, the cosine is the one of the angle between a and c.
+        power (list, optional): Already squared a, b and c plugs. Without them the squares are built or taken from the
+            cache, and the reused ones are reported as saved.
+        name (str): Prefix of the created nodes.
+        negate (bool): Also return the negated cosine.
+        acos (bool): Also return the acos node.
+        module (str, optional): Module the nodes are reported under, defaults to name.
     """
     
 
@@ -135,53 +215,108 @@ def law_of_cosine(sides = [], power=[], name = "L_armModule", negate=False, acos
         b_square = None
         c_square = None
 
-    if a_square is None:
-        a_square = square_multiyply(a, "A")
-    if b_square is None:
-        b_square = square_multiyply(b, "B")
-    if c_square is None:
-        c_square = square_multiyply(c, "C")
+    cache = COSINE_CACHE
+    created = []
+
+    def cached(key, build):
+        plug, built = cache.get(key, build)
+        if built:
+            created.append(plug)
+        return plug
+
+    squares = []
+    for side, plug, square in (("A", a, a_square), ("B", b, b_square), ("C", c, c_square)):
+        if square is None:
+            square = cached(("square", plug), lambda plug=plug, side=side: square_multiyply(plug, side))
+        else:
+            cache.nodes.setdefault(("square", plug), square)
+        squares.append(square)
+    a_square, b_square, c_square = squares
 
     power_mults = [a_square, b_square, c_square]
+    # Nodes an uncached call with the same arguments creates: sum, subtract, multiply, divide and the squares not passed
+    # in power. Squares handed over through power were never built by the call, so they are not reported as saved.
+    legacy = 4 + (0 if len(power) == 3 else 3)
 
     # a2 + c2 -b2
-    sum = cmds.createNode("sum", name=f"{name}CustomSolver_SUM")
-    cmds.connectAttr(f"{a_square}", f"{sum}.input[0]")
-    cmds.connectAttr(f"{c_square}", f"{sum}.input[1]")
+    def build_sum():
+        sum = cmds.createNode("sum", name=f"{name}CustomSolver_SUM")
+        cmds.connectAttr(f"{a_square}", f"{sum}.input[0]")
+        cmds.connectAttr(f"{c_square}", f"{sum}.input[1]")
+        return f"{sum}.output"
+    sum_output = cached(("sum", frozenset((a_square, c_square))), build_sum)
 
-    subtract = cmds.createNode("subtract", name=f"{name}CosNumerator_SUB")
-    cmds.connectAttr(f"{sum}.output", f"{subtract}.input1")
-    cmds.connectAttr(f"{b_square}", f"{subtract}.input2")
+    def build_subtract():
+        subtract = cmds.createNode("subtract", name=f"{name}CosNumerator_SUB")
+        cmds.connectAttr(sum_output, f"{subtract}.input1")
+        cmds.connectAttr(f"{b_square}", f"{subtract}.input2")
+        return f"{subtract}.output"
+    subtract_output = cached(("subtract", sum_output, b_square), build_subtract)
 
     # 2ac
-    multiply = cmds.createNode("multiply", name=f"{name}CosDenominator_MULT")
-    cmds.setAttr(f"{multiply}.input[0]", 2)
-    cmds.connectAttr(f"{a}", f"{multiply}.input[1]")
-    cmds.connectAttr(f"{c}", f"{multiply}.input[2]")
+    def build_multiply():
+        multiply = cmds.createNode("multiply", name=f"{name}CosDenominator_MULT")
+        cmds.setAttr(f"{multiply}.input[0]", 2)
+        cmds.connectAttr(f"{a}", f"{multiply}.input[1]")
+        cmds.connectAttr(f"{c}", f"{multiply}.input[2]")
+        return f"{multiply}.output"
+    multiply_output = cached(("denominator", frozenset((a, c))), build_multiply)
 
     #complete formula
-    divide = cmds.createNode("divide", name=f"{name}CosValue_DIV", ss=True)
-    cmds.connectAttr(f"{subtract}.output", f"{divide}.input1")
-    cmds.connectAttr(f"{multiply}.output", f"{divide}.input2")
+    def build_divide():
+        divide = cmds.createNode("divide", name=f"{name}CosValue_DIV", ss=True)
+        cmds.connectAttr(subtract_output, f"{divide}.input1")
+        cmds.connectAttr(multiply_output, f"{divide}.input2")
+        return f"{divide}.output"
+    divide = cached(("divide", subtract_output, multiply_output), build_divide).split(".")[0]
+
+    def build_acos():
+        acos_node = cmds.createNode("acos", name=f"{name}CustomSolver_ACOS")
+        cmds.connectAttr(f"{divide}.output", f"{acos_node}.input")
+        return f"{acos_node}.output"
 
-    if acos and negate:
-        acos = cmds.createNode("acos", name=f"{name}CustomSolver_ACOS")
-        cmds.connectAttr(f"{divide}.output", f"{acos}.input")
+    def build_negate():
         negate_cos_value = cmds.createNode("negate", name=f"{name}CosineValue_NEGATE")
         cmds.connectAttr(f"{divide}.output", f"{negate_cos_value}.input")
-    
-        return divide, acos, power_mults, negate_cos_value
+        return f"{negate_cos_value}.output"
 
+    result = [divide]
     if acos:
-        acos = cmds.createNode("acos", name=f"{name}CustomSolver_ACOS")
-        cmds.connectAttr(f"{divide}.output", f"{acos}.input")
+        result.append(cached(("acos", divide), build_acos).split(".")[0])
+        legacy += 1
+    result.append(power_mults)
+    if negate:
+        result.append(cached(("negate", divide), build_negate).split(".")[0])
+        legacy += 1
 
-        return divide, acos, power_mults
+    cache.count(module or name, len(created), legacy)
 
-    if negate:
-        negate_cos_value = cmds.createNode("negate", name=f"{name}CosineValue_NEGATE")
-        cmds.connectAttr(f"{divide}.output", f"{negate_cos_value}.input")
+    return tuple(result)
+
+def volume_preservation_node(name, control, settings, stretch_factor, percentages, joints):
+    """
+    Builds the volume preservation of a chain with a single ggVolumePreservation node instead of the remapValue network.
+
+    Args:
+        name (str): Name of the node.
+        control (str): Controller holding the falloff, maxPos and volumePreservation attributes.
+        settings (str): Settings node holding the stretch length and effect attributes.
+        stretch_factor (str): Plug with the current length of the chain divided by its rest length.
+        percentages (list): Squash percentage plug of every joint.
+        joints (list): Squash joints, their scaleX and scaleZ are driven.
+    Returns:
+        str: The created node.
+    """
+    node = cmds.createNode("ggVolumePreservation", name=name, ss=True)
+    cmds.connectAttr(stretch_factor, f"{node}.stretchFactor")
+    for attr in ["falloff", "maxPos", "volumePreservation"]:
+        cmds.connectAttr(f"{control}.{attr}", f"{node}.{attr}")
+    for attr in ["maxStretchLength", "minStretchLength", "maxStretchEffect", "minStretchEffect"]:
+        cmds.connectAttr(f"{settings}.{attr}", f"{node}.{attr}")
 
-        return divide, power_mults, negate_cos_value
+    for i, (percentage, joint) in enumerate(zip(percentages, joints)):
+        cmds.connectAttr(percentage, f"{node}.percentage[{i}]")
+        cmds.connectAttr(f"{node}.outputScale[{i}]", f"{joint}.scaleX")
+        cmds.connectAttr(f"{node}.outputScale[{i}]", f"{joint}.scaleZ")
 
-    return divide, power_mults
\ No newline at end of file
+    return node
@@ -2,13 +2,147 @@ import maya.api.OpenMaya as om
 import maya.cmds as cmds
 import json
 import os
+import hashlib
 
 from gg_autorig.utils import core
+from gg_autorig.utils import attribute_spec
 from importlib import reload
 reload(core)
 
 TEMPLATE_FILE = None
 
+# Parsed .ctls templates keyed by path, invalidated when the file modification time changes.
+TEMPLATE_CACHE = {}
+
+# Shape instancing, when enabled identical curve geometries are created once and instanced under every controller using them.
+SHAPE_INSTANCING = False
+SHAPE_CACHE = {}
+SHAPE_STATS = {"controllers": 0, "shapes": 0, "hashes": set()}
+CIRCLE_SHAPE_KEY = "defaultCircle"
+
+# Keyword arguments of controller_creator, used to fill the specs of controller_creator_batch.
+CONTROLLER_DEFAULTS = {
+    "suffixes": ["GRP", "ANM"],
+    "mirror": False,
+    "parent": None,
+    "match": None,
+    "lock": ["scaleX", "scaleY", "scaleZ", "visibility"],
+    "ro": True,
+    "prefix": "CTL",
+}
+ROTATE_ORDERS = ["xyz", "yzx", "zxy", "xzy", "yxz", "zyx"]
+
+def load_template(path):
+    """
+    Returns the parsed controllers template, reading the file only when it changed since the last call.
+
+    Args:
+        path (str): Path of the .ctls template file.
+    Returns:
+        dict: The controllers data of the template.
+    """
+    mtime = os.path.getmtime(path)
+    cached = TEMPLATE_CACHE.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "r") as f:
+        ctl_data = json.load(f)
+
+    by_name = {v["transform"].get("name"): v for v in ctl_data.values() if "transform" in v}
+    TEMPLATE_CACHE[path] = (mtime, ctl_data, by_name)
+
+    return ctl_data
+
+def set_shape_instancing(enabled=True):
+    """
+    Enables or disables the controller shape instancing and clears the shape cache.
+
+    Args:
+        enabled (bool): True to share identical curve geometries between controllers.
+    """
+    global SHAPE_INSTANCING
+    SHAPE_INSTANCING = enabled
+    reset_shape_cache()
+
+def reset_shape_cache():
+    """
+    Clears the shared shape cache and the instancing stats, called at the start of every build.
+    """
+    SHAPE_CACHE.clear()
+    SHAPE_STATS["controllers"] = 0
+    SHAPE_STATS["shapes"] = 0
+    SHAPE_STATS["hashes"].clear()
+
+def shape_hash(shape_data):
+    """
+    Returns a content hash of a curve shape, including the display attributes so shapes with different colors are never shared.
+
+    Args:
+        shape_data (dict): Shape data as stored in the .ctls template.
+    Returns:
+        str: The hash of the shape.
+    """
+    curve_info = shape_data["curve"]
+    key = {
+        "cvs": [[round(value, 5) for value in pt] for pt in curve_info["cvs"]],
+        "knots": [round(value, 5) for value in curve_info["knots"]],
+        "degree": curve_info["degree"],
+        "form": curve_info["form"],
+        "overrideEnabled": shape_data.get("overrideEnabled"),
+        "overrideColor": shape_data.get("overrideColor"),
+        "alwaysDrawOnTop": shape_data.get("alwaysDrawOnTop", False),
+        "lineWidth": shape_data.get("lineWidth"),
+    }
+    return hashlib.sha1(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+
+def instance_cached_shape(key, transform_obj):
+    """
+    Instances a cached shape under the given transform.
+
+    Args:
+        key (str): Hash of the shape in the shape cache.
+        transform_obj (om.MObject): Transform receiving the instanced shape.
+    Returns:
+        bool: True if the shape was instanced, False if there is no valid cached shape.
+    """
+    handle = SHAPE_CACHE.get(key)
+    if not handle or not handle.isValid():
+        SHAPE_CACHE.pop(key, None)
+        return False
+
+    # The handle survives renames and reparenting of the source controller, the dag path is resolved at instancing time.
+    source_shape = om.MDagPath.getAPathTo(handle.object()).fullPathName()
+    cmds.parent(source_shape, om.MFnDagNode(transform_obj).fullPathName(), shape=True, addObject=True)
+    return True
+
+def cache_shape(key, shape):
+    """
+    Stores a shape in the shared shape cache.
+
+    Args:
+        key (str): Hash of the shape.
+        shape (om.MObject or str): The shape node.
+    """
+    if isinstance(shape, str):
+        shape = om.MSelectionList().add(shape).getDependNode(0)
+    SHAPE_CACHE[key] = om.MObjectHandle(shape)
+
+def shape_cache_report():
+    """
+    Reports how many unique curve geometries exist versus controllers built since the last reset.
+
+    Returns:
+        dict: The number of controllers, shapes and unique geometries.
+    """
+    report = {
+        "controllers": SHAPE_STATS["controllers"],
+        "shapes": SHAPE_STATS["shapes"],
+        "unique": len(SHAPE_STATS["hashes"]),
+    }
+    om.MGlobal.displayInfo(f"Controller shapes: {report['unique']} unique geometries for {report['shapes']} shapes on {report['controllers']} controllers (instancing {'on' if SHAPE_INSTANCING else 'off'}).")
+    return report
+
 def lock_attr(ctl, attrs = ["scaleX", "scaleY", "scaleZ", "visibility"], ro=True):
     """
     Lock specified attributes of a controller, added rotate order attribute if ro is True.
@@ -141,6 +275,90 @@ def get_all_ctl_curves_data(path = "",prefix="CTL"):
     print(f"Controller curves data saved to {TEMPLATE_FILE}")
 
 
+def build_template_shapes(data, transform_obj):
+    """
+    Sets the display overrides of a controller transform and builds its curve shapes from the template data.
+
+    Args:
+        data (dict): The controller entry of the .ctls template.
+        transform_obj (om.MObject): The controller transform.
+    Returns:
+        list: The created shapes as om.MObject, instanced shapes are not included.
+    """
+    transform_info = data["transform"]
+    shape_data_list = data["shapes"]
+
+    if transform_info["overrideEnabled"]:
+        fn_dep = om.MFnDependencyNode(transform_obj)
+        fn_dep.findPlug('overrideEnabled', False).setBool(True)
+        fn_dep.findPlug('overrideColor', False).setInt(transform_info["overrideColor"])
+
+    created_shapes = []
+    SHAPE_STATS["controllers"] += 1
+
+    for shape_data in shape_data_list:
+        SHAPE_STATS["shapes"] += 1
+        key = shape_hash(shape_data)
+        SHAPE_STATS["hashes"].add(key)
+        if SHAPE_INSTANCING:
+            if instance_cached_shape(key, transform_obj):
+                continue
+
+        curve_info = shape_data["curve"]
+        cvs = curve_info["cvs"]
+        degree = curve_info["degree"]
+        knots = curve_info["knots"]
+        form = curve_info["form"]
+
+        form_flags = {
+            "open": om.MFnNurbsCurve.kOpen,
+            "closed": om.MFnNurbsCurve.kClosed,
+            "periodic": om.MFnNurbsCurve.kPeriodic
+        }
+        form_flag = form_flags.get(form, om.MFnNurbsCurve.kOpen)
+
+        points = om.MPointArray()
+        for pt in cvs:
+            points.append(om.MPoint(pt[0], pt[1], pt[2]))
+
+        curve_fn = om.MFnNurbsCurve()
+        shape_obj = curve_fn.create(
+            points,
+            knots,
+            degree,
+            form_flag,
+            False,    
+            True,     
+            transform_obj
+        )
+
+        shape_fn = om.MFnDagNode(shape_obj)
+        shape_fn.setName(shape_data["name"])
+
+        if shape_data["overrideEnabled"]:
+            fn_dep = om.MFnDependencyNode(shape_obj)
+            fn_dep.findPlug('overrideEnabled', False).setBool(True)
+            fn_dep.findPlug('overrideColor', False).setInt(shape_data["overrideColor"])
+
+        if shape_data.get("alwaysDrawOnTop", False):
+            fn_dep = om.MFnDependencyNode(shape_obj)
+            fn_dep.findPlug('alwaysDrawOnTop', False).setBool(True)
+
+        line_width = shape_data.get("lineWidth", None)
+        if line_width is not None:
+            if cmds.attributeQuery("lineWidth", node=shape_fn.name(), exists=True):
+                try:
+                    cmds.setAttr(shape_fn.name() + ".lineWidth", line_width)
+                except:
+                    om.MGlobal.displayWarning(f"Could not set lineWidth for {shape_fn.name()}")
+
+        created_shapes.append(shape_obj)
+
+        if SHAPE_INSTANCING:
+            cache_shape(key, shape_obj)
+
+    return created_shapes
+
 def build_curves_from_template(target_transform_name=None, path=None):
     """
     Builds controller curves from a predefined template JSON file.
@@ -156,19 +374,18 @@ def build_curves_from_template(target_transform_name=None, path=None):
         om.MGlobal.displayError("Template file does not exist.")
         return
 
-    with open(path, "r") as f:
-        ctl_data = json.load(f)
+    ctl_data = load_template(path)
 
     if target_transform_name:
-        ctl_data = {k: v for k, v in ctl_data.items() if "transform" in v and v["transform"].get("name") == target_transform_name}
-        if not ctl_data:
+        data = TEMPLATE_CACHE[path][2].get(target_transform_name)
+        if not data:
             return
+        ctl_data = {target_transform_name: data}
 
     created_transforms = []
 
     for transform_path, data in ctl_data.items():
         transform_info = data["transform"]
-        shape_data_list = data["shapes"]
 
         dag_modifier = om.MDagModifier()
         transform_obj = dag_modifier.createNode("transform")
@@ -178,67 +395,34 @@ def build_curves_from_template(target_transform_name=None, path=None):
         final_name = transform_fn.setName(transform_info["name"])
         created_transforms.append(final_name)
 
-        if transform_info["overrideEnabled"]:
-            fn_dep = om.MFnDependencyNode(transform_obj)
-            fn_dep.findPlug('overrideEnabled', False).setBool(True)
-            fn_dep.findPlug('overrideColor', False).setInt(transform_info["overrideColor"])
-
-        created_shapes = []
-
-        for shape_data in shape_data_list:
-            curve_info = shape_data["curve"]
-            cvs = curve_info["cvs"]
-            degree = curve_info["degree"]
-            knots = curve_info["knots"]
-            form = curve_info["form"]
+        build_template_shapes(data, transform_obj)
 
-            form_flags = {
-                "open": om.MFnNurbsCurve.kOpen,
-                "closed": om.MFnNurbsCurve.kClosed,
-                "periodic": om.MFnNurbsCurve.kPeriodic
-            }
-            form_flag = form_flags.get(form, om.MFnNurbsCurve.kOpen)
-
-            points = om.MPointArray()
-            for pt in cvs:
-                points.append(om.MPoint(pt[0], pt[1], pt[2]))
-
-            curve_fn = om.MFnNurbsCurve()
-            shape_obj = curve_fn.create(
-                points,
-                knots,
-                degree,
-                form_flag,
-                False,    
-                True,     
-                transform_obj
-            )
-
-            shape_fn = om.MFnDagNode(shape_obj)
-            shape_fn.setName(shape_data["name"])
-
-            if shape_data["overrideEnabled"]:
-                fn_dep = om.MFnDependencyNode(shape_obj)
-                fn_dep.findPlug('overrideEnabled', False).setBool(True)
-                fn_dep.findPlug('overrideColor', False).setInt(shape_data["overrideColor"])
-
-            if shape_data.get("alwaysDrawOnTop", False):
-                fn_dep = om.MFnDependencyNode(shape_obj)
-                fn_dep.findPlug('alwaysDrawOnTop', False).setBool(True)
-
-            line_width = shape_data.get("lineWidth", None)
-            if line_width is not None:
-                if cmds.attributeQuery("lineWidth", node=shape_fn.name(), exists=True):
-                    try:
-                        cmds.setAttr(shape_fn.name() + ".lineWidth", line_width)
-                    except:
-                        om.MGlobal.displayWarning(f"Could not set lineWidth for {shape_fn.name()}")
-
-            created_shapes.append(shape_obj)
+    return created_transforms
 
 
-    return created_transforms
+def default_circle(ctl_name):
+    """
+    Creates the circle used by the controllers missing from the template, instanced when shape instancing is enabled.
 
+    Args:
+        ctl_name (str): Name of the controller.
+    Returns:
+        str: The controller transform.
+    """
+    SHAPE_STATS["controllers"] += 1
+    SHAPE_STATS["shapes"] += 1
+    SHAPE_STATS["hashes"].add(CIRCLE_SHAPE_KEY)
+    if SHAPE_INSTANCING and CIRCLE_SHAPE_KEY in SHAPE_CACHE:
+        ctl = cmds.createNode("transform", name=ctl_name, ss=True)
+        ctl_obj = om.MSelectionList().add(ctl).getDependNode(0)
+        if instance_cached_shape(CIRCLE_SHAPE_KEY, ctl_obj):
+            return ctl
+        cmds.delete(ctl)
+
+    ctl = cmds.circle(name=ctl_name, ch=False)[0]
+    if SHAPE_INSTANCING:
+        cache_shape(CIRCLE_SHAPE_KEY, cmds.listRelatives(ctl, shapes=True, fullPath=True)[0])
+    return ctl
 
 def controller_creator(name, suffixes=["GRP", "ANM"], mirror=False, parent=None, match=None, lock=["scaleX", "scaleY", "scaleZ", "visibility"], ro=True, prefix="CTL"):
     """
@@ -284,7 +468,7 @@ def controller_creator(name, suffixes=["GRP", "ANM"], mirror=False, parent=None,
             #     cmds.setAttr(ctl + ".overrideColor", 14)
             #     ctl = [ctl]
             # else:
-            ctl = cmds.circle(name=f"{name}_{prefix}", ch=False)
+            ctl = [default_circle(f"{name}_{prefix}")]
         else:
             ctl = [ctl[0]]
 
@@ -316,6 +500,148 @@ def controller_creator(name, suffixes=["GRP", "ANM"], mirror=False, parent=None,
 
 
 
+def controller_creator_batch(specs):
+    """
+    Creates several controllers at once, with the names, hierarchy and locks controller_creator gives them.
+    Every name is checked with a single scene query, the group stacks and controller transforms are created and parented
+    with a single modifier and the locks and rotate order attributes are queued on a single attribute modifier.
+
+    Args:
+        specs (list): controller_creator keyword arguments of every controller, name is required. The parent can be a
+            controller or group of the batch.
+    Returns:
+        list: What controller_creator returns for every spec, None for the specs with a name that already exists.
+    """
+    specs = [dict(CONTROLLER_DEFAULTS, **spec) for spec in specs]
+    if not specs:
+        return []
+
+    TEMPLATE_FILE = core.init_template_file(ext=".ctls", export=False)
+    template = {}
+    if os.path.exists(TEMPLATE_FILE):
+        load_template(TEMPLATE_FILE)
+        template = TEMPLATE_CACHE[TEMPLATE_FILE][2]
+
+    stacks = [[f"{spec['name']}_{suffix}" for suffix in spec["suffixes"] or []] + [f"{spec['name']}_{spec['prefix']}"] for spec in specs]
+    existing = {node.split("|")[-1] for node in cmds.ls([name for stack in stacks for name in stack]) or []}
+
+    claimed = set()
+    for i, stack in enumerate(stacks):
+        clash = next((name for name in stack if name in existing or name in claimed), None)
+        if clash:
+            om.MGlobal.displayWarning(f"{clash} already exists.")
+            stacks[i] = None
+        else:
+            claimed.update(stack)
+
+    sel_list = om.MSelectionList()
+
+    def get_dag_path(node):
+        sel_list.clear()
+        try:
+            sel_list.add(node)
+        except RuntimeError:
+            return None
+        return sel_list.getDagPath(0)
+
+    # Controllers missing from the template get the default circle before the modifier runs.
+    dag_modifier = om.MDagModifier()
+    created = []
+    for stack in stacks:
+        if stack is None:
+            created.append(None)
+            continue
+
+        grp_objs = []
+        for grp_name in stack[:-1]:
+            grp_obj = dag_modifier.createNode("transform", grp_objs[-1] if grp_objs else om.MObject.kNullObj)
+            dag_modifier.renameNode(grp_obj, grp_name)
+            grp_objs.append(grp_obj)
+
+        if stack[-1] in template:
+            ctl_obj = dag_modifier.createNode("transform", grp_objs[-1] if grp_objs else om.MObject.kNullObj)
+            dag_modifier.renameNode(ctl_obj, stack[-1])
+        else:
+            ctl_obj = get_dag_path(default_circle(stack[-1])).node()
+            if grp_objs:
+                dag_modifier.reparentNode(ctl_obj, grp_objs[-1])
+
+        created.append((grp_objs, ctl_obj))
+    dag_modifier.doIt()
+
+    for stack, nodes in zip(stacks, created):
+        if nodes and stack[-1] in template:
+            build_template_shapes(template[stack[-1]], nodes[1])
+
+    # Groups are built at the origin and keep their world position when parented, like cmds.parent does.
+    parent_modifier = om.MDagModifier()
+    placements = []
+    for spec, nodes in zip(specs, created):
+        if nodes is None:
+            continue
+        grp_objs, ctl_obj = nodes
+        top_obj = grp_objs[0] if grp_objs else ctl_obj
+
+        parent_path = get_dag_path(spec["parent"]) if spec["parent"] else None
+        if parent_path is not None:
+            parent_modifier.reparentNode(top_obj, parent_path.node())
+
+        match_path = get_dag_path(spec["match"]) if spec["match"] else None
+        if parent_path is not None or match_path is not None:
+            placements.append((top_obj, ctl_obj, parent_path, match_path))
+    parent_modifier.doIt()
+
+    for top_obj, ctl_obj, parent_path, match_path in placements:
+        ctl_matrix = om.MMatrix()
+        if match_path is not None:
+            match_matrix = om.MTransformationMatrix(match_path.inclusiveMatrix())
+            transformation = om.MTransformationMatrix()
+            transformation.setTranslation(match_matrix.translation(om.MSpace.kWorld), om.MSpace.kWorld)
+            transformation.setRotation(match_matrix.rotation())
+            ctl_matrix = transformation.asMatrix()
+
+        parent_inverse = parent_path.inclusiveMatrixInverse() if parent_path is not None else om.MMatrix()
+        if top_obj == ctl_obj:
+            om.MFnTransform(ctl_obj).setTransformation(om.MTransformationMatrix(ctl_matrix * parent_inverse))
+        else:
+            om.MFnTransform(top_obj).setTransformation(om.MTransformationMatrix(parent_inverse))
+            om.MFnTransform(ctl_obj).setTransformation(om.MTransformationMatrix(ctl_matrix))
+
+    results = []
+    attr_modifier = om.MDGModifier()
+    rotate_orders = []
+    for spec, nodes in zip(specs, created):
+        if nodes is None:
+            results.append(None)
+            continue
+        grp_objs, ctl_obj = nodes
+        grp_names = [om.MFnDagNode(grp_obj).name() for grp_obj in grp_objs]
+        ctl_name = om.MFnDagNode(ctl_obj).name()
+
+        if spec["mirror"]:
+            force_behavior_mirror(grp_names[0])
+
+        ctl_fn = om.MFnDependencyNode(ctl_obj)
+        if spec["lock"]:
+            # Queued on the modifier so the locks are undone with the attributes it adds.
+            ctl_path = om.MFnDagNode(ctl_obj).fullPathName()
+            attr_modifier.commandToExecute("; ".join(
+                f"setAttr -keyable false -channelBox false -lock true {ctl_path}.{attr}" for attr in spec["lock"]
+            ))
+
+        if spec["ro"]:
+            attr_modifier.addAttribute(ctl_obj, attribute_spec.create_attribute(attribute_spec.enum("rotate_order", "Rotate Order", ROTATE_ORDERS)))
+            rotate_orders.append(ctl_fn)
+
+        results.append((ctl_name, grp_names) if grp_names else ctl_name)
+    attr_modifier.doIt()
+
+    for ctl_fn in rotate_orders:
+        attr_modifier.connect(ctl_fn.findPlug("rotate_order", False), ctl_fn.findPlug("rotateOrder", False))
+    attr_modifier.doIt()
+
+    return results
+
 def force_behavior_mirror(node):
 
     """Mirrors the transform of a given node along the X-axis.
@@ -347,79 +673,142 @@ def force_behavior_mirror(node):
     cmds.parent(node, mirror_transform)
 
 
-def mirror_shapes():
-    left_side = 'L_'
-    right_side = 'R_'
-    suffix = '_CTL'
-
-    color_map = {
-        6: 13,
-        18: 4
-    }
-
-    all_ctls = cmds.ls(type='transform')
-    source_ctls = []
-    for tr in all_ctls:
-        if suffix in tr:
-            shapes = cmds.listRelatives(tr, shapes=True) or []
-            if any(cmds.nodeType(s) == 'nurbsCurve' for s in shapes):
-                source_ctls.append(tr)
+def get_curve_shapes(transform_obj):
+    """
+    Returns the dag paths of the nurbsCurve shapes under a transform.
 
-    for src in source_ctls:
-        if not src.startswith(left_side):
-            continue
+    Args:
+        transform_obj (om.MObject): The transform node.
+    Returns:
+        list: A list of om.MDagPath, one per curve shape.
+    """
+    transform_path = om.MDagPath.getAPathTo(transform_obj)
+    shapes = []
+    for i in range(transform_path.childCount()):
+        child = transform_path.child(i)
+        if child.hasFn(om.MFn.kNurbsCurve):
+            shape_path = om.MDagPath(transform_path)
+            shape_path.push(child)
+            shapes.append(shape_path)
+    return shapes
+
+def copy_override(src_fn, tgt_fn, color_map, display_type=False):
+    """
+    Copies the drawing override plugs between two nodes, remapping the colour through the color map.
 
-        tgt = src.replace(left_side, right_side, 1)
-        src_shapes = cmds.listRelatives(src, shapes=True, fullPath=True) or []
+    Args:
+        src_fn (om.MFnDependencyNode): Source node.
+        tgt_fn (om.MFnDependencyNode): Target node.
+        color_map (dict): Source to target colour indices.
+        display_type (bool): If True the overrideDisplayType is copied too.
+    """
+    override = src_fn.findPlug("overrideEnabled", False).asBool()
+    tgt_fn.findPlug("overrideEnabled", False).setBool(override)
+    if not override:
+        return
 
-        if not cmds.objExists(tgt):
-            cmds.warning(f"No matching right-side transform for {src}, expected {tgt}")
-            continue
+    if display_type:
+        tgt_fn.findPlug("overrideDisplayType", False).setInt(src_fn.findPlug("overrideDisplayType", False).asInt())
 
-        trans_override = cmds.getAttr(f'{src}.overrideEnabled')
-        cmds.setAttr(f'{tgt}.overrideEnabled', trans_override)
+    src_col = src_fn.findPlug("overrideColor", False).asInt()
+    tgt_fn.findPlug("overrideColor", False).setInt(color_map.get(src_col, src_col))
 
-        if trans_override:
-            src_col = cmds.getAttr(f'{src}.overrideColor')
-            tgt_col = color_map.get(src_col, src_col)
-            cmds.setAttr(f'{tgt}.overrideColor', tgt_col)
+def mirror_shapes(left_side="L_", right_side="R_", suffix="_CTL", color_map=None):
+    """
+    Mirrors the curve shapes of every left controller onto its right counterpart along the X axis.
+    Controllers are found with a single pass over the nurbsCurve nodes and the CVs are transferred in bulk per shape.
+    When the target topology matches the CVs are written in place, otherwise the target shapes are rebuilt.
 
-        tgt_shapes = cmds.listRelatives(tgt, shapes=True, fullPath=True) or []
-        for s in tgt_shapes:
-            cmds.delete(s)
+    Args:
+        left_side (str): Side token of the source controllers.
+        right_side (str): Side token of the target controllers.
+        suffix (str): Suffix of the controllers.
+        color_map (dict, optional): Source to target override colour indices. Defaults to {6: 13, 18: 4}.
+    Returns:
+        dict: The number of mirrored and skipped controllers.
+    """
+    if color_map is None:
+        color_map = {
+            6: 13,
+            18: 4
+        }
 
-        for i, src_shape in enumerate(src_shapes):
-            dup_tr = cmds.duplicate(src, name=src + '_dup')[0]
-            dup_shapes = cmds.listRelatives(dup_tr, shapes=True, fullPath=True)
-            dup_shape = dup_shapes[i] if i < len(dup_shapes) else dup_shapes[0]
+    source_ctls = {}
+    curve_iter = om.MItDependencyNodes(om.MFn.kNurbsCurve)
+    while not curve_iter.isDone():
+        shape_obj = curve_iter.thisNode()
+        curve_iter.next()
 
-            new_shape = cmds.parent(dup_shape, tgt, shape=True, relative=True)[0]
-            shape_name = f'{tgt}Shape{i+1:02d}'
-            new_shape = cmds.rename(new_shape, shape_name)
+        transform_obj = om.MFnDagNode(shape_obj).parent(0)
+        transform_name = om.MFnDependencyNode(transform_obj).name()
+        if transform_name.startswith(left_side) and suffix in transform_name:
+            source_ctls[transform_name] = transform_obj
 
-            cmds.delete(dup_tr)
+    mirrored = 0
+    skipped = []
+    sel_list = om.MSelectionList()
 
-            num_cvs = cmds.getAttr(f'{src_shape}.spans') + cmds.getAttr(f'{src_shape}.degree')
-            for pt_idx in range(num_cvs + 1):
-                pt = cmds.xform(f'{src_shape}.controlPoints[{pt_idx}]', q=True, t=True, ws=True)
-                cmds.xform(f'{new_shape}.controlPoints[{pt_idx}]', t=(-pt[0], pt[1], pt[2]), ws=True)
+    for src, src_obj in source_ctls.items():
+        tgt = src.replace(left_side, right_side, 1)
 
-            if cmds.attributeQuery('lineWidth', node=src_shape, exists=True):
-                line_width = cmds.getAttr(f'{src_shape}.lineWidth')
-                cmds.setAttr(f'{new_shape}.lineWidth', line_width)
+        sel_list.clear()
+        try:
+            sel_list.add(tgt)
+        except RuntimeError:
+            om.MGlobal.displayWarning(f"No matching right-side transform for {src}, expected {tgt}")
+            skipped.append(src)
+            continue
+        tgt_obj = sel_list.getDependNode(0)
+
+        copy_override(om.MFnDependencyNode(src_obj), om.MFnDependencyNode(tgt_obj), color_map)
+
+        src_shapes = get_curve_shapes(src_obj)
+        tgt_shapes = get_curve_shapes(tgt_obj)
+
+        src_fns = [om.MFnNurbsCurve(shape) for shape in src_shapes]
+        tgt_fns = [om.MFnNurbsCurve(shape) for shape in tgt_shapes]
+
+        same_topology = len(src_fns) == len(tgt_fns) and all(
+            src_fn.numCVs == tgt_fn.numCVs and src_fn.degree == tgt_fn.degree and src_fn.form == tgt_fn.form and not tgt_shape.isInstanced()
+            for src_fn, tgt_fn, tgt_shape in zip(src_fns, tgt_fns, tgt_shapes)
+        )
+
+        if not same_topology:
+            dag_modifier = om.MDagModifier()
+            for tgt_shape in tgt_shapes:
+                if tgt_shape.isInstanced():
+                    # Only drop this instance, the shared shape is still used by other controllers.
+                    cmds.parent(tgt_shape.fullPathName(), removeObject=True, shape=True)
+                    continue
+                dag_modifier.deleteNode(tgt_shape.node())
+            dag_modifier.doIt()
+
+            tgt_matrix_inverse = om.MDagPath.getAPathTo(tgt_obj).inclusiveMatrixInverse()
+            tgt_fns = []
+            for i, src_fn in enumerate(src_fns):
+                points = om.MPointArray([om.MPoint(-pt.x, pt.y, pt.z) * tgt_matrix_inverse for pt in src_fn.cvPositions(om.MSpace.kWorld)])
+                new_fn = om.MFnNurbsCurve()
+                new_fn.create(points, src_fn.knots(), src_fn.degree, src_fn.form, False, True, tgt_obj)
+                new_fn.setName(f"{tgt}Shape{i+1:02d}")
+                tgt_fns.append(om.MFnNurbsCurve(om.MDagPath.getAPathTo(new_fn.object())))
+        else:
+            for src_fn, tgt_fn in zip(src_fns, tgt_fns):
+                points = om.MPointArray([om.MPoint(-pt.x, pt.y, pt.z) for pt in src_fn.cvPositions(om.MSpace.kWorld)])
+                tgt_fn.setCVPositions(points, om.MSpace.kWorld)
+                tgt_fn.updateCurve()
 
-            shape_override = cmds.getAttr(f'{src_shape}.overrideEnabled')
-            cmds.setAttr(f'{new_shape}.overrideEnabled', shape_override)
+        for src_fn, tgt_fn in zip(src_fns, tgt_fns):
+            src_dep = om.MFnDependencyNode(src_fn.object())
+            tgt_dep = om.MFnDependencyNode(tgt_fn.object())
+            if src_dep.hasAttribute("lineWidth") and tgt_dep.hasAttribute("lineWidth"):
+                tgt_dep.findPlug("lineWidth", False).setFloat(src_dep.findPlug("lineWidth", False).asFloat())
+            copy_override(src_dep, tgt_dep, color_map, display_type=True)
 
-            if shape_override:
-                draw_type = cmds.getAttr(f'{src_shape}.overrideDisplayType')
-                cmds.setAttr(f'{new_shape}.overrideDisplayType', draw_type)
+        mirrored += 1
 
-                src_col = cmds.getAttr(f'{src_shape}.overrideColor')
-                tgt_col = color_map.get(src_col, src_col)
-                cmds.setAttr(f'{new_shape}.overrideColor', tgt_col)
+    om.MGlobal.displayInfo(f"Mirrored {mirrored} controllers from {left_side} to {right_side}, skipped {len(skipped)}.")
 
-        print(f"Mirrored {len(src_shapes)} shapes from {src} → {tgt}")
+    return {"mirrored": mirrored, "skipped": len(skipped)}
 
 
 def text_curve(ctl_name):
@@ -1,6 +1,8 @@
 import json
 import os
 
+from gg_autorig.utils import template_resolver
+
 class DataExport:
     """
     Class to handle data export and import for Maya rigging modules.
@@ -14,8 +16,7 @@ class DataExport:
             self: Instance of the DataExport class.
         """ 
 
-        complete_path = os.path.realpath(__file__)
-        self.relative_path = complete_path.split("\\scripts")[0]
+        self.relative_path = template_resolver.get_repo_root(__file__)
         self.build_path = os.path.join(self.relative_path, "build", "build_cache.cache")
 
     def new_build(self):
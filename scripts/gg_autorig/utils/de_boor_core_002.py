@@ -1,112 +1,57 @@
 import maya.cmds as cmds
 from maya.api import OpenMaya as om
 
-OPEN = 'open'
-PERIODIC = 'periodic'
-AXIS_VECTOR = {'x': (1, 0, 0), '-x': (-1, 0, 0), 'y': (0, 1, 0), '-y': (0, -1, 0), 'z': (0, 0, 1), '-z': (0, 0, -1)}
-KNOT_TO_FORM_INDEX = {OPEN: om.MFnNurbsCurve.kOpen, PERIODIC: om.MFnNurbsCurve.kPeriodic}
-
-def get_open_uniform_kv(n, d):
-    """
-    Get open uniform knot vector
-
-    Attributes:
-        n (int): the number of control vertices
-        d (int): degree of outputs
-
-    Returns:
-        list: open uniform knot vector
-    """
-
-    return [0] * (d + 1) + [(i - d) / (n - d) for i in range(d + 1, n)] + [1] * (d + 1)
-
-
-def get_periodic_uniform_kv(n, d):
-    """
-    Get periodic uniform knot vector.  Append d values to the start and end
-
-    Returns:
-        list: periodic uniform knot vector with d additional values at the start and end
-    """
-
-    i = 1.0 / (n + d)
-    return  [-i * a for a in range(d, 0, -1)] + [i * a for a in range(n + d + 1)] + [i * a + 1 for a in range(1, d + 1)]
-
-
-def knot_vector(kv_type, cvs, d):
-    """
-    Convenience function for creating knot vectors and editing cv/joint/controls/etc lists
-
-    Attributes:
-        kv_type (str): knot vector type to be created
-        cvs (list): list of objects to be associated with the knot vector
-        d (int): degree of outputs
-
-    Returns:
-        tuple: knot vector and (modified) cvs list
-    """
-
-    cvs_copy = cvs[:]
-
-    if kv_type == 'open':
-
-        kv = get_open_uniform_kv(len(cvs), d)
-
-    else:
-
-        kv = get_periodic_uniform_kv(len(cvs), d)
-
-        for i in range(d):
-            cvs_copy.insert(0, cvs[len(cvs) - i - 1])
-            cvs_copy.append(cvs[i])
-
-    return kv, cvs_copy
-
-
-def de_boor(n, d, t, kv, tol=0.000001):
-    """
-    Attributes:
-        n (integer): number of control vertices
-        d (integer): degree of the resulting curve
-        t (float): parametric value along the curve that we use to query the value
-        kv (list or tuple): represents the knot vector which is used to calculate the basis function weights
-
-    Returns:
-        list: contains float values between 0 and 1
-    """
-
-    if t + tol > 1:
-        return [0.0 if i != n - 1 else 1.0 for i in range(n)]
-
-    weights = [1.0 if kv[i] <= t < kv[i + 1] else 0.0 for i in range(n + d)]
-
-    basis_width = n + d - 1
-
-    for degree in range(1, d + 1):
+from gg_autorig.utils.node_graph import NodeGraph
+from gg_autorig.utils.de_boor_math import (OPEN, PERIODIC, get_open_uniform_kv, get_periodic_uniform_kv, knot_vector,
+                                           de_boor, curve_point, polyline_length, arc_length_table, params_from_lengths,
+                                           param_from_length, uniform_length_params, get_consolidated_wts, basis_table,
+                                           extend_past_end)
 
-        for i in range(basis_width):
-
-            if weights[i] == 0 and weights[i + 1] == 0:
-                continue
-
-            a_denom = kv[i + degree] - kv[i]
-            b_denom = kv[i + degree + 1] - kv[i + 1]
-            a = (t - kv[i]) * weights[i] / a_denom if a_denom != 0 else 0.0
-            b = (kv[i + degree + 1] - t) * weights[i + 1] / b_denom if b_denom != 0 else 0.0
-
-            weights[i] = a + b
-
-        basis_width -= 1
+AXIS_VECTOR = {'x': (1, 0, 0), '-x': (-1, 0, 0), 'y': (0, 1, 0), '-y': (0, -1, 0), 'z': (0, 0, 1), '-z': (0, 0, -1)}
 
-    return weights[:n]
+# Stretch of a de_boor_chain.  The runtime arc length of the curve against its rest length gives the stretch factor,
+# clamped and blended like the ikSpline stretch.  The ratio is the fraction of the current curve the chain covers, every
+# joint multiplies its rest length fraction by it.
+CHAIN_STRETCH_GRAPH = NodeGraph(
+    nodes={
+        "restLength": ("floatMath", "{prefix}RestLength_FLM", 2),
+        "factor": ("floatMath", "{prefix}StretchFactor_FLM", 3),
+        "clamp": ("clamp", "{prefix}StretchFactor_CLM", None),
+        "baseStretch": ("floatConstant", "{prefix}BaseStretch_FLC", None),
+        "blend": ("blendTwoAttr", "{prefix}Stretch_BTA", None),
+        "ratio": ("floatMath", "{prefix}StretchRatio_FLM", 3),
+    },
+    edges=[
+        ("@length", "factor.floatA"),
+        ("@globalScale", "restLength.floatA"),
+        ("restLength.outFloat", "factor.floatB"),
+        ("factor.outFloat", "clamp.inputR"),
+        ("@stretchMin", "clamp.minR"),
+        ("@stretchMax", "clamp.maxR"),
+        ("clamp.outputR", "blend.input[1]"),
+        ("baseStretch.outFloat", "blend.input[0]"),
+        ("@stretch", "blend.attributesBlender"),
+        ("blend.output", "ratio.floatA"),
+        ("factor.outFloat", "ratio.floatB"),
+    ],
+    values={
+        "baseStretch.inFloat": 1.0,
+    },
+)
 
 def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=0.001, d=None, kv_type=OPEN,
                    param_from_length=True, tol=0.000001, name='ribbon', use_position=True, use_tangent=True,
-                   use_up=True, use_scale=True, custom_parm = [], parent=None, axis_change=False):
+                   use_up=True, use_scale=True, custom_parm = [], parent=None, axis_change=False, length_samples=100,
+                   stretch_aware=False, runtime_samples=16):
     """
     Use controls and de_boor function to get position, tangent and up values for joints.  The param_from_length can
     be used to get the parameter values using a fraction of the curve length, otherwise the parameter values will be
-    equally spaced
+    equally spaced.  The lengths come from an arc length table of length_samples segments, see de_boor_math.
+
+    With stretch_aware the parameters are not frozen at build time: a runtime arc length table of runtime_samples
+    segments maps the rest length fraction of every joint to a parameter, and the De Boor weights are rebuilt from ramps
+    of the basis functions, so the joints keep their length spacing when the ribbon stretches unevenly.  It needs
+    use_position and costs a remapValue per joint and control, so it is off by default.
 
     To optimize the setup we change the nodes and connections if different combinations of position, tangent and up are
     used:
@@ -170,7 +115,6 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
 
         kv, _ = knot_vector(OPEN, cvs, d)
 
-        m_kv = kv[1:-1]
         # m_cvs = cvs[:]
         m_cvs = []
 
@@ -182,6 +126,7 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
             else:
                 m_cvs.append(cv)
 
+        domain = (0.0, 1.0)
 
     else:  # kv_type is PERIODIC
 
@@ -189,49 +134,23 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
         for i in range(d):
             m_cvs.append(m_cvs[i])
 
-        m_kv_len = len(m_cvs) + d - 1
-        m_kv_interval = 1 / (m_kv_len - 2 * (d - 1) - 1)
-        m_kv = [-m_kv_interval * (d - 1) * (1 - t / (m_kv_len - 1)) +
-                (1 + m_kv_interval * (d - 1)) * t / (m_kv_len - 1) for t in range(m_kv_len)]
-
         kv, cvs = knot_vector(PERIODIC, cvs, d)
 
-    m_cv_poss = om.MPointArray([cmds.xform(obj, q=True, ws=True, t=True) for obj in m_cvs])
-    form = KNOT_TO_FORM_INDEX[kv_type]
-    is_2d = False
-    rational = True
-    data_creator = om.MFnNurbsCurveData()
-    parent = data_creator.create()
+        domain = (kv[d + 1] * (d * 0.5 + 0.5), 1 - kv[d + 1] * (d * 0.5 - 0.5))
 
-    crv_fn = om.MFnNurbsCurve()
-    crv_fn.create(m_cv_poss, m_kv, d, form, is_2d, rational, parent)
+    if param_from_length or stretch_aware:
+        cv_positions = {cv: cmds.getAttr(ctl)[12:15] for cv, ctl in zip(original_cvs, ctls)}
+        table = arc_length_table([cv_positions[cv] for cv in cvs], d=d, kv=kv, samples=length_samples, domain=domain,
+                                 tol=tol)
 
     if param_from_length:
-
-        crv_len = crv_fn.length()
-        params = []
-
-        for i in range(num_joints):
-
-            sample_len = crv_len * i / (num_joints - 1)
-
-            if kv_type == PERIODIC:
-                t = crv_fn.findParamFromLength((sample_len + crv_len * m_kv[2] * 0.5) % crv_len)
-                params.append(t - m_kv[2] * 0.5)
-            else:
-                t = crv_fn.findParamFromLength(sample_len)
-                params.append(t)
-
+        params = [(t - domain[0]) / (domain[1] - domain[0]) for t in uniform_length_params(table, num_joints)]
     else:
         params = [i / (num_joints - 1) for i in range(num_joints)]
 
     params = custom_parm if custom_parm else params
 
-
-    if kv_type == PERIODIC:
-
-        params = [(kv[d + 1] * (d * 0.5 + 0.5)) * (1 - t) + t * (1 - kv[d + 1] * (d * 0.5 - 0.5))
-                  for i, t in enumerate(params)]
+    params = [domain[0] * (1 - t) + t * domain[1] for t in params]
 
     par_off_plugs = []
     trans_off_plugs = []
@@ -257,6 +176,16 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
 
             sca_off_plugs.append(f'{sca_off}.outputMatrix')
 
+    if stretch_aware:
+        # The table is monotonic both ways, swapping its columns maps the joint parameters to their rest lengths.
+        rest_lengths = params_from_lengths((table[1], table[0]), params)
+        sample_params = [domain[0] + (domain[1] - domain[0]) * k / runtime_samples for k in range(runtime_samples + 1)]
+        basis = basis_table(original_cvs, cvs, d, kv, sample_params, tol=tol)
+        table_plugs, _ = create_length_table(trans_off_plugs, [list(sample_wts) for sample_wts in zip(*basis)], name,
+                                             tol=tol)
+        runtime_params = create_length_params(table_plugs, sample_params,
+                                              [length / table[1][-1] for length in rest_lengths], name)
+
     jnts = []
 
     for i, param in enumerate(params):
@@ -281,6 +210,9 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
         if kv_type == PERIODIC:
             tangent_wts = get_consolidated_wts(tangent_wts, original_cvs, cvs)
 
+        if stretch_aware:
+            weight_plugs = create_basis_weights(runtime_params[i], basis, sample_params, f'{name}Weight0{i}')
+
         position_plug = None
         tangent_plug = None
 
@@ -289,6 +221,8 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
 
             position = create_wt_add_matrix(trans_off_plugs, wts, f'{name}Position0{i}_WAM', tol=tol)
             position_plug = f'{position}.matrixSum'
+            if stretch_aware:
+                connect_wt_add_matrix_weights(position, trans_off_plugs, weight_plugs)
 
             if not use_tangent and not use_up:  # no aimMatrix necessary, connect wtAddMatrix to joint
 
@@ -309,6 +243,14 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
                 tangent = create_wt_add_matrix(trans_off_plugs, tangent_wts, f'{name}Tangent0{i}_WAM', tol=tol)
                 tangent_plug = f'{tangent}.matrixSum'
 
+                if stretch_aware:
+                    tangent_param_flm = cmds.createNode('floatMath', n=f'{name}TangentParam0{i}_FLM', ss=True)
+                    cmds.connectAttr(runtime_params[i], f'{tangent_param_flm}.floatA')
+                    cmds.setAttr(f'{tangent_param_flm}.floatB', tangent_param - param)
+                    tangent_weight_plugs = create_basis_weights(f'{tangent_param_flm}.outFloat', basis, sample_params,
+                                                                f'{name}TangentWeight0{i}')
+                    connect_wt_add_matrix_weights(tangent, trans_off_plugs, tangent_weight_plugs)
+
         # ----- up setup
         if use_up:
 
@@ -319,6 +261,8 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
                 cmds.setAttr(f'{ori_con}.{m_cvs[j]}W{j}', wt)
 
             up = create_wt_add_matrix(par_off_plugs, wts, f'{name}Up0{i}_WAM', tol=tol)
+            if stretch_aware:
+                connect_wt_add_matrix_weights(up, par_off_plugs, weight_plugs)
 
             temp_mat = om.MMatrix(cmds.getAttr(f'{temp}.matrix'))
             up_inverse = om.MMatrix(cmds.getAttr(f'{up}.matrixSum')).inverse()
@@ -385,6 +329,8 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
 
         if use_scale:
             scale_wam = create_wt_add_matrix(sca_off_plugs, wts, f'{name}Scale0{i}_WAM', tol=tol)
+            if stretch_aware:
+                connect_wt_add_matrix_weights(scale_wam, sca_off_plugs, weight_plugs)
 
             scale_mm = cmds.createNode('multMatrix', n=f'{name}Scale0{i}_MM', ss=True)
             cmds.connectAttr(f'{scale_wam}.matrixSum', f'{scale_mm}.matrixIn[0]')
@@ -401,15 +347,6 @@ def de_boor_ribbon(cvs, aim_axis='x', up_axis='y', num_joints=5, tangent_offset=
     return jnts
 
 
-def get_consolidated_wts(wts, original_cvs, cvs):
-
-    consolidated_wts = {cv: 0 for cv in original_cvs}
-    for j, wt in enumerate(wts):
-        consolidated_wts[cvs[j]] += wt
-
-    return [consolidated_wts[cv] for cv in original_cvs]
-
-
 def create_wt_add_matrix(matrix_attrs, wts, name, tol=0.000001):
 
     wam = cmds.createNode('wtAddMatrix', n=name, ss=True)
@@ -423,6 +360,141 @@ def create_wt_add_matrix(matrix_attrs, wts, name, tol=0.000001):
 
     return wam
 
+def connect_wt_add_matrix_weights(wam, matrix_attrs, weight_plugs):
+    """
+    Drive the weights of a wtAddMatrix from plugs, the matrices skipped by create_wt_add_matrix are connected too.
+    Entries that already have a matrix keep it.
+
+    Attributes:
+        wam (str): wtAddMatrix node
+        matrix_attrs (list): matrix plug of every control
+        weight_plugs (list): weight plug of every control
+    """
+
+    for i, (matrix_attr, weight_plug) in enumerate(zip(matrix_attrs, weight_plugs)):
+
+        if not cmds.listConnections(f'{wam}.wtMatrix[{i}].matrixIn', source=True, destination=False):
+            cmds.connectAttr(matrix_attr, f'{wam}.wtMatrix[{i}].matrixIn')
+        cmds.connectAttr(weight_plug, f'{wam}.wtMatrix[{i}].weightIn')
+
+
+def create_length_table(matrix_attrs, sample_wts, name, tol=0.000001):
+    """
+    Runtime arc length table of a curve.  The curve is sampled with wtAddMatrix nodes and the chord lengths between the
+    samples are accumulated and normalized.
+
+    Attributes:
+        matrix_attrs (list): translation matrix plug of every control
+        sample_wts (list): De Boor weights of every sample
+        name (str): prefix of the created nodes
+
+    Returns:
+        tuple: length fraction plug of every inner sample, the first and last ones are 0 and 1, and the length plug
+    """
+
+    sample_plugs = [f'{create_wt_add_matrix(matrix_attrs, wts, f"{name}LengthSample{k:02d}_WAM", tol=tol)}.matrixSum'
+                    for k, wts in enumerate(sample_wts)]
+
+    length_plugs = []
+    for k, (start, end) in enumerate(zip(sample_plugs, sample_plugs[1:])):
+
+        distance = cmds.createNode('distanceBetween', n=f'{name}LengthChord{k:02d}_BTW', ss=True)
+        cmds.connectAttr(start, f'{distance}.inMatrix1')
+        cmds.connectAttr(end, f'{distance}.inMatrix2')
+
+        if length_plugs:
+            length = cmds.createNode('floatMath', n=f'{name}Length{k:02d}_FLM', ss=True)
+            cmds.connectAttr(length_plugs[-1], f'{length}.floatA')
+            cmds.connectAttr(f'{distance}.distance', f'{length}.floatB')
+            length_plugs.append(f'{length}.outFloat')
+        else:
+            length_plugs.append(f'{distance}.distance')
+
+    fraction_plugs = []
+    for k, length_plug in enumerate(length_plugs[:-1]):
+
+        fraction = cmds.createNode('floatMath', n=f'{name}LengthFraction{k:02d}_FLM', ss=True)
+        cmds.setAttr(f'{fraction}.operation', 3)
+        cmds.connectAttr(length_plug, f'{fraction}.floatA')
+        cmds.connectAttr(length_plugs[-1], f'{fraction}.floatB')
+        fraction_plugs.append(f'{fraction}.outFloat')
+
+    return fraction_plugs, length_plugs[-1]
+
+
+def create_length_params(fraction_plugs, sample_params, fractions, name):
+    """
+    Map length fractions to parameters with a remapValue per joint reading the runtime arc length table.
+
+    Attributes:
+        fraction_plugs (list): length fraction plug of every inner sample, from create_length_table
+        sample_params (list): parameter of every sample
+        fractions (list): length fraction of every joint, a value from 0 to 1 or a plug
+        name (str): prefix of the created nodes
+
+    Returns:
+        list: parameter plug of every joint
+    """
+
+    param_plugs = []
+    for i, joint_fraction in enumerate(fractions):
+
+        remap = cmds.createNode('remapValue', n=f'{name}LengthParam0{i}_RMV', ss=True)
+        if isinstance(joint_fraction, str):
+            cmds.connectAttr(joint_fraction, f'{remap}.inputValue')
+        else:
+            cmds.setAttr(f'{remap}.inputValue', joint_fraction)
+
+        for k, param in enumerate(sample_params):
+            if k == 0:
+                cmds.setAttr(f'{remap}.value[{k}].value_Position', 0)
+            elif k == len(sample_params) - 1:
+                cmds.setAttr(f'{remap}.value[{k}].value_Position', 1)
+            else:
+                cmds.connectAttr(fraction_plugs[k - 1], f'{remap}.value[{k}].value_Position')
+            cmds.setAttr(f'{remap}.value[{k}].value_FloatValue', param)
+            cmds.setAttr(f'{remap}.value[{k}].value_Interp', 1)
+
+        param_plugs.append(f'{remap}.outValue')
+
+    return param_plugs
+
+
+def create_basis_weights(param_plug, basis, sample_params, name):
+    """
+    Rebuild the De Boor weights of a runtime parameter with a ramp per control sampling its basis function.  The ramps
+    span the sampled parameters, which can go past the 0 to 1 range of the remapValue positions.
+
+    Attributes:
+        param_plug (str): parameter plug
+        basis (list): for every control, its weight at every sample, from de_boor_math.basis_table
+        sample_params (list): parameter of every sample
+        name (str): prefix of the created nodes
+
+    Returns:
+        list: weight plug of every control
+    """
+
+    start, end = sample_params[0], sample_params[-1]
+
+    weight_plugs = []
+    for j, cv_basis in enumerate(basis):
+
+        remap = cmds.createNode('remapValue', n=f'{name}Cv0{j}_RMV', ss=True)
+        cmds.connectAttr(param_plug, f'{remap}.inputValue')
+        cmds.setAttr(f'{remap}.inputMin', start)
+        cmds.setAttr(f'{remap}.inputMax', end)
+
+        for k, (param, wt) in enumerate(zip(sample_params, cv_basis)):
+            cmds.setAttr(f'{remap}.value[{k}].value_Position', (param - start) / (end - start))
+            cmds.setAttr(f'{remap}.value[{k}].value_FloatValue', wt)
+            cmds.setAttr(f'{remap}.value[{k}].value_Interp', 1)
+
+        weight_plugs.append(f'{remap}.outValue')
+
+    return weight_plugs
+
+
 def get_weighted_translation_matrix(matrices, wts):
 
     translation_m = om.MMatrix(((1, 0, 0, 0), (0, 1, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1)))
@@ -432,3 +504,186 @@ def get_weighted_translation_matrix(matrices, wts):
             translation_m[i] += m[i] * wt
 
     return translation_m
+
+
+def de_boor_chain(ctls, params, name, aim_axis='y', up_axis='x', d=None, tangent_offset=0.001, tol=0.000001):
+    """
+    Matrix only evaluation of an open curve for a joint chain, used instead of an ikSpline handle.  The De Boor weights
+    of every parameter are computed once and baked in wtAddMatrix nodes, so nothing is solved at evaluation time.  The
+    aim axis follows the curve tangent and the up axis is aligned with the weighted controller matrices.
+
+    Attributes:
+        ctls (list): controllers used as control vertices
+        params (list): parameter of every joint, usually from uniform_length_params
+        name (str): prefix of the created nodes
+        aim_axis (str): joint axis aimed along the curve
+        up_axis (str): joint axis aligned with the controllers up axis
+        d (int): degree of the curve, defaults to len(ctls) - 1
+
+    Returns:
+        tuple: position and output matrix plugs of every joint
+    """
+
+    d = len(ctls) - 1 if d is None else d
+    kv = get_open_uniform_kv(len(ctls), d)
+
+    ctl_plugs = [ctl if "." in ctl else f"{ctl}.worldMatrix[0]" for ctl in ctls]
+
+    trans_off_plugs = []
+    for i, ctl_plug in enumerate(ctl_plugs):
+        trans_off = cmds.createNode('pickMatrix', n=f'{name}Translation0{i}_PM', ss=True)
+        cmds.connectAttr(ctl_plug, f'{trans_off}.inputMatrix')
+        for attr in 'useRotate', 'useScale', 'useShear':
+            cmds.setAttr(f'{trans_off}.{attr}', False)
+        trans_off_plugs.append(f'{trans_off}.outputMatrix')
+
+    position_plugs = []
+    output_plugs = []
+
+    for i, param in enumerate(params):
+
+        wts = de_boor(len(ctls), d, param, kv, tol=tol)
+
+        tangent_param = param + tangent_offset
+        aim_vector = om.MVector(AXIS_VECTOR[aim_axis])
+        if tangent_param > 1:
+            tangent_param = param - 2 * tangent_offset
+            aim_vector *= -1
+
+        tangent_wts = de_boor(len(ctls), d, tangent_param, kv, tol=tol)
+
+        position = create_wt_add_matrix(trans_off_plugs, wts, f'{name}Position0{i}_WAM', tol=tol)
+        tangent = create_wt_add_matrix(trans_off_plugs, tangent_wts, f'{name}Tangent0{i}_WAM', tol=tol)
+        up = create_wt_add_matrix(ctl_plugs, wts, f'{name}Up0{i}_WAM', tol=tol)
+
+        aim = cmds.createNode('aimMatrix', n=f'{name}PointOnCurve0{i}_AM', ss=True)
+        cmds.connectAttr(f'{position}.matrixSum', f'{aim}.inputMatrix')
+        cmds.connectAttr(f'{tangent}.matrixSum', f'{aim}.primaryTargetMatrix')
+        cmds.connectAttr(f'{up}.matrixSum', f'{aim}.secondaryTargetMatrix')
+
+        cmds.setAttr(f'{aim}.primaryInputAxis', *aim_vector)
+        cmds.setAttr(f'{aim}.secondaryInputAxis', *AXIS_VECTOR[up_axis])
+        cmds.setAttr(f'{aim}.secondaryMode', 2)
+        cmds.setAttr(f'{aim}.secondaryTargetVector', *AXIS_VECTOR[up_axis])
+
+        position_plugs.append(f'{position}.matrixSum')
+        output_plugs.append(f'{aim}.outputMatrix')
+
+    return position_plugs, output_plugs
+
+
+def chain_stretch(ctls, params, output_plugs, stretch, stretch_min, stretch_max, global_scale, name, d=None,
+                  tangent_offset=0.001, runtime_samples=16, overshoot=1.0, tol=0.000001):
+    """
+    Stretch and squash limits for a de_boor_chain.  The curve length is measured at runtime with an arc length table of
+    runtime_samples segments, and the joint parameters are remapped from it: every joint keeps its rest length fraction
+    of the clamped chain length, so the joints slide along the curve instead of leaving it.  With stretch at 0 the
+    chain keeps its rest length whatever the curve does.  A chain longer than its curve continues along the end
+    tangent, up to overshoot times the curve length.
+
+    The weights of the position, tangent and up wtAddMatrix nodes of de_boor_chain are rebuilt with ramps of the basis
+    functions, so they are linearly interpolated between the samples.  This replaces the baked weights of every joint
+    but the first with a runtime network heavier than the baked chain, so it is opt-in: without it the joints keep
+    their precomputed parameters and follow the curve as it stretches.
+
+    Attributes:
+        ctls (list): controllers given to de_boor_chain
+        params (list): parameters given to de_boor_chain
+        output_plugs (list): output matrix plugs from de_boor_chain
+        stretch (str): plug blending between the rest length (0) and the clamped length (1)
+        stretch_min (str): plug with the minimum stretch factor
+        stretch_max (str): plug with the maximum stretch factor
+        global_scale (str): plug with the rig global scale
+        name (str): prefix of the created nodes
+        d (int): degree of the curve, defaults to len(ctls) - 1
+
+    Returns:
+        list: output matrix plugs, the first joint is not affected
+    """
+
+    d = len(ctls) - 1 if d is None else d
+    kv = get_open_uniform_kv(len(ctls), d)
+
+    ctl_plugs = [ctl if "." in ctl else f"{ctl}.worldMatrix[0]" for ctl in ctls]
+    positions = [cmds.getAttr(ctl_plug)[12:15] for ctl_plug in ctl_plugs]
+
+    trans_off_plugs = []
+    for j, ctl_plug in enumerate(ctl_plugs):
+        trans_off = cmds.createNode('pickMatrix', n=f'{name}StretchTranslation0{j}_PM', ss=True)
+        cmds.connectAttr(ctl_plug, f'{trans_off}.inputMatrix')
+        for attr in 'useRotate', 'useScale', 'useShear':
+            cmds.setAttr(f'{trans_off}.{attr}', False)
+        trans_off_plugs.append(f'{trans_off}.outputMatrix')
+
+    # The rest fractions come from a table sampled like the runtime one, so the joints keep their parameters at rest.
+    table = arc_length_table(positions, d=d, kv=kv, samples=runtime_samples, tol=tol)
+    rest_length = table[1][-1]
+    rest_fractions = [length / rest_length for length in params_from_lengths((table[1], table[0]), params)]
+
+    indices = list(range(len(ctls)))
+    basis = basis_table(indices, indices, d, kv, table[0], tol=tol)
+
+    table_plugs, length_plug = create_length_table(trans_off_plugs, [list(wts) for wts in zip(*basis)], name, tol=tol)
+
+    created_nodes = CHAIN_STRETCH_GRAPH.build(
+        inputs={
+            "length": length_plug,
+            "globalScale": global_scale,
+            "stretch": stretch,
+            "stretchMin": stretch_min,
+            "stretchMax": stretch_max,
+        },
+        prefix=name,
+    )
+    cmds.setAttr(f'{created_nodes["restLength"]}.floatB', rest_length)
+
+    # Past the end of the curve the basis ramps gain a last sample on the end tangent.
+    extension_param, extension_wts = extend_past_end(positions, d, kv, overshoot * rest_length,
+                                                     tangent_offset=tangent_offset, tol=tol)
+    extended_params = table[0] + [extension_param]
+    extended_basis = [cv_basis + [wt] for cv_basis, wt in zip(basis, extension_wts)]
+
+    for i, (param, rest_fraction, output_plug) in enumerate(zip(params, rest_fractions, output_plugs)):
+
+        if i == 0:
+            continue
+
+        fraction = cmds.createNode('floatMath', n=f'{name}StretchFraction0{i}_FLM', ss=True)
+        cmds.setAttr(f'{fraction}.operation', 2)
+        cmds.setAttr(f'{fraction}.floatA', rest_fraction)
+        cmds.connectAttr(f'{created_nodes["ratio"]}.outFloat', f'{fraction}.floatB')
+
+        curve_param = create_length_params(table_plugs, table[0], [f'{fraction}.outFloat'], f'{name}Stretch0{i}')[0]
+
+        # The fraction past 1 is mapped linearly to the extension parameters.
+        overshoot_remap = cmds.createNode('remapValue', n=f'{name}StretchOvershoot0{i}_RMV', ss=True)
+        cmds.connectAttr(f'{fraction}.outFloat', f'{overshoot_remap}.inputValue')
+        cmds.setAttr(f'{overshoot_remap}.inputMin', 1)
+        cmds.setAttr(f'{overshoot_remap}.inputMax', 1 + overshoot)
+        cmds.setAttr(f'{overshoot_remap}.outputMax', extension_param - 1)
+
+        runtime_param = cmds.createNode('floatMath', n=f'{name}StretchParam0{i}_FLM', ss=True)
+        cmds.connectAttr(curve_param, f'{runtime_param}.floatA')
+        cmds.connectAttr(f'{overshoot_remap}.outValue', f'{runtime_param}.floatB')
+
+        weight_plugs = create_basis_weights(f'{runtime_param}.outFloat', extended_basis, extended_params,
+                                            f'{name}StretchWeight0{i}')
+
+        # The extension keeps the tangent ahead of the joint, the chain end no longer aims backwards.
+        tangent_param = cmds.createNode('floatMath', n=f'{name}StretchTangentParam0{i}_FLM', ss=True)
+        cmds.connectAttr(f'{runtime_param}.outFloat', f'{tangent_param}.floatA')
+        cmds.setAttr(f'{tangent_param}.floatB', tangent_offset)
+        tangent_weight_plugs = create_basis_weights(f'{tangent_param}.outFloat', extended_basis, extended_params,
+                                                    f'{name}StretchTangentWeight0{i}')
+
+        aim = output_plug.split('.')[0]
+        if param + tangent_offset > 1:
+            cmds.setAttr(f'{aim}.primaryInputAxis', *[-value for value in cmds.getAttr(f'{aim}.primaryInputAxis')[0]])
+
+        position, tangent, up = [cmds.listConnections(f'{aim}.{attr}', source=True, destination=False)[0]
+                                 for attr in ('inputMatrix', 'primaryTargetMatrix', 'secondaryTargetMatrix')]
+        connect_wt_add_matrix_weights(position, trans_off_plugs, weight_plugs)
+        connect_wt_add_matrix_weights(tangent, trans_off_plugs, tangent_weight_plugs)
+        connect_wt_add_matrix_weights(up, ctl_plugs, weight_plugs)
+
+    return output_plugs
@@ -0,0 +1,278 @@
+"""
+Pure python De Boor evaluation of open and periodic uniform curves, shared by de_boor_core_002 and the spine modules.
+The arc length tables map lengths along a curve to parameters without building an MFnNurbsCurve.
+This module does not import maya so it can be used and tested outside of it.
+"""
+
+OPEN = 'open'
+PERIODIC = 'periodic'
+
+def get_open_uniform_kv(n, d):
+    """
+    Get open uniform knot vector
+
+    Attributes:
+        n (int): the number of control vertices
+        d (int): degree of outputs
+
+    Returns:
+        list: open uniform knot vector
+    """
+
+    return [0] * (d + 1) + [(i - d) / (n - d) for i in range(d + 1, n)] + [1] * (d + 1)
+
+
+def get_periodic_uniform_kv(n, d):
+    """
+    Get periodic uniform knot vector.  Append d values to the start and end
+
+    Returns:
+        list: periodic uniform knot vector with d additional values at the start and end
+    """
+
+    i = 1.0 / (n + d)
+    return  [-i * a for a in range(d, 0, -1)] + [i * a for a in range(n + d + 1)] + [i * a + 1 for a in range(1, d + 1)]
+
+
+def knot_vector(kv_type, cvs, d):
+    """
+    Convenience function for creating knot vectors and editing cv/joint/controls/etc lists
+
+    Attributes:
+        kv_type (str): knot vector type to be created
+        cvs (list): list of objects to be associated with the knot vector
+        d (int): degree of outputs
+
+    Returns:
+        tuple: knot vector and (modified) cvs list
+    """
+
+    cvs_copy = cvs[:]
+
+    if kv_type == 'open':
+
+        kv = get_open_uniform_kv(len(cvs), d)
+
+    else:
+
+        kv = get_periodic_uniform_kv(len(cvs), d)
+
+        for i in range(d):
+            cvs_copy.insert(0, cvs[len(cvs) - i - 1])
+            cvs_copy.append(cvs[i])
+
+    return kv, cvs_copy
+
+
+def de_boor(n, d, t, kv, tol=0.000001):
+    """
+    Attributes:
+        n (integer): number of control vertices
+        d (integer): degree of the resulting curve
+        t (float): parametric value along the curve that we use to query the value
+        kv (list or tuple): represents the knot vector which is used to calculate the basis function weights
+
+    Returns:
+        list: contains float values between 0 and 1
+    """
+
+    if t + tol > 1:
+        return [0.0 if i != n - 1 else 1.0 for i in range(n)]
+
+    weights = [1.0 if kv[i] <= t < kv[i + 1] else 0.0 for i in range(n + d)]
+
+    basis_width = n + d - 1
+
+    for degree in range(1, d + 1):
+
+        for i in range(basis_width):
+
+            if weights[i] == 0 and weights[i + 1] == 0:
+                continue
+
+            a_denom = kv[i + degree] - kv[i]
+            b_denom = kv[i + degree + 1] - kv[i + 1]
+            a = (t - kv[i]) * weights[i] / a_denom if a_denom != 0 else 0.0
+            b = (kv[i + degree + 1] - t) * weights[i + 1] / b_denom if b_denom != 0 else 0.0
+
+            weights[i] = a + b
+
+        basis_width -= 1
+
+    return weights[:n]
+
+
+def curve_point(positions, d, t, kv, tol=0.000001):
+    """
+    Attributes:
+        positions (list): control vertex positions
+        d (integer): degree of the curve
+        t (float): parametric value along the curve
+        kv (list or tuple): knot vector
+
+    Returns:
+        list: position of the curve at t
+    """
+
+    wts = de_boor(len(positions), d, t, kv, tol=tol)
+
+    return [sum(wt * position[axis] for wt, position in zip(wts, positions)) for axis in range(3)]
+
+
+def polyline_length(points):
+    """
+    Attributes:
+        points (list): ordered positions
+
+    Returns:
+        float: sum of the distances between consecutive points
+    """
+
+    return sum(sum((b - a) ** 2 for a, b in zip(start, end)) ** 0.5 for start, end in zip(points, points[1:]))
+
+
+def arc_length_table(positions, d=None, kv=None, samples=100, domain=(0.0, 1.0), tol=0.000001):
+    """
+    Sample a curve with the basis functions and accumulate the chord lengths between the samples, the table is
+    used to find parameters from lengths without building a curve
+
+    Attributes:
+        positions (list): control vertex positions, already wrapped for periodic knot vectors
+        d (integer): degree of the curve, defaults to len(positions) - 1
+        kv (list or tuple): knot vector, defaults to the open uniform knot vector
+        samples (int): number of segments sampled along the curve
+        domain (tuple): first and last sampled parameters
+
+    Returns:
+        tuple: sampled parameters and the cumulative length at each of them
+    """
+
+    d = len(positions) - 1 if d is None else d
+    kv = get_open_uniform_kv(len(positions), d) if kv is None else kv
+
+    start, end = domain
+    params = [start + (end - start) * i / samples for i in range(samples + 1)]
+    points = [curve_point(positions, d, t, kv, tol=tol) for t in params]
+
+    lengths = [0.0]
+    for point, next_point in zip(points, points[1:]):
+        lengths.append(lengths[-1] + polyline_length([point, next_point]))
+
+    return params, lengths
+
+
+def params_from_lengths(table, lengths):
+    """
+    Map many lengths at once, the lengths are sorted and the table is walked a single time
+
+    Attributes:
+        table (tuple): parameters and cumulative lengths from arc_length_table
+        lengths (list): lengths along the curve, clamped to the table
+
+    Returns:
+        list: parameter of every length, in the given order and linearly interpolated between the table samples
+    """
+
+    params, table_lengths = table
+    total_length = table_lengths[-1]
+
+    result = [params[0]] * len(lengths)
+    index = 1
+
+    for i in sorted(range(len(lengths)), key=lambda i: lengths[i]):
+
+        length = min(max(lengths[i], 0.0), total_length)
+
+        while index < len(table_lengths) - 1 and table_lengths[index] < length:
+            index += 1
+
+        segment = table_lengths[index] - table_lengths[index - 1]
+        weight = (length - table_lengths[index - 1]) / segment if segment else 0.0
+
+        result[i] = params[index - 1] + (params[index] - params[index - 1]) * weight
+
+    return result
+
+
+def param_from_length(table, length):
+    """
+    Attributes:
+        table (tuple): parameters and cumulative lengths from arc_length_table
+        length (float): length along the curve
+
+    Returns:
+        float: parameter at the given length
+    """
+
+    return params_from_lengths(table, [length])[0]
+
+
+def uniform_length_params(table, num_joints):
+    """
+    Attributes:
+        table (tuple): parameters and cumulative lengths from arc_length_table
+        num_joints (int): number of parameters
+
+    Returns:
+        list: parameters equally spaced by length along the curve
+    """
+
+    total_length = table[1][-1]
+
+    return params_from_lengths(table, [total_length * i / (num_joints - 1) for i in range(num_joints)])
+
+
+def get_consolidated_wts(wts, original_cvs, cvs):
+
+    consolidated_wts = {cv: 0 for cv in original_cvs}
+    for j, wt in enumerate(wts):
+        consolidated_wts[cvs[j]] += wt
+
+    return [consolidated_wts[cv] for cv in original_cvs]
+
+
+def basis_table(original_cvs, cvs, d, kv, params, tol=0.000001):
+    """
+    Basis function of every original control vertex sampled at the given parameters, used to rebuild the De Boor
+    weights with ramps when the parameters change at evaluation time
+
+    Attributes:
+        original_cvs (list): control vertices of the curve
+        cvs (list): control vertices wrapped by knot_vector, the same list for open curves
+        d (integer): degree of the curve
+        kv (list or tuple): knot vector
+        params (list): sampled parameters
+
+    Returns:
+        list: for every original control vertex, its weight at every parameter
+    """
+
+    wts = [get_consolidated_wts(de_boor(len(cvs), d, t, kv, tol=tol), original_cvs, cvs) for t in params]
+
+    return [[param_wts[j] for param_wts in wts] for j in range(len(original_cvs))]
+
+
+def extend_past_end(positions, d, kv, length, tangent_offset=0.001, tol=0.000001):
+    """
+    Straight extension of an open curve along its end tangent.  Past the parameter 1 the weights keep the slope they
+    have at the end of the curve, so weights interpolated between 1 and the returned parameter move along a line
+
+    Attributes:
+        positions (list): control vertex positions
+        d (integer): degree of the curve
+        kv (list or tuple): open knot vector
+        length (float): length of the extension
+        tangent_offset (float): parameter step used to measure the end tangent
+
+    Returns:
+        tuple: parameter past 1 at the end of the extension and the control weights at it
+    """
+
+    end_wts = de_boor(len(positions), d, 1.0, kv, tol=tol)
+    before_wts = de_boor(len(positions), d, 1.0 - tangent_offset, kv, tol=tol)
+
+    speed = polyline_length([curve_point(positions, d, 1.0 - tangent_offset, kv, tol=tol),
+                             curve_point(positions, d, 1.0, kv, tol=tol)]) / tangent_offset
+    param = 1.0 + length / speed
+
+    return param, [end + (end - before) * (param - 1.0) / tangent_offset for end, before in zip(end_wts, before_wts)]
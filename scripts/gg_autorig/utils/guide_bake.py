@@ -0,0 +1,273 @@
+"""
+Bake guides mode.
+Once a rig is built the imported guides never move, so every node fed only by the guides outputs a constant.
+bake_guides evaluates those networks once, writes the results as static values on the plugs they feed
+(offsetParentMatrix, distances, ...) and deletes the networks together with the guide transforms.
+aimMatrix, blendMatrix, multMatrix and inverseMatrix are evaluated with matrix_math, any other node is read back from Maya.
+"""
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+from gg_autorig.utils import data_export
+from gg_autorig.utils import matrix_math
+
+GUIDE_SUFFIX = "_GUIDE"
+
+MATRIX_OUTPUTS = {
+    "aimMatrix": "outputMatrix",
+    "blendMatrix": "outputMatrix",
+    "multMatrix": "matrixSum",
+    "inverseMatrix": "outputMatrix",
+}
+
+def plug_key(plug):
+    """
+    Args:
+        plug (om.MPlug): Any plug.
+    Returns:
+        str: "node.attribute" with long attribute names, used to key the evaluated values.
+    """
+    return plug.partialName(includeNodeName=True, useLongNames=True, useFullAttributePath=True)
+
+def node_key(node):
+    """
+    Args:
+        node (om.MObject): Any node.
+    Returns:
+        str: Unique name of the node, the full path for dag nodes, used to key the visited nodes.
+    """
+    if node.hasFn(om.MFn.kDagNode):
+        return om.MFnDagNode(node).fullPathName()
+    return om.MFnDependencyNode(node).name()
+
+def find_guides():
+    """
+    Returns the imported guide transforms, the ones named *_GUIDE and everything under guides_GRP.
+
+    Returns:
+        list: Guide nodes as om.MObject.
+    """
+    guides = set(cmds.ls(f"*{GUIDE_SUFFIX}", type="transform", long=True) or [])
+
+    guides_grp = data_export.DataExport().get_data("basic_structure", "guides_GRP")
+    if guides_grp and cmds.objExists(guides_grp):
+        guides.update(cmds.listRelatives(guides_grp, allDescendents=True, type="transform", fullPath=True) or [])
+
+    sel_list = om.MSelectionList()
+    for guide in sorted(guides):
+        sel_list.add(guide)
+
+    return [sel_list.getDependNode(i) for i in range(sel_list.length())]
+
+def source_connections(node):
+    """
+    Args:
+        node (om.MObject): Any node.
+    Returns:
+        dict: Source plug of every connected input, keyed by its long attribute path.
+    """
+    connections = {}
+    for plug in om.MFnDependencyNode(node).getConnections():
+        if plug.isDestination:
+            connections[plug.partialName(useLongNames=True, useFullAttributePath=True)] = plug.source()
+    return connections
+
+def destination_connections(node):
+    """
+    Args:
+        node (om.MObject): Any node.
+    Returns:
+        list: (source plug, destination plug) pairs of every connected output, message connections excluded.
+    """
+    connections = []
+    for plug in om.MFnDependencyNode(node).getConnections():
+        if not plug.isSource or plug.attribute().hasFn(om.MFn.kMessageAttribute):
+            continue
+        for destination in plug.destinations():
+            connections.append((plug, destination))
+    return connections
+
+def constant_networks(guides):
+    """
+    Walks the graph downstream of the guides and returns the dependency nodes whose inputs all come from the guides
+    or from other constant nodes. Dag nodes and sets are never folded.
+
+    Args:
+        guides (list): Guide nodes as om.MObject.
+    Returns:
+        list: Constant nodes as om.MObject, every node after the nodes it depends on.
+    """
+    constant = {node_key(guide) for guide in guides}
+    ordered = []
+
+    queue = list(guides)
+    while queue:
+        node = queue.pop(0)
+        for _, destination in destination_connections(node):
+            candidate = destination.node()
+            key = node_key(candidate)
+            if key in constant or candidate.hasFn(om.MFn.kDagNode) or candidate.hasFn(om.MFn.kSet):
+                continue
+            if om.MFnDependencyNode(candidate).isDefaultNode:
+                continue
+            if all(node_key(source.node()) in constant for source in source_connections(candidate).values()):
+                constant.add(key)
+                ordered.append(candidate)
+                queue.append(candidate)
+
+    return ordered
+
+def evaluate_node(node, values):
+    """
+    Evaluates the output matrix of a constant guide network node with matrix_math.
+
+    Args:
+        node (om.MObject): The node.
+        values (dict): Values already evaluated, keyed by plug_key.
+    Returns:
+        list: 16 floats matrix, None if the node or its settings are not supported by the kernel.
+    """
+    node_fn = om.MFnDependencyNode(node)
+    name = node_fn.name()
+    sources = source_connections(node)
+
+    def read(attribute):
+        source = sources.get(attribute)
+        if source is None:
+            return cmds.getAttr(f"{name}.{attribute}")
+        value = values.get(plug_key(source))
+        return cmds.getAttr(source.name()) if value is None else value
+
+    def read_vector(attribute):
+        value = read(attribute)
+        return list(value[0]) if isinstance(value[0], tuple) else list(value)
+
+    if node_fn.typeName == "aimMatrix":
+        if read("primaryMode") != 1 or read("secondaryMode") != 1 or "preSpaceMatrix" in sources or "postSpaceMatrix" in sources:
+            return None
+        return matrix_math.aim_axes_matrix(
+            list(read("inputMatrix")),
+            matrix_math.translation(read("primaryTargetMatrix")),
+            read_vector("primaryInputAxis"),
+            matrix_math.translation(read("secondaryTargetMatrix")),
+            read_vector("secondaryInputAxis"),
+        )
+
+    if node_fn.typeName == "blendMatrix":
+        targets = cmds.getAttr(f"{name}.target", multiIndices=True) or []
+        if len(targets) != 1:
+            return None
+        target = f"target[{targets[0]}]"
+        weight = read(f"{target}.weight") * read("envelope")
+        return matrix_math.blend(
+            list(read("inputMatrix")),
+            list(read(f"{target}.targetMatrix")),
+            translate_weight=weight * read(f"{target}.translateWeight"),
+            rotate_weight=weight * read(f"{target}.rotateWeight"),
+            scale_weight=weight * read(f"{target}.scaleWeight"),
+        )
+
+    if node_fn.typeName == "multMatrix":
+        indices = cmds.getAttr(f"{name}.matrixIn", multiIndices=True) or []
+        return matrix_math.mult_all([list(read(f"matrixIn[{i}]")) for i in indices])
+
+    if node_fn.typeName == "inverseMatrix":
+        return matrix_math.inverse(list(read("inputMatrix")))
+
+    return None
+
+def set_static_value(destination, value):
+    """
+    Writes a baked value on a plug that is no longer connected.
+
+    Args:
+        destination (str): The destination plug.
+        value: The value, as returned by cmds.getAttr or a 16 floats matrix.
+    """
+    locked = cmds.getAttr(destination, lock=True)
+    if locked:
+        cmds.setAttr(destination, lock=False)
+
+    attr_type = cmds.getAttr(destination, type=True)
+    if attr_type == "matrix":
+        cmds.setAttr(destination, list(value), type="matrix")
+    elif isinstance(value, list) and value and isinstance(value[0], tuple):
+        cmds.setAttr(destination, *value[0], type=attr_type)
+    else:
+        cmds.setAttr(destination, value)
+
+    if locked:
+        cmds.setAttr(destination, lock=True)
+
+def bake_guides(verify=False, tolerance=0.0001):
+    """
+    Replaces the guide networks of the built rig by static values and deletes them with the guide transforms.
+    The matrix nodes are baked with the matrix_math kernels, which are tested headless against the node definitions.
+
+    Args:
+        verify (bool): If True every kernel result is also compared with the Maya evaluation of the node, mismatches
+            are reported and the Maya value is baked instead. Slower, meant to check a new template.
+        tolerance (float): Largest difference allowed by verify.
+    Returns:
+        int: Number of evaluation nodes removed.
+    """
+    guides = find_guides()
+    if not guides:
+        om.MGlobal.displayWarning("Bake guides: no guides found.")
+        return 0
+
+    constants = constant_networks(guides)
+    constant_keys = {node_key(node) for node in guides + constants}
+
+    values = {}
+    for guide in guides:
+        world_matrix = om.MFnDagNode(guide).findPlug("worldMatrix", False).elementByLogicalIndex(0)
+        values[plug_key(world_matrix)] = cmds.xform(om.MFnDagNode(guide).fullPathName(), query=True, worldSpace=True, matrix=True)
+
+    mismatches = 0
+    for node in constants:
+        node_fn = om.MFnDependencyNode(node)
+        matrix = evaluate_node(node, values)
+        if matrix is None:
+            continue
+        output = f"{node_fn.name()}.{MATRIX_OUTPUTS[node_fn.typeName]}"
+        if verify:
+            maya_matrix = cmds.getAttr(output)
+            if max(abs(a - b) for a, b in zip(matrix, maya_matrix)) > tolerance:
+                om.MGlobal.displayWarning(f"Bake guides: {output} differs from the Maya evaluation, the Maya value is baked.")
+                mismatches += 1
+                matrix = list(maya_matrix)
+        values[output] = matrix
+
+    baked = []
+    for node in guides + constants:
+        for source, destination in destination_connections(node):
+            if node_key(destination.node()) in constant_keys:
+                continue
+            value = values.get(plug_key(source))
+            baked.append((source.name(), destination.name(), cmds.getAttr(source.name()) if value is None else value))
+
+    cmds.undoInfo(openChunk=True, chunkName="gg_bake_guides")
+    try:
+        for source, destination, value in baked:
+            cmds.disconnectAttr(source, destination)
+            set_static_value(destination, value)
+
+        # Disconnected unitConversion nodes are deleted by Maya on their own.
+        constant_names = [om.MFnDependencyNode(node).name() for node in constants if om.MObjectHandle(node).isValid()]
+        constant_names = [name for name in constant_names if cmds.objExists(name)]
+        if constant_names:
+            cmds.delete(constant_names)
+
+        guide_paths = [om.MFnDagNode(guide).fullPathName() for guide in guides]
+        cmds.delete([path for path in guide_paths if not any(path.startswith(f"{parent}|") for parent in guide_paths)])
+    finally:
+        cmds.undoInfo(closeChunk=True)
+
+    message = f"Bake guides: {len(constants)} evaluation nodes and {len(guides)} guides removed, {len(baked)} plugs baked."
+    if verify:
+        message += f" {mismatches} kernel mismatches."
+    om.MGlobal.displayInfo(message)
+
+    return len(constants)
@@ -1,6 +1,8 @@
 import maya.cmds as cmds
 from importlib import reload
 import json
+import os
+import time
 
 from gg_autorig.utils import core
 import re
@@ -8,6 +10,210 @@ reload(core)
 import maya.api.OpenMaya as om
 
 
+GUIDE_SHAPES_DATA = {
+    "joint": {
+        "shapes": [
+            {
+                "curve": {
+                    "cvs": [
+                        [-0.22838263, 8.743786e-17, 0.22838263],
+                        [-0.32298181, -1.9776932e-17, 2.0788098e-17],
+                        [-0.22838263, -1.1540666e-16, -0.22838263],
+                        [-8.1458056e-17, -1.4343274e-16, -0.32298181],
+                        [0.22838263, -8.743786e-17, -0.22838263],
+                        [0.32298181, 1.9776932e-17, -3.1342143e-17],
+                        [0.22838263, 1.1540666e-16, 0.22838263],
+                        [-2.0669707e-17, 1.4343274e-16, 0.32298181],
+                        [-0.22838263, 8.743786e-17, 0.22838263],
+                        [-0.32298181, -1.9776932e-17, 2.0788098e-17],
+                        [-0.22838263, -1.1540666e-16, -0.22838263]
+                    ],
+                    "form": "periodic",
+                    "knots": [-2.0, -1.0, 0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0],
+                    "degree": 3
+                }
+            },
+            {
+                "curve": {
+                    "cvs": [
+                        [-1.908927e-20, -0.22838263, 0.22838263],
+                        [2.6778678e-17, -0.32298181, 9.250447e-17],
+                        [-1.908927e-20, -0.22838263, -0.22838263],
+                        [-6.4714622e-17, -8.8459802e-17, -0.32298181],
+                        [-1.2941016e-16, 0.22838263, -0.22838263],
+                        [-1.5620792e-16, 0.32298181, -1.0305851e-16],
+                        [-1.2941016e-16, 0.22838263, 0.22838263],
+                        [-6.4714622e-17, 1.1576128e-16, 0.32298181],
+                        [-1.908927e-20, -0.22838263, 0.22838263],
+                        [2.6778678e-17, -0.32298181, 9.250447e-17],
+                        [-1.908927e-20, -0.22838263, -0.22838263]
+                    ],
+                    "form": "periodic",
+                    "knots": [-2.0, -1.0, 0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0],
+                    "degree": 3
+                }
+            },
+            {
+                "curve": {
+                    "cvs": [
+                        [-0.22838263, -0.22838263, -1.2973237e-17],
+                        [-0.32298181, -1.9776932e-17, -1.8765766e-17],
+                        [-0.22838263, 0.22838263, -1.2973237e-17],
+                        [-8.1458056e-17, 0.32298181, 1.011166e-18],
+                        [0.22838263, 0.22838263, 1.4995569e-17],
+                        [0.32298181, 3.2353309e-17, 2.0788098e-17],
+                        [0.22838263, -0.22838263, 1.4995569e-17],
+                        [-2.0669707e-17, -0.32298181, 1.011166e-18],
+                        [-0.22838263, -0.22838263, -1.2973237e-17],
+                        [-0.32298181, -1.9776932e-17, -1.8765766e-17],
+                        [-0.22838263, 0.22838263, -1.2973237e-17]
+                    ],
+                    "form": "periodic",
+                    "knots": [-2.0, -1.0, 0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0],
+                    "degree": 3
+                }
+            }
+        ]
+    },
+    "arrow": {
+        "shapes": [
+            {
+                "curve": {
+                    "cvs": [
+                        [0.05710937039931652, -0.46208100343651526, 1.2381136152831843e-06],
+                        [-0.13243611287906498, -0.43980584749283874, 1.1784288984233384e-06],
+                        [-0.2709619403561311, -0.46741316704204877, 1.2524007734001178e-06],
+                        [-0.3110801360209462, -0.4997154863303799, 1.3389525706362542e-06],
+                        [-0.3125322482823646, -0.5452255108954519, 1.4608934871137462e-06],
+                        [-0.3279198465141865, -1.0274752154006066, 2.7530477212710005e-06],
+                        [-0.3293719587755938, -1.072985239965675, 2.874988637748483e-06],
+                        [-0.2913151372523647, -1.1052875592540063, 2.96154043498462e-06],
+                        [-0.1504102897778976, -1.1343047230011487, 3.0392898885329146e-06],
+                        [0.040251692463613487, -1.1134394112554025, 2.9833827502445854e-06],
+                        [0.9838829618428812, -0.9500234372888587, 2.545521118154057e-06],
+                        [1.0820129424698943, -0.8688846951636224, 2.3281155537506556e-06],
+                        [1.1222758743474053, -0.7876195094560698, 2.1103711926434997e-06],
+                        [1.0843407745637117, -0.7055646343449953, 1.8905109142078366e-06],
+                        [0.9885386260305203, -0.623383315651595, 1.6703118390683945e-06],
+                        [0.05710937039931652, -0.46208100343651526, 1.2381136152831843e-06]
+                    ],
+                    "form": "open",
+                    "knots": [
+                        0.0, 0.0, 0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0, 12.0, 13.0, 13.0, 13.0
+                    ],
+                    "degree": 3
+                }
+            }
+        ]
+    },
+    "settings": {
+        "shapes": [
+            {
+                "curve": {
+                    "cvs": [
+                        [0.27583961709940663, 1.1100465970347986, 2.3349109140730323e-07],
+                        [0.2760224292833038, 0.27746594834149785, 2.0823220965254452e-07],
+                        [1.1042723272392925, 0.2772831361576038, 8.076698100604056e-07],
+                        [1.1043942020285566, -0.2777706296379296, 7.90830555557233e-07],
+                        [0.27614430407258217, -0.27758781745403516, 1.9139295514937222e-07],
+                        [0.2763271162564531, -1.1101684661473408, 1.6613407339461295e-07],
+                        [-0.27583948238085565, -1.1100465913580786, -2.3349099354396076e-07],
+                        [-0.27602229456474703, -0.2774659426647736, -2.0823211178920218e-07],
+                        [-1.1042721925207435, -0.277283130480879, -8.076697121970679e-07],
+                        [-1.1043940673100048, 0.2777706353146552, -7.90830457693897e-07],
+                        [-0.27614416935401165, 0.2775878231307607, -1.913928572860296e-07],
+                        [-0.27632698153791013, 1.1101684718240596, -1.6613397553127101e-07],
+                        [0.27583961709940663, 1.1100465970347986, 2.3349109140730323e-07],
+                        [0.27583948238086897, 1.1100465913580817, 2.3349099354396645e-07],
+                        [-0.2763271162564669, 1.1101684661473432, -1.6613407339460769e-07],
+                        [-0.27632698153791013, 1.1101684718240596, -1.6613397553127101e-07],
+                        [-0.2763271162564669, 1.1101684661473432, -1.6613407339460769e-07],
+                        [-0.27614430407256974, 0.27758781745404004, -1.9139295514936631e-07],
+                        [-1.1043942020285564, 0.2777706296379332, -7.908305555572311e-07],
+                        [-1.1043940673100048, 0.2777706353146552, -7.90830457693897e-07],
+                        [-1.1042721925207435, -0.277283130480879, -8.076697121970679e-07],
+                        [-1.1042723272392956, -0.2772831361575999, -8.076698100604056e-07],
+                        [-1.1043942020285564, 0.2777706296379332, -7.908305555572311e-07],
+                        [-1.1042723272392956, -0.2772831361575999, -8.076698100604056e-07],
+                        [-0.276022429283306, -0.2774659483414943, -2.0823220965253864e-07],
+                        [-0.2758396170994102, -1.1100465970348, -2.3349109140729796e-07],
+                        [-0.27583948238085565, -1.1100465913580786, -2.3349099354396076e-07],
+                        [-0.27602229456474703, -0.2774659426647736, -2.0823211178920218e-07],
+                        [-0.276022429283306, -0.2774659483414943, -2.0823220965253864e-07],
+                        [-0.2758396170994102, -1.1100465970348, -2.3349109140729796e-07],
+                        [0.276326981537907, -1.1101684718240636, 1.6613397553127612e-07],
+                        [0.2763271162564531, -1.1101684661473408, 1.6613407339461295e-07],
+                        [-0.27583948238085565, -1.1100465913580786, -2.3349099354396076e-07],
+                        [-0.2758396170994102, -1.1100465970348, -2.3349109140729796e-07],
+                        [0.276326981537907, -1.1101684718240636, 1.6613397553127612e-07],
+                        [0.27614416935402675, -0.2775878231307562, 1.9139285728603528e-07],
+                        [1.1043940673100092, -0.27777063531465007, 7.908304576938965e-07],
+                        [1.1043942020285566, -0.2777706296379296, 7.90830555557233e-07],
+                        [0.27614430407258217, -0.27758781745403516, 1.9139295514937222e-07],
+                        [0.27614416935402675, -0.2775878231307562, 1.9139285728603528e-07],
+                        [1.1043940673100092, -0.27777063531465007, 7.908304576938965e-07],
+                        [1.1042721925207433, 0.2772831304808836, 8.076697121970698e-07],
+                        [0.27602229456475014, 0.2774659426647772, 2.0823211178920748e-07],
+                        [0.2760224292833038, 0.27746594834149785, 2.0823220965254452e-07],
+                        [1.1042723272392925, 0.2772831361576038, 8.076698100604056e-07],
+                        [1.1042721925207433, 0.2772831304808836, 8.076697121970698e-07],
+                        [0.27602229456475014, 0.2774659426647772, 2.0823211178920748e-07],
+                        [0.27583948238086897, 1.1100465913580817, 2.3349099354396645e-07],
+                        [0.27583961709940663, 1.1100465970347986, 2.3349109140730323e-07],
+                        [-0.27632698153791013, 1.1101684718240596, -1.6613397553127101e-07],
+                        [-0.2763271162564669, 1.1101684661473432, -1.6613407339460769e-07],
+                        [-0.27614430407256974, 0.27758781745404004, -1.9139295514936631e-07],
+                        [-0.27614416935401165, 0.2775878231307607, -1.913928572860296e-07],
+                        [-1.1043940673100048, 0.2777706353146552, -7.90830457693897e-07],
+                        [-1.1043942020285564, 0.2777706296379332, -7.908305555572311e-07]
+                    ],
+                    "form": "open",
+                    "knots": [
+                        0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0, 12.0, 13.0, 14.0, 15.0, 16.0, 17.0, 18.0, 19.0, 20.0, 21.0, 22.0, 23.0, 24.0, 25.0, 26.0, 27.0, 28.0, 29.0, 30.0, 31.0, 32.0, 33.0, 34.0, 35.0, 36.0, 37.0, 38.0, 39.0, 40.0, 41.0, 42.0, 43.0, 44.0, 45.0, 46.0, 47.0, 48.0, 49.0, 50.0, 51.0, 52.0, 53.0, 54.0
+                    ],
+                    "degree": 1
+                }
+            }
+        ]
+    }
+}
+
+
+def pack_guide_shapes(shapes_data):
+    """
+    Converts the guide shapes library to API arrays ready to be passed to MFnNurbsCurve.create.
+
+    Args:
+        shapes_data (dict): Guide shapes keyed by type, as stored in GUIDE_SHAPES_DATA.
+    Returns:
+        dict: Tuples of (MPointArray, MDoubleArray, degree, form) per shape, keyed by type.
+    """
+    form_flags = {
+        "open": om.MFnNurbsCurve.kOpen,
+        "closed": om.MFnNurbsCurve.kClosed,
+        "periodic": om.MFnNurbsCurve.kPeriodic
+    }
+
+    packed = {}
+    for type, type_data in shapes_data.items():
+        packed[type] = tuple(
+            (
+                om.MPointArray([om.MPoint(pt[0], pt[1], pt[2]) for pt in shape_data["curve"]["cvs"]]),
+                om.MDoubleArray(shape_data["curve"]["knots"]),
+                shape_data["curve"]["degree"],
+                form_flags.get(shape_data["curve"]["form"], om.MFnNurbsCurve.kOpen),
+            )
+            for shape_data in type_data.get("shapes", [])
+        )
+    return packed
+
+# Packed once at import, every guide reuses the same arrays.
+GUIDE_SHAPES = pack_guide_shapes(GUIDE_SHAPES_DATA)
+
+# Source shapes per type when GuideCreation.share_shapes is enabled.
+SHARED_GUIDE_SHAPES = {}
+
+
 class GuideCreation(object):
     """
     Base class to create guides in the Maya scene.
@@ -16,6 +222,10 @@ class GuideCreation(object):
 
     position_data = {}
     value = 0
+    # If True the guide shapes are created once per type and instanced under every guide.
+    share_shapes = False
+    # If True the connector lines are drawn by one ggGuideDisplay node per module instead of a curve per guide pair.
+    use_display_node = True
 
     def build_curves_from_template(self, type, transform_name):
         """
@@ -23,232 +233,81 @@ class GuideCreation(object):
         If a specific target transform name is provided, it filters the curves to only create those associated with that transform.
         If no target transform name is provided, it creates all curves defined in the template.
         """
-            
-        curve_data = {
-            "joint": {
-                "shapes": [
-                    {
-                        "curve": {
-                            "cvs": [
-                                [-0.22838263, 8.743786e-17, 0.22838263],
-                                [-0.32298181, -1.9776932e-17, 2.0788098e-17],
-                                [-0.22838263, -1.1540666e-16, -0.22838263],
-                                [-8.1458056e-17, -1.4343274e-16, -0.32298181],
-                                [0.22838263, -8.743786e-17, -0.22838263],
-                                [0.32298181, 1.9776932e-17, -3.1342143e-17],
-                                [0.22838263, 1.1540666e-16, 0.22838263],
-                                [-2.0669707e-17, 1.4343274e-16, 0.32298181],
-                                [-0.22838263, 8.743786e-17, 0.22838263],
-                                [-0.32298181, -1.9776932e-17, 2.0788098e-17],
-                                [-0.22838263, -1.1540666e-16, -0.22838263]
-                            ],
-                            "form": "periodic",
-                            "knots": [-2.0, -1.0, 0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0],
-                            "degree": 3
-                        }
-                    },
-                    {
-                        "curve": {
-                            "cvs": [
-                                [-1.908927e-20, -0.22838263, 0.22838263],
-                                [2.6778678e-17, -0.32298181, 9.250447e-17],
-                                [-1.908927e-20, -0.22838263, -0.22838263],
-                                [-6.4714622e-17, -8.8459802e-17, -0.32298181],
-                                [-1.2941016e-16, 0.22838263, -0.22838263],
-                                [-1.5620792e-16, 0.32298181, -1.0305851e-16],
-                                [-1.2941016e-16, 0.22838263, 0.22838263],
-                                [-6.4714622e-17, 1.1576128e-16, 0.32298181],
-                                [-1.908927e-20, -0.22838263, 0.22838263],
-                                [2.6778678e-17, -0.32298181, 9.250447e-17],
-                                [-1.908927e-20, -0.22838263, -0.22838263]
-                            ],
-                            "form": "periodic",
-                            "knots": [-2.0, -1.0, 0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0],
-                            "degree": 3
-                        }
-                    },
-                    {
-                        "curve": {
-                            "cvs": [
-                                [-0.22838263, -0.22838263, -1.2973237e-17],
-                                [-0.32298181, -1.9776932e-17, -1.8765766e-17],
-                                [-0.22838263, 0.22838263, -1.2973237e-17],
-                                [-8.1458056e-17, 0.32298181, 1.011166e-18],
-                                [0.22838263, 0.22838263, 1.4995569e-17],
-                                [0.32298181, 3.2353309e-17, 2.0788098e-17],
-                                [0.22838263, -0.22838263, 1.4995569e-17],
-                                [-2.0669707e-17, -0.32298181, 1.011166e-18],
-                                [-0.22838263, -0.22838263, -1.2973237e-17],
-                                [-0.32298181, -1.9776932e-17, -1.8765766e-17],
-                                [-0.22838263, 0.22838263, -1.2973237e-17]
-                            ],
-                            "form": "periodic",
-                            "knots": [-2.0, -1.0, 0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0],
-                            "degree": 3
-                        }
-                    }
-                ]
-            },
-            "arrow": {
-                "shapes": [
-                    {
-                        "curve": {
-                            "cvs": [
-                                [0.05710937039931652, -0.46208100343651526, 1.2381136152831843e-06],
-                                [-0.13243611287906498, -0.43980584749283874, 1.1784288984233384e-06],
-                                [-0.2709619403561311, -0.46741316704204877, 1.2524007734001178e-06],
-                                [-0.3110801360209462, -0.4997154863303799, 1.3389525706362542e-06],
-                                [-0.3125322482823646, -0.5452255108954519, 1.4608934871137462e-06],
-                                [-0.3279198465141865, -1.0274752154006066, 2.7530477212710005e-06],
-                                [-0.3293719587755938, -1.072985239965675, 2.874988637748483e-06],
-                                [-0.2913151372523647, -1.1052875592540063, 2.96154043498462e-06],
-                                [-0.1504102897778976, -1.1343047230011487, 3.0392898885329146e-06],
-                                [0.040251692463613487, -1.1134394112554025, 2.9833827502445854e-06],
-                                [0.9838829618428812, -0.9500234372888587, 2.545521118154057e-06],
-                                [1.0820129424698943, -0.8688846951636224, 2.3281155537506556e-06],
-                                [1.1222758743474053, -0.7876195094560698, 2.1103711926434997e-06],
-                                [1.0843407745637117, -0.7055646343449953, 1.8905109142078366e-06],
-                                [0.9885386260305203, -0.623383315651595, 1.6703118390683945e-06],
-                                [0.05710937039931652, -0.46208100343651526, 1.2381136152831843e-06]
-                            ],
-                            "form": "open",
-                            "knots": [
-                                0.0, 0.0, 0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0, 12.0, 13.0, 13.0, 13.0
-                            ],
-                            "degree": 3
-                        }
-                    }
-                ]
-            },
-            "settings": {
-                "shapes": [
-                    {
-                        "curve": {
-                            "cvs": [
-                                [0.27583961709940663, 1.1100465970347986, 2.3349109140730323e-07],
-                                [0.2760224292833038, 0.27746594834149785, 2.0823220965254452e-07],
-                                [1.1042723272392925, 0.2772831361576038, 8.076698100604056e-07],
-                                [1.1043942020285566, -0.2777706296379296, 7.90830555557233e-07],
-                                [0.27614430407258217, -0.27758781745403516, 1.9139295514937222e-07],
-                                [0.2763271162564531, -1.1101684661473408, 1.6613407339461295e-07],
-                                [-0.27583948238085565, -1.1100465913580786, -2.3349099354396076e-07],
-                                [-0.27602229456474703, -0.2774659426647736, -2.0823211178920218e-07],
-                                [-1.1042721925207435, -0.277283130480879, -8.076697121970679e-07],
-                                [-1.1043940673100048, 0.2777706353146552, -7.90830457693897e-07],
-                                [-0.27614416935401165, 0.2775878231307607, -1.913928572860296e-07],
-                                [-0.27632698153791013, 1.1101684718240596, -1.6613397553127101e-07],
-                                [0.27583961709940663, 1.1100465970347986, 2.3349109140730323e-07],
-                                [0.27583948238086897, 1.1100465913580817, 2.3349099354396645e-07],
-                                [-0.2763271162564669, 1.1101684661473432, -1.6613407339460769e-07],
-                                [-0.27632698153791013, 1.1101684718240596, -1.6613397553127101e-07],
-                                [-0.2763271162564669, 1.1101684661473432, -1.6613407339460769e-07],
-                                [-0.27614430407256974, 0.27758781745404004, -1.9139295514936631e-07],
-                                [-1.1043942020285564, 0.2777706296379332, -7.908305555572311e-07],
-                                [-1.1043940673100048, 0.2777706353146552, -7.90830457693897e-07],
-                                [-1.1042721925207435, -0.277283130480879, -8.076697121970679e-07],
-                                [-1.1042723272392956, -0.2772831361575999, -8.076698100604056e-07],
-                                [-1.1043942020285564, 0.2777706296379332, -7.908305555572311e-07],
-                                [-1.1042723272392956, -0.2772831361575999, -8.076698100604056e-07],
-                                [-0.276022429283306, -0.2774659483414943, -2.0823220965253864e-07],
-                                [-0.2758396170994102, -1.1100465970348, -2.3349109140729796e-07],
-                                [-0.27583948238085565, -1.1100465913580786, -2.3349099354396076e-07],
-                                [-0.27602229456474703, -0.2774659426647736, -2.0823211178920218e-07],
-                                [-0.276022429283306, -0.2774659483414943, -2.0823220965253864e-07],
-                                [-0.2758396170994102, -1.1100465970348, -2.3349109140729796e-07],
-                                [0.276326981537907, -1.1101684718240636, 1.6613397553127612e-07],
-                                [0.2763271162564531, -1.1101684661473408, 1.6613407339461295e-07],
-                                [-0.27583948238085565, -1.1100465913580786, -2.3349099354396076e-07],
-                                [-0.2758396170994102, -1.1100465970348, -2.3349109140729796e-07],
-                                [0.276326981537907, -1.1101684718240636, 1.6613397553127612e-07],
-                                [0.27614416935402675, -0.2775878231307562, 1.9139285728603528e-07],
-                                [1.1043940673100092, -0.27777063531465007, 7.908304576938965e-07],
-                                [1.1043942020285566, -0.2777706296379296, 7.90830555557233e-07],
-                                [0.27614430407258217, -0.27758781745403516, 1.9139295514937222e-07],
-                                [0.27614416935402675, -0.2775878231307562, 1.9139285728603528e-07],
-                                [1.1043940673100092, -0.27777063531465007, 7.908304576938965e-07],
-                                [1.1042721925207433, 0.2772831304808836, 8.076697121970698e-07],
-                                [0.27602229456475014, 0.2774659426647772, 2.0823211178920748e-07],
-                                [0.2760224292833038, 0.27746594834149785, 2.0823220965254452e-07],
-                                [1.1042723272392925, 0.2772831361576038, 8.076698100604056e-07],
-                                [1.1042721925207433, 0.2772831304808836, 8.076697121970698e-07],
-                                [0.27602229456475014, 0.2774659426647772, 2.0823211178920748e-07],
-                                [0.27583948238086897, 1.1100465913580817, 2.3349099354396645e-07],
-                                [0.27583961709940663, 1.1100465970347986, 2.3349109140730323e-07],
-                                [-0.27632698153791013, 1.1101684718240596, -1.6613397553127101e-07],
-                                [-0.2763271162564669, 1.1101684661473432, -1.6613407339460769e-07],
-                                [-0.27614430407256974, 0.27758781745404004, -1.9139295514936631e-07],
-                                [-0.27614416935401165, 0.2775878231307607, -1.913928572860296e-07],
-                                [-1.1043940673100048, 0.2777706353146552, -7.90830457693897e-07],
-                                [-1.1043942020285564, 0.2777706296379332, -7.908305555572311e-07]
-                            ],
-                            "form": "open",
-                            "knots": [
-                                0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0, 12.0, 13.0, 14.0, 15.0, 16.0, 17.0, 18.0, 19.0, 20.0, 21.0, 22.0, 23.0, 24.0, 25.0, 26.0, 27.0, 28.0, 29.0, 30.0, 31.0, 32.0, 33.0, 34.0, 35.0, 36.0, 37.0, 38.0, 39.0, 40.0, 41.0, 42.0, 43.0, 44.0, 45.0, 46.0, 47.0, 48.0, 49.0, 50.0, 51.0, 52.0, 53.0, 54.0
-                            ],
-                            "degree": 1
-                        }
-                    }
-                ]
-            }
-        }
 
         created_transforms = []
-        type_data = curve_data[type]
-        shapes_data = type_data.get("shapes", [])
+
+        transform_name = self.unique_guide_name(transform_name)
 
         dag_modifier = om.MDagModifier()
         transform_obj = dag_modifier.createNode("transform")
+        dag_modifier.renameNode(transform_obj, transform_name)
+        self.create_guide_shapes(dag_modifier, type, transform_obj, transform_name)
         dag_modifier.doIt()
-        transform_fn = om.MFnDagNode(transform_obj)
+
+        created_transforms.append(om.MFnDagNode(transform_obj).name())
+
+        return created_transforms
+
+    def unique_guide_name(self, transform_name, reserved=()):
+        """
+        Returns a guide name that does not exist in the scene, adding a number before the _GUIDE suffix if needed.
+
+        Args:
+            transform_name (str): The desired name.
+            reserved (set): Names already taken by nodes that are not created yet.
+        Returns:
+            str: The unique name.
+        """
         i = 1
-        while cmds.objExists(transform_name):
+        while cmds.objExists(transform_name) or transform_name in reserved:
             if not re.search(r"\d+_GUIDE$", transform_name):
                 transform_name = transform_name.replace("_GUIDE", f"0{i}_GUIDE")
             else:
                 transform_name = transform_name.replace(f"{i-1}_GUIDE", f"{i}_GUIDE")
             i += 1
-        final_name = transform_fn.setName(transform_name)
-        created_transforms.append(final_name)
+        return transform_name
+
+    def create_guide_shapes(self, dag_modifier, type, transform_obj, transform_name):
+        """
+        Queues the curve shapes of a guide type under the given transform. The curve geometry is written on the cached
+        attribute of the shapes, so nothing is created before the modifier runs.
+
+        Args:
+            dag_modifier (om.MDagModifier): Modifier receiving the shapes.
+            type (str): Guide type, "joint", "arrow" or "settings".
+            transform_obj (om.MObject): Transform receiving the shapes.
+            transform_name (str): Name the transform has once the modifier runs.
+        Returns:
+            list: The created shape objects, shared shapes are not included.
+        """
+        shared = SHARED_GUIDE_SHAPES.get(type) if self.share_shapes else None
+        if shared and all(handle.isValid() for handle, _ in shared):
+            for handle, path in shared:
+                try:
+                    path = om.MDagPath.getAPathTo(handle.object()).fullPathName()
+                except RuntimeError:
+                    pass
+                dag_modifier.commandToExecute(f'parent -shape -addObject "{path}" "{transform_name}"')
+            return []
 
         created_shapes = []
-        for idx, shape_data in enumerate(shapes_data):
-            curve_info = shape_data["curve"]
-            cvs = curve_info["cvs"]
-            degree = curve_info["degree"]
-            knots = curve_info["knots"]
-            form = curve_info["form"]
-
-            form_flags = {
-                "open": om.MFnNurbsCurve.kOpen,
-                "closed": om.MFnNurbsCurve.kClosed,
-                "periodic": om.MFnNurbsCurve.kPeriodic
-            }
-            form_flag = form_flags.get(form, om.MFnNurbsCurve.kOpen)
-
-            points = om.MPointArray()
-            for pt in cvs:
-                points.append(om.MPoint(pt[0], pt[1], pt[2]))
-
-            curve_fn = om.MFnNurbsCurve()
-            shape_obj = curve_fn.create(
-                points,
-                knots,
-                degree,
-                form_flag,
-                False,
-                True,
-                transform_obj
-            )
+        for idx, (points, knots, degree, form_flag) in enumerate(GUIDE_SHAPES[type]):
+            curve_data = om.MFnNurbsCurveData().create()
+            om.MFnNurbsCurve().create(points, knots, degree, form_flag, False, True, curve_data)
 
-            shape_fn = om.MFnDagNode(shape_obj)
-            shape_fn.setName(f"{type}Shape{idx}")
+            shape_obj = dag_modifier.createNode("nurbsCurve", transform_obj)
+            dag_modifier.renameNode(shape_obj, f"{type}Shape{idx}")
 
             fn_dep = om.MFnDependencyNode(shape_obj)
-            fn_dep.findPlug('alwaysDrawOnTop', False).setBool(True)
+            dag_modifier.newPlugValue(fn_dep.findPlug("cached", False), curve_data)
+            dag_modifier.newPlugValueBool(fn_dep.findPlug("alwaysDrawOnTop", False), True)
 
             created_shapes.append(shape_obj)
 
-        return created_transforms
+        if self.share_shapes:
+            SHARED_GUIDE_SHAPES[type] = [(om.MObjectHandle(shape_obj), f"{transform_name}|{type}Shape{idx}") for idx, shape_obj in enumerate(created_shapes)]
+
+        return created_shapes
 
     def controller_creator(self,name, type, parent=None, match=None, color=6):
         """
@@ -292,145 +351,325 @@ class GuideCreation(object):
 
         return ctl
 
+    def add_guide_attribute(self, dag_modifier, node, attr_type, name, value=None, fields=None):
+        """
+        Queues a non keyable attribute creation on a guide in the given modifier.
+
+        Args:
+            dag_modifier (om.MDagModifier): Modifier receiving the attribute.
+            node (om.MObject): The guide.
+            attr_type (str): "float", "long" or "enum".
+            name (str): Long name of the attribute.
+            value (float, optional): Default value.
+            fields (list, optional): Enum field names.
+        """
+        if attr_type == "enum":
+            attr_fn = om.MFnEnumAttribute()
+            attr = attr_fn.create(name, name, value or 0)
+            for idx, field in enumerate(fields):
+                attr_fn.addField(field, idx)
+        else:
+            attr_fn = om.MFnNumericAttribute()
+            numeric_type = om.MFnNumericData.kFloat if attr_type == "float" else om.MFnNumericData.kLong
+            attr = attr_fn.create(name, name, numeric_type, value or 0)
+        attr_fn.keyable = False
+        dag_modifier.addAttribute(node, attr)
+
+    def lock_guide_attributes(self, dg_modifier, name, attrs=("scaleX", "scaleY", "scaleZ", "visibility")):
+        """
+        Queues the lock of guide attributes, they are hidden from the channel box too.
+
+        Args:
+            dg_modifier (om.MDGModifier): Modifier receiving the locks, after the connections to the locked attributes.
+            name (str): Name of the guide once the modifiers run.
+            attrs (tuple): Attributes to lock.
+        """
+        for attr in attrs:
+            dg_modifier.commandToExecute(f'setAttr -keyable false -channelBox false -lock true "{name}.{attr}"')
+
+    def create_connector(self, dag_modifier, dg_modifier, start, end, start_name, end_name, index):
+        """
+        Creates a display curve between two guides, driven by two decomposeMatrix nodes.
+
+        Args:
+            dag_modifier (om.MDagModifier): Modifier receiving the curve.
+            dg_modifier (om.MDGModifier): Modifier receiving the decomposeMatrix nodes and the connections.
+            start (om.MObject): First guide.
+            end (om.MObject): Second guide.
+            start_name (str): Name of the first guide.
+            end_name (str): Name of the second guide.
+            index (int): Index of the first guide in the module.
+        """
+        curve_name = f"{start_name}_to_{end_name}_CRV"
+        curve_trn = dag_modifier.createNode("transform", self.buffers_obj)
+        dag_modifier.renameNode(curve_trn, curve_name)
+
+        curve_data = om.MFnNurbsCurveData().create()
+        om.MFnNurbsCurve().create(om.MPointArray([om.MPoint(1, 0, 0), om.MPoint(2, 0, 0)]), [0.0, 1.0], 1, om.MFnNurbsCurve.kOpen, False, True, curve_data)
+        curve_shape = dag_modifier.createNode("nurbsCurve", curve_trn)
+        dag_modifier.renameNode(curve_shape, f"{curve_name}Shape")
+
+        curve_dep = om.MFnDependencyNode(curve_shape)
+        curve_trn_dep = om.MFnDependencyNode(curve_trn)
+        dag_modifier.newPlugValue(curve_dep.findPlug("cached", False), curve_data)
+        dag_modifier.newPlugValueBool(curve_trn_dep.findPlug("overrideEnabled", False), True)
+        dag_modifier.newPlugValueInt(curve_trn_dep.findPlug("overrideDisplayType", False), 1)
+
+        control_points = curve_dep.findPlug("controlPoints", False)
+        for i, (guide, suffix) in enumerate(((start, index), (end, index + 1))):
+            dcmp = dg_modifier.createNode("decomposeMatrix")
+            dg_modifier.renameNode(dcmp, f"{start_name}_to_{end_name}{suffix}_DCM")
+            world_matrix = om.MFnDependencyNode(guide).findPlug("worldMatrix", False).elementByLogicalIndex(0)
+            dg_modifier.connect(world_matrix, om.MFnDependencyNode(dcmp).findPlug("inputMatrix", False))
+            dg_modifier.connect(om.MFnDependencyNode(dcmp).findPlug("outputTranslate", False), control_points.elementByLogicalIndex(i))
+
+    def create_display_node(self, dag_modifier, dg_modifier, name, guide_objs, segments):
+        """
+        Creates a ggGuideDisplay locator drawing all the connector lines of the module.
+
+        Args:
+            dag_modifier (om.MDagModifier): Modifier receiving the display node.
+            dg_modifier (om.MDGModifier): Modifier receiving the connections.
+            name (str): Base name of the display node.
+            guide_objs (list): The guides of the module.
+            segments (list): Pairs of guide indices to join with a line.
+        """
+        display_trn = dag_modifier.createNode("transform", self.buffers_obj)
+        dag_modifier.renameNode(display_trn, f"{name}GuideDisplay_TRN")
+        display_obj = dag_modifier.createNode("ggGuideDisplay", display_trn)
+        dag_modifier.renameNode(display_obj, f"{name}GuideDisplay_TRNShape")
+        display_dep = om.MFnDependencyNode(display_obj)
+
+        input_matrix = display_dep.findPlug("inputMatrix", False)
+        for i, guide_obj in enumerate(guide_objs):
+            world_matrix = om.MFnDependencyNode(guide_obj).findPlug("worldMatrix", False).elementByLogicalIndex(0)
+            dg_modifier.connect(world_matrix, input_matrix.elementByLogicalIndex(i))
+
+        segment_plug = display_dep.findPlug("segment", False)
+        for i, (start, end) in enumerate(segments):
+            element = segment_plug.elementByLogicalIndex(i)
+            dg_modifier.newPlugValueInt(element.child(0), start)
+            dg_modifier.newPlugValueInt(element.child(1), end)
+
     def create_guides(self, guides_trn, buffers_trn):
+        """
+        Creates the guides of the module for every side.
+        The dag nodes of a side (guides, shapes, connectors and aim arrow) are queued in one MDagModifier, the dependency
+        nodes, connections, positions and locks in one MDGModifier. Guide positions are converted to local translations
+        beforehand, so no temporary nodes are needed.
+
+        Args:
+            guides_trn (str): Group of the guides.
+            buffers_trn (str): Group of the display buffers.
+        Returns:
+            list: The guides of the last created side.
+        """
+        start_time = time.perf_counter()
+
         self.guides_trn = guides_trn
         self.buffers_trn = buffers_trn
 
+        sel_list = om.MSelectionList()
+        sel_list.add(guides_trn)
+        sel_list.add(buffers_trn)
+        guides_obj = sel_list.getDependNode(0)
+        self.buffers_obj = sel_list.getDependNode(1)
+        guides_dep = om.MFnDependencyNode(guides_obj)
+        guide_scale = guides_dep.findPlug("guideScale", False) if guides_dep.hasAttribute("guideScale") else None
+        scale = guide_scale.asDouble() if guide_scale is not None else 1.0
+        guides_world = sel_list.getDagPath(0).inclusiveMatrix()
+
+        use_display_node = self.use_display_node and core.load_plugin()
+
         for side in self.sides:
             color = {"L": 6, "R": 13}.get(side, 17)
             self.guides = []
+
+            dag_modifier = om.MDagModifier()
+            dg_modifier = om.MDGModifier()
+            guide_objs = []
+            guide_worlds = []
+            reserved = set()
+
             for i, (joint_name, position) in enumerate(self.position_data.items()):
-                temp_pos = cmds.createNode("transform", name=f"{side}_{joint_name}_temp")
                 type = "joint"
-                cmds.setAttr(temp_pos + ".translate", position[0], position[1], position[2])
-
-                parent = self.guides_trn if not self.guides else self.guides[-1]
+                parent_index = len(guide_objs) - 1
                 if "Settings" in joint_name:
-                    parent = self.guides[0]
+                    parent_index = 0
                     type = "settings"
-                
+
                 if "localHip" in joint_name:
-                    parent = self.guides_trn
-                    
+                    parent_index = -1
+
+                if i and ("metacarpal" in joint_name or "Metacarpal" in joint_name):
+                    parent_index = 0
+
+                parent = guide_objs[parent_index] if parent_index >= 0 else guides_obj
+                parent_world = guide_worlds[parent_index] if parent_index >= 0 else guides_world
+
+                guide_name = self.unique_guide_name(f"{side}_{joint_name}_GUIDE", reserved)
+                reserved.add(guide_name)
 
-                guide = self.controller_creator(
-                    f"{side}_{joint_name}",
-                    type=type,
-                    parent=parent,
-                    match=temp_pos,
-                    color=color
-                )
+                guide_obj = dag_modifier.createNode("transform", parent)
+                dag_modifier.renameNode(guide_obj, guide_name)
+                self.create_guide_shapes(dag_modifier, type, guide_obj, guide_name)
 
                 if i == 0:
                     if hasattr(self, "twist_joints"):
-                        attr_name = "jointTwist"
-                        cmds.addAttr(guide, longName=attr_name, attributeType="float", defaultValue=self.twist_joints, keyable=False)
-                        cmds.setAttr(f"{guide}.{attr_name}", self.twist_joints)
-                    
+                        self.add_guide_attribute(dag_modifier, guide_obj, "float", "jointTwist", value=self.twist_joints)
+
                     if self.controller_number:
-                        attr_name = "controllerNumber"
-                        cmds.addAttr(guide, longName=attr_name, attributeType="long", defaultValue=self.controller_number, keyable=False)
-                        cmds.setAttr(f"{guide}.{attr_name}", self.controller_number)
+                        self.add_guide_attribute(dag_modifier, guide_obj, "long", "controllerNumber", value=self.controller_number)
 
                     if self.prefix:
-                        enum_name = "prefix"
-                        cmds.addAttr(guide, longName=enum_name, attributeType="enum", enumName=self.prefix, keyable=False)
+                        self.add_guide_attribute(dag_modifier, guide_obj, "enum", "prefix", fields=[self.prefix])
 
                     if hasattr(self, "type"):
-                        enum_name = "type"
-                        cmds.addAttr(guide, longName=enum_name, attributeType="enum", enumName="biped:quadruped", keyable=False)
-                        cmds.setAttr(f"{guide}.{enum_name}", 0 if self.type == "biped" else 1)
-
-                    cmds.addAttr(guide, longName="moduleName", attributeType="enum", enumName=self.limb_name, keyable=False)
+                        self.add_guide_attribute(dag_modifier, guide_obj, "enum", "type", value=0 if self.type == "biped" else 1, fields=["biped", "quadruped"])
 
+                    self.add_guide_attribute(dag_modifier, guide_obj, "enum", "moduleName", fields=[self.limb_name])
 
+                # World position to local translation, the guide scale is part of the matrix the children inherit.
+                translation = om.MPoint(position[0], position[1], position[2]) * parent_world.inverse()
+                local = om.MTransformationMatrix()
+                local.setTranslation(om.MVector(translation), om.MSpace.kTransform)
+                local.setScale([scale, scale, scale], om.MSpace.kTransform)
+                guide_worlds.append(local.asMatrix() * parent_world)
 
+                guide_dep = om.MFnDependencyNode(guide_obj)
+                for attr, value in zip(("translateX", "translateY", "translateZ"), (translation.x, translation.y, translation.z)):
+                    dg_modifier.newPlugValueDouble(guide_dep.findPlug(attr, False), value)
+                dg_modifier.newPlugValueBool(guide_dep.findPlug("overrideEnabled", False), True)
+                dg_modifier.newPlugValueInt(guide_dep.findPlug("overrideColor", False), color)
+                if guide_scale is not None:
+                    for attr in ["scaleX", "scaleY", "scaleZ"]:
+                        dg_modifier.connect(guide_scale, guide_dep.findPlug(attr, False))
 
-                cmds.delete(temp_pos)
-                self.guides.append(guide)
-            enum_name = ":".join(self.guides)
-            cmds.addAttr(self.guides[0], longName="guide_name", attributeType="enum", enumName=enum_name, keyable=False)
+                guide_objs.append(guide_obj)
+                self.guides.append(guide_name)
 
-            meta = []
+            self.add_guide_attribute(dag_modifier, guide_objs[0], "enum", "guide_name", fields=self.guides)
 
+            segments = []
             for i in range(len(self.guides) - 1):
                 if "Settings" in self.guides[i+1] or "localHip" in self.guides[i+1]:
                     continue
                 if "metacarpal" in self.guides[i] or "Metacarpal" in self.guides[i]:
-                    if cmds.listRelatives(self.guides[i], parent=True) != [self.guides[0]]:
-                        cmds.parent(self.guides[i], self.guides[0])
-                    curve = cmds.curve(d=1, p=[(1, 0, 0), (2, 0, 0)], n=f"{self.guides[i]}_to_{self.guides[0]}_CRV")
-                    dcmp = cmds.createNode("decomposeMatrix", name=f"{self.guides[i]}_to_{self.guides[0]}{i}_DCM", ss=True)
-                    dcmp02 = cmds.createNode("decomposeMatrix", name=f"{self.guides[i]}_to_{self.guides[0]}{i+1}_DCM", ss=True)
-                    cmds.connectAttr(self.guides[i] + ".worldMatrix[0]", dcmp + ".inputMatrix")
-                    cmds.connectAttr(self.guides[0] + ".worldMatrix[0]", dcmp02 + ".inputMatrix")
-                    cmds.connectAttr(dcmp + ".outputTranslate", curve + ".controlPoints[0]")
-                    cmds.connectAttr(dcmp02 + ".outputTranslate", curve + ".controlPoints[1]")
-                    cmds.parent(curve, self.buffers_trn)
-                    cmds.setAttr(curve + ".overrideEnabled", 1)
-                    cmds.setAttr(curve + ".overrideDisplayType", 1)
+                    segments.append((i, 0))
 
                 if not "metacarpal" in self.guides[i+1]:
-                    curve = cmds.curve(d=1, p=[(1, 0, 0), (2, 0, 0)], n=f"{self.guides[i]}_to_{self.guides[i + 1]}_CRV")
-                    dcmp = cmds.createNode("decomposeMatrix", name=f"{self.guides[i]}_to_{self.guides[i + 1]}{i}_DCM", ss=True)
-                    dcmp02 = cmds.createNode("decomposeMatrix", name=f"{self.guides[i]}_to_{self.guides[i + 1]}{i+1}_DCM", ss=True)
-                    cmds.connectAttr(self.guides[i] + ".worldMatrix[0]", dcmp + ".inputMatrix")
-                    cmds.connectAttr(self.guides[i + 1] + ".worldMatrix[0]", dcmp02 + ".inputMatrix")
-                    cmds.connectAttr(dcmp + ".outputTranslate", curve + ".controlPoints[0]")
-                    cmds.connectAttr(dcmp02 + ".outputTranslate", curve + ".controlPoints[1]")
-                    cmds.parent(curve, self.buffers_trn)
-                    cmds.setAttr(curve + ".overrideEnabled", 1)
-                    cmds.setAttr(curve + ".overrideDisplayType", 1)
-                
-                    
+                    segments.append((i, i + 1))
+
+            if use_display_node:
+                self.create_display_node(dag_modifier, dg_modifier, f"{side}_{self.limb_name}", guide_objs, segments)
+            else:
+                for start, end in segments:
+                    self.create_connector(dag_modifier, dg_modifier, guide_objs[start], guide_objs[end], self.guides[start], self.guides[end], start)
 
+            locked = list(self.guides)
 
             if self.aim_name:
-                arrrow_buffer = self.controller_creator(
-                    f"{side}_{self.limb_name}Buffer",
-                    type="arrow",
-                    parent=self.buffers_trn,
-                    match=None,
-                )
-                cmds.setAttr(arrrow_buffer + ".overrideEnabled", 1)
-                cmds.setAttr(arrrow_buffer + ".overrideDisplayType", 2)
-
-                aimMatrix = cmds.createNode("aimMatrix", name=f"{side}_{self.aim_name}_Aim_AMX", ss=True)
-                cmds.setAttr(aimMatrix + ".primaryInputAxis", 1, 0, 0, type="double3")
-                cmds.setAttr(aimMatrix + ".secondaryInputAxis", 0, -1, 0, type="double3")
-                cmds.setAttr(aimMatrix + ".primaryMode", 1)
-                cmds.setAttr(aimMatrix + ".secondaryMode", 1)
+                arrow_name = self.unique_guide_name(f"{side}_{self.limb_name}Buffer_GUIDE", reserved)
+                arrow_obj = dag_modifier.createNode("transform", self.buffers_obj)
+                dag_modifier.renameNode(arrow_obj, arrow_name)
+                self.create_guide_shapes(dag_modifier, "arrow", arrow_obj, arrow_name)
+                arrow_dep = om.MFnDependencyNode(arrow_obj)
+                dg_modifier.newPlugValueBool(arrow_dep.findPlug("overrideEnabled", False), True)
+                dg_modifier.newPlugValueInt(arrow_dep.findPlug("overrideColor", False), 6)
+                dg_modifier.newPlugValueInt(arrow_dep.findPlug("overrideDisplayType", False), 2)
+
+                aim_matrix = dg_modifier.createNode("aimMatrix")
+                dg_modifier.renameNode(aim_matrix, f"{side}_{self.aim_name}_Aim_AMX")
+                aim_dep = om.MFnDependencyNode(aim_matrix)
+
+                for attr, values in (("primaryInputAxis", (1, 0, 0)), ("secondaryInputAxis", (0, -1, 0))):
+                    plug = aim_dep.findPlug(attr, False)
+                    for child_index, value in enumerate(values):
+                        dg_modifier.newPlugValueDouble(plug.child(child_index), value)
+                dg_modifier.newPlugValueInt(aim_dep.findPlug("primaryMode", False), 1)
+                dg_modifier.newPlugValueInt(aim_dep.findPlug("secondaryMode", False), 1)
 
                 value = self.aim_offset
 
-                cmds.connectAttr(self.guides[1 + value] + ".worldMatrix[0]", aimMatrix + ".inputMatrix")
-                cmds.connectAttr(aimMatrix + ".outputMatrix", arrrow_buffer + ".offsetParentMatrix")
-                cmds.connectAttr(self.guides[2 + value] + ".worldMatrix[0]", aimMatrix + ".primaryTargetMatrix")
-                cmds.connectAttr(self.guides[3 + value] + ".worldMatrix[0]", aimMatrix + ".secondaryTargetMatrix")
+                def world_matrix(obj):
+                    return om.MFnDependencyNode(obj).findPlug("worldMatrix", False).elementByLogicalIndex(0)
+
+                dg_modifier.connect(world_matrix(guide_objs[1 + value]), aim_dep.findPlug("inputMatrix", False))
+                dg_modifier.connect(aim_dep.findPlug("outputMatrix", False), arrow_dep.findPlug("offsetParentMatrix", False))
+                dg_modifier.connect(world_matrix(guide_objs[2 + value]), aim_dep.findPlug("primaryTargetMatrix", False))
+                dg_modifier.connect(world_matrix(guide_objs[3 + value]), aim_dep.findPlug("secondaryTargetMatrix", False))
+
+                locked.append(arrow_name)
+
+            # Locks go last, the guide scale connections have to reach the scale plugs first.
+            for name in locked:
+                self.lock_guide_attributes(dg_modifier, name)
+
+            dag_modifier.doIt()
+            try:
+                dg_modifier.doIt()
+            except RuntimeError:
+                dg_modifier.undoIt()
+                dag_modifier.undoIt()
+                raise
 
         cmds.select(self.guides[0])
+
+        om.MGlobal.displayInfo(f"{self.limb_name} guides loaded in {(time.perf_counter() - start_time) * 1000:.1f} ms.")
+
         return self.guides
 
-def get_data(name, file_name=None):
-    if not file_name or file_name == "_":
-        file_name = "body_template_"
+# Parsed guides template shared by every get_data call, reloaded only when the template path or its modification time changes.
+GUIDES_SNAPSHOT = {"path": None, "mtime": None, "guides": [], "lookups": {}}
+
+def get_guides_snapshot():
+    """
+    Returns the (guide name, world position) pairs of the current guides template, parsing the file once per change.
+    Positions are stored as tuples so the cached values can't be modified through the returned data.
 
-    # final_path = core.init_template_file(ext=".guides", export=False)
+    Returns:
+        dict: The snapshot with the guides list and the memoized lookups.
+    """
     final_path = core.init_template_file(ext=".guides", export=False)
 
+    try:
+        mtime = os.path.getmtime(final_path)
+    except (OSError, TypeError):
+        mtime = None
+
+    if GUIDES_SNAPSHOT["path"] == final_path and GUIDES_SNAPSHOT["mtime"] == mtime:
+        return GUIDES_SNAPSHOT
+
+    guides_list = []
     try:
         with open(final_path, "r") as infile:
             guides_data = json.load(infile)
-    except Exception as e:
-        return [0,0,0]
+        for template_name, guides in guides_data.items():
+            if not isinstance(guides, dict):
+                continue
+            for guide_name, guide_info in guides.items():
+                position = guide_info.get("worldPosition")
+                guides_list.append((guide_name, tuple(position) if position is not None else None))
+    except Exception:
+        guides_list = []
 
-    for template_name, guides in guides_data.items():
-        if not isinstance(guides, dict):
-            continue
-        for guide_name, guide_info in guides.items():
-            if name in guide_name:
-                return guide_info.get("worldPosition")
-    return [0,0,0]
+    GUIDES_SNAPSHOT.update({"path": final_path, "mtime": mtime, "guides": guides_list, "lookups": {}})
+
+    return GUIDES_SNAPSHOT
+
+def get_data(name, file_name=None):
+    if not file_name or file_name == "_":
+        file_name = "body_template_"
+
+    snapshot = get_guides_snapshot()
+    lookups = snapshot["lookups"]
+
+    if name not in lookups:
+        lookups[name] = next((position for guide_name, position in snapshot["guides"] if name in guide_name), (0, 0, 0))
+
+    # The snapshot keeps tuples, every caller gets its own list.
+    position = lookups[name]
+    return list(position) if position is not None else None
 
 
 
@@ -706,6 +945,38 @@ class JiggleJoint(GuideCreation):
         }
         self.position_data.update(position_data)
 
+# Guide modules shown in the UI, with the constructor keyword of every create_guide_module option the module takes.
+GUIDE_MODULES = {
+    "Arm Module": (ArmGuideCreation, {"side": "side", "twist_joints": "twist_joints"}),
+    "Front Leg Module": (FrontLegGuideCreation, {"side": "side", "twist_joints": "twist_joints"}),
+    "Leg Module": (LegGuideCreation, {"side": "side", "twist_joints": "twist_joints"}),
+    "Back Leg Module": (BackLegGuideCreation, {"side": "side", "twist_joints": "twist_joints"}),
+    "Spine Module": (SpineGuideCreation, {"side": "side", "twist_joints": "twist_joints", "type": "type"}),
+    "Neck Module": (NeckGuideCreation, {"side": "side", "twist_joints": "twist_joints", "type": "type"}),
+    "Hand Module": (HandGuideCreation, {"side": "side", "controller_number": "controller_number"}),
+    "Variable Fk Module": (VariableFK, {"sides": "side", "quantity": "controller_number", "prefix": "prefix", "joints": "twist_joints"}),
+}
+
+def create_guide_module(module_name, side="L", twist_joints=5, type=None, controller_number=5, prefix=None):
+    """
+    Constructs only the requested guide module from the GUIDE_MODULES table.
+
+    Args:
+        module_name (str): UI name of the module, e.g. "Arm Module".
+        side (str): Side of the module.
+        twist_joints (int): Number of twist joints.
+        type (str): Rig type of the module (biped or quadruped).
+        controller_number (int): Number of controllers.
+        prefix (str): Prefix of the module.
+    Returns:
+        GuideCreation: The guide module, None if the module name is not registered.
+    """
+    if module_name not in GUIDE_MODULES:
+        return None
+    module_class, keywords = GUIDE_MODULES[module_name]
+    options = {"side": side, "twist_joints": twist_joints, "type": type, "controller_number": controller_number, "prefix": prefix}
+    return module_class(**{keyword: options[option] for keyword, option in keywords.items()})
+
 def biped_rebuild_guides():
     """
     Rebuilds the guides in the Maya scene.
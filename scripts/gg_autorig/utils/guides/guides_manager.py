@@ -1,5 +1,5 @@
 import maya.cmds as cmds
-import maya.OpenMaya as om
+import maya.api.OpenMaya as om
 import os
 import json
 from gg_autorig.utils import core
@@ -103,13 +103,272 @@ def guides_export(skelTree = None):
 
         om.MGlobal.displayInfo(f"Guides data exported to {TEMPLATE_FILE}")
 
+TEMPLATE_CACHE = {}
+
+def load_template(path):
+    """
+    Reads a guides template, the file is only read again when it changes on disk.
+
+    Args:
+        path (str): The template file.
+    Returns:
+        dict: The template data.
+    """
+    mtime = os.path.getmtime(path)
+    cached = TEMPLATE_CACHE.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "r") as infile:
+        guides_data = json.load(infile)
+    TEMPLATE_CACHE[path] = (mtime, guides_data)
+    return guides_data
+
+class GuideRegistry:
+    """
+    Guides imported during a build.
+    The first request creates the guides of every module being built in a single batch, later requests return the
+    existing transforms. Every request is recorded under the module that owns the guide, so a rebuild of the same template
+    can skip the guides no module used.
+    """
+
+    def __init__(self, skip=None, modules=None):
+        """
+        Args:
+            skip (set): Guides left out of the first batch, they are still created if a module requests them.
+            modules (list): Module guides being built, the first batch creates them with their descendents.
+        """
+        self.path = None
+        self.mtime = None
+        self.guides_data = {}
+        self.parent_map = {}
+        self.children = {}
+        self.handles = {}
+        self.usage = {}
+        self.skip = set(skip or ())
+        self.modules = list(modules or ())
+        self.batches = 0
+
+    def load(self):
+        """
+        Reads the guides template once per registry.
+        """
+        if self.path is not None:
+            return
+
+        self.path = core.init_template_file(ext=".guides", export=False)
+        self.mtime = os.path.getmtime(self.path)
+        guides_data = load_template(self.path)
+
+        guide_set_name = next(iter(guides_data))
+        self.guides_data = guides_data[guide_set_name]
+        self.parent_map = {joint: data.get("parent") for joint, data in self.guides_data.items()}
+        self.children = {}
+        for joint, parent in self.parent_map.items():
+            self.children.setdefault(parent, []).append(joint)
+
+    def descendants(self, joint_name):
+        """
+        Args:
+            joint_name (str): The guide.
+        Returns:
+            list: Descendents of the guide breadth first, the settings guides and their children are left out.
+        """
+        descendants = []
+        processing_queue = list(self.children.get(joint_name, []))
+        while processing_queue:
+            joint = processing_queue.pop(0)
+            if "Settings" in joint:
+                continue
+            descendants.append(joint)
+            processing_queue.extend(self.children.get(joint, []))
+        return descendants
+
+    def module_of(self, joint_name):
+        """
+        Args:
+            joint_name (str): The guide.
+        Returns:
+            str: The closest guide up the template hierarchy with a module name, the guide itself if there is none.
+        """
+        joint = joint_name
+        while joint in self.guides_data:
+            if self.guides_data[joint].get("moduleName", "Child") != "Child":
+                return joint
+            joint = self.parent_map.get(joint)
+        return joint_name
+
+    def exists(self, joint_name):
+        """
+        Args:
+            joint_name (str): The guide.
+        Returns:
+            bool: True if the guide was imported by this registry and still exists.
+        """
+        handle = self.handles.get(joint_name)
+        return handle is not None and handle.isAlive() and handle.isValid()
+
+    def name(self, joint_name):
+        """
+        Args:
+            joint_name (str): An imported guide.
+        Returns:
+            str: The name of its transform.
+        """
+        return om.MFnDagNode(self.handles[joint_name].object()).name()
+
+    def materialize(self, names, roots=()):
+        """
+        Creates guides with a single modifier, parents first. The requested guides go under guides_GRP like the guide_import
+        they replace, the others are parented to their template parent. Guides whose parent is not imported go under
+        guides_GRP too and the children of C_root_JNT stay in world.
+
+        Args:
+            names (list): Guides to create.
+            roots (set): Requested guides, created under guides_GRP whatever their template parent is.
+        """
+        data_exporter = data_export.DataExport()
+        guides_grp = data_exporter.get_data("basic_structure", "guides_GRP")
+        if not guides_grp or not cmds.objExists(guides_grp):
+            guides_grp = cmds.createNode("transform", name="guides_GRP")
+        guides_grp_obj = om.MSelectionList().add(guides_grp).getDependNode(0)
+
+        names = set(names)
+
+        def depth(joint):
+            level = 0
+            while self.parent_map.get(joint) in names:
+                joint = self.parent_map[joint]
+                level += 1
+            return level
+
+        ordered = sorted(names, key=depth)
+
+        dag_modifier = om.MDagModifier()
+        for joint in ordered:
+            parent = self.parent_map.get(joint)
+            if joint in roots:
+                parent_obj = guides_grp_obj
+            elif parent in names or self.exists(parent):
+                parent_obj = self.handles[parent].object()
+            elif parent == "C_root_JNT":
+                parent_obj = om.MObject.kNullObj
+            else:
+                parent_obj = guides_grp_obj
+
+            node = dag_modifier.createNode("transform", parent_obj)
+            dag_modifier.renameNode(node, joint)
+            self.handles[joint] = om.MObjectHandle(node)
+
+            for attribute in ("moduleName", "prefix"):
+                value = self.guides_data[joint].get(attribute)
+                if value and value != "Child":
+                    attr_fn = om.MFnEnumAttribute()
+                    attr = attr_fn.create(attribute, attribute, 0)
+                    attr_fn.addField(value, 0)
+                    attr_fn.keyable = False
+                    dag_modifier.addAttribute(node, attr)
+        dag_modifier.doIt()
+
+        for joint in ordered:
+            dag_path = om.MDagPath.getAPathTo(self.handles[joint].object())
+            position = om.MVector(self.guides_data[joint]["worldPosition"])
+            om.MFnTransform(dag_path).setTranslation(position, om.MSpace.kWorld)
+
+        self.batches += 1
+
+    def request(self, joint_name, all_descendents=True):
+        """
+        Returns the transforms of a guide and its descendents, creating the ones that are missing.
+
+        Args:
+            joint_name (str): The guide.
+            all_descendents (bool): If True, the descendents of the guide are returned too.
+        Returns:
+            list: The guide names, the requested guide first.
+        Raises:
+            ValueError: If the guide is not in the template.
+        """
+        self.load()
+        if joint_name not in self.guides_data:
+            raise ValueError(f"Guide '{joint_name}' not found in {self.path}.")
+
+        names = [joint_name] + (self.descendants(joint_name) if all_descendents else [])
+        missing = [joint for joint in names if not self.exists(joint)]
+        if missing:
+            roots = {joint_name}
+            if not self.batches:
+                for module in self.modules:
+                    if module in self.skip or module not in self.guides_data:
+                        continue
+                    roots.add(module)
+                    missing += [joint for joint in [module] + self.descendants(module)
+                                if joint not in self.skip and not self.exists(joint) and joint not in missing]
+            self.materialize(missing, roots=roots)
+
+        self.usage.setdefault(self.module_of(joint_name), set()).update(names)
+
+        return [self.name(joint) for joint in names]
+
+    def unused(self):
+        """
+        Returns:
+            set: Template guides no module requested.
+        """
+        used = set().union(*self.usage.values())
+        return set(self.guides_data) - used
+
+    def report(self):
+        """
+        Reports the guides imported and the ones no module used.
+
+        Returns:
+            dict: Imported, unused and skipped guide counts and the number of batches.
+        """
+        report = {
+            "imported": len(self.handles),
+            "unused": len(self.unused()),
+            "skipped": len(self.skip),
+            "batches": self.batches,
+        }
+        om.MGlobal.displayInfo(f"Guides: {report['imported']} imported in {report['batches']} batches, {report['unused']} unused, {report['skipped']} skipped.")
+        return report
+
+REGISTRY = None
+
+def reset_registry(modules=None):
+    """
+    Starts a new guide registry, called at the start of every build.
+    When the previous build used the same template, the guides none of its modules requested are skipped.
+
+    Args:
+        modules (list): Module guides the build makes, created in the first batch.
+    """
+    global REGISTRY
+    skip = ()
+    if REGISTRY is not None and REGISTRY.path:
+        path = core.init_template_file(ext=".guides", export=False)
+        if path == REGISTRY.path and os.path.exists(path) and os.path.getmtime(path) == REGISTRY.mtime:
+            skip = REGISTRY.unused()
+    REGISTRY = GuideRegistry(skip=skip, modules=modules)
+    return REGISTRY
+
+def get_registry():
+    """
+    Returns:
+        GuideRegistry: The registry of the current build.
+    """
+    global REGISTRY
+    if REGISTRY is None:
+        REGISTRY = GuideRegistry()
+    return REGISTRY
+
 def get_data(name, module_name=False):
 
     final_path = core.init_template_file(ext=".guides", export=False)
 
     try:
-        with open(final_path, "r") as infile:
-            guides_data = json.load(infile)
+        guides_data = load_template(final_path)
     except Exception as e:
         if module_name:
             return None, None, None, None
@@ -137,78 +396,16 @@ def get_data(name, module_name=False):
 
 def guide_import(joint_name, all_descendents=True, path=None):
         """
-        Imports guides from a JSON file into the Maya scene.
-        
+        Imports guides from the guides template into the Maya scene.
+        The guides go through the build registry, so every guide is created once and later requests return the existing transforms.
+
         Args:
-                joint_name (str): The name of the joint to import. If "all", imports all guides.
-                all_descendents (bool): If True, imports all descendents of the specified joint. Defaults to True.
+                joint_name (str): The name of the guide to import.
+                all_descendents (bool): If True, imports all descendents of the specified guide. Defaults to True.
         Returns:
-                list: A list of imported joint names if joint_name is not "all", otherwise returns the world position and rotation of the specified joint.
+                list: The imported guide names, the requested guide first.
         """
-        
-        data_exporter = data_export.DataExport()
-        guides_grp = data_exporter.get_data("basic_structure", "guides_GRP")
 
+        return get_registry().request(joint_name, all_descendents=all_descendents)
 
-        if cmds.objExists(guides_grp):
-                guide_grp = guides_grp
-        else:
-                guide_grp = cmds.createNode("transform", name="guides_GRP")
-
-        transforms_chain_export = []
-
-        if all_descendents:
-                
-                if all_descendents is True:
-                        world_position, parent, moduleName, prefix = get_data(joint_name, module_name=True)
-                        guide_transform = cmds.createNode('transform', name=joint_name)
-                        cmds.xform(guide_transform, ws=True, t=world_position)
-                        cmds.parent(guide_transform, guide_grp)
-                        transforms_chain_export.append(guide_transform)
-                        if moduleName != "Child":
-                               cmds.addAttr(guide_transform, longName="moduleName", attributeType="enum", enumName=moduleName, keyable=False)
-                        if prefix != "Child":
-                               cmds.addAttr(guide_transform, longName="prefix", attributeType="enum", enumName=prefix, keyable=False)
-
-
-                        final_path = core.init_template_file(ext=".guides", export=False)
-                        with open(final_path, "r") as infile:
-                                        guides_data = json.load(infile)
-
-                        guide_set_name = next(iter(guides_data))
-                        parent_map = {joint: data.get("parent") for joint, data in guides_data[guide_set_name].items()}
-                        transforms_chain = []
-                        processing_queue = [joint for joint, parent in parent_map.items() if parent == joint_name]
-
-                        while processing_queue:
-                                joint = processing_queue.pop(0)
-                                if "Settings" in joint:
-                                        continue
-                                cmds.select(clear=True)
-                                imported_transform = cmds.createNode('transform', name=joint)
-                                position = guides_data[guide_set_name][joint]["worldPosition"]
-                                cmds.xform(imported_transform, ws=True, t=position)
-                                parent = parent_map[joint]
-                                if parent and parent != "C_root_JNT":
-                                                cmds.parent(imported_transform, parent)
-                                transforms_chain.append(joint)
-                                children = [child for child, p in parent_map.items() if p == joint]
-                                processing_queue.extend(children)
-                                transforms_chain_export.append(imported_transform)
-                                                         
-        
-        
-        else:
-                world_position, parent, moduleName, prefix = get_data(joint_name, module_name=True)
-                guide_transform = cmds.createNode('transform', name=joint_name)
-                cmds.xform(guide_transform, ws=True, t=world_position)
-                cmds.parent(guide_transform, guide_grp)
-                transforms_chain_export.append(guide_transform)
-                if moduleName != "Child":
-                        cmds.addAttr(guide_transform, longName="moduleName", attributeType="enum", enumName=moduleName, keyable=False)
-                if prefix != "Child":
-                        cmds.addAttr(guide_transform, longName="prefix", attributeType="enum", enumName=prefix, keyable=False)
-
-        return transforms_chain_export
-               
 # guides_export()
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+Pure python helpers to resolve the skeleton hierarchy stored in the guides file.
+This module does not import maya so it can be used and tested outside of it.
+"""
+
+def flatten_hierarchy(hierarchy_list):
+    """
+    Flattens the nested guides hierarchy into (parent, child) pairs.
+    The walk is depth first and keeps the sibling order of the file.
+
+    Args:
+        hierarchy_list (list): The "hierarchy" entry of the guides file, a list of {guide: [children]} dicts.
+    Returns:
+        list: (parent, child) guide name pairs.
+    """
+    pairs = []
+
+    def walk(parent_name, item):
+        for key, children in item.items():
+            if parent_name:
+                pairs.append((parent_name, key))
+            for child in children:
+                if isinstance(child, dict):
+                    walk(key, child)
+
+    for item in hierarchy_list:
+        walk(None, item)
+
+    return pairs
+
+def module_key(guide_name):
+    """
+    Returns the (side, module) key of a guide name, the local hip belongs to the spine module.
+
+    Args:
+        guide_name (str): Guide name, e.g. "L_arm_GUIDE".
+    Returns:
+        tuple: The side and module name.
+    """
+    side, module = guide_name.split("_")[0], guide_name.split("_")[1]
+    return side, "spine" if module == "localHip" else module
+
+def resolve_hierarchy(hierarchy_list, group_modules):
+    """
+    Matches every parent/child pair of the guides hierarchy with the skinning groups built by the modules.
+
+    Args:
+        hierarchy_list (list): The "hierarchy" entry of the guides file.
+        group_modules (list): (side, module) of each skinning group, in the same order as the groups. When two groups
+            share a (side, module), the links use the last one.
+    Returns:
+        tuple: A list of resolved links and a list of guide names without a matching skinning group.
+            Each link is a dict with parent/child side and module, the group indices (parent_index is None for the root),
+            the joint of the parent chain to use (parent_index_chain) and whether the child is a hand.
+    """
+    # Like the skinning group search it replaces, the last group of a duplicated (side, module) wins.
+    module_indices = {}
+    for i, key in enumerate(group_modules):
+        module_indices[tuple(key)] = i
+
+    links = []
+    missing = []
+
+    for parent, child in flatten_hierarchy(hierarchy_list):
+        parent_side, parent_module = parent.split("_")[0], parent.split("_")[1]
+        child_side, child_module = child.split("_")[0], child.split("_")[1]
+
+        if child_module == "localHip" and parent_module == "spine":
+            continue
+
+        child_index = module_indices.get(module_key(child))
+        if child_index is None:
+            missing.append(child)
+            continue
+
+        if parent_module == "root":
+            parent_index = None
+        else:
+            parent_index = module_indices.get(module_key(parent))
+            if parent_index is None:
+                missing.append(parent)
+                continue
+
+        links.append({
+            "parent_side": parent_side,
+            "parent_module": parent_module,
+            "child_side": child_side,
+            "child_module": child_module,
+            "parent_index": parent_index,
+            "child_index": child_index,
+            "parent_index_chain": -1 if not parent_module == "spine" else -2,
+            "hand_value": child_module == "hand",
+        })
+
+    return links, missing
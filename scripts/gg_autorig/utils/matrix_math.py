@@ -0,0 +1,498 @@
+"""
+Pure python matrix math shared by the ggAutorigNodes plugin and the rig builders.
+Matrices are flat lists of 16 floats in Maya order (row vectors, translation in the last row).
+This module does not import maya so it can be used and tested outside of it.
+"""
+
+import math
+
+IDENTITY = (1.0, 0.0, 0.0, 0.0,
+            0.0, 1.0, 0.0, 0.0,
+            0.0, 0.0, 1.0, 0.0,
+            0.0, 0.0, 0.0, 1.0)
+
+def mult(a, b):
+    """
+    Returns the product a * b, with Maya row vectors this is "a in the space of b".
+
+    Args:
+        a (list): 16 floats matrix.
+        b (list): 16 floats matrix.
+    Returns:
+        list: The product.
+    """
+    return [sum(a[row * 4 + k] * b[k * 4 + col] for k in range(4)) for row in range(4) for col in range(4)]
+
+def mult_all(matrices):
+    """
+    Returns the product of a list of matrices, like a multMatrix node.
+
+    Args:
+        matrices (list): Matrices to multiply in order.
+    Returns:
+        list: The product, identity for an empty list.
+    """
+    result = list(IDENTITY)
+    for matrix in matrices:
+        result = mult(result, matrix)
+    return result
+
+def inverse(m):
+    """
+    Returns the inverse of a 4x4 matrix using Gauss-Jordan elimination.
+
+    Args:
+        m (list): 16 floats matrix.
+    Returns:
+        list: The inverse matrix.
+    Raises:
+        ValueError: If the matrix is singular.
+    """
+    rows = [list(m[i * 4:i * 4 + 4]) + [1.0 if i == j else 0.0 for j in range(4)] for i in range(4)]
+    for col in range(4):
+        pivot = max(range(col, 4), key=lambda r: abs(rows[r][col]))
+        if abs(rows[pivot][col]) < 1e-12:
+            raise ValueError("Matrix is singular.")
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        pivot_value = rows[col][col]
+        rows[col] = [value / pivot_value for value in rows[col]]
+        for r in range(4):
+            if r != col:
+                factor = rows[r][col]
+                rows[r] = [value - factor * pivot for value, pivot in zip(rows[r], rows[col])]
+    return [rows[i][4 + j] for i in range(4) for j in range(4)]
+
+def vector_length(v):
+    return math.sqrt(sum(value * value for value in v))
+
+def normalize(v):
+    length = vector_length(v)
+    if length < 1e-12:
+        return [0.0 for _ in v]
+    return [value / length for value in v]
+
+def dot(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+def cross(a, b):
+    return [a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]]
+
+def lerp(a, b, weight):
+    return [x + (y - x) * weight for x, y in zip(a, b)]
+
+def quaternion_from_rows(x_axis, y_axis, z_axis):
+    """
+    Returns the (x, y, z, w) quaternion of an orthonormal rotation given by its three axes (matrix rows).
+
+    Args:
+        x_axis (list): First row.
+        y_axis (list): Second row.
+        z_axis (list): Third row.
+    Returns:
+        list: The quaternion.
+    """
+    m00, m01, m02 = x_axis
+    m10, m11, m12 = y_axis
+    m20, m21, m22 = z_axis
+    trace = m00 + m11 + m22
+    if trace > 0.0:
+        s = math.sqrt(trace + 1.0) * 2.0
+        return [(m12 - m21) / s, (m20 - m02) / s, (m01 - m10) / s, 0.25 * s]
+    if m00 > m11 and m00 > m22:
+        s = math.sqrt(1.0 + m00 - m11 - m22) * 2.0
+        return [0.25 * s, (m01 + m10) / s, (m02 + m20) / s, (m12 - m21) / s]
+    if m11 > m22:
+        s = math.sqrt(1.0 + m11 - m00 - m22) * 2.0
+        return [(m01 + m10) / s, 0.25 * s, (m12 + m21) / s, (m20 - m02) / s]
+    s = math.sqrt(1.0 + m22 - m00 - m11) * 2.0
+    return [(m02 + m20) / s, (m12 + m21) / s, 0.25 * s, (m01 - m10) / s]
+
+def rows_from_quaternion(q):
+    """
+    Returns the three rotation rows of a (x, y, z, w) quaternion, inverse of quaternion_from_rows.
+
+    Args:
+        q (list): The quaternion.
+    Returns:
+        list: The x, y and z axes.
+    """
+    x, y, z, w = normalize(q)
+    return [
+        [1.0 - 2.0 * (y * y + z * z), 2.0 * (x * y + z * w), 2.0 * (x * z - y * w)],
+        [2.0 * (x * y - z * w), 1.0 - 2.0 * (x * x + z * z), 2.0 * (y * z + x * w)],
+        [2.0 * (x * z + y * w), 2.0 * (y * z - x * w), 1.0 - 2.0 * (x * x + y * y)],
+    ]
+
+def slerp(q0, q1, weight):
+    """
+    Spherical interpolation between two quaternions, always through the shortest path.
+
+    Args:
+        q0 (list): Start quaternion.
+        q1 (list): End quaternion.
+        weight (float): 0 returns q0, 1 returns q1.
+    Returns:
+        list: The interpolated quaternion.
+    """
+    cos_theta = dot(q0, q1)
+    if cos_theta < 0.0:
+        q1 = [-value for value in q1]
+        cos_theta = -cos_theta
+    if cos_theta > 0.9995:
+        return normalize(lerp(q0, q1, weight))
+    theta = math.acos(cos_theta)
+    sin_theta = math.sin(theta)
+    a = math.sin((1.0 - weight) * theta) / sin_theta
+    b = math.sin(weight * theta) / sin_theta
+    return [a * x + b * y for x, y in zip(q0, q1)]
+
+def decompose(m):
+    """
+    Splits a matrix in translation, rotation quaternion and scale, shear is ignored.
+
+    Args:
+        m (list): 16 floats matrix.
+    Returns:
+        tuple: translation, quaternion and scale lists.
+    """
+    rows = [list(m[i * 4:i * 4 + 3]) for i in range(3)]
+    scale = [vector_length(row) for row in rows]
+    if dot(cross(rows[0], rows[1]), rows[2]) < 0.0:
+        scale[0] = -scale[0]
+    axes = [[value / s if abs(s) > 1e-12 else 0.0 for value in row] for row, s in zip(rows, scale)]
+    return list(m[12:15]), quaternion_from_rows(*axes), scale
+
+def compose(translation, quaternion, scale):
+    """
+    Builds a matrix from translation, rotation quaternion and scale, inverse of decompose.
+
+    Args:
+        translation (list): Translation.
+        quaternion (list): Rotation.
+        scale (list): Scale.
+    Returns:
+        list: 16 floats matrix.
+    """
+    rows = rows_from_quaternion(quaternion)
+    result = []
+    for row, s in zip(rows, scale):
+        result.extend([value * s for value in row] + [0.0])
+    result.extend(list(translation) + [1.0])
+    return result
+
+def blend(input_matrix, target_matrix, translate_weight=1.0, rotate_weight=1.0, scale_weight=0.0):
+    """
+    Blends two matrices like a blendMatrix node with a single target and no shear.
+
+    Args:
+        input_matrix (list): Matrix at weight 0.
+        target_matrix (list): Matrix at weight 1.
+        translate_weight (float): Translation weight.
+        rotate_weight (float): Rotation weight.
+        scale_weight (float): Scale weight.
+    Returns:
+        list: The blended matrix.
+    """
+    t0, q0, s0 = decompose(input_matrix)
+    t1, q1, s1 = decompose(target_matrix)
+    return compose(lerp(t0, t1, translate_weight), slerp(q0, q1, rotate_weight), lerp(s0, s1, scale_weight))
+
+def space_switch(default_matrix, default_offset, drivers, offsets, index=0, translate_weight=1.0, rotate_weight=1.0):
+    """
+    Reference of the ggSpaceSwitch node.
+    The default space (masterWalk) is blended towards the selected driver space with the translate and rotate weights.
+
+    Args:
+        default_matrix (list): World matrix of the default space.
+        default_offset (list): Offset of the target in the default space.
+        drivers (list): World matrices of the drivers.
+        offsets (list): Offset of the target in each driver space.
+        index (int): Selected driver.
+        translate_weight (float): How much the translation follows the driver.
+        rotate_weight (float): How much the rotation follows the driver.
+    Returns:
+        list: The offsetParentMatrix of the target.
+    """
+    default_space = mult(default_offset, default_matrix)
+    if not drivers:
+        return default_space
+
+    index = min(max(int(index), 0), len(drivers) - 1)
+    offset = offsets[index] if index < len(offsets) else IDENTITY
+    driver_space = mult(offset, drivers[index])
+
+    return blend(default_space, driver_space, translate_weight, rotate_weight)
+
+def translation(m):
+    return list(m[12:15])
+
+def translation_matrix(position):
+    return list(IDENTITY[:12]) + list(position) + [1.0]
+
+def sub(a, b):
+    return [x - y for x, y in zip(a, b)]
+
+def add(a, b):
+    return [x + y for x, y in zip(a, b)]
+
+def scale_vector(v, scalar):
+    return [value * scalar for value in v]
+
+def pole_vector_position(start, mid, end, pole_distance=1.0):
+    """
+    Reference of the pole vector network of limb_module_matrix.create_matrix_pole_vector.
+    The pole sits in front of the mid joint along the bisector of the mid angle, at half the chain length scaled by
+    pole_distance. With equal bone lengths the bisector is perpendicular to the start-end line.
+    A straight chain has no bend direction, the pole then stays on the mid joint like the network does.
+
+    Args:
+        start (list): Position of the first joint.
+        mid (list): Position of the mid joint.
+        end (list): Position of the last joint.
+        pole_distance (float): Multiplier of the distance to the mid joint.
+    Returns:
+        list: The pole vector position.
+    """
+    half = (vector_length(sub(start, mid)) + vector_length(sub(end, mid))) * pole_distance / 2.0
+
+    start_final = add(mid, scale_vector(normalize(sub(start, mid)), half))
+    end_final = add(mid, scale_vector(normalize(sub(end, mid)), half))
+
+    direction = normalize(sub(end_final, start_final))
+    projection = scale_vector(direction, dot(sub(mid, start_final), direction))
+    mid_point = add(start_final, projection)
+
+    pointer = sub(mid, mid_point)
+    if vector_length(pointer) <= 1e-9 * max(half, 1.0):
+        return list(mid)
+    return add(mid, scale_vector(normalize(pointer), half))
+
+def aim_matrix(position, target, up_vector):
+    """
+    Builds a matrix at position with Z aiming to target and X aligned to up_vector, like the aimMatrix used by the pole vector.
+
+    Args:
+        position (list): Translation of the matrix.
+        target (list): Point to aim Z at.
+        up_vector (list): Direction X is aligned to.
+    Returns:
+        list: 16 floats matrix.
+    """
+    z_axis = normalize(sub(target, position))
+    y_axis = normalize(cross(z_axis, up_vector))
+    x_axis = cross(y_axis, z_axis)
+    return x_axis + [0.0] + y_axis + [0.0] + z_axis + [0.0] + list(position) + [1.0]
+
+def pole_vector_matrix(start_matrix, mid_matrix, end_matrix, pole_distance=1.0, orient_weight=0.0):
+    """
+    Reference of the ggPoleVector node.
+
+    Args:
+        start_matrix (list): World matrix of the first joint.
+        mid_matrix (list): World matrix of the mid joint.
+        end_matrix (list): World matrix of the last joint.
+        pole_distance (float): Multiplier of the distance to the mid joint.
+        orient_weight (float): 0 keeps a world oriented matrix, 1 aims Z to the mid joint with X aligned to its X axis.
+    Returns:
+        list: The pole vector matrix.
+    """
+    position = pole_vector_position(translation(start_matrix), translation(mid_matrix), translation(end_matrix), pole_distance)
+    pole = translation_matrix(position)
+    # On a straight chain the pole sits on the mid joint and there is nothing to aim at.
+    if orient_weight <= 0.0 or vector_length(sub(translation(mid_matrix), position)) < 1e-9:
+        return pole
+
+    aimed = aim_matrix(position, translation(mid_matrix), list(mid_matrix[0:3]))
+    return blend(pole, aimed, orient_weight, orient_weight)
+
+def clamp(value, low, high):
+    return min(max(value, low), high)
+
+def smoothstep(value):
+    value = clamp(value, 0.0, 1.0)
+    return value * value * (3.0 - 2.0 * value)
+
+def law_of_cosine(a, b, c):
+    """
+    Returns the cosine of the angle between sides a and c of a triangle, clamped to a valid cosine.
+
+    Args:
+        a (float): First side.
+        b (float): Side opposite to the angle.
+        c (float): Second side.
+    Returns:
+        float: The cosine.
+    """
+    denominator = 2.0 * a * c
+    if abs(denominator) < 1e-12:
+        return 1.0
+    return clamp((a * a + c * c - b * b) / denominator, -1.0, 1.0)
+
+def soft_lengths(upper, lower, reach, soft=0.0, soft_start=0.8):
+    """
+    Reference of the soft network of limb_module_matrix.ik_rig, it lengthens the bones as the chain gets straight
+    so the end eases in instead of snapping.
+
+    Args:
+        upper (float): Upper bone length.
+        lower (float): Lower bone length.
+        reach (float): Clamped distance from the root to the end.
+        soft (float): Blend between the cubic falloff (0) and the smoothstep falloff (1). Like the network, 0 is not
+            "off": the cubic falloff still scales the bones slightly (about 0.99 at a 90 degree elbow) and fades to
+            the rest lengths as the chain gets straight.
+        soft_start (float): Cosine of the root angle where the smoothstep falloff starts.
+    Returns:
+        tuple: The soft upper and lower lengths.
+    """
+    cos_value = law_of_cosine(upper, lower, reach)
+    height = math.sqrt(max(0.0, 1.0 - cos_value * cos_value))
+    quadratic_height = (1.0 - cos_value) ** 2
+
+    if soft_start < 1.0:
+        setup_blend = smoothstep((cos_value - soft_start) / (1.0 - soft_start))
+    else:
+        setup_blend = 0.0
+    cubic_height = quadratic_height ** 3
+    blend_value = cubic_height + (setup_blend - cubic_height) * soft
+    blended_height = height + (quadratic_height - height) * blend_value
+
+    upper_scaler = math.sqrt(blended_height * blended_height + cos_value * cos_value)
+
+    ratio = upper / lower if lower else 0.0
+    lower_height = height * ratio
+    lower_blended_height = blended_height * ratio
+    lower_scaler = math.sqrt(max(0.0, lower_blended_height * lower_blended_height + 1.0 - lower_height * lower_height))
+
+    return upper * upper_scaler, lower * lower_scaler
+
+def two_bone_lengths(upper_rest, lower_rest, distance, stretch=0.0, upper_mult=1.0, lower_mult=1.0, soft=0.0, soft_start=0.8,
+                     pin=0.0, pin_upper=0.0, pin_lower=0.0):
+    """
+    Resolves the final bone lengths of a two bone chain with stretch, length multipliers, soft and pin.
+
+    Args:
+        upper_rest (float): Upper bone rest length.
+        lower_rest (float): Lower bone rest length.
+        distance (float): Distance from the root to the end, without global scale.
+        stretch (float): 0 keeps the rest lengths, 1 stretches the chain to reach the end.
+        upper_mult (float): Upper length multiplier.
+        lower_mult (float): Lower length multiplier.
+        soft (float): Soft falloff blend.
+        soft_start (float): Soft falloff start.
+        pin (float): Blend towards the pinned lengths.
+        pin_upper (float): Distance from the root to the pole vector.
+        pin_lower (float): Distance from the pole vector to the end.
+    Returns:
+        tuple: Upper length, lower length and reach (the triangle side from root to end).
+    """
+    rest_length = upper_rest + lower_rest
+    ratio = max(distance / rest_length, 1.0) if rest_length else 1.0
+    scalar = 1.0 + (ratio - 1.0) * stretch
+
+    upper = upper_rest * scalar * upper_mult
+    lower = lower_rest * scalar * lower_mult
+    reach = min(upper + lower, distance)
+
+    upper, lower = soft_lengths(upper, lower, reach, soft, soft_start)
+
+    if pin > 0.0:
+        upper = upper + (pin_upper - upper) * pin
+        lower = lower + (pin_lower - lower) * pin
+        reach = min(upper + lower, distance)
+
+    return upper, lower, reach
+
+def aim_axes_matrix(input_matrix, primary_target, primary_axis, secondary_target, secondary_axis):
+    """
+    Reference of an aimMatrix node with both modes set to aim.
+
+    Args:
+        input_matrix (list): Matrix giving the position and scale.
+        primary_target (list): Point the primary axis aims to.
+        primary_axis (list): Local primary axis.
+        secondary_target (list): Point the secondary axis aims to, orthogonalized against the primary.
+        secondary_axis (list): Local secondary axis.
+    Returns:
+        list: 16 floats matrix.
+    """
+    position = translation(input_matrix)
+    _, _, scale = decompose(input_matrix)
+
+    primary = normalize(sub(primary_target, position))
+    secondary = sub(secondary_target, position)
+    secondary = normalize(sub(secondary, scale_vector(primary, dot(secondary, primary))))
+    world_frame = [primary, secondary, cross(primary, secondary)]
+
+    local_primary = normalize(primary_axis)
+    local_secondary = normalize(sub(secondary_axis, scale_vector(local_primary, dot(secondary_axis, local_primary))))
+    local_frame = [local_primary, local_secondary, cross(local_primary, local_secondary)]
+
+    # rotation = transpose(local_frame) * world_frame, so every local axis lands on its world axis.
+    rows = []
+    for i in range(3):
+        row = [sum(local_frame[k][i] * world_frame[k][j] for k in range(3)) for j in range(3)]
+        rows.append(scale_vector(row, abs(scale[i])))
+
+    return rows[0] + [0.0] + rows[1] + [0.0] + rows[2] + [0.0] + position + [1.0]
+
+def two_bone_ik(root_matrix, pole_matrix, handle_matrix, upper_rest, lower_rest, global_scale=1.0, stretch=0.0,
+                upper_mult=1.0, lower_mult=1.0, soft=0.0, soft_start=0.8, pin=0.0,
+                primary_axis=(1.0, 0.0, 0.0), secondary_axis=(0.0, 1.0, 0.0), mirror=False):
+    """
+    Reference of the ggTwoBoneIk node, the closed form version of the soft/stretch network of limb_module_matrix.ik_rig.
+    The bones are laid along local X and bend around local Z like the fourByFourMatrix nodes of the network.
+
+    Args:
+        root_matrix (list): World matrix of the root ik controller.
+        pole_matrix (list): World matrix of the pole vector controller.
+        handle_matrix (list): World matrix of the end ik controller.
+        upper_rest (float): Upper bone rest length.
+        lower_rest (float): Lower bone rest length.
+        global_scale (float): Rig global scale.
+        stretch (float): Stretch weight.
+        upper_mult (float): Upper length multiplier.
+        lower_mult (float): Lower length multiplier.
+        soft (float): Soft falloff blend.
+        soft_start (float): Soft falloff start.
+        pin (float): Pin to the pole vector weight.
+        primary_axis (list): Local axis aiming from the root to the end.
+        secondary_axis (list): Local axis aiming to the pole vector.
+        mirror (bool): Bones are laid along -X.
+    Returns:
+        tuple: Upper, lower and end world matrices.
+    """
+    root = translation(root_matrix)
+    pole = translation(pole_matrix)
+    handle = translation(handle_matrix)
+    global_scale = global_scale or 1.0
+
+    distance = vector_length(sub(handle, root)) / global_scale
+    pin_upper = vector_length(sub(pole, root)) / global_scale
+    pin_lower = vector_length(sub(handle, pole)) / global_scale
+
+    upper, lower, reach = two_bone_lengths(upper_rest, lower_rest, distance, stretch, upper_mult, lower_mult, soft, soft_start,
+                                           pin, pin_upper, pin_lower)
+
+    cos_upper = law_of_cosine(upper, lower, reach)
+    sin_upper = math.sqrt(max(0.0, 1.0 - cos_upper * cos_upper))
+    cos_lower = law_of_cosine(upper, reach, lower)
+    sin_lower = math.sqrt(max(0.0, 1.0 - cos_lower * cos_lower))
+    side = -1.0 if mirror else 1.0
+
+    aim = aim_axes_matrix(root_matrix, handle, primary_axis, pole, secondary_axis)
+    upper_local = [cos_upper, sin_upper, 0.0, 0.0,
+                   -sin_upper, cos_upper, 0.0, 0.0,
+                   0.0, 0.0, 1.0, 0.0,
+                   0.0, 0.0, 0.0, 1.0]
+    upper_matrix = mult(upper_local, aim)
+
+    lower_local = [-cos_lower, -sin_lower, 0.0, 0.0,
+                   sin_lower, -cos_lower, 0.0, 0.0,
+                   0.0, 0.0, 1.0, 0.0,
+                   upper * side, 0.0, 0.0, 1.0]
+    lower_matrix = mult(lower_local, upper_matrix)
+
+    end_local = mult(handle_matrix, inverse(lower_matrix))[:12] + [lower * side, 0.0, 0.0, 1.0]
+    end_matrix = mult(end_local, lower_matrix)
+
+    return upper_matrix, lower_matrix, end_matrix
@@ -0,0 +1,166 @@
+"""
+Declarative node networks.
+A NodeGraph lists its nodes by key and its connections as "key.attribute" pairs, so a subsystem is plain data that can be
+validated without Maya and built with a single MDGModifier.
+External plugs are referenced with "@name" and given when the graph is built.
+"""
+
+class NodeGraph:
+    """
+    Node and edge list of a subsystem, reusable as a template through the {} fields of the node names.
+    """
+
+    def __init__(self, nodes, edges=(), values=None):
+        """
+        Args:
+            nodes (dict): (node type, name template, operation or None) tuples keyed by node key, in creation order.
+            edges (list): (source, destination) pairs, "key.attribute" for graph plugs and "@name" for external plugs.
+            values (dict): Static values keyed by "key.attribute".
+        """
+        self.nodes = dict(nodes)
+        self.edges = list(edges)
+        self.values = dict(values or {})
+
+    def node_names(self, **fields):
+        """
+        Returns the final name of every node.
+
+        Args:
+            **fields: Values of the {} fields of the name templates.
+        Returns:
+            dict: Node names keyed by node key.
+        """
+        return {key: name.format(**fields) for key, (_, name, _) in self.nodes.items()}
+
+    def externals(self):
+        """
+        Returns the external sources and destinations the graph expects.
+
+        Returns:
+            tuple: Sets of the external input and output names.
+        """
+        inputs = {source[1:] for source, _ in self.edges if source.startswith("@")}
+        outputs = {destination[1:] for _, destination in self.edges if destination.startswith("@")}
+        return inputs, outputs
+
+    def validate(self, **fields):
+        """
+        Checks the graph before anything is created: every plug points to a declared node, no name is repeated
+        and no destination is connected twice.
+
+        Args:
+            **fields: Values of the {} fields of the name templates.
+        Returns:
+            dict: Node names keyed by node key.
+        Raises:
+            ValueError: With every problem found.
+        """
+        errors = []
+
+        names = self.node_names(**fields)
+        seen = {}
+        for key, name in names.items():
+            if name in seen:
+                errors.append(f"Nodes '{seen[name]}' and '{key}' share the name '{name}'.")
+            seen[name] = key
+
+        def check_plug(plug):
+            if plug.startswith("@"):
+                return
+            key, _, attribute = plug.partition(".")
+            if key not in self.nodes:
+                errors.append(f"'{plug}' references the undeclared node '{key}'.")
+            elif not attribute:
+                errors.append(f"'{plug}' has no attribute.")
+
+        destinations = set()
+        for source, destination in self.edges:
+            check_plug(source)
+            check_plug(destination)
+            if source.startswith("@") and destination.startswith("@"):
+                errors.append(f"Edge '{source}' -> '{destination}' does not touch the graph.")
+            if not destination.startswith("@"):
+                if destination in destinations or destination in self.values:
+                    errors.append(f"'{destination}' is driven more than once.")
+                destinations.add(destination)
+
+        for plug in self.values:
+            if plug.startswith("@"):
+                errors.append(f"Value '{plug}' can't be set on an external plug.")
+            else:
+                check_plug(plug)
+
+        if errors:
+            raise ValueError("Invalid node graph:\n" + "\n".join(errors))
+
+        return names
+
+    def build(self, inputs=None, outputs=None, **fields):
+        """
+        Validates and creates the graph, nodes, connections and values go through a single MDGModifier.
+
+        Args:
+            inputs (dict): External source plugs keyed by "@" name.
+            outputs (dict): External destination plug, or list of plugs, keyed by "@" name.
+            **fields: Values of the {} fields of the name templates.
+        Returns:
+            dict: Created node names keyed by node key.
+        Raises:
+            ValueError: If the graph is invalid or an external plug is missing.
+        """
+        import maya.api.OpenMaya as om
+
+        inputs = inputs or {}
+        outputs = outputs or {}
+
+        names = self.validate(**fields)
+        expected_inputs, expected_outputs = self.externals()
+        missing = sorted(expected_inputs - set(inputs)) + sorted(expected_outputs - set(outputs))
+        if missing:
+            raise ValueError(f"Missing external plugs: {', '.join(missing)}.")
+
+        dg_modifier = om.MDGModifier()
+        created = {}
+        for key, (node_type, _, operation) in self.nodes.items():
+            node = dg_modifier.createNode(node_type)
+            dg_modifier.renameNode(node, names[key])
+            created[key] = node
+        dg_modifier.doIt()
+
+        created = {key: om.MFnDependencyNode(node).name() for key, node in created.items()}
+
+        def resolve(plug, externals):
+            if plug.startswith("@"):
+                plugs = externals[plug[1:]]
+                return plugs if isinstance(plugs, (list, tuple)) else [plugs]
+            key, _, attribute = plug.partition(".")
+            return [f"{created[key]}.{attribute}"]
+
+        sel_list = om.MSelectionList()
+
+        def get_plug(plug_name):
+            sel_list.clear()
+            sel_list.add(plug_name)
+            return sel_list.getPlug(0)
+
+        for key, (_, _, operation) in self.nodes.items():
+            if operation is not None:
+                dg_modifier.newPlugValueInt(get_plug(f"{created[key]}.operation"), operation)
+
+        for plug, value in self.values.items():
+            destination = get_plug(resolve(plug, outputs)[0])
+            if isinstance(value, bool):
+                dg_modifier.newPlugValueBool(destination, value)
+            elif isinstance(value, int):
+                dg_modifier.newPlugValueInt(destination, value)
+            else:
+                dg_modifier.newPlugValueDouble(destination, value)
+
+        for source, destination in self.edges:
+            for source_plug in resolve(source, inputs):
+                for destination_plug in resolve(destination, outputs):
+                    dg_modifier.connect(get_plug(source_plug), get_plug(destination_plug))
+
+        dg_modifier.doIt()
+
+        return created
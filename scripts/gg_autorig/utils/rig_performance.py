@@ -1,33 +1,39 @@
 import maya.cmds as cmds
 import random
+import os
+import tempfile
+import time
 
-def getAverageEvaluationTime(n=99, range_size=20):
-    for controller in cmds.ls(type="transform"):
-        if "_CTL" in controller:
-            cmds.currentTime(0)
-            cmds.setKeyframe(controller)
-            
-            cmds.currentTime(n+1)
-            for attr in ["tx", "ty", "tz", "rx", "ry", "rz"]:
-                num = round(random.uniform(0, 100), 1)
-                cmds.setKeyframe(f"{controller}.{attr}", v=num)
-                try:
-                    cmds.setAttr(f"{controller}.{attr}", num)
-                except:
-                    pass
-
-            cmds.setKeyframe(controller)
-
-    buffer_size = 100
-    current_frame = int(cmds.currentTime(q=True))
+def get_profile_out_file():
+    """
+    Returns the text file used to dump the profiler buffer, next to the current scene.
 
+    Returns:
+        str: The path of the profiler output file.
+    """
     tmp = cmds.file(q=True, exn=True)
-    out_path = tmp[:tmp.rfind(".")]
+    out_path = tmp[:tmp.rfind(".")] if "." in os.path.basename(tmp) else os.path.join(tempfile.gettempdir(), "untitled")
 
     version = cmds.about(mnv=True).replace(" ", "")
     product = cmds.about(p=True).replace(" ", "")
 
-    out_file = f"{out_path}_{product}_{version}_.txt"
+    return f"{out_path}_{product}_{version}_.txt"
+
+def profile_evaluation(n=99, range_size=20, out_file=None):
+    """
+    Profiles the graph evaluation of n frames and returns the average duration.
+
+    Args:
+        n (int): Number of frames to profile.
+        range_size (int): Step between the profiled frames.
+        out_file (str, optional): Profiler dump file. Defaults to get_profile_out_file().
+    Returns:
+        float: The average EvaluationGraphExecution duration in micro seconds.
+    """
+    buffer_size = 100
+    current_frame = int(cmds.currentTime(q=True))
+    out_file = out_file or get_profile_out_file()
+
     cmds.profiler(b=buffer_size)
     average_duration = 0
     for i in range(n):
@@ -49,8 +55,242 @@ def getAverageEvaluationTime(n=99, range_size=20):
                         average_duration += duration
                         break
     average_duration /= n
-    print(f"{average_duration=} micro seconds\nPure fps={(1000000/average_duration)}")
     cmds.currentTime(current_frame)
 
+    return average_duration
+
+def getAverageEvaluationTime(n=99, range_size=20):
+    for controller in cmds.ls(type="transform"):
+        if "_CTL" in controller:
+            cmds.currentTime(0)
+            cmds.setKeyframe(controller)
+            
+            cmds.currentTime(n+1)
+            for attr in ["tx", "ty", "tz", "rx", "ry", "rz"]:
+                num = round(random.uniform(0, 100), 1)
+                cmds.setKeyframe(f"{controller}.{attr}", v=num)
+                try:
+                    cmds.setAttr(f"{controller}.{attr}", num)
+                except:
+                    pass
+
+            cmds.setKeyframe(controller)
+
+    average_duration = profile_evaluation(n=n, range_size=range_size)
+    print(f"{average_duration=} micro seconds\nPure fps={(1000000/average_duration)}")
+
+    return average_duration
+
+def build_rivet_benchmark_scene(count, backend, subdivisions=60):
+    """
+    Creates a deforming plane with the given number of rivets on it.
+    The plane is animated with a sine deformer so every rivet has to be evaluated on each frame.
+
+    Args:
+        count (int): Number of rivets to create.
+        backend (str): Rivet backend, "loft" or "uvPin".
+        subdivisions (int): Subdivisions of the test plane.
+    """
+    from gg_autorig.autorig import rivet_module
+
+    cmds.file(new=True, force=True)
+
+    mesh = cmds.polyPlane(name="C_rivetBenchmark_MSH", width=20, height=20, subdivisionsX=subdivisions, subdivisionsY=subdivisions)[0]
+    sine, sine_handle = cmds.nonLinear(mesh, type="sine", name="C_rivetBenchmark_SINE")
+    cmds.setAttr(f"{sine}.amplitude", 1)
+    cmds.setAttr(f"{sine}.wavelength", 0.5)
+    cmds.setAttr(f"{sine_handle}.rotateZ", 90)
+    cmds.setKeyframe(sine, attribute="offset", time=0, value=0)
+    cmds.setKeyframe(sine, attribute="offset", time=2000, value=100)
+
+    random.seed(count)
+    names = [f"C_rivetBenchmark{i:03d}" for i in range(count)]
+    positions = [(random.uniform(-9, 9), 0, random.uniform(-9, 9)) for _ in range(count)]
+
+    if backend == "uvPin":
+        matrix_plugs = rivet_module.uv_pin_rivet_matrices(mesh, names, positions)
+    else:
+        matrix_plugs = [rivet_module.loft_rivet_matrix(mesh, name, position) for name, position in zip(names, positions)]
+
+    for name, matrix_plug in zip(names, matrix_plugs):
+        locator = cmds.spaceLocator(name=f"{name}_LOC")[0]
+        cmds.connectAttr(matrix_plug, f"{locator}.offsetParentMatrix", force=True)
+
+def benchmark_rivets(counts=(10, 100, 500), backends=("loft", "uvPin"), n=50, range_size=1):
+    """
+    Compares the per frame evaluation cost of the rivet backends.
+
+    Args:
+        counts (tuple): Rivet counts to benchmark.
+        backends (tuple): Backends to compare.
+        n (int): Number of profiled frames per scene.
+        range_size (int): Step between the profiled frames.
+    Returns:
+        dict: Average evaluation time in micro seconds keyed by (backend, count).
+    """
+    results = {}
+    for count in counts:
+        for backend in backends:
+            build_rivet_benchmark_scene(count, backend)
+            results[(backend, count)] = profile_evaluation(n=n, range_size=range_size)
+
+    for count in counts:
+        line = " | ".join(f"{backend}: {results[(backend, count)]:.1f} us" for backend in backends)
+        print(f"{count} rivets -> {line}")
+
+    return results
+
+def benchmark_parented_chain(counts=(100, 500)):
+    """
+    Times the _ENV chain creation of skeleton_hierarchy.parented_chain for chains of the given lengths.
+
+    Args:
+        counts (tuple): Number of joints of each benchmarked hierarchy.
+    Returns:
+        dict: Build time in milli seconds keyed by joint count.
+    """
+    from gg_autorig.autorig import skeleton_hierarchy
+
+    results = {}
+    for count in counts:
+        cmds.file(new=True, force=True)
+
+        root = cmds.createNode("joint", name="C_benchmarkRoot_JNT", ss=True)
+        joints = []
+        parent = root
+        for i in range(count):
+            parent = cmds.createNode("joint", name=f"C_benchmark{i:03d}_JNT", parent=parent, ss=True)
+            cmds.setAttr(f"{parent}.translateX", 1)
+            joints.append(parent)
+
+        start_time = time.perf_counter()
+        skeleton_hierarchy.parented_chain(skinning_joints=joints, parent=root, hand_value=False)
+        results[count] = (time.perf_counter() - start_time) * 1000
+
+        print(f"{count} joints -> {results[count]:.1f} ms ({results[count] / count:.3f} ms per joint)")
+
+    return results
+
+def build_spine_benchmark_scene(count, backend, num_joints=5):
+    """
+    Creates animated five controller spines with the given backend, both stretch to the controllers.
+    The ikSpline spines use a curve, an advanced twist handle and a curveInfo stretch like the spine modules.
+    The deBoor spines use the baked weights of de_boor_core_002.de_boor_chain, the deBoorStretch spines add the runtime
+    reparametrization of chain_stretch.
+
+    Args:
+        count (int): Number of spines to create.
+        backend (str): Spine backend, "ikSpline", "deBoor" or "deBoorStretch".
+        num_joints (int): Joints of each spine.
+    """
+    from gg_autorig.utils import de_boor_core_002 as de_boor
+
+    cmds.file(new=True, force=True)
+
+    settings = cmds.createNode("transform", name="C_spineBenchmarkSettings_TRN", ss=True)
+    for attr, value in (("stretch", 1.0), ("stretchMin", 0.8), ("stretchMax", 1.2), ("globalScale", 1.0)):
+        cmds.addAttr(settings, longName=attr, defaultValue=value, keyable=True)
+
+    random.seed(count)
+    for index in range(count):
+        name = f"C_spineBenchmark{index:03d}"
+
+        controllers = []
+        for i in range(5):
+            ctl = cmds.createNode("transform", name=f"{name}Ctl0{i}_CTL", ss=True)
+            cmds.setAttr(f"{ctl}.translate", index * 5, i * 2, 0)
+            for attr in ("tx", "tz", "rx", "ry"):
+                cmds.setKeyframe(ctl, attribute=attr, time=0, value=cmds.getAttr(f"{ctl}.{attr}"))
+                cmds.setKeyframe(ctl, attribute=attr, time=2000, value=cmds.getAttr(f"{ctl}.{attr}") + random.uniform(-90, 90))
+            controllers.append(ctl)
+
+        if backend in ("deBoor", "deBoorStretch"):
+            positions = [cmds.xform(ctl, query=True, worldSpace=True, translation=True) for ctl in controllers]
+            kv = de_boor.get_open_uniform_kv(len(positions), 3)
+            params = de_boor.uniform_length_params(de_boor.arc_length_table(positions, d=3, kv=kv), num_joints)
+
+            _, output_plugs = de_boor.de_boor_chain(controllers, params, name=name, aim_axis="y", up_axis="x", d=3)
+            if backend == "deBoorStretch":
+                output_plugs = de_boor.chain_stretch(controllers, params, output_plugs,
+                                                     stretch=f"{settings}.stretch",
+                                                     stretch_min=f"{settings}.stretchMin",
+                                                     stretch_max=f"{settings}.stretchMax",
+                                                     global_scale=f"{settings}.globalScale",
+                                                     name=name, d=3)
+            for i, plug in enumerate(output_plugs):
+                joint = cmds.createNode("joint", name=f"{name}0{i}_JNT", ss=True)
+                cmds.connectAttr(plug, f"{joint}.offsetParentMatrix")
+
+        else:
+            joints = []
+            for i in range(num_joints):
+                if joints:
+                    joint = cmds.createNode("joint", name=f"{name}0{i}_JNT", parent=joints[-1], ss=True)
+                    cmds.setAttr(f"{joint}.translateY", 8 / (num_joints - 1))
+                else:
+                    joint = cmds.createNode("joint", name=f"{name}0{i}_JNT", ss=True)
+                    cmds.setAttr(f"{joint}.translateX", index * 5)
+                joints.append(joint)
+
+            ik_handle, _, curve = cmds.ikHandle(name=f"{name}_HDL", startJoint=joints[0], endEffector=joints[-1],
+                                                solver="ikSplineSolver", numSpans=2, createCurve=True, parentCurve=False)
+            for i, ctl in enumerate(controllers):
+                dcp = cmds.createNode("decomposeMatrix", name=f"{name}Ctl0{i}_DCP", ss=True)
+                cmds.connectAttr(f"{ctl}.worldMatrix[0]", f"{dcp}.inputMatrix")
+                cmds.connectAttr(f"{dcp}.outputTranslate", f"{curve}.controlPoints[{i}]")
+
+            cmds.setAttr(f"{ik_handle}.dTwistControlEnable", 1)
+            cmds.setAttr(f"{ik_handle}.dWorldUpType", 4)
+            cmds.setAttr(f"{ik_handle}.dForwardAxis", 2)
+            cmds.setAttr(f"{ik_handle}.dWorldUpAxis", 6)
+            cmds.setAttr(f"{ik_handle}.dWorldUpVector", 1, 0, 0)
+            cmds.setAttr(f"{ik_handle}.dWorldUpVectorEnd", 1, 0, 0)
+            cmds.connectAttr(f"{controllers[0]}.worldMatrix[0]", f"{ik_handle}.dWorldUpMatrix")
+            cmds.connectAttr(f"{controllers[-1]}.worldMatrix[0]", f"{ik_handle}.dWorldUpMatrixEnd")
+
+            curve_info = cmds.createNode("curveInfo", name=f"{name}_CIN", ss=True)
+            cmds.connectAttr(f"{curve}.worldSpace[0]", f"{curve_info}.inputCurve")
+            factor = cmds.createNode("floatMath", name=f"{name}StretchFactor_FLM", ss=True)
+            cmds.setAttr(f"{factor}.operation", 3)
+            cmds.connectAttr(f"{curve_info}.arcLength", f"{factor}.floatA")
+            cmds.setAttr(f"{factor}.floatB", cmds.getAttr(f"{curve_info}.arcLength"))
+            clamp = cmds.createNode("clamp", name=f"{name}StretchFactor_CLM", ss=True)
+            cmds.connectAttr(f"{factor}.outFloat", f"{clamp}.inputR")
+            cmds.connectAttr(f"{settings}.stretchMin", f"{clamp}.minR")
+            cmds.connectAttr(f"{settings}.stretchMax", f"{clamp}.maxR")
+            value = cmds.createNode("floatMath", name=f"{name}StretchValue_FLM", ss=True)
+            cmds.setAttr(f"{value}.operation", 2)
+            cmds.connectAttr(f"{clamp}.outputR", f"{value}.floatA")
+            cmds.setAttr(f"{value}.floatB", 8 / (num_joints - 1))
+            for joint in joints[1:]:
+                cmds.connectAttr(f"{value}.outFloat", f"{joint}.translateY")
+
+def benchmark_spine_backends(counts=(1, 10, 50), backends=("ikSpline", "deBoor", "deBoorStretch"), n=50, range_size=1):
+    """
+    Compares the per frame evaluation cost of the ikSpline spine against the De Boor matrix spine.
+
+    Args:
+        counts (tuple): Spine counts to benchmark.
+        backends (tuple): Backends to compare.
+        n (int): Number of profiled frames per scene.
+        range_size (int): Step between the profiled frames.
+    Returns:
+        dict: Average evaluation time in micro seconds keyed by (backend, count).
+    """
+    results = {}
+    for count in counts:
+        for backend in backends:
+            build_spine_benchmark_scene(count, backend)
+            results[(backend, count)] = profile_evaluation(n=n, range_size=range_size)
+
+    for count in counts:
+        line = " | ".join(f"{backend}: {results[(backend, count)]:.1f} us" for backend in backends)
+        print(f"{count} spines -> {line}")
+
+    return results
+
 
-getAverageEvaluationTime()
+# getAverageEvaluationTime()
+# benchmark_rivets()
+# benchmark_parented_chain()
+# benchmark_spine_backends()
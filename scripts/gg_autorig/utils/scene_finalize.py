@@ -0,0 +1,79 @@
+"""
+Scene finalize pass shared by rig_builder.finalize_scene and the ggFinalizeScene command of the ggAutorigNodes plugin.
+The edits are collected in a single dag traversal and queued in one MDagModifier, the command owns the modifier so the
+whole pass is a single undoable step.
+"""
+
+import maya.api.OpenMaya as om
+
+SIDE_LABELS = {"C": 0, "L": 1, "R": 2}
+OTHER_TYPE = 18
+
+def collect_edits(rename_shapes=True, label_joints=True):
+    """
+    Walks the dag once and returns the shape renames and joint labels of the finalize pass.
+    Every nurbsCurve shape is renamed after its parent transform ("Shape", "Shape1", ...), instanced shapes keep their name.
+    Every joint gets its side from the name prefix (C_, L_, R_), type Other and the module name as otherType.
+
+    Args:
+        rename_shapes (bool): If True the nurbsCurve shapes are renamed.
+        label_joints (bool): If True the joints are labeled.
+    Returns:
+        tuple: (shape, new name) pairs and (joint, side, other type) tuples, side and other type are None when the name
+            does not give them. Nodes are om.MObject.
+    """
+    renames = []
+    labels = []
+    shape_counts = {}
+    visited = {}
+
+    dag_iter = om.MItDag(om.MItDag.kDepthFirst, om.MFn.kInvalid)
+    while not dag_iter.isDone():
+        node = dag_iter.currentItem()
+        # Instanced nodes are visited once per path, hash codes can collide so the handles themselves are compared.
+        handle = om.MObjectHandle(node)
+        bucket = visited.setdefault(handle.hashCode(), [])
+        if any(handle == other for other in bucket):
+            dag_iter.next()
+            continue
+        bucket.append(handle)
+
+        if rename_shapes and node.hasFn(om.MFn.kNurbsCurve) and not dag_iter.isInstanced(False):
+            parent_name = om.MFnDependencyNode(om.MFnDagNode(node).parent(0)).name()
+            index = shape_counts.get(parent_name, 0)
+            shape_counts[parent_name] = index + 1
+            renames.append((node, f"{parent_name}Shape{index if index else ''}"))
+
+        elif label_joints and node.hasFn(om.MFn.kJoint):
+            name_parts = om.MFnDependencyNode(node).name().split("_")
+            labels.append((node, SIDE_LABELS.get(name_parts[0]), name_parts[1] if len(name_parts) > 1 else None))
+
+        dag_iter.next()
+
+    return renames, labels
+
+def queue_edits(renames, labels, dag_modifier=None):
+    """
+    Queues the edits returned by collect_edits on a modifier, without executing it.
+
+    Args:
+        renames (list): (shape, new name) pairs.
+        labels (list): (joint, side, other type) tuples.
+        dag_modifier (om.MDagModifier): Modifier to fill, a new one if None.
+    Returns:
+        om.MDagModifier: The modifier.
+    """
+    dag_modifier = dag_modifier or om.MDagModifier()
+
+    for node, name in renames:
+        dag_modifier.renameNode(node, name)
+
+    for node, side, other_type in labels:
+        fn_dep = om.MFnDependencyNode(node)
+        if side is not None:
+            dag_modifier.newPlugValueInt(fn_dep.findPlug("side", False), side)
+        dag_modifier.newPlugValueInt(fn_dep.findPlug("type", False), OTHER_TYPE)
+        if other_type is not None:
+            dag_modifier.newPlugValueString(fn_dep.findPlug("otherType", False), other_type)
+
+    return dag_modifier
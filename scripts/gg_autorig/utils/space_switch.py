@@ -1,6 +1,9 @@
 import maya.cmds as cmds
 import maya.api.OpenMaya as om
+from contextlib import contextmanager
 from gg_autorig.utils import data_export
+from gg_autorig.utils import core
+from gg_autorig.utils import attribute_spec as attrs
 
 
 def get_offset_matrix(child, parent):
@@ -23,6 +26,43 @@ def get_offset_matrix(child, parent):
     
     return offset_matrix
 
+def get_world_matrices(nodes):
+    """
+    Returns the world matrix of every given node, resolving each dag path only once.
+
+    Args:
+        nodes (list): Names of the transforms.
+    Returns:
+        dict: om.MMatrix world matrices keyed by node name.
+    """
+    matrices = {}
+    sel_list = om.MSelectionList()
+    for node in nodes:
+        if node in matrices:
+            continue
+        sel_list.clear()
+        sel_list.add(node)
+        matrices[node] = sel_list.getDagPath(0).inclusiveMatrix()
+    return matrices
+
+def get_offset_matrices(pairs):
+    """
+    Batch version of get_offset_matrix, computes the offset of every (child, parent) pair in one pass.
+
+    Args:
+        pairs (list): (child, parent) transform name pairs.
+    Returns:
+        list: The om.MMatrix offsets, in the same order as the pairs.
+    """
+    matrices = get_world_matrices([node for pair in pairs for node in pair])
+    inverses = {}
+    offsets = []
+    for child, parent in pairs:
+        if parent not in inverses:
+            inverses[parent] = matrices[parent].inverse()
+        offsets.append(matrices[child] * inverses[parent])
+    return offsets
+
 def switch_matrix_space(target, sources = [None], default_value=1): 
     """
     Switch the matrix space of a target control to multiple source controls in Maya.
@@ -50,10 +90,11 @@ def switch_matrix_space(target, sources = [None], default_value=1):
 
     condition_nodes = []
     spaces = []
+    offsets = get_offset_matrices([(target_grp, matrix) for matrix in sources])
     
     for i, matrix in enumerate(sources):
 
-        matrix_offset = get_offset_matrix(target_grp, matrix)
+        matrix_offset = offsets[i]
 
         cmds.connectAttr(f"{matrix}.worldMatrix[0]", f"{parent_matrix}.target[{i}].targetMatrix")
         cmds.setAttr(f"{parent_matrix}.target[{i}].offsetMatrix", matrix_offset, type="matrix")
@@ -135,81 +176,296 @@ def leg_pv_spaceswitch(localHip, legPv, footCtl, root):
     cmds.connectAttr(f"{legPv}.spaceSwitchValue", f"{foot_trn}.blendAim1")
     cmds.connectAttr(f"{legPv}.automaticPoleVector", f"{pv_SPC}.blendParent1")
 
-def fk_switch(target, sources = [], default_rotate = 1, default_translate = 1):
+class SpaceSwitchManager:
     """
-    Switch the matrix space of a target control to multiple source controls in Maya.
-
-    Args:
-        target (str): The name of the target control to switch space for.
-        sources (list, optional): A list of source controls to switch to. Defaults to [None].
-        default_value (float, optional): The default value for the follow attribute. Defaults to 1.
+    Builds the space switches of a rig sharing as much of the network as possible between targets.
+    Every driver (and the masterWalk) gets a single delta node (rest world inverse * current world) reused by all the targets,
+    so each target only needs its own rest matrix as a static offset. The space selection is done by one choice node per target
+    instead of one condition node per source.
+    Inside batch() the switches are only queued, on exit all the rest matrices are read in one pass before the scene changes
+    and every matrix value is written with a single MDGModifier.
+    With use_node the whole network of a target is replaced by one ggSpaceSwitch node from the ggAutorigNodes plugin.
     """
 
-    target_grp = target.replace("CTL", "GRP")
-    if not cmds.objExists(target):
-        target_grp = target
-    if not cmds.objExists(target_grp):
-        om.MGlobal.displayError(f"Target group '{target_grp}' does not exist.")
-        return
-    
-    cmds.setAttr(f"{target_grp}.inheritsTransform", 0)
-
-    connections = cmds.listConnections(f"{target_grp}.offsetParentMatrix", plugs=True, source=True, destination=False)[0]
-
-    data_exporter = data_export.DataExport()
-
-
-    masterWalk_ctl = data_exporter.get_data("basic_structure", "masterWalk_CTL")
+    def __init__(self, use_node=False):
+        """
+        Initializes the manager, the masterWalk lookup is cached for the whole build.
+
+        Args:
+            use_node (bool): Build the switches with the ggSpaceSwitch node, falls back to the native nodes if the plugin can't be loaded.
+        """
+        self.use_node = use_node and core.load_plugin()
+        self.data_exporter = data_export.DataExport()
+        self.masterWalk_ctl = self.data_exporter.get_data("basic_structure", "masterWalk_CTL")
+        self.deltas = {}
+        self.nodes_created = 0
+        self.nodes_legacy = 0
+        self.batching = False
+        self.queue = []
+
+    @contextmanager
+    def batch(self):
+        """
+        Queues every fk_switch call made inside the context and builds them together on exit.
+        """
+        self.batching = True
+        try:
+            yield self
+        finally:
+            self.batching = False
+            queue, self.queue = self.queue, []
+            self.build(queue)
+
+    def get_delta(self, driver, matrices, dg_modifier):
+        """
+        Returns the plug with the movement of a driver since the build pose, creating its shared node the first time.
+
+        Args:
+            driver (str): The driver transform.
+            matrices (dict): Rest world matrices of the batch.
+            dg_modifier (om.MDGModifier): Modifier receiving the matrix writes.
+        Returns:
+            str: The matrixSum plug of the driver delta node.
+        """
+        delta = self.deltas.get(driver)
+        if delta and cmds.objExists(delta):
+            return f"{delta}.matrixSum"
+
+        delta = cmds.createNode("multMatrix", name=f"{driver.replace('_CTL', '')}SpaceDelta_MMX", ss=True)
+        set_matrix(dg_modifier, f"{delta}.matrixIn[0]", matrices[driver].inverse())
+        cmds.connectAttr(f"{driver}.worldMatrix[0]", f"{delta}.matrixIn[1]")
+
+        self.deltas[driver] = delta
+        self.nodes_created += 1
+
+        return f"{delta}.matrixSum"
+
+    def fk_switch(self, target, sources = [], default_rotate = 1, default_translate = 1):
+        """
+        Switch the matrix space of a target control to multiple source controls in Maya.
+
+        Args:
+            target (str): The name of the target control to switch space for.
+            sources (list, optional): A list of source controls to switch to. Defaults to [None].
+            default_rotate (float, optional): The default value for the rotate follow attribute. Defaults to 1.
+            default_translate (float, optional): The default value for the translate follow attribute. Defaults to 1.
+        """
+
+        target_grp = target.replace("CTL", "GRP")
+        if not cmds.objExists(target):
+            target_grp = target
+        if not cmds.objExists(target_grp):
+            om.MGlobal.displayError(f"Target group '{target_grp}' does not exist.")
+            return
+
+        self.queue.append((target, target_grp, list(sources), default_rotate, default_translate))
+
+        if not self.batching:
+            queue, self.queue = self.queue, []
+            self.build(queue)
+
+    def build(self, requests):
+        """
+        Builds the space switch networks of the queued requests.
+
+        Args:
+            requests (list): (target, target_grp, sources, default_rotate, default_translate) tuples.
+        """
+        if not requests:
+            return
+
+        nodes = [self.masterWalk_ctl]
+        for target, target_grp, sources, _, _ in requests:
+            nodes.extend(sources)
+        if not self.use_node:
+            nodes = [node for node in nodes if not cmds.objExists(self.deltas.get(node) or "")]
+        nodes.extend(request[1] for request in requests)
+        matrices = get_world_matrices(nodes)
+
+        dg_modifier = om.MDGModifier()
+        build_switch = self.build_switch_node if self.use_node else self.build_switch
+        for target, target_grp, sources, default_rotate, default_translate in requests:
+            build_switch(target, target_grp, sources, default_rotate, default_translate, matrices, dg_modifier)
+        dg_modifier.doIt()
+
+    def add_switch_attributes(self, target, sources, default_rotate, default_translate):
+        """
+        Adds the space switch attributes of a target in a single batch.
+
+        Args:
+            target (str): The target control.
+            sources (list): The space drivers, SpaceFollow is only added with more than one.
+            default_rotate (float): The default value for the rotate follow attribute.
+            default_translate (float): The default value for the translate follow attribute.
+        """
+        specs = [attrs.separator("SpaceSwitchSep", "Space Switches")]
+        if len(sources) > 1:
+            specs.append(attrs.enum("SpaceFollow", "Space Follow", [src.split("_")[1] for src in sources]))
+        specs.append(attrs.numeric("TranslateValue", "Translate Value", default=default_translate, min_value=0, max_value=1, attribute_type="float"))
+        specs.append(attrs.numeric("RotateValue", "Rotate Value", default=default_rotate, min_value=0, max_value=1, attribute_type="float"))
+        attrs.apply_specs(target, specs)
+
+    def build_switch(self, target, target_grp, sources, default_rotate, default_translate, matrices, dg_modifier):
+        """
+        Builds the space switch network of one target.
+
+        Args:
+            target (str): The target control.
+            target_grp (str): The group driven by the space switch.
+            sources (list): The space drivers.
+            default_rotate (float): The default value for the rotate follow attribute.
+            default_translate (float): The default value for the translate follow attribute.
+            matrices (dict): Rest world matrices of the batch.
+            dg_modifier (om.MDGModifier): Modifier receiving the matrix writes.
+        """
+        cmds.setAttr(f"{target_grp}.inheritsTransform", 0)
+
+        connections = cmds.listConnections(f"{target_grp}.offsetParentMatrix", plugs=True, source=True, destination=False)
+
+        rest_matrix = matrices[target_grp]
+
+        parent_matrix_masterwalk = cmds.createNode("parentMatrix", name=target.replace("_CTL", "MasterwalkSpace_PM"), ss=True)
+        parent_matrix_parents = cmds.createNode("parentMatrix", name=target.replace("_CTL", "Space_PM"), ss=True)
+        blend_matrix = cmds.createNode("blendMatrix", name=target.replace("_CTL", "Space_BMX"), ss=True)
+        self.nodes_created += 3
+        self.nodes_legacy += 3
+
+        self.add_switch_attributes(target, sources, default_rotate, default_translate)
+
+        if len(sources) > 1:
+            selector = cmds.createNode("choice", name=target.replace("_CTL", "Space_CHC"), ss=True)
+            cmds.connectAttr(f"{target}.SpaceFollow", f"{selector}.selector")
+            for i, driver in enumerate(sources):
+                cmds.connectAttr(self.get_delta(driver, matrices, dg_modifier), f"{selector}.input[{i}]")
+            cmds.connectAttr(f"{selector}.output", f"{parent_matrix_parents}.target[0].targetMatrix")
+
+            self.nodes_created += 1
+            self.nodes_legacy += len(sources)
+        elif sources:
+            cmds.connectAttr(self.get_delta(sources[0], matrices, dg_modifier), f"{parent_matrix_parents}.target[0].targetMatrix")
+
+        if connections:
+            cmds.connectAttr(connections[0], f"{parent_matrix_parents}.inputMatrix")
+            cmds.connectAttr(connections[0], f"{parent_matrix_masterwalk}.inputMatrix")
+        cmds.connectAttr(f"{parent_matrix_parents}.outputMatrix", f"{blend_matrix}.target[0].targetMatrix")
+        cmds.connectAttr(f"{parent_matrix_masterwalk}.outputMatrix", f"{blend_matrix}.inputMatrix")
+
+        cmds.connectAttr(self.get_delta(self.masterWalk_ctl, matrices, dg_modifier), f"{parent_matrix_masterwalk}.target[0].targetMatrix")
+        set_matrix(dg_modifier, f"{parent_matrix_masterwalk}.target[0].offsetMatrix", rest_matrix)
+        set_matrix(dg_modifier, f"{parent_matrix_parents}.target[0].offsetMatrix", rest_matrix)
+
+        cmds.connectAttr(f"{target}.RotateValue", f"{blend_matrix}.target[0].rotateWeight")
+        cmds.connectAttr(f"{target}.TranslateValue", f"{blend_matrix}.target[0].translateWeight")
+        cmds.setAttr(f"{blend_matrix}.target[0].scaleWeight", 0)
+        cmds.setAttr(f"{blend_matrix}.target[0].shearWeight", 0)
+
+        cmds.connectAttr(f"{blend_matrix}.outputMatrix", f"{target_grp}.offsetParentMatrix", force=True)
+
+    def build_switch_node(self, target, target_grp, sources, default_rotate, default_translate, matrices, dg_modifier):
+        """
+        Builds the space switch of one target with a single ggSpaceSwitch node.
+        The offsets are the rest matrix of the target in the space of each driver, so the node output matches build_switch.
+
+        Args:
+            target (str): The target control.
+            target_grp (str): The group driven by the space switch.
+            sources (list): The space drivers.
+            default_rotate (float): The default value for the rotate follow attribute.
+            default_translate (float): The default value for the translate follow attribute.
+            matrices (dict): Rest world matrices of the batch.
+            dg_modifier (om.MDGModifier): Modifier receiving the matrix writes.
+        """
+        cmds.setAttr(f"{target_grp}.inheritsTransform", 0)
+
+        rest_matrix = matrices[target_grp]
+
+        space_switch = cmds.createNode("ggSpaceSwitch", name=target.replace("_CTL", "Space_SSW"), ss=True)
+        self.nodes_created += 1
+        self.nodes_legacy += 3 + (len(sources) if len(sources) > 1 else 0)
+
+        self.add_switch_attributes(target, sources, default_rotate, default_translate)
+
+        if len(sources) > 1:
+            cmds.connectAttr(f"{target}.SpaceFollow", f"{space_switch}.spaceIndex")
+        cmds.connectAttr(f"{target}.TranslateValue", f"{space_switch}.translateFollow")
+        cmds.connectAttr(f"{target}.RotateValue", f"{space_switch}.rotateFollow")
+
+        cmds.connectAttr(f"{self.masterWalk_ctl}.worldMatrix[0]", f"{space_switch}.defaultMatrix")
+        set_matrix(dg_modifier, f"{space_switch}.defaultOffset", rest_matrix * matrices[self.masterWalk_ctl].inverse())
+        for i, driver in enumerate(sources):
+            cmds.connectAttr(f"{driver}.worldMatrix[0]", f"{space_switch}.driverMatrix[{i}]")
+            set_matrix(dg_modifier, f"{space_switch}.driverOffset[{i}]", rest_matrix * matrices[driver].inverse())
 
+        cmds.connectAttr(f"{space_switch}.outputMatrix", f"{target_grp}.offsetParentMatrix", force=True)
 
-    parent_matrix_masterwalk = cmds.createNode("parentMatrix", name=target.replace("_CTL", "MasterwalkSpace_PM"), ss=True)
-    parent_matrix_parents = cmds.createNode("parentMatrix", name=target.replace("_CTL", "Space_PM"), ss=True)
-    blend_matrix = cmds.createNode("blendMatrix", name=target.replace("_CTL", "Space_BMX"), ss=True)
+    def report(self):
+        """
+        Reports how many nodes the shared network saved compared to one full network per target.
 
-    cmds.addAttr(target, longName="SpaceSwitchSep", niceName = "Space Switches  ———", attributeType="enum", enumName="———", keyable=True)
-    cmds.setAttr(f"{target}.SpaceSwitchSep", channelBox=True, lock=True)   
+        Returns:
+            dict: Nodes created, nodes the unshared network would have created and the difference.
+        """
+        report = {
+            "created": self.nodes_created,
+            "legacy": self.nodes_legacy,
+            "saved": self.nodes_legacy - self.nodes_created,
+        }
+        om.MGlobal.displayInfo(f"Space switches: {report['created']} nodes created, {report['saved']} saved ({report['legacy']} without sharing).")
+        return report
 
-    spaces = [src.split("_")[1] for src in sources]
 
+def set_matrix(dg_modifier, plug_name, matrix):
+    """
+    Queues a matrix value write in a modifier.
 
-    if len(sources) > 1:
-        cmds.addAttr(target, longName="SpaceFollow", attributeType="enum", enumName=":".join(spaces), keyable=True)
+    Args:
+        dg_modifier (om.MDGModifier): The modifier.
+        plug_name (str): The destination plug, e.g. "node.offsetMatrix".
+        matrix (om.MMatrix): The value.
+    """
+    plug = om.MSelectionList().add(plug_name).getPlug(0)
+    dg_modifier.newPlugValue(plug, om.MFnMatrixData().create(matrix))
 
-        for i, driver in enumerate(sources):
 
-            condition = cmds.createNode("condition", name=target.replace('_CTL', f"Space0{i}_CON"), ss=True)
-            cmds.setAttr(f"{condition}.firstTerm", i)
-            cmds.connectAttr(f"{target}.SpaceFollow", f"{condition}.secondTerm")
-            cmds.setAttr(f"{condition}.operation", 0)
-            cmds.setAttr(f"{condition}.colorIfFalseR", 0)
-            cmds.setAttr(f"{condition}.colorIfTrueR", 1)
+MANAGER = None
 
+USE_NODE = False
 
-            cmds.connectAttr(f"{condition}.outColorR", f"{parent_matrix_parents}.target[{i}].weight")
+def get_manager():
+    """
+    Returns the space switch manager of the current build, creating it if needed.
 
-    cmds.addAttr(target, longName="TranslateValue", attributeType="float", min=0, max=1, defaultValue=default_translate, keyable=True)
-    cmds.addAttr(target, longName="RotateValue", attributeType="float", min=0, max=1, defaultValue=default_rotate, keyable=True)
+    Returns:
+        SpaceSwitchManager: The manager.
+    """
+    global MANAGER
+    if MANAGER is None:
+        MANAGER = SpaceSwitchManager(use_node=USE_NODE)
+    return MANAGER
 
-    cmds.connectAttr(connections, f"{parent_matrix_parents}.inputMatrix")
-    cmds.connectAttr(connections, f"{parent_matrix_masterwalk}.inputMatrix")
-    cmds.connectAttr(f"{parent_matrix_parents}.outputMatrix", f"{blend_matrix}.target[0].targetMatrix")
-    cmds.connectAttr(f"{parent_matrix_masterwalk}.outputMatrix", f"{blend_matrix}.inputMatrix")
+def reset_manager(use_node=False):
+    """
+    Drops the current space switch manager, called at the start of every build.
 
-    offset_masterwalk = get_offset_matrix(target_grp, masterWalk_ctl)
-    cmds.connectAttr(f"{masterWalk_ctl}.worldMatrix[0]", f"{parent_matrix_masterwalk}.target[0].targetMatrix")
-    cmds.setAttr(f"{parent_matrix_masterwalk}.target[0].offsetMatrix", offset_masterwalk, type="matrix")
+    Args:
+        use_node (bool): If True the next manager builds the switches with the ggSpaceSwitch node.
+    """
+    global MANAGER, USE_NODE
+    MANAGER = None
+    USE_NODE = use_node
 
-    for z, driver in enumerate(sources):
-        off_matrix = get_offset_matrix(target_grp, driver)
-        cmds.connectAttr(f"{driver}.worldMatrix[0]", f"{parent_matrix_parents}.target[{z}].targetMatrix") 
-        cmds.setAttr(f"{parent_matrix_parents}.target[{z}].offsetMatrix", off_matrix, type="matrix")
+def fk_switch(target, sources = [], default_rotate = 1, default_translate = 1):
+    """
+    Switch the matrix space of a target control to multiple source controls in Maya.
 
-    cmds.connectAttr(f"{target}.RotateValue", f"{blend_matrix}.target[0].rotateWeight")
-    cmds.connectAttr(f"{target}.TranslateValue", f"{blend_matrix}.target[0].translateWeight")
-    cmds.setAttr(f"{blend_matrix}.target[0].scaleWeight", 0)
-    cmds.setAttr(f"{blend_matrix}.target[0].shearWeight", 0)
+    Args:
+        target (str): The name of the target control to switch space for.
+        sources (list, optional): A list of source controls to switch to. Defaults to [None].
+        default_rotate (float, optional): The default value for the rotate follow attribute. Defaults to 1.
+        default_translate (float, optional): The default value for the translate follow attribute. Defaults to 1.
+    """
 
-    cmds.connectAttr(f"{blend_matrix}.outputMatrix", f"{target_grp}.offsetParentMatrix", force=True)
+    return get_manager().fk_switch(target, sources=sources, default_rotate=default_rotate, default_translate=default_translate)
 
 
 def make_spaces_biped():
@@ -221,18 +477,19 @@ def make_spaces_biped():
     local_hip_ctl = data_exporter.get_data("C_spineModule", "local_hip_ctl")
     local_chest_ctl = data_exporter.get_data("C_spineModule", "local_chest_ctl")
 
-    for side in ["L", "R"]:
-        clavicle_ctl = data_exporter.get_data(f"{side}_armModule", f"clavicle_ctl")
-        l_shoulder_ctl = data_exporter.get_data(f"{side}_armModule", f"fk_ctl")[0]
-        l_armRootIk = data_exporter.get_data(f"{side}_armModule", f"root_ctl")
-        l_leg_ctl = data_exporter.get_data(f"{side}_legModule", f"fk_ctl")[0]
-        l_legRootIk = data_exporter.get_data(f"{side}_legModule", f"root_ctl")
+    with get_manager().batch():
+        for side in ["L", "R"]:
+            clavicle_ctl = data_exporter.get_data(f"{side}_armModule", f"clavicle_ctl")
+            l_shoulder_ctl = data_exporter.get_data(f"{side}_armModule", f"fk_ctl")[0]
+            l_armRootIk = data_exporter.get_data(f"{side}_armModule", f"root_ctl")
+            l_leg_ctl = data_exporter.get_data(f"{side}_legModule", f"fk_ctl")[0]
+            l_legRootIk = data_exporter.get_data(f"{side}_legModule", f"root_ctl")
 
-        fk_switch(target=clavicle_ctl, sources=[local_chest_ctl])
-        fk_switch(target=l_shoulder_ctl, sources=[clavicle_ctl, local_chest_ctl])
-        fk_switch(target=l_leg_ctl, sources=[local_hip_ctl, body_ctl])
-        fk_switch(target=l_armRootIk, sources=[clavicle_ctl, local_chest_ctl, body_ctl])
-        fk_switch(target=l_legRootIk, sources=[local_hip_ctl, body_ctl])
+            fk_switch(target=clavicle_ctl, sources=[local_chest_ctl])
+            fk_switch(target=l_shoulder_ctl, sources=[clavicle_ctl, local_chest_ctl])
+            fk_switch(target=l_leg_ctl, sources=[local_hip_ctl, body_ctl])
+            fk_switch(target=l_armRootIk, sources=[clavicle_ctl, local_chest_ctl, body_ctl])
+            fk_switch(target=l_legRootIk, sources=[local_hip_ctl, body_ctl])
 
 
 def make_spaces_quadruped():
@@ -249,31 +506,32 @@ def make_spaces_quadruped():
 
     trunk = data_exporter.get_data("C_trunkModule", "main_ctl")
 
-    fk_switch(target=trunk, sources=[head, local_chest_ctl, body_ctl], default_rotate=1, default_translate=1)
-    fk_switch(target=neck, sources=[local_chest_ctl, body_ctl])
-    fk_switch(target=head, sources=[neck, local_chest_ctl, body_ctl], default_rotate=0, default_translate=1)
+    with get_manager().batch():
+        fk_switch(target=trunk, sources=[head, local_chest_ctl, body_ctl], default_rotate=1, default_translate=1)
+        fk_switch(target=neck, sources=[local_chest_ctl, body_ctl])
+        fk_switch(target=head, sources=[neck, local_chest_ctl, body_ctl], default_rotate=0, default_translate=1)
 
 
-    for side in ["L", "R"]:
-        scapula = data_exporter.get_data(f"{side}_frontLegModule", f"scapula_ctl")
-        shoulder_ctl = data_exporter.get_data(f"{side}_frontLegModule", f"fk_ctl")[0]
-        frontLegRootIk = data_exporter.get_data(f"{side}_frontLegModule", f"root_ctl")
-        armPv = data_exporter.get_data(f"{side}_frontLegModule", f"pv_ctl")
-        frontLegEndIk = data_exporter.get_data(f"{side}_frontLegModule", f"end_ik")
-        backLeg_ctl = data_exporter.get_data(f"{side}_backLegModule", f"fk_ctl")[0]
-        backLegRootIk = data_exporter.get_data(f"{side}_backLegModule", f"root_ctl")
-        backLegPv = data_exporter.get_data(f"{side}_backLegModule", f"pv_ctl")
-        backLegEndIk = data_exporter.get_data(f"{side}_backLegModule", f"end_ik")
+        for side in ["L", "R"]:
+            scapula = data_exporter.get_data(f"{side}_frontLegModule", f"scapula_ctl")
+            shoulder_ctl = data_exporter.get_data(f"{side}_frontLegModule", f"fk_ctl")[0]
+            frontLegRootIk = data_exporter.get_data(f"{side}_frontLegModule", f"root_ctl")
+            armPv = data_exporter.get_data(f"{side}_frontLegModule", f"pv_ctl")
+            frontLegEndIk = data_exporter.get_data(f"{side}_frontLegModule", f"end_ik")
+            backLeg_ctl = data_exporter.get_data(f"{side}_backLegModule", f"fk_ctl")[0]
+            backLegRootIk = data_exporter.get_data(f"{side}_backLegModule", f"root_ctl")
+            backLegPv = data_exporter.get_data(f"{side}_backLegModule", f"pv_ctl")
+            backLegEndIk = data_exporter.get_data(f"{side}_backLegModule", f"end_ik")
 
-        fk_switch(target=scapula, sources=[local_chest_ctl])
-        fk_switch(target=shoulder_ctl, sources=[scapula, local_chest_ctl])
-        fk_switch(target=backLeg_ctl, sources=[local_hip_ctl, body_ctl])
-        fk_switch(target=frontLegRootIk, sources=[scapula, local_chest_ctl, body_ctl])
-        fk_switch(target=backLegRootIk, sources=[local_hip_ctl, body_ctl])
+            fk_switch(target=scapula, sources=[local_chest_ctl])
+            fk_switch(target=shoulder_ctl, sources=[scapula, local_chest_ctl])
+            fk_switch(target=backLeg_ctl, sources=[local_hip_ctl, body_ctl])
+            fk_switch(target=frontLegRootIk, sources=[scapula, local_chest_ctl, body_ctl])
+            fk_switch(target=backLegRootIk, sources=[local_hip_ctl, body_ctl])
 
 
-        fk_switch(target=frontLegEndIk, sources=[scapula, local_chest_ctl, body_ctl], default_rotate=0, default_translate=0)
-        fk_switch(target=backLegEndIk, sources=[local_hip_ctl, body_ctl], default_rotate=0, default_translate=0)
+            fk_switch(target=frontLegEndIk, sources=[scapula, local_chest_ctl, body_ctl], default_rotate=0, default_translate=0)
+            fk_switch(target=backLegEndIk, sources=[local_hip_ctl, body_ctl], default_rotate=0, default_translate=0)
 
-        fk_switch(target=armPv, sources=[frontLegEndIk, local_chest_ctl, body_ctl])
-        fk_switch(target=backLegPv, sources=[backLegEndIk, local_hip_ctl, body_ctl])
+            fk_switch(target=armPv, sources=[frontLegEndIk, local_chest_ctl, body_ctl])
+            fk_switch(target=backLegPv, sources=[backLegEndIk, local_hip_ctl, body_ctl])
@@ -0,0 +1,152 @@
+"""
+Node graphs shared by the spine and neck modules.
+The ikSpline stretch, offset, squash and volume preservation networks are the same for every spline module,
+only the "{prefix}" of the names and the plugs they drive change.
+"""
+
+from gg_autorig.utils.node_graph import NodeGraph
+
+STRETCH_GRAPH = NodeGraph(
+    nodes={
+        "curveInfo": ("curveInfo", "{prefix}_CIN", None),
+        "factor": ("floatMath", "{prefix}StretchFactor_FLM", 3),
+        "clamp": ("clamp", "{prefix}StretchFactor_CLM", None),
+        "initialLength": ("floatMath", "{prefix}InitialArcLegth_FLM", 2),
+        "baseStretch": ("floatConstant", "{prefix}BaseStretch_FLC", None),
+        "blend": ("blendTwoAttr", "{prefix}Stretch_BTA", None),
+        "value": ("floatMath", "{prefix}StretchValue_FLM", 2),
+    },
+    edges=[
+        ("curveInfo.arcLength", "factor.floatA"),
+        ("factor.outFloat", "clamp.inputR"),
+        ("initialLength.outFloat", "factor.floatB"),
+        ("clamp.outputR", "blend.input[1]"),
+        ("baseStretch.outFloat", "blend.input[0]"),
+        ("blend.output", "value.floatA"),
+        ("@stretch", "blend.attributesBlender"),
+        ("@stretchMax", "clamp.maxR"),
+        ("@stretchMin", "clamp.minR"),
+        ("@curve", "curveInfo.inputCurve"),
+        ("@distance", "initialLength.floatB"),
+        ("@globalScale", "initialLength.floatA"),
+        ("@twistDivision", "value.floatB"),
+        ("value.outFloat", "@joints"),
+    ],
+    values={
+        "baseStretch.inFloat": 1.0,
+    },
+)
+
+OFFSET_GRAPH = NodeGraph(
+    nodes={
+        "decompose": ("decomposeMatrix", "{prefix}Reversed05_DCM", None),
+        "nearestPoint": ("nearestPointOnCurve", "{prefix}Offset_NPC", None),
+        "initialValue": ("floatConstant", "{prefix}OffsetInitialValue_FLC", None),
+        "blend": ("blendTwoAttr", "{prefix}Offset_BTA", None),
+    },
+    edges=[
+        ("decompose.outputTranslate", "nearestPoint.inPosition"),
+        ("nearestPoint.parameter", "blend.input[1]"),
+        ("initialValue.outFloat", "blend.input[0]"),
+        ("@offset", "blend.attributesBlender"),
+        ("@reverseMatrix", "decompose.inputMatrix"),
+        ("@curve", "nearestPoint.inputCurve"),
+        ("blend.output", "@ikOffset"),
+    ],
+    values={
+        "initialValue.inFloat": 0.0,
+    },
+)
+
+SQUASH_GRAPH = NodeGraph(
+    nodes={
+        "curveInfo": ("curveInfo", "{prefix}Squash_CIN", None),
+        "baseLength": ("floatMath", "{prefix}SquashBaseLength_FLM", 2),
+        "factor": ("floatMath", "{prefix}SquashFactor_FLM", 3),
+    },
+    edges=[
+        ("@curve", "curveInfo.inputCurve"),
+        ("curveInfo.arcLength", "factor.floatA"),
+        ("baseLength.outFloat", "factor.floatB"),
+        ("@globalScale", "baseLength.floatA"),
+    ],
+)
+
+VOLUME_BOUNDS_GRAPH = NodeGraph(
+    nodes={
+        "lowBound": ("remapValue", "{prefix}VolumeLowBound_RMV", None),
+        "highBound": ("remapValue", "{prefix}VolumeHighBound_RMV", None),
+        "lowBoundNegative": ("floatMath", "{prefix}VolumeLowBoundNegative_FLM", 1),
+        "highBoundNegative": ("floatMath", "{prefix}VolumeHighBoundNegative_FLM", 1),
+        "squashDelta": ("floatMath", "{prefix}VolumeSquashDelta_FLM", 1),
+        "stretchDelta": ("floatMath", "{prefix}VolumeStretchDelta_FLM", 1),
+    },
+    edges=[
+        ("@falloff", "lowBound.inputValue"),
+        ("@maxPos", "lowBound.outputMin"),
+        ("lowBound.outValue", "lowBoundNegative.floatB"),
+        ("@falloff", "highBound.inputValue"),
+        ("@maxPos", "highBound.outputMin"),
+        ("highBound.outValue", "highBoundNegative.floatB"),
+        ("@maxStretchEffect", "squashDelta.floatA"),
+        ("@minStretchEffect", "stretchDelta.floatB"),
+    ],
+    values={
+        "lowBound.outputMax": 0.001,
+        "highBound.outputMax": 0.999,
+        "lowBoundNegative.floatA": 0.0,
+        "highBoundNegative.floatA": 2.0,
+        "squashDelta.floatB": 1.0,
+        "stretchDelta.floatA": 1.0,
+    },
+)
+
+# Template reused for every squash joint, the {index} field keeps the names unique.
+VOLUME_JOINT_GRAPH = NodeGraph(
+    nodes={
+        "squashFactor": ("floatMath", "{prefix}VolumeSquashFactor0{index}_FLM", 2),
+        "stretchFactor": ("floatMath", "{prefix}VolumeStretchFactor0{index}_FLM", 2),
+        "stretchFullValue": ("floatMath", "{prefix}VolumeStretchFullValue0{index}_FLM", 1),
+        "squashFullValue": ("floatMath", "{prefix}VolumeSquashFullValue0{index}_FLM", 0),
+        "volume": ("remapValue", "{prefix}Volume0{index}_RMV", None),
+        "factor": ("remapValue", "{prefix}VolumeFactor0{index}_RMV", None),
+        "constant": ("floatConstant", "{prefix}Volume0{index}_FLC", None),
+        "blend": ("blendTwoAttr", "{prefix}Volume0{index}_BTA", None),
+    },
+    edges=[
+        ("@squashPercentage", "factor.inputValue"),
+        ("@lowBoundNegative", "factor.value[0].value_Position"),
+        ("@lowBound", "factor.value[1].value_Position"),
+        ("@highBound", "factor.value[2].value_Position"),
+        ("@highBoundNegative", "factor.value[3].value_Position"),
+        ("squashFactor.outFloat", "squashFullValue.floatA"),
+        ("stretchFactor.outFloat", "stretchFullValue.floatB"),
+        ("stretchFullValue.outFloat", "volume.value[2].value_FloatValue"),
+        ("squashFullValue.outFloat", "volume.value[0].value_FloatValue"),
+        ("@squashFactor", "volume.inputValue"),
+        ("@squashDelta", "squashFactor.floatA"),
+        ("@stretchDelta", "stretchFactor.floatA"),
+        ("factor.outValue", "squashFactor.floatB"),
+        ("factor.outValue", "stretchFactor.floatB"),
+        ("@maxStretchLength", "volume.value[2].value_Position"),
+        ("@minStretchLength", "volume.value[0].value_Position"),
+        ("volume.outValue", "blend.input[1]"),
+        ("constant.outFloat", "blend.input[0]"),
+        ("@volumePreservation", "blend.attributesBlender"),
+        ("blend.output", "@scale"),
+    ],
+    values={
+        "squashFullValue.floatB": 1.0,
+        "stretchFullValue.floatA": 1.0,
+        # Rest scale of the joints with volumePreservation at 0, the restScale of ggVolumePreservation.
+        "constant.inFloat": 1.0,
+        "factor.value[0].value_Interp": 2,
+        "factor.value[1].value_Interp": 2,
+        "factor.value[2].value_Interp": 2,
+        "factor.value[3].value_Interp": 2,
+        "factor.value[0].value_FloatValue": -1.0,
+        "factor.value[1].value_FloatValue": 1.0,
+        "factor.value[2].value_FloatValue": 1.0,
+        "factor.value[3].value_FloatValue": -1.0,
+    },
+)
@@ -0,0 +1,138 @@
+import os
+
+TEMPLATE_FOLDERS = {".guides": "guides", ".ctls": "curves"}
+
+def get_repo_root(path=None):
+    """
+    Returns the root folder of the autorig (the folder containing scripts, guides and curves).
+    Walks up the parents of the given path until the scripts folder is found. Backslashes are read as separators, so
+    Windows paths resolve the same way on every platform.
+
+    Args:
+        path (str, optional): Path inside the repository. Defaults to this file.
+    Returns:
+        str: The root folder of the repository, the one of this file if the path is not inside a scripts folder.
+    """
+    path = (path or __file__).replace("\\", "/")
+    current = os.path.dirname(os.path.realpath(path) if os.path.exists(path) else path)
+    while True:
+        parent = os.path.dirname(current)
+        if os.path.basename(current) == "scripts":
+            return parent
+        if parent == current:
+            # scripts/gg_autorig/utils/template_resolver.py
+            return os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))))
+        current = parent
+
+
+class TemplateResolver:
+    """
+    Resolves the guides and controllers template names stored in the DataManager to file paths.
+    Directory listings and resolved paths are cached and only recomputed when the folder modification time changes
+    or when the template names change. This module does not import maya so it can be used and tested outside of it.
+    """
+
+    def __init__(self, root=None):
+        """
+        Initializes the resolver.
+
+        Args:
+            root (str, optional): Root folder of the repository. Defaults to get_repo_root().
+        """
+        self.root = root or get_repo_root()
+        self._listings = {}
+        self._resolved = {}
+
+    def invalidate(self):
+        """
+        Clears the resolved paths and folder listings, called every time the DataManager template names change.
+        The next resolve reads the template folders again even if their modification time did not change.
+        """
+        self._resolved.clear()
+        self._listings.clear()
+
+    def template_dir(self, ext):
+        """
+        Returns the folder where the templates of the given extension live.
+
+        Args:
+            ext (str): Template extension, ".guides" or ".ctls".
+        Returns:
+            str: The template folder.
+        """
+        return os.path.join(self.root, TEMPLATE_FOLDERS[ext])
+
+    def list_dir(self, directory):
+        """
+        Returns the file names of a folder, reusing the previous listing if the folder did not change.
+
+        Args:
+            directory (str): Folder to list.
+        Returns:
+            tuple: The modification time of the folder and its file names.
+        """
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None, []
+
+        cached = self._listings.get(directory)
+        if cached and cached[0] == mtime:
+            return cached
+
+        listing = (mtime, os.listdir(directory))
+        self._listings[directory] = listing
+        return listing
+
+    def latest_version(self, base_name, ext):
+        """
+        Returns the highest two digit version of a template name in its folder, 1 if there is none.
+
+        Args:
+            base_name (str): Template name without version and extension.
+            ext (str): Template extension.
+        Returns:
+            int: The highest version found.
+        """
+        _, files = self.list_dir(self.template_dir(ext))
+
+        max_num = 1
+        for f in files:
+            if not (f.startswith(base_name) and f.endswith(ext)):
+                continue
+            try:
+                num = int(f[len(base_name):len(base_name)+2])
+                if num > max_num:
+                    max_num = num
+            except ValueError:
+                continue
+        return max_num
+
+    def resolve(self, file_name, ext):
+        """
+        Returns the path of the latest version of a template.
+        Absolute paths are returned untouched, names are looked up in the template folder of the extension.
+
+        Args:
+            file_name (str): Template name or absolute path.
+            ext (str): Template extension, ".guides" or ".ctls".
+        Returns:
+            str: The path of the template.
+        """
+        if os.path.isabs(file_name):
+            return file_name
+
+        directory = self.template_dir(ext)
+        mtime, _ = self.list_dir(directory)
+
+        key = (file_name, ext)
+        cached = self._resolved.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        path = os.path.join(directory, f"{file_name}{self.latest_version(file_name, ext):02d}{ext}")
+        self._resolved[key] = (mtime, path)
+        return path
+
+
+RESOLVER = TemplateResolver()
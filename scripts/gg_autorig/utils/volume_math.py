@@ -0,0 +1,101 @@
+"""
+Pure python reference of the squash and stretch volume preservation used by the spine and neck modules.
+It mirrors the remapValue/floatMath network of volume_preservation_system and is shared with the ggVolumePreservation node.
+This module does not import maya so it can be used and tested outside of it.
+"""
+
+LINEAR = 1
+SMOOTH = 2
+
+def remap(value, input_min, input_max, output_min, output_max):
+    """
+    Linear remap like a remapValue node with its default ramp.
+
+    Args:
+        value (float): Input value.
+        input_min (float): Input range start.
+        input_max (float): Input range end.
+        output_min (float): Output range start.
+        output_max (float): Output range end.
+    Returns:
+        float: The remapped value, clamped to the output range.
+    """
+    if input_max == input_min:
+        return output_min
+    weight = min(max((value - input_min) / (input_max - input_min), 0.0), 1.0)
+    return output_min + (output_max - output_min) * weight
+
+def ramp(value, keys):
+    """
+    Evaluates a ramp attribute like the value ramp of a remapValue node.
+
+    Args:
+        value (float): Ramp position.
+        keys (list): (position, value, interpolation) tuples, interpolation is LINEAR or SMOOTH.
+    Returns:
+        float: The ramp value, held at the end values outside of the keys.
+    """
+    keys = sorted(keys)
+    if value <= keys[0][0]:
+        return keys[0][1]
+    if value >= keys[-1][0]:
+        return keys[-1][1]
+
+    for (start, start_value, interpolation), (end, end_value, _) in zip(keys, keys[1:]):
+        if start <= value <= end:
+            weight = (value - start) / (end - start) if end != start else 0.0
+            if interpolation == SMOOTH:
+                weight = weight * weight * (3.0 - 2.0 * weight)
+            return start_value + (end_value - start_value) * weight
+
+    return keys[-1][1]
+
+def volume_bounds(falloff, max_pos):
+    """
+    Returns the four positions of the per joint factor ramp.
+
+    Args:
+        falloff (float): Falloff of the effect along the chain.
+        max_pos (float): Position of the maximum effect along the chain.
+    Returns:
+        tuple: Low bound negative, low bound, high bound and high bound negative positions.
+    """
+    low_bound = remap(falloff, 0.0, 1.0, max_pos, 0.001)
+    high_bound = remap(falloff, 0.0, 1.0, max_pos, 0.999)
+    return -low_bound, low_bound, high_bound, 2.0 - high_bound
+
+def volume_preservation(stretch_factor, percentages, falloff=0.0, max_pos=0.5, max_stretch_length=2.0, min_stretch_length=0.5,
+                        max_stretch_effect=2.0, min_stretch_effect=0.5, volume_preservation=1.0, rest_scale=1.0):
+    """
+    Returns the scaleX/scaleZ of every squash joint.
+
+    Args:
+        stretch_factor (float): Current length of the chain divided by its rest length.
+        percentages (list): Position of every joint along the chain, from 0 to 1.
+        falloff (float): Falloff of the effect along the chain.
+        max_pos (float): Position of the maximum effect along the chain.
+        max_stretch_length (float): Stretch factor where the effect is full.
+        min_stretch_length (float): Squash factor where the effect is full.
+        max_stretch_effect (float): Scale of the joints fully squashed.
+        min_stretch_effect (float): Scale of the joints fully stretched.
+        volume_preservation (float): Blend between rest_scale and the preserved scale.
+        rest_scale (float): Scale used when volume_preservation is 0.
+    Returns:
+        list: The scale of every joint.
+    """
+    low_negative, low, high, high_negative = volume_bounds(falloff, max_pos)
+    factor_keys = [(low_negative, -1.0, SMOOTH), (low, 1.0, SMOOTH), (high, 1.0, SMOOTH), (high_negative, -1.0, SMOOTH)]
+
+    squash_delta = max_stretch_effect - 1.0
+    stretch_delta = 1.0 - min_stretch_effect
+
+    scales = []
+    for percentage in percentages:
+        factor = ramp(percentage, factor_keys)
+        squash_value = squash_delta * factor + 1.0
+        stretch_value = 1.0 - stretch_delta * factor
+
+        volume = ramp(stretch_factor, [(min_stretch_length, squash_value, LINEAR), (1.0, 1.0, LINEAR), (max_stretch_length, stretch_value, LINEAR)])
+        scales.append(rest_scale + (volume - rest_scale) * volume_preservation)
+
+    return scales
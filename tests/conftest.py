@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The gg_autorig package lives in scripts/, the folder Maya adds to the python path through gg_autorig.mod.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
@@ -0,0 +1,45 @@
+"""
+Headless tests of the de_boor_math tables used by the De Boor spine stretch.
+"""
+
+import pytest
+
+from gg_autorig.utils import de_boor_math
+
+POSITIONS = [[0.0, 0.0, 0.0], [0.0, 3.0, 1.0], [2.0, 5.0, 0.0], [4.0, 6.0, -1.0], [5.0, 9.0, 0.0]]
+DEGREE = 3
+KV = de_boor_math.get_open_uniform_kv(len(POSITIONS), DEGREE)
+
+
+def weighted_point(wts):
+    return [sum(wt * position[axis] for wt, position in zip(wts, POSITIONS)) for axis in range(3)]
+
+
+def test_rest_fractions_round_trip_through_the_table():
+    table = de_boor_math.arc_length_table(POSITIONS, d=DEGREE, kv=KV, samples=16)
+    params = de_boor_math.uniform_length_params(de_boor_math.arc_length_table(POSITIONS, d=DEGREE, kv=KV), 5)
+
+    lengths = de_boor_math.params_from_lengths((table[1], table[0]), params)
+    assert de_boor_math.params_from_lengths(table, lengths) == pytest.approx(params, abs=1e-9)
+
+
+def test_extension_starts_at_the_curve_end():
+    param, wts = de_boor_math.extend_past_end(POSITIONS, DEGREE, KV, 0.0)
+    assert param == pytest.approx(1.0)
+    assert weighted_point(wts) == pytest.approx(POSITIONS[-1])
+
+
+def test_extension_follows_the_end_tangent():
+    length = 2.5
+    param, wts = de_boor_math.extend_past_end(POSITIONS, DEGREE, KV, length)
+    assert param > 1.0
+    assert sum(wts) == pytest.approx(1.0)
+
+    end = de_boor_math.curve_point(POSITIONS, DEGREE, 1.0, KV)
+    before = de_boor_math.curve_point(POSITIONS, DEGREE, 1.0 - 0.001, KV)
+    tangent_length = de_boor_math.polyline_length([before, end])
+    direction = [(b - a) / tangent_length for a, b in zip(before, end)]
+
+    point = weighted_point(wts)
+    assert de_boor_math.polyline_length([end, point]) == pytest.approx(length)
+    assert point == pytest.approx([e + length * v for e, v in zip(end, direction)])
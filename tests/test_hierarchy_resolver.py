@@ -0,0 +1,109 @@
+"""
+Headless tests of the hierarchy_resolver used by skeleton_hierarchy.
+"""
+
+from gg_autorig.utils import hierarchy_resolver
+
+HIERARCHY = [
+    {"C_root_GUIDE": [
+        {"C_spine_GUIDE": [
+            {"C_localHip_GUIDE": [
+                {"L_leg_GUIDE": []},
+                {"R_leg_GUIDE": []},
+            ]},
+            {"C_neck_GUIDE": []},
+            {"L_arm_GUIDE": [
+                {"L_hand_GUIDE": []},
+            ]},
+            {"R_arm_GUIDE": []},
+        ]},
+    ]},
+]
+
+GROUPS = [("C", "spine"), ("L", "leg"), ("R", "leg"), ("C", "neck"), ("L", "arm"), ("L", "hand"), ("R", "arm")]
+
+
+def test_flatten_keeps_the_sibling_order():
+    assert hierarchy_resolver.flatten_hierarchy(HIERARCHY) == [
+        ("C_root_GUIDE", "C_spine_GUIDE"),
+        ("C_spine_GUIDE", "C_localHip_GUIDE"),
+        ("C_localHip_GUIDE", "L_leg_GUIDE"),
+        ("C_localHip_GUIDE", "R_leg_GUIDE"),
+        ("C_spine_GUIDE", "C_neck_GUIDE"),
+        ("C_spine_GUIDE", "L_arm_GUIDE"),
+        ("L_arm_GUIDE", "L_hand_GUIDE"),
+        ("C_spine_GUIDE", "R_arm_GUIDE"),
+    ]
+
+
+def test_flatten_skips_leaf_strings():
+    assert hierarchy_resolver.flatten_hierarchy([{"C_root_GUIDE": ["C_spine_GUIDE", {"L_arm_GUIDE": []}]}]) == [
+        ("C_root_GUIDE", "L_arm_GUIDE"),
+    ]
+
+
+def test_module_key_maps_local_hip_to_spine():
+    assert hierarchy_resolver.module_key("C_localHip_GUIDE") == ("C", "spine")
+    assert hierarchy_resolver.module_key("L_arm_GUIDE") == ("L", "arm")
+
+
+def links_by_child(links):
+    return {(link["child_side"], link["child_module"]): link for link in links}
+
+
+def test_root_parent_has_no_index():
+    links, missing = hierarchy_resolver.resolve_hierarchy(HIERARCHY, GROUPS)
+    assert not missing
+    spine = links_by_child(links)[("C", "spine")]
+    assert spine["parent_index"] is None
+    assert spine["child_index"] == 0
+
+
+def test_local_hip_children_hang_from_the_spine():
+    links, _ = hierarchy_resolver.resolve_hierarchy(HIERARCHY, GROUPS)
+    by_child = links_by_child(links)
+
+    assert ("C", "localHip") not in by_child
+    left_leg = by_child[("L", "leg")]
+    assert left_leg["parent_module"] == "localHip"
+    assert left_leg["parent_index"] == 0
+    assert left_leg["parent_index_chain"] == -1
+
+
+def test_spine_children_use_the_second_to_last_joint():
+    links, _ = hierarchy_resolver.resolve_hierarchy(HIERARCHY, GROUPS)
+    by_child = links_by_child(links)
+
+    assert by_child[("C", "neck")]["parent_index_chain"] == -2
+    assert by_child[("L", "arm")]["parent_index_chain"] == -2
+    assert by_child[("L", "hand")]["parent_index_chain"] == -1
+    assert by_child[("L", "hand")]["parent_index"] == 4
+    assert by_child[("L", "hand")]["hand_value"]
+    assert not by_child[("L", "arm")]["hand_value"]
+
+
+def test_links_keep_the_file_order():
+    links, _ = hierarchy_resolver.resolve_hierarchy(HIERARCHY, GROUPS)
+    assert [(link["child_side"], link["child_module"]) for link in links] == [
+        ("C", "spine"), ("L", "leg"), ("R", "leg"), ("C", "neck"), ("L", "arm"), ("L", "hand"), ("R", "arm"),
+    ]
+
+
+def test_missing_groups_are_reported():
+    groups = [("C", "spine"), ("L", "arm")]
+    links, missing = hierarchy_resolver.resolve_hierarchy(HIERARCHY, groups)
+    assert missing == ["L_leg_GUIDE", "R_leg_GUIDE", "C_neck_GUIDE", "L_hand_GUIDE", "R_arm_GUIDE"]
+    assert [(link["child_side"], link["child_module"]) for link in links] == [("C", "spine"), ("L", "arm")]
+
+
+def test_missing_parent_group_is_reported():
+    hierarchy = [{"C_root_GUIDE": [{"L_arm_GUIDE": [{"L_hand_GUIDE": []}]}]}]
+    links, missing = hierarchy_resolver.resolve_hierarchy(hierarchy, [("L", "hand")])
+    assert missing == ["L_arm_GUIDE", "L_arm_GUIDE"]
+    assert links == []
+
+
+def test_duplicated_group_uses_the_last_one():
+    hierarchy = [{"C_root_GUIDE": [{"L_arm_GUIDE": []}]}]
+    links, _ = hierarchy_resolver.resolve_hierarchy(hierarchy, [("L", "arm"), ("L", "arm")])
+    assert links[0]["child_index"] == 1
@@ -0,0 +1,260 @@
+"""
+Headless tests of the matrix_math references shared with the ggAutorigNodes plugin.
+"""
+
+import math
+
+import pytest
+
+from gg_autorig.utils import matrix_math
+
+SQRT_HALF = math.sqrt(0.5)
+
+
+def assert_matrix(result, expected, tolerance=1e-6):
+    assert len(result) == 16
+    for value, expected_value in zip(result, expected):
+        assert value == pytest.approx(expected_value, abs=tolerance)
+
+
+def rotation_z(degrees, position=(0.0, 0.0, 0.0)):
+    angle = math.radians(degrees)
+    c, s = math.cos(angle), math.sin(angle)
+    return [c, s, 0.0, 0.0,
+            -s, c, 0.0, 0.0,
+            0.0, 0.0, 1.0, 0.0,
+            position[0], position[1], position[2], 1.0]
+
+
+# space_switch
+
+DEFAULT = matrix_math.translation_matrix([1.0, 0.0, 0.0])
+DRIVERS = [matrix_math.translation_matrix([0.0, 5.0, 0.0]), rotation_z(90.0, (0.0, 0.0, 3.0))]
+OFFSETS = [list(matrix_math.IDENTITY), matrix_math.translation_matrix([1.0, 0.0, 0.0])]
+
+
+def test_space_switch_first_driver():
+    result = matrix_math.space_switch(DEFAULT, matrix_math.IDENTITY, DRIVERS, OFFSETS, index=0)
+    assert_matrix(result, matrix_math.translation_matrix([0.0, 5.0, 0.0]))
+
+
+def test_space_switch_second_driver_applies_offset_in_driver_space():
+    result = matrix_math.space_switch(DEFAULT, matrix_math.IDENTITY, DRIVERS, OFFSETS, index=1)
+    # The (1, 0, 0) offset rotated 90 degrees around Z is (0, 1, 0), plus the driver translation.
+    assert_matrix(result, rotation_z(90.0, (0.0, 1.0, 3.0)))
+
+
+def test_space_switch_partial_translate_weight():
+    result = matrix_math.space_switch(DEFAULT, matrix_math.IDENTITY, DRIVERS, OFFSETS, index=1, translate_weight=0.5, rotate_weight=0.0)
+    assert_matrix(result, matrix_math.translation_matrix([0.5, 0.5, 1.5]))
+
+
+def test_space_switch_partial_rotate_weight():
+    result = matrix_math.space_switch(DEFAULT, matrix_math.IDENTITY, DRIVERS, OFFSETS, index=1, translate_weight=0.0, rotate_weight=0.5)
+    assert_matrix(result, [SQRT_HALF, SQRT_HALF, 0.0, 0.0,
+                           -SQRT_HALF, SQRT_HALF, 0.0, 0.0,
+                           0.0, 0.0, 1.0, 0.0,
+                           1.0, 0.0, 0.0, 1.0])
+
+
+def test_space_switch_zero_weights_keep_default_space():
+    default_offset = matrix_math.translation_matrix([0.0, 2.0, 0.0])
+    result = matrix_math.space_switch(DEFAULT, default_offset, DRIVERS, OFFSETS, index=1, translate_weight=0.0, rotate_weight=0.0)
+    assert_matrix(result, matrix_math.translation_matrix([1.0, 2.0, 0.0]))
+
+
+def test_space_switch_index_is_clamped():
+    result = matrix_math.space_switch(DEFAULT, matrix_math.IDENTITY, DRIVERS, OFFSETS, index=5)
+    assert_matrix(result, rotation_z(90.0, (0.0, 1.0, 3.0)))
+
+
+def test_space_switch_without_drivers():
+    result = matrix_math.space_switch(DEFAULT, matrix_math.IDENTITY, [], [], index=0)
+    assert_matrix(result, DEFAULT)
+
+
+# pole_vector_position / pole_vector_matrix
+
+def test_pole_vector_is_perpendicular_to_start_end_line():
+    start, mid, end = [0.0, 0.0, 0.0], [2.0, 1.0, 0.0], [4.0, 0.0, 0.0]
+    pole = matrix_math.pole_vector_position(start, mid, end)
+    assert matrix_math.dot(matrix_math.sub(pole, mid), matrix_math.sub(end, start)) == pytest.approx(0.0, abs=1e-9)
+    # In front of the mid joint, away from the start-end line.
+    assert pole[1] > mid[1]
+    assert pole[2] == pytest.approx(0.0)
+
+
+def test_pole_vector_follows_mid_bisector_with_unequal_bones():
+    start, mid, end = [0.0, 0.0, 0.0], [1.0, 1.0, 0.0], [4.0, 0.0, 0.0]
+    pole = matrix_math.pole_vector_position(start, mid, end)
+    direction = matrix_math.normalize(matrix_math.sub(pole, mid))
+    to_start = matrix_math.normalize(matrix_math.sub(start, mid))
+    to_end = matrix_math.normalize(matrix_math.sub(end, mid))
+    # Same angle to both bones, pointing away from them.
+    assert matrix_math.dot(direction, to_start) == pytest.approx(matrix_math.dot(direction, to_end))
+    assert matrix_math.dot(direction, to_start) < 0.0
+
+
+@pytest.mark.parametrize("pole_distance", [0.5, 1.0, 2.0])
+def test_pole_distance_scales_the_offset(pole_distance):
+    start, mid, end = [0.0, 0.0, 0.0], [2.0, 1.0, 0.0], [4.0, 0.0, 0.0]
+    chain_length = 2.0 * math.sqrt(5.0)
+    pole = matrix_math.pole_vector_position(start, mid, end, pole_distance)
+    assert matrix_math.vector_length(matrix_math.sub(pole, mid)) == pytest.approx(chain_length * pole_distance / 2.0)
+
+
+def test_pole_vector_on_straight_chain_stays_on_mid_joint():
+    start, mid, end = [0.0, 0.0, 0.0], [2.0, 0.0, 0.0], [4.0, 0.0, 0.0]
+    assert matrix_math.pole_vector_position(start, mid, end) == pytest.approx(mid)
+
+    matrices = [matrix_math.translation_matrix(position) for position in (start, mid, end)]
+    result = matrix_math.pole_vector_matrix(*matrices, orient_weight=1.0)
+    assert_matrix(result, matrix_math.translation_matrix(mid))
+
+
+def test_pole_vector_matrix_orient_weight():
+    start, mid, end = [0.0, 0.0, 0.0], [2.0, 1.0, 0.0], [4.0, 0.0, 0.0]
+    matrices = [matrix_math.translation_matrix(position) for position in (start, mid, end)]
+    position = matrix_math.pole_vector_position(start, mid, end)
+
+    assert_matrix(matrix_math.pole_vector_matrix(*matrices), matrix_math.translation_matrix(position))
+
+    oriented = matrix_math.pole_vector_matrix(*matrices, orient_weight=1.0)
+    assert matrix_math.translation(oriented) == pytest.approx(position)
+    # Z aims back at the mid joint.
+    assert oriented[8:11] == pytest.approx(matrix_math.normalize(matrix_math.sub(mid, position)))
+
+
+# two_bone_ik
+
+def solve(handle, pole, **kwargs):
+    return matrix_math.two_bone_ik(list(matrix_math.IDENTITY), matrix_math.translation_matrix(pole), matrix_math.translation_matrix(handle), 2.0, 2.0, **kwargs)
+
+
+@pytest.mark.parametrize("soft", [0.0, 0.5, 1.0])
+def test_two_bone_ik_reaches_handle_in_reach(soft):
+    upper, lower, end = solve([3.0, 0.0, 0.0], [1.5, 2.0, 0.0], soft=soft)
+    assert matrix_math.translation(end) == pytest.approx([3.0, 0.0, 0.0], abs=1e-9)
+    assert matrix_math.translation(upper) == pytest.approx([0.0, 0.0, 0.0])
+    # The elbow bends towards the pole vector.
+    assert matrix_math.translation(lower)[1] > 0.0
+
+
+def test_two_bone_ik_without_stretch_stops_at_chain_length():
+    _, lower, end = solve([6.0, 0.0, 0.0], [3.0, 2.0, 0.0])
+    assert matrix_math.translation(lower) == pytest.approx([2.0, 0.0, 0.0], abs=1e-9)
+    assert matrix_math.translation(end) == pytest.approx([4.0, 0.0, 0.0], abs=1e-9)
+
+
+def test_two_bone_ik_stretch_reaches_handle():
+    _, lower, end = solve([6.0, 0.0, 0.0], [3.0, 2.0, 0.0], stretch=1.0)
+    assert matrix_math.translation(lower) == pytest.approx([3.0, 0.0, 0.0], abs=1e-9)
+    assert matrix_math.translation(end) == pytest.approx([6.0, 0.0, 0.0], abs=1e-9)
+
+
+def test_two_bone_ik_stretch_uses_global_scale():
+    # The rig global scale reaches the root controller matrix too, the chain is 8 long and the handle is in reach.
+    root = matrix_math.compose([0.0, 0.0, 0.0], [0.0, 0.0, 0.0, 1.0], [2.0, 2.0, 2.0])
+    _, lower, end = matrix_math.two_bone_ik(root, matrix_math.translation_matrix([3.0, 2.0, 0.0]),
+                                            matrix_math.translation_matrix([6.0, 0.0, 0.0]), 2.0, 2.0, global_scale=2.0, stretch=1.0)
+    assert matrix_math.vector_length(matrix_math.translation(lower)) == pytest.approx(4.0, rel=1e-3)
+    assert matrix_math.translation(end) == pytest.approx([6.0, 0.0, 0.0], abs=1e-9)
+
+
+def test_two_bone_ik_pin_puts_elbow_on_pole():
+    _, lower, end = solve([3.0, 0.0, 0.0], [1.0, 2.0, 0.0], pin=1.0)
+    assert matrix_math.translation(lower) == pytest.approx([1.0, 2.0, 0.0], abs=1e-9)
+    assert matrix_math.translation(end) == pytest.approx([3.0, 0.0, 0.0], abs=1e-9)
+
+
+def test_soft_lengths_at_zero_soft_follow_the_cubic_falloff():
+    # Same falloff as the soft network: at soft 0 the bones are still scaled by the cubic term.
+    cos_value = matrix_math.law_of_cosine(2.0, 2.0, 2.0)
+    height = math.sqrt(1.0 - cos_value * cos_value)
+    quadratic = (1.0 - cos_value) ** 2
+    blended = height + (quadratic - height) * quadratic ** 3
+    scaler = math.sqrt(blended * blended + cos_value * cos_value)
+
+    upper, lower = matrix_math.soft_lengths(2.0, 2.0, 2.0, soft=0.0)
+    assert upper == pytest.approx(2.0 * scaler)
+    assert lower == pytest.approx(2.0 * scaler)
+    assert scaler == pytest.approx(0.99168, abs=1e-5)
+
+
+def test_soft_lengths_are_rest_lengths_on_a_straight_chain():
+    assert matrix_math.soft_lengths(2.0, 2.0, 4.0, soft=0.0) == pytest.approx((2.0, 2.0))
+    assert matrix_math.soft_lengths(2.0, 2.0, 4.0, soft=1.0) == pytest.approx((2.0, 2.0))
+
+
+def test_soft_lengths_smoothstep_starts_at_soft_start():
+    # Below the soft start cosine the smoothstep falloff is 0 and soft 1 keeps the rest lengths.
+    assert matrix_math.soft_lengths(2.0, 2.0, 3.0, soft=1.0, soft_start=0.8) == pytest.approx((2.0, 2.0))
+    upper, lower = matrix_math.soft_lengths(2.0, 2.0, 3.9, soft=1.0, soft_start=0.8)
+    assert upper < 2.0 and lower < 2.0
+
+
+# guide bake kernels: mult_all / inverse / blend / aim_axes_matrix
+
+def test_mult_all_of_nothing_is_identity():
+    assert_matrix(matrix_math.mult_all([]), matrix_math.IDENTITY)
+
+
+def test_mult_all_applies_the_matrices_in_order():
+    # Like a multMatrix node: the translation is applied first, then the rotation moves it.
+    result = matrix_math.mult_all([matrix_math.translation_matrix([1.0, 0.0, 0.0]), rotation_z(90.0)])
+    assert_matrix(result, rotation_z(90.0, (0.0, 1.0, 0.0)))
+
+
+def test_inverse_round_trip():
+    matrix = rotation_z(30.0, (1.0, 2.0, 3.0))
+    assert_matrix(matrix_math.mult(matrix_math.inverse(matrix), matrix), matrix_math.IDENTITY)
+    assert_matrix(matrix_math.mult(matrix, matrix_math.inverse(matrix)), matrix_math.IDENTITY)
+
+
+def test_inverse_of_singular_matrix_raises():
+    with pytest.raises(ValueError):
+        matrix_math.inverse([0.0] * 16)
+
+
+def test_blend_weights():
+    target = rotation_z(90.0, (2.0, 4.0, 0.0))
+    result = matrix_math.blend(list(matrix_math.IDENTITY), target, translate_weight=0.5, rotate_weight=0.5)
+    assert_matrix(result, rotation_z(45.0, (1.0, 2.0, 0.0)))
+
+
+def test_blend_keeps_the_input_scale_by_default():
+    scaled = [2.0, 0.0, 0.0, 0.0, 0.0, 2.0, 0.0, 0.0, 0.0, 0.0, 2.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+    result = matrix_math.blend(scaled, matrix_math.translation_matrix([1.0, 0.0, 0.0]))
+    assert_matrix(result, scaled[:12] + [1.0, 0.0, 0.0, 1.0])
+
+
+AIMED = [0.0, 1.0, 0.0, 0.0,
+         0.0, 0.0, 1.0, 0.0,
+         1.0, 0.0, 0.0, 0.0,
+         1.0, 2.0, 3.0, 1.0]
+
+
+def test_aim_axes_matrix_aligns_both_axes():
+    result = matrix_math.aim_axes_matrix(matrix_math.translation_matrix([1.0, 2.0, 3.0]), [1.0, 5.0, 3.0], [1.0, 0.0, 0.0],
+                                         [1.0, 2.0, 10.0], [0.0, 1.0, 0.0])
+    assert_matrix(result, AIMED)
+
+
+def test_aim_axes_matrix_orthogonalizes_the_secondary_target():
+    result = matrix_math.aim_axes_matrix(matrix_math.translation_matrix([1.0, 2.0, 3.0]), [1.0, 5.0, 3.0], [1.0, 0.0, 0.0],
+                                         [1.0, 4.0, 10.0], [0.0, 1.0, 0.0])
+    assert_matrix(result, AIMED)
+
+
+def test_aim_axes_matrix_keeps_the_input_scale():
+    input_matrix = [2.0, 0.0, 0.0, 0.0, 0.0, 2.0, 0.0, 0.0, 0.0, 0.0, 2.0, 0.0, 1.0, 2.0, 3.0, 1.0]
+    result = matrix_math.aim_axes_matrix(input_matrix, [1.0, 5.0, 3.0], [1.0, 0.0, 0.0], [1.0, 2.0, 10.0], [0.0, 1.0, 0.0])
+    assert_matrix(result, [value * 2.0 for value in AIMED[:12]] + AIMED[12:])
+
+
+def test_aim_axes_matrix_with_negative_primary_axis():
+    result = matrix_math.aim_axes_matrix(list(matrix_math.IDENTITY), [0.0, 1.0, 0.0], [-1.0, 0.0, 0.0],
+                                         [0.0, 0.0, 1.0], [0.0, 1.0, 0.0])
+    # -X aims at +Y, so +X points down.
+    assert result[0:3] == pytest.approx([0.0, -1.0, 0.0])
+    assert result[4:7] == pytest.approx([0.0, 0.0, 1.0])
@@ -0,0 +1,120 @@
+"""
+Headless tests of NodeGraph.validate and the graphs shared by the spine and neck modules.
+"""
+
+import pytest
+
+from gg_autorig.utils.node_graph import NodeGraph
+from gg_autorig.utils import spine_graphs
+
+
+def make_graph(nodes=None, edges=None, values=None):
+    return NodeGraph(
+        nodes=nodes or {
+            "a": ("floatMath", "{prefix}A_FLM", 2),
+            "b": ("floatMath", "{prefix}B_FLM", 0),
+        },
+        edges=edges if edges is not None else [
+            ("@input", "a.floatA"),
+            ("a.outFloat", "b.floatA"),
+            ("b.outFloat", "@output"),
+        ],
+        values=values,
+    )
+
+
+def test_validate_returns_the_formatted_names():
+    names = make_graph().validate(prefix="C_test")
+    assert names == {"a": "C_testA_FLM", "b": "C_testB_FLM"}
+
+
+def test_externals():
+    assert make_graph().externals() == ({"input"}, {"output"})
+
+
+def test_dangling_key():
+    graph = make_graph(edges=[("a.outFloat", "missing.floatA")])
+    with pytest.raises(ValueError, match="references the undeclared node 'missing'"):
+        graph.validate(prefix="C_test")
+
+
+def test_dangling_value_key():
+    graph = make_graph(values={"missing.floatB": 1.0})
+    with pytest.raises(ValueError, match="references the undeclared node 'missing'"):
+        graph.validate(prefix="C_test")
+
+
+def test_duplicate_name():
+    graph = make_graph(nodes={
+        "a": ("floatMath", "{prefix}Same_FLM", 2),
+        "b": ("floatMath", "{prefix}Same_FLM", 0),
+    })
+    with pytest.raises(ValueError, match="share the name 'C_testSame_FLM'"):
+        graph.validate(prefix="C_test")
+
+
+def test_duplicate_name_from_template_fields():
+    graph = make_graph(nodes={
+        "a": ("floatMath", "{prefix}0{index}_FLM", 2),
+        "b": ("floatMath", "{prefix}0{index}_FLM", 0),
+    })
+    with pytest.raises(ValueError, match="share the name"):
+        graph.validate(prefix="C_test", index=1)
+
+
+def test_destination_driven_twice():
+    graph = make_graph(edges=[
+        ("@input", "b.floatA"),
+        ("a.outFloat", "b.floatA"),
+    ])
+    with pytest.raises(ValueError, match="'b.floatA' is driven more than once"):
+        graph.validate(prefix="C_test")
+
+
+def test_destination_connected_and_set():
+    graph = make_graph(values={"b.floatA": 1.0})
+    with pytest.raises(ValueError, match="'b.floatA' is driven more than once"):
+        graph.validate(prefix="C_test")
+
+
+def test_every_problem_is_reported():
+    graph = make_graph(
+        nodes={
+            "a": ("floatMath", "{prefix}Same_FLM", 2),
+            "b": ("floatMath", "{prefix}Same_FLM", 0),
+        },
+        edges=[
+            ("a.outFloat", "missing.floatA"),
+            ("@input", "b.floatA"),
+            ("a.outFloat", "b.floatA"),
+            ("@input", "@output"),
+        ],
+        values={"@output": 1.0, "a.": 0.0},
+    )
+    with pytest.raises(ValueError) as error:
+        graph.validate(prefix="C_test")
+    message = str(error.value)
+    assert message.startswith("Invalid node graph:")
+    assert "share the name" in message
+    assert "undeclared node 'missing'" in message
+    assert "is driven more than once" in message
+    assert "does not touch the graph" in message
+    assert "can't be set on an external plug" in message
+    assert "'a.' has no attribute" in message
+
+
+@pytest.mark.parametrize("prefix", ["C_spine", "C_neck"])
+def test_spine_graphs_are_valid(prefix):
+    for graph in (
+        spine_graphs.STRETCH_GRAPH,
+        spine_graphs.OFFSET_GRAPH,
+        spine_graphs.SQUASH_GRAPH,
+        spine_graphs.VOLUME_BOUNDS_GRAPH,
+    ):
+        graph.validate(prefix=prefix)
+
+
+def test_volume_joint_graph_names_are_unique_per_joint():
+    first = spine_graphs.VOLUME_JOINT_GRAPH.validate(prefix="C_spine", index=1)
+    second = spine_graphs.VOLUME_JOINT_GRAPH.validate(prefix="C_spine", index=2)
+    assert not set(first.values()) & set(second.values())
@@ -0,0 +1,89 @@
+"""
+Headless tests of the template_resolver used by core.init_template_file.
+"""
+
+import os
+
+import pytest
+
+from gg_autorig.utils import template_resolver
+
+
+@pytest.mark.parametrize("path", [
+    "/home/user/gg_autorig/scripts/gg_autorig/utils/data_export.py",
+    "C:\\Users\\user\\gg_autorig\\scripts\\gg_autorig\\utils\\data_export.py",
+    "C:/Users/user/gg_autorig/scripts/gg_autorig/utils/data_export.py",
+])
+def test_repo_root_with_any_separator(path):
+    root = template_resolver.get_repo_root(path)
+    assert root.replace("\\", "/").endswith("/user/gg_autorig")
+
+
+def test_repo_root_of_this_checkout():
+    expected = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    assert template_resolver.get_repo_root() == expected
+    assert os.path.isdir(os.path.join(template_resolver.get_repo_root(), "scripts"))
+
+
+def test_repo_root_outside_of_scripts_falls_back_to_this_checkout():
+    assert template_resolver.get_repo_root("/tmp/elsewhere/file.py") == template_resolver.get_repo_root()
+
+
+def make_resolver(tmp_path, *names):
+    guides = tmp_path / "guides"
+    guides.mkdir()
+    for name in names:
+        (guides / name).write_text("{}")
+    return template_resolver.TemplateResolver(root=str(tmp_path)), guides
+
+
+def test_resolve_picks_the_highest_numeric_suffix(tmp_path):
+    resolver, guides = make_resolver(tmp_path, "body_template_01.guides", "body_template_03.guides",
+                                     "body_template_02.guides", "body_template_07.ctls", "body_template_xx.guides")
+    assert resolver.resolve("body_template_", ".guides") == os.path.join(str(guides), "body_template_03.guides")
+
+
+def test_resolve_without_versions_defaults_to_01(tmp_path):
+    resolver, guides = make_resolver(tmp_path)
+    assert resolver.resolve("body_template_", ".guides") == os.path.join(str(guides), "body_template_01.guides")
+
+
+def test_resolve_keeps_absolute_paths(tmp_path):
+    resolver, _ = make_resolver(tmp_path)
+    path = str(tmp_path / "custom.guides")
+    assert resolver.resolve(path, ".guides") == path
+
+
+def test_listing_is_reused_until_the_folder_changes(tmp_path):
+    resolver, guides = make_resolver(tmp_path, "body_template_01.guides")
+    first = resolver.list_dir(str(guides))
+    assert resolver.list_dir(str(guides)) is first
+
+    (guides / "body_template_02.guides").write_text("{}")
+    stat = os.stat(guides)
+    os.utime(guides, ns=(stat.st_atime_ns, first[0] + 1_000_000_000))
+
+    assert resolver.resolve("body_template_", ".guides") == os.path.join(str(guides), "body_template_02.guides")
+
+
+def test_invalidate_forces_a_new_lookup(tmp_path):
+    resolver, guides = make_resolver(tmp_path, "body_template_01.guides")
+    assert resolver.resolve("body_template_", ".guides").endswith("body_template_01.guides")
+
+    # A new version written without changing the folder modification time is only seen after invalidate.
+    mtime = os.stat(guides).st_mtime_ns
+    (guides / "body_template_02.guides").write_text("{}")
+    os.utime(guides, ns=(os.stat(guides).st_atime_ns, mtime))
+    assert resolver.resolve("body_template_", ".guides").endswith("body_template_01.guides")
+
+    resolver.invalidate()
+    assert resolver.resolve("body_template_", ".guides").endswith("body_template_02.guides")
+
+
+def test_data_manager_change_invalidates_the_resolver():
+    pytest.importorskip("maya.cmds")
+    from gg_autorig.utils import core
+
+    template_resolver.RESOLVER.resolve("body_template_", ".guides")
+    core.DataManager.set_guide_data("body_template_")
+    assert not template_resolver.RESOLVER._resolved
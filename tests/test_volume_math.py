@@ -0,0 +1,61 @@
+"""
+Headless tests of the volume_math reference shared with the ggVolumePreservation node.
+"""
+
+import pytest
+
+from gg_autorig.utils import volume_math
+
+PERCENTAGES = [0.0, 0.25, 0.5, 0.75, 1.0]
+
+
+def test_rest_length_keeps_the_scale():
+    assert volume_math.volume_preservation(1.0, PERCENTAGES) == pytest.approx([1.0] * len(PERCENTAGES))
+
+
+def test_full_squash_at_max_pos():
+    scales = volume_math.volume_preservation(0.5, [0.5], max_stretch_effect=2.0, min_stretch_length=0.5)
+    assert scales == pytest.approx([2.0])
+
+
+def test_full_stretch_at_max_pos():
+    scales = volume_math.volume_preservation(2.0, [0.5], min_stretch_effect=0.5, max_stretch_length=2.0)
+    assert scales == pytest.approx([0.5])
+
+
+def test_half_squash_is_linear():
+    scales = volume_math.volume_preservation(0.75, [0.5], max_stretch_effect=2.0, min_stretch_length=0.5)
+    assert scales == pytest.approx([1.5])
+
+
+def test_volume_bounds_without_falloff():
+    assert volume_math.volume_bounds(0.0, 0.5) == pytest.approx((-0.5, 0.5, 0.5, 1.5))
+
+
+def test_volume_bounds_with_full_falloff():
+    assert volume_math.volume_bounds(1.0, 0.5) == pytest.approx((-0.001, 0.001, 0.999, 1.001))
+
+
+def test_full_falloff_spreads_the_effect_along_the_chain():
+    scales = volume_math.volume_preservation(0.5, [0.1, 0.5, 0.9], falloff=1.0)
+    assert scales == pytest.approx([2.0, 2.0, 2.0])
+
+
+def test_no_falloff_fades_away_from_max_pos():
+    scales = volume_math.volume_preservation(0.5, [0.0, 0.5, 1.0], falloff=0.0, max_pos=0.5)
+    assert scales[1] == pytest.approx(2.0)
+    assert scales[0] < scales[1]
+    assert scales[2] < scales[1]
+
+
+@pytest.mark.parametrize("stretch_factor", [0.5, 1.0, 2.0])
+def test_no_volume_preservation_keeps_the_rest_scale(stretch_factor):
+    scales = volume_math.volume_preservation(stretch_factor, PERCENTAGES, volume_preservation=0.0)
+    assert scales == pytest.approx([1.0] * len(PERCENTAGES))
+
+
+def test_ramp_holds_the_end_values():
+    keys = [(0.0, 1.0, volume_math.LINEAR), (1.0, 3.0, volume_math.LINEAR)]
+    assert volume_math.ramp(-1.0, keys) == 1.0
+    assert volume_math.ramp(2.0, keys) == 3.0
+    assert volume_math.ramp(0.5, keys) == pytest.approx(2.0)